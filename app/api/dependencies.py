@@ -3,9 +3,10 @@ import asyncpg
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from typing import Optional
+from typing import Optional, List, Dict
 
 from app.core.config import settings
+from app.core.cache import user_cache
 from app.core.database import get_connection
 from app.repositories.usuario_repo import UsuarioRepository
 from app.repositories.usuario_perfil_repo import UsuarioPerfilRepository
@@ -17,6 +18,38 @@ from app.schemas.session_context_schema import ContextoSessao
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+async def get_cached_user(conn: asyncpg.Connection, user_id: int) -> Optional[Dict]:
+    """
+    Retorna os dados do usuário ativo usando o cache de autenticação.
+    Só consulta o banco em caso de miss/expiração.
+    """
+    entry = user_cache.get(user_id)
+    if entry is not None:
+        return entry["user"]
+
+    user_db = await UsuarioRepository(conn).get_user_by_id(user_id=user_id)
+    if user_db is None:
+        return None
+
+    user_cache.set(user_id, {"user": user_db, "perfis": None})
+    return user_db
+
+async def get_cached_profile_names(conn: asyncpg.Connection, user_id: int) -> List[str]:
+    """
+    Retorna os nomes dos perfis ativos do usuário usando o cache de autenticação.
+    """
+    entry = user_cache.get(user_id)
+    if entry is not None and entry["perfis"] is not None:
+        return entry["perfis"]
+
+    perfis = await UsuarioPerfilRepository(conn).get_user_profiles(user_id)
+    perfil_nomes = [p["perfil_nome"] for p in perfis]
+
+    if entry is not None:
+        entry["perfis"] = perfil_nomes
+    return perfil_nomes
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     conn: asyncpg.Connection = Depends(get_connection)
@@ -39,8 +72,7 @@ async def get_current_user(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    user_repo = UsuarioRepository(conn)
-    user_db = await user_repo.get_user_by_id(user_id=token_data.user_id)
+    user_db = await get_cached_user(conn, token_data.user_id)
     if user_db is None:
         raise credentials_exception
 
@@ -53,9 +85,7 @@ async def get_current_admin_user(
     """
     Verifica se o usuário tem perfil de Administrador no sistema de perfis múltiplos
     """
-    usuario_perfil_repo = UsuarioPerfilRepository(conn)
-    
-    is_admin = await usuario_perfil_repo.has_profile(current_user.id, "Administrador")
+    is_admin = "Administrador" in await get_cached_profile_names(conn, current_user.id)
     
     if not is_admin:
         raise HTTPException(
@@ -82,11 +112,8 @@ async def get_current_fiscal_user(
     """
     Verifica se o usuário pode exercer função de fiscal (Admin ou Fiscal)
     """
-    usuario_perfil_repo = UsuarioPerfilRepository(conn)
-    
-    can_be_fiscal = await usuario_perfil_repo.has_any_profile(
-        current_user.id, ["Administrador", "Fiscal"]
-    )
+    perfis = await get_cached_profile_names(conn, current_user.id)
+    can_be_fiscal = any(p in perfis for p in ["Administrador", "Fiscal"])
     
     if not can_be_fiscal:
         raise HTTPException(
@@ -102,11 +129,8 @@ async def get_current_manager_user(
     """
     Verifica se o usuário pode exercer função de gestor (Admin ou Gestor)
     """
-    usuario_perfil_repo = UsuarioPerfilRepository(conn)
-    
-    can_be_manager = await usuario_perfil_repo.has_any_profile(
-        current_user.id, ["Administrador", "Gestor"]
-    )
+    perfis = await get_cached_profile_names(conn, current_user.id)
+    can_be_manager = any(p in perfis for p in ["Administrador", "Gestor"])
     
     if not can_be_manager:
         raise HTTPException(
@@ -3,7 +3,7 @@ from typing import List
 from fastapi import HTTPException, status, Depends
 import asyncpg
 
-from app.api.dependencies import get_current_user, get_connection, get_current_user_with_context
+from app.api.dependencies import get_current_user, get_connection, get_current_user_with_context, get_cached_profile_names
 from app.schemas.usuario_schema import Usuario
 from app.repositories.usuario_perfil_repo import UsuarioPerfilRepository
 from app.repositories.contrato_repo import ContratoRepository
@@ -18,11 +18,12 @@ class PermissionChecker:
 
     async def has_profile(self, user: Usuario, profile_name: str) -> bool:
         """Verifica se o usuário tem um perfil específico"""
-        return await self.usuario_perfil_repo.has_profile(user.id, profile_name)
+        return profile_name in await get_cached_profile_names(self.conn, user.id)
 
     async def has_any_profile(self, user: Usuario, profile_names: List[str]) -> bool:
         """Verifica se o usuário tem pelo menos um dos perfis especificados"""
-        return await self.usuario_perfil_repo.has_any_profile(user.id, profile_names)
+        perfis = await get_cached_profile_names(self.conn, user.id)
+        return any(p in perfis for p in profile_names)
 
     async def is_contract_stakeholder(self, user: Usuario, contrato_id: int) -> bool:
         """Verifica se o usuário é gestor ou fiscal do contrato"""
@@ -108,8 +109,7 @@ async def require_any_profile(
     conn: asyncpg.Connection = Depends(get_connection)
 ) -> Usuario:
     """Permite qualquer usuário com pelo menos um perfil ativo"""
-    checker = PermissionChecker(conn)
-    profiles = await checker.usuario_perfil_repo.get_user_profiles(current_user.id)
+    profiles = await get_cached_profile_names(conn, current_user.id)
     
     if not profiles:
         raise HTTPException(
@@ -7,6 +7,7 @@ from typing import Optional
 from datetime import datetime
 
 from app.core.database import get_connection
+from app.core.pagination import Contagem
 from app.schemas.usuario_schema import Usuario
 from app.api.permissions import admin_required, get_current_user
 from app.repositories.audit_log_repo import AuditLogRepository
@@ -51,6 +52,7 @@ async def listar_logs(
     # Paginação
     pagina: int = Query(1, ge=1, description="Número da página"),
     tamanho_pagina: int = Query(50, ge=1, le=100, description="Itens por página"),
+    contagem: Contagem = Query("estimada", description="Estratégia de contagem do total: estimada (padrão), exata ou nenhuma"),
 
     # Ordenação
     ordenar_por: str = Query("data_hora", description="Campo para ordenar"),
@@ -74,6 +76,10 @@ async def listar_logs(
     - **data_inicio** e **data_fim**: Período de busca
     - **busca**: Busca texto livre na descrição
 
+    **Contagem:** por padrão o total é estimado pelo banco (`total_estimado=true`)
+    para não varrer toda a tabela; use `contagem=exata` para o valor exato ou
+    `contagem=nenhuma` para navegar apenas por `tem_proxima_pagina`.
+
     **Ordenação:**
     - Campos: id, data_hora, usuario_nome, acao, entidade
     - Ordem: ASC ou DESC
@@ -89,6 +95,7 @@ async def listar_logs(
         busca=busca,
         pagina=pagina,
         tamanho_pagina=tamanho_pagina,
+        contagem=contagem,
         ordenar_por=ordenar_por,
         ordem=ordem
     )
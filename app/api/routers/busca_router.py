@@ -0,0 +1,45 @@
+# app/api/routers/busca_router.py
+import asyncpg
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+
+from app.core.database import get_connection
+from app.api.dependencies import get_current_user_with_context
+from app.repositories.busca_repo import BuscaRepository
+from app.services.busca_service import BuscaService
+from app.schemas.busca_schema import BuscaResponse, TipoResultadoBusca
+
+router = APIRouter(
+    prefix="/busca",
+    tags=["Busca"]
+)
+
+
+def get_busca_service(conn: asyncpg.Connection = Depends(get_connection)) -> BuscaService:
+    return BuscaService(BuscaRepository(conn))
+
+
+@router.get("", response_model=BuscaResponse, summary="Busca textual em contratos, pendências e relatórios")
+async def buscar(
+    q: str = Query(..., min_length=2, description="Termos de busca (aceita \"frase exata\", OR e -exclusão)"),
+    tipos: Optional[List[TipoResultadoBusca]] = Query(None, description="Restringe os tipos de resultado"),
+    page: int = Query(1, ge=1, description="Número da página"),
+    per_page: int = Query(20, ge=1, le=100, description="Itens por página"),
+    service: BuscaService = Depends(get_busca_service),
+    user_context: tuple = Depends(get_current_user_with_context)
+):
+    """
+    Busca no objeto e nos termos contratuais dos contratos, na descrição das
+    pendências e nas observações dos relatórios fiscais, com stemming em
+    português. Os resultados vêm ordenados por relevância, com trechos
+    destacados (`<mark>`); o restante do trecho vem com o HTML escapado.
+
+    Cada perfil vê apenas o que veria na listagem de contratos: fiscal e gestor
+    recebem somente resultados dos seus contratos.
+    """
+    current_user, context = user_context
+    user_ctx = {
+        'usuario_id': context.usuario_id,
+        'perfil_ativo_nome': context.perfil_ativo_nome
+    }
+    return await service.buscar(termo=q, page=page, per_page=per_page, tipos=tipos, user_context=user_ctx)
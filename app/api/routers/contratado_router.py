@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
 from typing import List, Optional
 
 from app.core.database import get_connection
+from app.core.pagination import CONTAGEM_DESCRICAO, Contagem
 from app.schemas.contratado_schema import Contratado, ContratadoCreate, ContratadoUpdate, ContratadoPaginated
 from app.services.contratado_service import ContratadoService
 from app.repositories.contratado_repo import ContratadoRepository
@@ -51,6 +52,8 @@ async def get_all_contratados(
     nome: Optional[str] = Query(None, description="Filtrar por nome"),
     cnpj: Optional[str] = Query(None, description="Filtrar por CNPJ"),
     cpf: Optional[str] = Query(None, description="Filtrar por CPF"),
+    busca: Optional[str] = Query(None, description="Busca aproximada por relevância (ignora acentos e tolera erros de digitação)"),
+    contagem: Contagem = Query("exata", description=CONTAGEM_DESCRICAO),
     service: ContratadoService = Depends(get_contratado_service),
     current_user: Usuario = Depends(get_current_user)
 ):
@@ -61,14 +64,16 @@ async def get_all_contratados(
     filters = {
         'nome': nome,
         'cnpj': cnpj,
-        'cpf': cpf
+        'cpf': cpf,
+        'busca': busca
     }
     active_filters = {k: v for k, v in filters.items() if v is not None}
     
     result = await service.get_all_paginated(
         page=page, 
         per_page=per_page, 
-        filters=active_filters
+        filters=active_filters,
+        contagem=contagem
     )
     
     print(f"🔍 CONTRATADOS - Retornando {len(result.data)} itens de {result.total_items} total")
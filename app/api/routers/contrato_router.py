@@ -1,11 +1,12 @@
 # app/api/routers/contrato_router.py
 import asyncpg
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File, Form, Request
-from fastapi.responses import FileResponse
-from typing import List, Optional
-from datetime import date
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response, UploadFile, File, Form, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import List, Literal, Optional, Union
+from datetime import date, datetime
 
 from app.core.database import get_connection
+from app.core.pagination import CONTAGEM_DESCRICAO, Contagem
 from app.schemas.usuario_schema import Usuario
 from app.api.dependencies import get_current_user, get_current_admin_user, get_current_user_with_context
 
@@ -21,10 +22,14 @@ from app.api.permissions import admin_required, PermissionChecker
 # Services
 from app.services.contrato_service import ContratoService
 from app.services.file_service import FileService
+from app.services.contrato_import_service import ContratoImportService, ler_planilha
+from app.services.contrato_export_service import ContratoExportService, FORMATOS_EXPORTACAO
+from app.repositories.contrato_import_repo import ContratoImportRepository
 
 # Schemas
 from app.schemas.contrato_schema import (
-    Contrato, ContratoCreate, ContratoUpdate, ContratoPaginated, ArquivoContrato, ArquivoContratoList
+    Contrato, ContratoCreate, ContratoUpdate, ContratoPaginated, ContratoCursorPage, ArquivoContrato, ArquivoContratoList,
+    ContratoImportResultado, ContratoCompleto, SecaoContratoCompleto, ContratoExclusaoLote, ContratoExclusaoResultado
 )
 
 router = APIRouter(
@@ -44,9 +49,12 @@ def get_contrato_service(conn: asyncpg.Connection = Depends(get_connection)) ->
         file_service=FileService()
     )
 
+def get_contrato_import_service(conn: asyncpg.Connection = Depends(get_connection)) -> ContratoImportService:
+    return ContratoImportService(ContratoImportRepository(conn))
+
 # --- Função auxiliar para criação de contrato ---
 async def _create_contrato_logic(
-    nr_contrato: str,
+    nr_contrato: Optional[str],
     objeto: str,
     data_inicio: date,
     data_fim: date,
@@ -71,7 +79,7 @@ async def _create_contrato_logic(
 ):
     """Lógica comum para criação de contrato"""
     contrato_create = ContratoCreate(
-        nr_contrato=nr_contrato,
+        nr_contrato=nr_contrato or "",  # vazio: numeração automática no service
         objeto=objeto,
         data_inicio=data_inicio,
         data_fim=data_fim,
@@ -98,7 +106,7 @@ async def _create_contrato_logic(
 @router.post("/", response_model=Contrato, status_code=status.HTTP_201_CREATED)
 async def create_contrato_with_slash(
     request: Request,
-    nr_contrato: str = Form(...),
+    nr_contrato: Optional[str] = Form(None, description="Vazio para numeração automática"),
     objeto: str = Form(...),
     data_inicio: date = Form(...),
     data_fim: date = Form(...),
@@ -132,7 +140,7 @@ async def create_contrato_with_slash(
 @router.post("", response_model=Contrato, status_code=status.HTTP_201_CREATED)
 async def create_contrato(
     request: Request,
-    nr_contrato: str = Form(...),
+    nr_contrato: Optional[str] = Form(None, description="Vazio para numeração automática"),
     objeto: str = Form(...),
     data_inicio: date = Form(...),
     data_fim: date = Form(...),
@@ -163,18 +171,120 @@ async def create_contrato(
     )
 
 
+@router.post("/importar", response_model=ContratoImportResultado)
+async def importar_contratos(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    arquivo: UploadFile = File(..., description="Planilha .csv ou .xlsx com uma linha por contrato"),
+    validar_apenas: bool = Form(False, description="Apenas valida a planilha, sem gravar"),
+    service: ContratoImportService = Depends(get_contrato_import_service),
+    admin_user: Usuario = Depends(admin_required)
+):
+    """
+    Importa contratos em lote a partir de uma planilha.
+
+    As colunas têm os nomes dos campos do contrato (nr_contrato, objeto,
+    data_inicio, data_fim, ...). As chaves estrangeiras podem ser informadas
+    por id ou por valor: contratado_cnpj / contratado_cpf, modalidade, status,
+    gestor_email, fiscal_email e fiscal_substituto_email. Datas aceitam
+    aaaa-mm-dd ou dd/mm/aaaa.
+
+    As linhas válidas são gravadas e as inválidas voltam no relatório `erros`,
+    com o número da linha. Gestores e fiscais recebem um único email com todos
+    os contratos atribuídos a eles.
+    """
+    linhas = ler_planilha(await arquivo.read(), arquivo.filename)
+    resultado, emails_pendentes = await service.importar(
+        linhas, validar_apenas=validar_apenas, current_user=admin_user, request=request
+    )
+    # Só sem a caixa de saída: os resumos já gravados nela são entregues pelo worker
+    if emails_pendentes:
+        background_tasks.add_task(ContratoImportService.enviar_resumos, emails_pendentes)
+    return resultado
+
+
+@router.post("/excluir-lote", response_model=ContratoExclusaoResultado, summary="Excluir contratos em lote")
+async def excluir_contratos_lote(
+    payload: ContratoExclusaoLote,
+    request: Request,
+    service: ContratoService = Depends(get_contrato_service),
+    admin_user: Usuario = Depends(admin_required)
+):
+    """
+    Exclui (soft delete) vários contratos de uma vez, com suas pendências,
+    relatórios e arquivos, em uma única transação. Os arquivos físicos são
+    removidos depois do prazo de retenção. Ids inexistentes ou já excluídos
+    voltam em `nao_encontrados`.
+    """
+    return await service.delete_contratos(payload.contrato_ids, current_user=admin_user, request=request)
+
+
 @router.get("/next-number", response_model=dict)
 async def get_next_contract_number(
     service: ContratoService = Depends(get_contrato_service),
     current_user: Usuario = Depends(get_current_user)
 ):
     """
-    Retorna o próximo número de contrato disponível.
-    Útil para sugerir um número ao criar um novo contrato.
+    Retorna o próximo número de contrato disponível, sem reservá-lo.
+    Útil para sugerir um número ao criar um novo contrato; para garantir o
+    número sob criações simultâneas, crie o contrato com nr_contrato vazio.
     """
     next_number = await service.contrato_repo.get_next_available_nr_contrato()
     return {"next_number": next_number}
 
+@router.get("/exportar", summary="Exportar contratos (CSV/XLSX)")
+async def exportar_contratos(
+    formato: Literal["csv", "xlsx"] = Query("csv", description="Formato do arquivo"),
+    busca: Optional[str] = Query(None, description="Busca aproximada por relevância"),
+    gestor_id: Optional[int] = Query(None),
+    fiscal_id: Optional[int] = Query(None),
+    objeto: Optional[str] = Query(None),
+    nr_contrato: Optional[str] = Query(None),
+    status_id: Optional[int] = Query(None),
+    pae: Optional[str] = Query(None),
+    ano: Optional[int] = Query(None),
+    vencimento_dias: Optional[str] = Query(None, description="Filtro por dias até vencimento (30,60,90)"),
+    tem_garantia: Optional[bool] = Query(None, description="Filtrar contratos que possuem garantia"),
+    garantia_prazo_dias: Optional[str] = Query(None, description="Filtro por prazo da garantia (30,60,90)"),
+    user_context: tuple = Depends(get_current_user_with_context)
+):
+    """
+    Exporta todos os contratos da listagem, com os mesmos filtros e o mesmo
+    isolamento por perfil de GET /contratos, sem paginação. O arquivo é
+    transmitido à medida que as linhas são lidas do banco.
+    """
+    current_user, context = user_context
+    filters = {
+        'gestor_id': gestor_id,
+        'fiscal_id': fiscal_id,
+        'objeto': objeto,
+        'nr_contrato': nr_contrato,
+        'status_id': status_id,
+        'pae': pae,
+        'ano': ano,
+        'vencimento_dias': vencimento_dias,
+        'tem_garantia': tem_garantia,
+        'garantia_prazo_dias': garantia_prazo_dias,
+        'busca': busca
+    }
+    active_filters = {k: v for k, v in filters.items() if v is not None}
+    user_ctx = {
+        'usuario_id': context.usuario_id,
+        'perfil_ativo_nome': context.perfil_ativo_nome
+    }
+
+    media_type, extensao = FORMATOS_EXPORTACAO[formato]
+    nome_arquivo = f"contratos_{datetime.now():%Y%m%d_%H%M%S}.{extensao}"
+    return StreamingResponse(
+        ContratoExportService.exportar(formato, active_filters, user_ctx),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{nome_arquivo}"',
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 # Rota GET com barra final
 @router.get("/", response_model=ContratoPaginated)
 async def list_contratos_with_slash(
@@ -206,10 +316,14 @@ async def list_contratos_with_slash(
     )
 
 # Rota GET sem barra final
-@router.get("", response_model=ContratoPaginated)
+@router.get("", response_model=Union[ContratoPaginated, ContratoCursorPage])
 async def list_contratos(
     page: int = Query(1, ge=1, description="Número da página"),
     per_page: int = Query(10, ge=1, le=100, description="Itens por página"),
+    paginacao: Literal["offset", "cursor"] = Query("offset", description="'cursor' para paginação por cursor (ignora page)"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor (implica paginacao=cursor)"),
+    contagem: Contagem = Query("exata", description=CONTAGEM_DESCRICAO),
+    busca: Optional[str] = Query(None, description="Busca aproximada por relevância (ignora acentos e tolera erros de digitação)"),
     gestor_id: Optional[int] = Query(None),
     fiscal_id: Optional[int] = Query(None),
     objeto: Optional[str] = Query(None),
@@ -234,7 +348,8 @@ async def list_contratos(
         'ano': ano,
         'vencimento_dias': vencimento_dias,
         'tem_garantia': tem_garantia,
-        'garantia_prazo_dias': garantia_prazo_dias
+        'garantia_prazo_dias': garantia_prazo_dias,
+        'busca': busca
     }
     active_filters = {k: v for k, v in filters.items() if v is not None}
 
@@ -259,7 +374,10 @@ async def list_contratos(
         'perfil_ativo_nome': context.perfil_ativo_nome
     }
 
-    return await service.get_all_contratos(page=page, per_page=per_page, filters=active_filters, user_context=user_ctx)
+    if paginacao == "cursor" or cursor:
+        return await service.get_contratos_cursor(per_page=per_page, cursor=cursor, filters=active_filters, user_context=user_ctx)
+
+    return await service.get_all_contratos(page=page, per_page=per_page, filters=active_filters, user_context=user_ctx, contagem=contagem)
 
 # Rota sem barra final (para evitar redirects do frontend)
 @router.get("", response_model=ContratoPaginated)
@@ -337,6 +455,31 @@ async def get_contrato_by_id(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contrato não encontrado")
     return contrato
 
+@router.get("/{contrato_id}/completo", response_model=ContratoCompleto, summary="Contrato com arquivos, pendências, relatórios e auditoria")
+async def get_contrato_completo(
+    contrato_id: int,
+    include: Optional[List[SecaoContratoCompleto]] = Query(None, description="Seções a incluir (padrão: todas)"),
+    service: ContratoService = Depends(get_contrato_service),
+    user_context: tuple = Depends(get_current_user_with_context)
+):
+    """
+    Visão completa do contrato para a tela de detalhe, em uma única requisição
+    e consulta: substitui GET /contratos/{id}, /arquivos, /pendencias,
+    /relatorios e /arquivos/relatorios/contrato/{id}. Seções não pedidas em
+    `include` vêm como null. A auditoria traz os 20 eventos mais recentes do
+    contrato e de suas pendências e relatórios.
+    """
+    current_user, context = user_context
+    user_ctx = {
+        'usuario_id': context.usuario_id,
+        'perfil_ativo_nome': context.perfil_ativo_nome
+    }
+
+    contrato = await service.get_contrato_completo(contrato_id, include, user_context=user_ctx)
+    if not contrato:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contrato não encontrado")
+    return contrato
+
 @router.patch("/{contrato_id}", response_model=Contrato)
 async def update_contrato(
     request: Request,
@@ -459,8 +602,8 @@ async def update_contrato(
     return updated_contrato
 
 @router.delete("/{contrato_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_contrato(contrato_id: int, service: ContratoService = Depends(get_contrato_service), admin_user: Usuario = Depends(admin_required)):
-    await service.delete_contrato(contrato_id)
+async def delete_contrato(contrato_id: int, request: Request, service: ContratoService = Depends(get_contrato_service), admin_user: Usuario = Depends(admin_required)):
+    await service.delete_contrato(contrato_id, current_user=admin_user, request=request)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 # Rotas para gerenciamento de arquivos do contrato
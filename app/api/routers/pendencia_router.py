@@ -158,6 +158,9 @@ async def criar_pendencias_automaticas(
     As pendências serão criadas com intervalo configurado no sistema (padrão: 60 dias),
     numeradas sequencialmente (1º Relatório, 2º Relatório, etc.) entre as datas
     de início e fim do contrato.
+
+    Os emails para o fiscal e o fiscal substituto são entregues em segundo
+    plano, respeitando os limites de envio do provedor.
     """
     pendencias = await service.criar_pendencias_automaticas(
         contrato_id=contrato_id,
@@ -4,13 +4,15 @@ from typing import List, Optional
 
 from app.schemas.usuario_schema import (
     Usuario, UsuarioCreate, UsuarioUpdate,
-    UsuarioChangePassword, UsuarioResetPassword, UsuarioPaginated 
+    UsuarioChangePassword, UsuarioResetPassword, UsuarioPaginated,
+    PreferenciaNotificacao
 )
 from app.schemas.usuario_perfil_schema import UsuarioPerfilGrantRequest
 from app.api.dependencies import get_current_user
 from app.services.usuario_service import UsuarioService
 from app.repositories.usuario_repo import UsuarioRepository
 from app.core.database import get_connection
+from app.core.pagination import CONTAGEM_DESCRICAO, Contagem
 import asyncpg
 from app.api.permissions import admin_required, require_admin_or_manager, require_any_profile
 
@@ -34,6 +36,31 @@ async def read_users_me(current_user: Usuario = Depends(get_current_user)):
     """
     return current_user
 
+@router.get("/me/preferencias-notificacao", response_model=PreferenciaNotificacao, summary="Obter preferência de notificação")
+async def get_minha_preferencia_notificacao(
+    service: UsuarioService = Depends(get_usuario_service),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Retorna como o usuário logado recebe os emails das rotinas diárias
+    (lembretes de prazo, alertas de vencimento e escalonamento).
+    """
+    return await service.get_preferencia_notificacao(current_user.id)
+
+@router.put("/me/preferencias-notificacao", response_model=PreferenciaNotificacao, summary="Alterar preferência de notificação")
+async def set_minha_preferencia_notificacao(
+    preferencia: PreferenciaNotificacao,
+    service: UsuarioService = Depends(get_usuario_service),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Define como o usuário logado recebe os emails das rotinas diárias:
+
+    - **resumo**: um único email por execução, com todos os avisos agrupados
+    - **imediato**: um email para cada aviso
+    """
+    return await service.set_preferencia_notificacao(current_user.id, preferencia)
+
 @router.get("/test")
 async def test_usuarios():
     """Rota de teste para verificar se o router está funcionando"""
@@ -46,13 +73,16 @@ async def list_users(
     per_page: int = Query(10, ge=1, le=100, description="Itens por página"),
     nome: Optional[str] = Query(None, description="Filtrar por nome (busca parcial)"),
     perfil: Optional[str] = Query(None, description="Filtrar por perfil (Administrador, Gestor, Fiscal)"),
+    busca: Optional[str] = Query(None, description="Busca aproximada por relevância (ignora acentos e tolera erros de digitação)"),
+    contagem: Contagem = Query("exata", description=CONTAGEM_DESCRICAO),
     service: UsuarioService = Depends(get_usuario_service),
     current_user: Usuario = Depends(get_current_user)
 ):
     """
     Lista todos os usuários ativos do sistema com paginação.
 
-    Permite filtrar por nome (busca parcial) e por perfil.
+    Permite filtrar por nome (busca parcial) e por perfil. O parâmetro `busca`
+    faz busca aproximada pelo nome, ordenando os resultados por similaridade.
 
     **Requer usuário com perfil ativo (Administrador, Gestor ou Fiscal).**
     """
@@ -65,8 +95,10 @@ async def list_users(
         filters['nome'] = nome
     if perfil:
         filters['perfil'] = perfil
+    if busca:
+        filters['busca'] = busca
     
-    result = await service.get_all_paginated(page=page, per_page=per_page, filters=filters)
+    result = await service.get_all_paginated(page=page, per_page=per_page, filters=filters, contagem=contagem)
     print(f"🔍 USUARIOS - Retornando {len(result.data)} itens de {result.total_items} total")
     return result
 
@@ -0,0 +1,54 @@
+# app/core/busca_trigram.py
+"""
+Fragmentos SQL para busca textual com índices de trigramas.
+
+Com a migração 006_busca_trigram.sql aplicada, os filtros comparam
+`normalizar_busca(coluna)` (minúsculas, sem acentos), expressão coberta pelos
+índices GIN gin_trgm_ops:
+
+- "contém": `normalizar_busca(col) LIKE normalizar_busca('%termo%')`;
+- "similar": contém OU `termo <% col` (similaridade de palavras do pg_trgm,
+  tolera erros de digitação), ordenado pela maior word_similarity.
+
+Sem a migração, os mesmos filtros caem para ILIKE, como antes.
+"""
+from typing import Sequence
+
+from app.core.schema_registry import schema_registry
+
+FUNCAO_NORMALIZAR = "normalizar_busca"
+
+
+async def trigram_disponivel(conn) -> bool:
+    """Indica se a migração de busca por trigramas foi aplicada"""
+    return await schema_registry.has_function(conn, FUNCAO_NORMALIZAR)
+
+
+def filtro_contem(coluna: str, placeholder: str, trigram: bool) -> str:
+    """Filtro "contém"; o parâmetro já traz os curingas ('%termo%')"""
+    if trigram:
+        return f"{FUNCAO_NORMALIZAR}({coluna}) LIKE {FUNCAO_NORMALIZAR}({placeholder})"
+    return f"{coluna} ILIKE {placeholder}"
+
+
+def filtro_similar(colunas: Sequence[str], placeholder: str, trigram: bool) -> str:
+    """Filtro da busca aproximada sobre várias colunas; o parâmetro é o termo puro"""
+    partes = []
+    for coluna in colunas:
+        if trigram:
+            termo = f"{FUNCAO_NORMALIZAR}({placeholder})"
+            valor = f"{FUNCAO_NORMALIZAR}({coluna})"
+            partes.append(f"{valor} LIKE '%' || {termo} || '%'")
+            partes.append(f"{termo} <% {valor}")
+        else:
+            partes.append(f"{coluna} ILIKE '%' || {placeholder} || '%'")
+    return "(" + " OR ".join(partes) + ")"
+
+
+def ordem_similaridade(colunas: Sequence[str], placeholder: str) -> str:
+    """Expressão ORDER BY por relevância (maior similaridade entre as colunas)"""
+    termo = f"{FUNCAO_NORMALIZAR}({placeholder})"
+    similaridades = ", ".join(
+        f"COALESCE(word_similarity({termo}, {FUNCAO_NORMALIZAR}({coluna})), 0)" for coluna in colunas
+    )
+    return f"GREATEST({similaridades}) DESC" if len(colunas) > 1 else f"{similaridades} DESC"
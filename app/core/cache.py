@@ -0,0 +1,102 @@
+# app/core/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+from app.core.cache_bus import register_cache, register_invalidation_handler, publish_invalidation
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache em memória do processo com expiração por tempo (TTL) e descarte
+    LRU quando atinge o tamanho máximo.
+    """
+
+    def __init__(self, name: str, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor do cache ou `default` se ausente/expirado"""
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Armazena um valor, descartando o menos usado se necessário"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove uma chave do cache"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """Estatísticas de uso do cache"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+# Usuários autenticados e seus perfis ativos, indexados por id do usuário.
+# Entradas: {"user": dict, "perfis": Optional[list[str]]}
+user_cache = TTLCache(
+    "usuarios",
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
+register_cache("usuario", user_cache, key_cast=int)
+
+
+# Resultados dos dashboards, indexados por (endpoint, perfil, usuario_id).
+# Qualquer escrita em contrato, pendência ou relatório limpa o cache inteiro,
+# pois uma mesma alteração afeta os dashboards de vários perfis.
+DASHBOARD_ENTITY = "dashboard"
+
+dashboard_cache = TTLCache(
+    "dashboards",
+    max_size=settings.DASHBOARD_CACHE_MAX_SIZE,
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS
+)
+
+register_invalidation_handler(DASHBOARD_ENTITY, lambda key: dashboard_cache.clear())
+
+
+async def invalidate_dashboards(conn) -> None:
+    """Invalida os dashboards em todos os workers após uma escrita"""
+    await publish_invalidation(conn, DASHBOARD_ENTITY)
@@ -0,0 +1,151 @@
+# app/core/cache_bus.py
+"""
+Barramento de invalidação de cache entre workers usando LISTEN/NOTIFY do Postgres.
+
+Cada worker mantém caches em memória próprios. Quando um repositório grava
+uma entidade cacheada, ele chama `publish_invalidation`, que:
+  1. remove a entrada do cache local imediatamente;
+  2. emite `pg_notify` na mesma conexão (entregue no commit, se houver transação).
+Todos os workers escutam o canal com uma conexão dedicada e removem as
+entradas correspondentes dos seus próprios caches — inclusive o worker que
+publicou: dentro de uma transação, uma leitura concorrente pode recolocar o
+dado antigo no cache entre a remoção local e o commit, e a notificação (que
+só chega após o commit) o remove de novo.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sigescon_cache_invalidation"
+
+# Identificador deste processo (diagnóstico das notificações recebidas)
+WORKER_ID = uuid.uuid4().hex
+
+# entidade -> lista de handlers(key). key=None significa "invalidar tudo"
+_handlers: Dict[str, List[Callable[[Optional[str]], Any]]] = {}
+
+
+def register_invalidation_handler(entity: str, handler: Callable[[Optional[str]], Any]) -> None:
+    """Registra um handler (síncrono ou assíncrono) para invalidações de uma entidade"""
+    _handlers.setdefault(entity, []).append(handler)
+
+
+def register_cache(entity: str, cache, key_cast: Callable[[str], Any] = str) -> None:
+    """Atalho para registrar um TTLCache: remove a chave ou limpa o cache inteiro"""
+    def _evict(key: Optional[str]) -> None:
+        if key is None:
+            cache.clear()
+        else:
+            cache.invalidate(key_cast(key))
+    register_invalidation_handler(entity, _evict)
+
+
+async def _dispatch(entity: str, key: Optional[str]) -> None:
+    """Executa os handlers registrados para a entidade"""
+    for handler in _handlers.get(entity, []):
+        try:
+            result = handler(key)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"Erro ao invalidar cache '{entity}' (chave={key}): {e}")
+
+
+async def _dispatch_all() -> None:
+    """Invalida todos os caches registrados (usado após reconexão do listener)"""
+    for entity in list(_handlers):
+        await _dispatch(entity, None)
+
+
+async def publish_invalidation(conn, entity: str, key: Any = None) -> None:
+    """
+    Invalida `entity`/`key` no cache local e notifica todos os workers
+    (inclusive este, de novo após o commit). Falhas no NOTIFY são apenas
+    registradas: o TTL dos caches limita a defasagem.
+    """
+    key_str = None if key is None else str(key)
+    await _dispatch(entity, key_str)
+
+    payload = json.dumps({"origin": WORKER_ID, "entity": entity, "key": key_str})
+    try:
+        await conn.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+    except Exception as e:
+        logger.warning(f"Falha ao publicar invalidação de cache '{entity}' (chave={key_str}): {e}")
+
+
+class CacheInvalidationListener:
+    """Escuta o canal de invalidação numa conexão dedicada (fora do pool)"""
+
+    def __init__(self, dsn: Optional[str] = None, reconnect_delay: float = 5.0):
+        self.dsn = dsn or settings.DATABASE_URL
+        self.reconnect_delay = reconnect_delay
+        self._conn: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def is_listening(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def start(self) -> None:
+        """Abre a conexão dedicada e começa a escutar o canal"""
+        self._stopping = False
+        self._conn = await asyncpg.connect(self.dsn)
+        await self._conn.add_listener(CHANNEL, self._on_notification)
+        self._conn.add_termination_listener(self._on_termination)
+        logger.info(f"Listener de invalidação de cache iniciado (canal={CHANNEL}, worker={WORKER_ID[:8]})")
+
+    async def stop(self) -> None:
+        """Para de escutar e fecha a conexão dedicada"""
+        self._stopping = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._conn and not self._conn.is_closed():
+            try:
+                await self._conn.remove_listener(CHANNEL, self._on_notification)
+                await self._conn.close()
+            except Exception as e:
+                logger.error(f"Erro ao encerrar listener de invalidação: {e}")
+        self._conn = None
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+        except (TypeError, ValueError):
+            logger.warning(f"Payload de invalidação inválido: {payload!r}")
+            return
+
+        # As próprias notificações também são tratadas: chegam após o commit
+        asyncio.get_running_loop().create_task(
+            _dispatch(message.get("entity"), message.get("key"))
+        )
+
+    def _on_termination(self, connection) -> None:
+        if self._stopping:
+            return
+        logger.warning("Conexão do listener de invalidação encerrada; reconectando...")
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.reconnect_delay)
+            try:
+                await self.start()
+                # Notificações podem ter sido perdidas enquanto desconectado
+                await _dispatch_all()
+                return
+            except Exception as e:
+                logger.error(f"Falha ao reconectar listener de invalidação: {e}")
+
+
+cache_invalidation_listener = CacheInvalidationListener()
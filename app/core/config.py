@@ -1,6 +1,6 @@
 # app/core/config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict # <-- IMPORTAR SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     # Dicionário de configuração do Pydantic v2
@@ -9,11 +9,47 @@ class Settings(BaseSettings):
     # Configuração do Banco de Dados
     DATABASE_URL: str
 
+    # Pool de conexões (asyncpg)
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT: float = 30.0  # segundos aguardando uma conexão livre
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0  # segundos até fechar conexão ociosa
+    DB_POOL_MAX_QUERIES: int = 50000  # queries por conexão antes de reciclá-la
+    DB_COMMAND_TIMEOUT: float = 60.0  # timeout do lado do cliente (segundos)
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None  # statement_timeout do Postgres (ms)
+    DB_FANOUT_MAX_CONCURRENCY: int = 4  # conexões simultâneas por fan_out
+    DB_FANOUT_QUERY_TIMEOUT: float = 15.0  # segundos por consulta no fan_out
+
     # Configuração de Autenticação JWT
     JWT_SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1400
 
+    # Cache de usuários autenticados (dados + perfis ativos)
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_MAX_SIZE: int = 1024
+
+    # Cache de resultados dos dashboards (por endpoint, perfil e usuário)
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30.0
+    DASHBOARD_CACHE_MAX_SIZE: int = 512
+
+    # Importação em lote de contratos (CSV/XLSX)
+    CONTRATO_IMPORT_MAX_LINHAS: int = 10000
+
+    # Exportação em streaming: linhas lidas por vez do cursor no servidor
+    CONTRATO_EXPORT_PREFETCH: int = 500
+
+    # Numeração automática de contratos (migrations/008_contrato_numeracao.sql).
+    # Placeholders: {numero} (obrigatório, aceita formatação, ex.: {numero:03d})
+    # e {ano}; com {ano} cada ano tem sua própria sequência, ex.: "{numero:03d}/{ano}"
+    CONTRATO_NUMERO_FORMATO: str = "{numero}"
+
+    # Dias que os arquivos de contratos excluídos ficam no disco antes da
+    # coleta (migrations/009_arquivo_coleta.sql)
+    CONTRATO_ARQUIVOS_RETENCAO_DIAS: int = 30
+    # Arquivos que a coleta não conseguiu remover voltam à fila após este prazo
+    CONTRATO_ARQUIVOS_COLETA_ESPERA_HORAS: int = 24
+
     # Credenciais do Admin 
     ADMIN_EMAIL: Optional[str] = None
     ADMIN_PASSWORD: Optional[str] = None
@@ -24,6 +60,31 @@ class Settings(BaseSettings):
     SENDER_EMAIL: Optional[str] = None
     SENDER_PASSWORD: Optional[str] = None
 
+    # Pool de conexões SMTP (sessões autenticadas reutilizadas entre envios)
+    SMTP_POOL_TAMANHO: int = 3
+    SMTP_POOL_MAX_MENSAGENS: int = 100
+    SMTP_POOL_NOOP_APOS_SEGUNDOS: float = 30.0
+    SMTP_POOL_OCIOSA_MAX_SEGUNDOS: float = 300.0
+
+    # Limites de envio (token bucket): emails por minuto por conta SMTP e por
+    # domínio do destinatário; SMTP_RAJADA envios seguidos antes de espaçar
+    SMTP_TAXA_CONTA_POR_MINUTO: float = 30.0
+    SMTP_TAXA_DOMINIO_POR_MINUTO: float = 10.0
+    SMTP_RAJADA: int = 3
+
+    # Caixa de saída de emails (migrations/010_email_outbox.sql)
+    EMAIL_OUTBOX_LOTE: int = 50
+    EMAIL_OUTBOX_CONCORRENCIA: int = 5
+    EMAIL_OUTBOX_INTERVALO_SEGUNDOS: int = 30
+    EMAIL_OUTBOX_RESERVA_SEGUNDOS: int = 300
+    EMAIL_OUTBOX_MAX_TENTATIVAS: int = 5
+    EMAIL_OUTBOX_ESPERA_BASE_SEGUNDOS: int = 60
+    EMAIL_OUTBOX_ESPERA_MAX_SEGUNDOS: int = 3600
+
+    # Modo de entrega das rotinas em lote para quem não escolheu um
+    # (migrations/011_preferencia_notificacao.sql): 'resumo' ou 'imediato'
+    NOTIFICACAO_MODO_PADRAO: Literal["resumo", "imediato"] = "resumo"
+
  
 
 settings = Settings()
\ No newline at end of file
@@ -1,6 +1,11 @@
 # app/core/database.py
+import asyncio
+import time
 import asyncpg
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from .config import settings
+from .metrics import Histogram, Counter
 import logging
 
 # Configurar logging
@@ -10,6 +15,23 @@ logger = logging.getLogger(__name__)
 # Usaremos um pool de conexões para eficiência
 pool = None
 
+# Métricas do pool: tempo de espera para obter conexão (segundos) e
+# quantidade de conexões em uso no momento de cada checkout
+acquire_wait_histogram = Histogram(
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+)
+in_use_histogram = Histogram(buckets=[1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100])
+acquire_timeouts = Counter()
+_connections_in_use = 0
+
+
+def _server_settings() -> Dict[str, str]:
+    """Parâmetros de sessão aplicados a cada nova conexão do pool"""
+    server_settings = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    return server_settings
+
 async def get_db_pool():
     """
     Retorna o pool de conexões, criando-o se não existir.
@@ -19,29 +41,236 @@ async def get_db_pool():
         try:
             pool = await asyncpg.create_pool(
                 dsn=settings.DATABASE_URL,
-                min_size=1,
-                max_size=10,  
-                command_timeout=60
+                min_size=settings.DB_POOL_MIN_SIZE,
+                max_size=settings.DB_POOL_MAX_SIZE,
+                max_queries=settings.DB_POOL_MAX_QUERIES,
+                max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+                command_timeout=settings.DB_COMMAND_TIMEOUT,
+                server_settings=_server_settings()
+            )
+            logger.info(
+                f"Pool de conexões do banco criado com sucesso "
+                f"(min={settings.DB_POOL_MIN_SIZE}, max={settings.DB_POOL_MAX_SIZE})"
             )
-            logger.info("Pool de conexões do banco criado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao criar pool de conexões: {e}")
             raise
     return pool
 
+async def _checkout():
+    """Retira uma conexão do pool registrando as métricas de espera e ocupação"""
+    global _connections_in_use
+    db_pool = await get_db_pool()
+
+    start = time.perf_counter()
+    try:
+        connection = await db_pool.acquire(timeout=settings.DB_POOL_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError:
+        acquire_timeouts.inc()
+        acquire_wait_histogram.observe(time.perf_counter() - start)
+        logger.error(
+            f"Timeout ao obter conexão do pool após {settings.DB_POOL_ACQUIRE_TIMEOUT}s "
+            f"(em uso: {_connections_in_use}/{db_pool.get_max_size()})"
+        )
+        raise
+    acquire_wait_histogram.observe(time.perf_counter() - start)
+
+    _connections_in_use += 1
+    in_use_histogram.observe(_connections_in_use)
+    return db_pool, connection
+
+async def _checkin(db_pool, connection) -> None:
+    """Devolve uma conexão ao pool"""
+    global _connections_in_use
+    _connections_in_use -= 1
+    await db_pool.release(connection)
+
+@asynccontextmanager
+async def acquire_connection():
+    """
+    Obtém uma conexão do pool registrando o tempo de espera e a ocupação.
+    Respeita DB_POOL_ACQUIRE_TIMEOUT.
+    """
+    db_pool, connection = await _checkout()
+    try:
+        yield connection
+    finally:
+        await _checkin(db_pool, connection)
+
+
+class _LazyTransaction:
+    """Transação de uma LazyConnection: fixa a conexão até o fim do bloco"""
+
+    def __init__(self, lazy_conn: "LazyConnection", kwargs: Dict):
+        self._lazy_conn = lazy_conn
+        self._kwargs = kwargs
+        self._transaction = None
+
+    async def __aenter__(self):
+        connection = await self._lazy_conn.acquire()
+        self._lazy_conn._pinned += 1
+        try:
+            self._transaction = connection.transaction(**self._kwargs)
+            await self._transaction.start()
+        except Exception:
+            self._lazy_conn._pinned -= 1
+            raise
+        return self._transaction
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                await self._transaction.commit()
+            else:
+                await self._transaction.rollback()
+        finally:
+            self._lazy_conn._pinned -= 1
+        return False
+
+
+class LazyConnection:
+    """
+    Conexão "preguiçosa": só retira uma conexão do pool na primeira query e
+    permite devolvê-la antes do fim da requisição (release), evitando que a
+    conexão fique ociosa durante trabalho lento fora do banco (JWT, SMTP,
+    escrita de arquivos). Após um release, a próxima query obtém outra
+    conexão automaticamente. Dentro de uma transação a conexão fica fixa.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._connection = None
+        self._pinned = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_acquired(self) -> bool:
+        return self._connection is not None
+
+    async def acquire(self) -> asyncpg.Connection:
+        """Retorna a conexão real, retirando-a do pool se necessário"""
+        if self._connection is None:
+            async with self._lock:
+                if self._connection is None:
+                    self._pool, self._connection = await _checkout()
+        return self._connection
+
+    async def release(self) -> None:
+        """Devolve a conexão ao pool (no-op se não houver conexão ou transação aberta)"""
+        if self._connection is None or self._pinned:
+            return
+        async with self._lock:
+            if self._connection is None or self._pinned:
+                return
+            db_pool, connection = self._pool, self._connection
+            self._pool, self._connection = None, None
+            await _checkin(db_pool, connection)
+
+    async def close(self) -> None:
+        """Devolve a conexão ao pool incondicionalmente (fim da requisição)"""
+        self._pinned = 0
+        await self.release()
+
+    async def fetch(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).fetch(query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).fetchval(query, *args, **kwargs)
+
+    async def execute(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).execute(query, *args, **kwargs)
+
+    async def executemany(self, command: str, args, **kwargs):
+        return await (await self.acquire()).executemany(command, args, **kwargs)
+
+    async def copy_records_to_table(self, table_name: str, **kwargs):
+        return await (await self.acquire()).copy_records_to_table(table_name, **kwargs)
+
+    def transaction(self, **kwargs) -> _LazyTransaction:
+        return _LazyTransaction(self, kwargs)
+
+
+async def release_connection(conn) -> None:
+    """
+    Libera antecipadamente a conexão de uma requisição antes de trabalho lento
+    fora do banco. Conexões comuns (asyncpg.Connection) são ignoradas.
+    """
+    if isinstance(conn, LazyConnection):
+        await conn.release()
+
 async def get_connection():
     """
-    Obtém uma conexão do pool.
+    Fornece uma LazyConnection por requisição: a conexão só é retirada do
+    pool na primeira query e é devolvida ao final (ou antes, via release).
     """
-    db_pool = await get_db_pool()
+    lazy_conn = LazyConnection()
+    try:
+        yield lazy_conn
+    finally:
+        try:
+            await lazy_conn.close()
+        except Exception as e:
+            logger.error(f"Erro ao devolver conexão ao pool: {e}")
+
+async def fan_out(
+    *queries: Callable[[Any], Awaitable[Any]],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    conn: Any = None
+) -> List[Any]:
+    """
+    Executa consultas de leitura independentes ao mesmo tempo, cada uma em
+    uma conexão própria do pool. Cada item é uma função que recebe a conexão
+    e retorna um awaitable; os resultados voltam na mesma ordem.
+
+    No máximo `max_concurrency` conexões são usadas de uma vez
+    (DB_FANOUT_MAX_CONCURRENCY) e cada consulta, incluindo a espera pelo pool,
+    tem `timeout` segundos (DB_FANOUT_QUERY_TIMEOUT). Se alguma falhar, as
+    demais são canceladas e a exceção é propagada.
+
+    `conn` é a conexão da requisição que chama o fan-out: ela é devolvida ao
+    pool antes (release_connection) e, se continuar presa (transação aberta
+    ou conexão comum), conta no limite. Assim cada requisição ocupa no máximo
+    `max_concurrency` conexões e requisições simultâneas não esgotam o pool
+    esperando umas pelas outras.
+    """
+    limit = max_concurrency or settings.DB_FANOUT_MAX_CONCURRENCY
+    query_timeout = settings.DB_FANOUT_QUERY_TIMEOUT if timeout is None else timeout
+    if conn is not None:
+        await release_connection(conn)
+        if not isinstance(conn, LazyConnection) or conn.is_acquired:
+            limit = max(limit - 1, 1)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(query):
+        async with semaphore:
+            async def _with_connection():
+                async with acquire_connection() as connection:
+                    return await query(connection)
+            return await asyncio.wait_for(_with_connection(), timeout=query_timeout)
+
+    tasks = [asyncio.ensure_future(_run(query)) for query in queries]
     try:
-        async with db_pool.acquire() as connection:
-            yield connection
-            # A conexão é automaticamente devolvida ao pool aqui
-    except Exception as e:
-        logger.error(f"Erro ao obter conexão do pool: {e}")
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         raise
 
+def get_pool_metrics() -> Dict:
+    """Retorna as métricas de uso do pool (histogramas e contadores)"""
+    return {
+        "in_use": _connections_in_use,
+        "acquire_timeout_seconds": settings.DB_POOL_ACQUIRE_TIMEOUT,
+        "acquire_timeouts": acquire_timeouts.value,
+        "acquire_wait_seconds": acquire_wait_histogram.snapshot(),
+        "in_use_at_acquire": in_use_histogram.snapshot()
+    }
+
 async def close_db_pool():
     """
     Fecha o pool de conexões.
@@ -54,4 +283,4 @@ async def close_db_pool():
         except Exception as e:
             logger.error(f"Erro ao fechar pool: {e}")
         finally:
-            pool = None
\ No newline at end of file
+            pool = None
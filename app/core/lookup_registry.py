@@ -0,0 +1,100 @@
+# app/core/lookup_registry.py
+"""
+Registro em memória das tabelas de domínio pequenas (status, modalidade,
+perfil, statuspendencia e statusrelatorio), indexado por id e por nome.
+
+As tabelas são carregadas na inicialização e recarregadas sob demanda quando
+uma escrita publica `lookup:<tabela>` no barramento de invalidação. Assim os
+fluxos quentes resolvem status por nome sem nenhuma consulta ao banco.
+"""
+import logging
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.cache_bus import register_invalidation_handler
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_TABLES = ("status", "modalidade", "perfil", "statuspendencia", "statusrelatorio")
+
+
+def lookup_entity(table: str) -> str:
+    """Nome da entidade usada no barramento de invalidação para a tabela"""
+    return f"lookup:{table}"
+
+
+class LookupTable:
+    """Linhas ativas de uma tabela de domínio, indexadas por id e por nome"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.by_id: Dict[int, Dict] = {}
+        self.by_name: Dict[str, Dict] = {}
+        self.loaded = False
+
+    async def load(self, conn) -> None:
+        records = await conn.fetch(f"SELECT * FROM {self.name} WHERE ativo = TRUE ORDER BY nome")
+        rows = [dict(r) for r in records]
+        self.by_id = {row["id"]: row for row in rows}
+        self.by_name = {row["nome"]: row for row in rows}
+        self.loaded = True
+
+    def mark_stale(self, key: Optional[str] = None) -> None:
+        self.loaded = False
+
+
+class LookupRegistry:
+    def __init__(self, tables=LOOKUP_TABLES):
+        self._tables: Dict[str, LookupTable] = {name: LookupTable(name) for name in tables}
+        for table in self._tables.values():
+            register_invalidation_handler(lookup_entity(table.name), table.mark_stale)
+
+    def _table(self, table: str) -> LookupTable:
+        try:
+            return self._tables[table]
+        except KeyError:
+            raise ValueError(f"Tabela de domínio desconhecida: {table}")
+
+    async def warm_up(self, conn) -> None:
+        """Carrega todas as tabelas (chamado na inicialização da aplicação)"""
+        for table in self._tables.values():
+            await table.load(conn)
+
+    async def _ensure_loaded(self, conn, table: str) -> LookupTable:
+        lookup = self._table(table)
+        if not lookup.loaded:
+            await lookup.load(conn)
+        return lookup
+
+    async def get_by_name(self, conn, table: str, nome: str) -> Optional[Dict]:
+        """Linha ativa com o nome informado; só consulta o banco se a tabela estiver desatualizada"""
+        lookup = await self._ensure_loaded(conn, table)
+        return lookup.by_name.get(nome)
+
+    async def get_by_id(self, conn, table: str, item_id: int) -> Optional[Dict]:
+        lookup = await self._ensure_loaded(conn, table)
+        return lookup.by_id.get(item_id)
+
+    async def get_all(self, conn, table: str) -> List[Dict]:
+        lookup = await self._ensure_loaded(conn, table)
+        return list(lookup.by_name.values())
+
+    async def require_id(self, conn, table: str, nome: str) -> int:
+        """Id da linha com o nome informado ou HTTP 500 se o domínio não estiver cadastrado"""
+        row = await self.get_by_name(conn, table, nome)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Status '{nome}' não encontrado no sistema"
+            )
+        return row["id"]
+
+    def stats(self) -> Dict:
+        return {
+            name: {"loaded": table.loaded, "size": len(table.by_id)}
+            for name, table in self._tables.items()
+        }
+
+
+lookup_registry = LookupRegistry()
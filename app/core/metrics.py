@@ -0,0 +1,74 @@
+# app/core/metrics.py
+import threading
+from bisect import bisect_left
+from typing import Dict, Sequence
+
+
+class Histogram:
+    """
+    Histograma simples em memória com buckets fixos (semântica cumulativa
+    no estilo Prometheus: cada bucket conta observações <= limite).
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # último = +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Registra uma observação"""
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    def reset(self) -> None:
+        """Zera todas as observações"""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+            self._max = 0.0
+
+    def snapshot(self) -> Dict:
+        """Retorna uma cópia serializável do histograma"""
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for limit, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[str(limit)] = cumulative
+            buckets["+Inf"] = cumulative + self._counts[-1]
+
+            return {
+                "count": self._count,
+                "sum": round(self._sum, 6),
+                "avg": round(self._sum / self._count, 6) if self._count else 0.0,
+                "max": round(self._max, 6),
+                "buckets": buckets
+            }
+
+
+class Counter:
+    """Contador monotônico simples"""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = 0
+
+    @property
+    def value(self) -> int:
+        return self._value
@@ -0,0 +1,143 @@
+# app/core/pagination.py
+"""
+Paginação das listagens.
+
+Paginação por página (LIMIT/OFFSET) com estratégia de contagem escolhida pelo
+cliente, em uma única consulta de dados:
+
+- "exata": total via COUNT(*) OVER() na própria consulta da página;
+- "estimada": estimativa do planejador (EXPLAIN), sem varrer a tabela; exata
+  quando a página é a última;
+- "nenhuma": sem total, apenas indica se existe próxima página.
+
+Paginação por cursor (keyset): o cursor é opaco para o cliente e codifica em
+base64 a chave de ordenação e o id do último item da página. A próxima página
+é buscada com `WHERE (chave, id) < (cursor.chave, cursor.id)`, que usa o
+índice composto correspondente e custa o mesmo em qualquer profundidade.
+"""
+import base64
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Optional, Sequence
+
+import asyncpg
+from fastapi import HTTPException, status
+
+Contagem = Literal["exata", "estimada", "nenhuma"]
+
+CONTAGEM_DESCRICAO = (
+    "Estratégia de contagem do total: exata (padrão), estimada (estimativa do "
+    "banco, mais barata em listas grandes) ou nenhuma (apenas has_more)"
+)
+
+
+@dataclass
+class Pagina:
+    """Resultado de uma consulta paginada"""
+    itens: List[Dict[str, Any]]
+    total: Optional[int]          # None com contagem="nenhuma"
+    has_more: bool
+    total_estimado: bool = False
+
+    def total_paginas(self, per_page: int) -> Optional[int]:
+        if self.total is None:
+            return None
+        return math.ceil(self.total / per_page) if self.total > 0 else 1
+
+
+async def _estimar_total(conn: asyncpg.Connection, from_sql: str, where_sql: str, params: Sequence[Any]) -> int:
+    """Número de linhas estimado pelo planejador (estatísticas do ANALYZE)"""
+    plano = await conn.fetchval(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_sql}{where_sql}", *params)
+    if isinstance(plano, str):
+        plano = json.loads(plano)
+    return int(plano[0]["Plan"]["Plan Rows"])
+
+
+async def paginar(
+    conn: asyncpg.Connection,
+    *,
+    colunas: str,
+    from_sql: str,
+    where_sql: str,
+    params: Sequence[Any],
+    order_by: str,
+    limit: int,
+    offset: int,
+    contagem: Contagem = "exata"
+) -> Pagina:
+    """
+    Busca uma página de `SELECT {colunas} {from_sql}{where_sql} ORDER BY {order_by}`.
+
+    `where_sql` inclui a palavra WHERE (ou é vazio) e usa $1..$n de `params`;
+    LIMIT e OFFSET recebem os parâmetros seguintes.
+    """
+    params = list(params)
+    idx = len(params) + 1
+
+    if contagem == "exata":
+        rows = await conn.fetch(
+            f"""
+            SELECT {colunas}, COUNT(*) OVER() AS _total_paginacao
+            {from_sql}{where_sql}
+            ORDER BY {order_by}
+            LIMIT ${idx} OFFSET ${idx + 1}
+            """,
+            *params, limit, offset
+        )
+        itens = [dict(r) for r in rows]
+        if itens:
+            total = itens[0]["_total_paginacao"]
+            for item in itens:
+                del item["_total_paginacao"]
+        elif offset == 0:
+            total = 0
+        else:
+            # Página além do fim: não há linha para carregar o total
+            total = await conn.fetchval(f"SELECT COUNT(*) {from_sql}{where_sql}", *params)
+        return Pagina(itens=itens, total=total, has_more=offset + len(itens) < total)
+
+    # Busca um item a mais para saber se existe próxima página
+    rows = await conn.fetch(
+        f"""
+        SELECT {colunas}
+        {from_sql}{where_sql}
+        ORDER BY {order_by}
+        LIMIT ${idx} OFFSET ${idx + 1}
+        """,
+        *params, limit + 1, offset
+    )
+    itens = [dict(r) for r in rows[:limit]]
+    has_more = len(rows) > limit
+
+    if contagem == "nenhuma":
+        return Pagina(itens=itens, total=None, has_more=has_more)
+
+    if not has_more and (itens or offset == 0):
+        # Última página: o total é conhecido sem contar
+        return Pagina(itens=itens, total=offset + len(itens), has_more=False)
+
+    estimado = await _estimar_total(conn, from_sql, where_sql, params)
+    minimo = offset + len(itens) + (1 if has_more else 0)
+    return Pagina(itens=itens, total=max(estimado, minimo), has_more=has_more, total_estimado=True)
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Codifica os valores da chave de ordenação em um cursor opaco"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decodifica um cursor; cursores malformados resultam em HTTP 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, dict):
+            raise ValueError("cursor não é um objeto")
+        return values
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor de paginação inválido: {e}"
+        )
@@ -0,0 +1,67 @@
+# app/core/schema_registry.py
+"""
+Registro das tabelas (e funções) existentes no schema `public`.
+
+Os repositórios que dependem de tabelas opcionais consultavam
+`information_schema.tables` a cada chamada. O registro faz essa leitura uma
+única vez (na inicialização) e a compartilha entre todos os repositórios.
+Depois de aplicar migrações, publique a entidade `schema` no barramento de
+invalidação para que todos os workers recarreguem o catálogo:
+
+    SELECT pg_notify('sigescon_cache_invalidation', '{"entity": "schema", "key": null}');
+"""
+from typing import FrozenSet, Iterable, Optional
+
+from app.core.cache_bus import register_invalidation_handler
+
+SCHEMA_ENTITY = "schema"
+
+
+class SchemaRegistry:
+    def __init__(self, schema: str = "public"):
+        self.schema = schema
+        self._tables: Optional[FrozenSet[str]] = None
+        self._functions: Optional[FrozenSet[str]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._tables is not None
+
+    async def load(self, conn) -> FrozenSet[str]:
+        """Lê o catálogo e substitui o conjunto de tabelas conhecido"""
+        records = await conn.fetch(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = $1",
+            self.schema
+        )
+        self._tables = frozenset(row["table_name"] for row in records)
+        return self._tables
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Força nova leitura do catálogo na próxima consulta"""
+        self._tables = None
+        self._functions = None
+
+    async def existing_tables(self, conn) -> FrozenSet[str]:
+        """Tabelas existentes; consulta o catálogo apenas se ainda não carregado"""
+        if self._tables is None:
+            return await self.load(conn)
+        return self._tables
+
+    async def missing_tables(self, conn, required: Iterable[str]) -> list:
+        tables = await self.existing_tables(conn)
+        return [table for table in required if table not in tables]
+
+    async def has_function(self, conn, name: str) -> bool:
+        """Indica se a função existe no schema (criada por migração opcional)"""
+        if self._functions is None:
+            records = await conn.fetch(
+                "SELECT routine_name FROM information_schema.routines WHERE routine_schema = $1",
+                self.schema
+            )
+            self._functions = frozenset(row["routine_name"] for row in records)
+        return name in self._functions
+
+
+schema_registry = SchemaRegistry()
+
+register_invalidation_handler(SCHEMA_ENTITY, schema_registry.invalidate)
@@ -0,0 +1,45 @@
+# app/email_worker.py
+"""
+Worker dedicado da caixa de saída de emails.
+
+    python -m app.email_worker [--uma-vez] [--concorrencia N] [--lote N]
+
+Entrega os emails gravados em email_outbox. Pode rodar em mais de uma
+instância: cada uma reserva lotes diferentes (FOR UPDATE SKIP LOCKED).
+"""
+import argparse
+import asyncio
+import signal
+
+from app.core.database import close_db_pool
+from app.services.email_outbox_service import EmailOutboxWorker
+from app.services.smtp_pool import close_smtp_pools
+
+
+async def main(uma_vez: bool, lote: int, concorrencia: int) -> None:
+    worker = EmailOutboxWorker(lote=lote, concorrencia=concorrencia)
+    try:
+        if uma_vez:
+            total = await worker.processar_pendentes()
+            print(f"📧 {total} emails processados")
+            return
+
+        parar = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sinal, parar.set)
+        print(f"📧 Worker da caixa de saída iniciado (lote={worker.lote}, concorrência={worker.concorrencia})")
+        await worker.executar(parar)
+        print("Worker da caixa de saída parado.")
+    finally:
+        await close_smtp_pools()
+        await close_db_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrega os emails da caixa de saída")
+    parser.add_argument("--uma-vez", action="store_true", help="Esvazia a fila uma vez e sai")
+    parser.add_argument("--lote", type=int, default=None, help="Emails reservados por lote")
+    parser.add_argument("--concorrencia", type=int, default=None, help="Envios simultâneos por worker")
+    args = parser.parse_args()
+    asyncio.run(main(args.uma_vez, args.lote, args.concorrencia))
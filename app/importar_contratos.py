@@ -0,0 +1,55 @@
+# app/importar_contratos.py
+"""
+Importação de contratos em lote pela linha de comando.
+
+    python -m app.importar_contratos planilha.csv [--validar-apenas] [--sem-notificacao]
+
+Usa as mesmas regras de POST /api/v1/contratos/importar e imprime o relatório
+de erros por linha.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from app.core.database import acquire_connection, close_db_pool
+from app.repositories.contrato_import_repo import ContratoImportRepository
+from app.services.contrato_import_service import ContratoImportService, ler_planilha
+from app.services.smtp_pool import close_smtp_pools
+
+
+async def main(caminho: str, validar_apenas: bool, notificar: bool) -> int:
+    arquivo = Path(caminho)
+    linhas = ler_planilha(arquivo.read_bytes(), arquivo.name)
+    print(f"📄 {len(linhas)} linhas lidas de {arquivo.name}")
+
+    try:
+        async with acquire_connection() as conn:
+            service = ContratoImportService(ContratoImportRepository(conn))
+            resultado, emails_pendentes = await service.importar(
+                linhas, validar_apenas=validar_apenas, notificar=notificar
+            )
+
+        for erro in resultado.erros:
+            print(f"❌ Linha {erro.linha} ({erro.nr_contrato or '-'}): {'; '.join(erro.erros)}")
+
+        acao = "válidos" if validar_apenas else "importados"
+        print(f"✅ {resultado.importados} contratos {acao}, {resultado.com_erro} linhas com erro")
+
+        # Sem a caixa de saída, os resumos são enviados daqui mesmo
+        if emails_pendentes:
+            await ContratoImportService.enviar_resumos(emails_pendentes)
+    finally:
+        await close_smtp_pools()
+        await close_db_pool()
+
+    return 1 if resultado.com_erro else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa contratos de uma planilha CSV/XLSX")
+    parser.add_argument("arquivo", help="Caminho da planilha (.csv ou .xlsx)")
+    parser.add_argument("--validar-apenas", action="store_true", help="Valida sem gravar")
+    parser.add_argument("--sem-notificacao", action="store_true", help="Não envia os emails de resumo")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.arquivo, args.validar_apenas, not args.sem_notificacao)))
@@ -15,14 +15,21 @@ from app.api.routers import (
     contratado_router, auth_router, usuario_router, perfil_router,
     modalidade_router, status_router, status_relatorio_router,
     status_pendencia_router, contrato_router, pendencia_router, relatorio_router,
-    arquivo_router, dashboard_router, config_router, audit_log_router
+    arquivo_router, dashboard_router, config_router, audit_log_router,
+    busca_router
 )
 from app.api.routers import usuario_perfil_router
 # Imports dos sistemas avançados
-from app.core.database import get_db_pool, close_db_pool
+from app.core.database import get_db_pool, close_db_pool, acquire_connection, get_pool_metrics
+from app.core.cache import user_cache, dashboard_cache
+from app.core.cache_bus import cache_invalidation_listener
+from app.core.lookup_registry import lookup_registry
+from app.core.schema_registry import schema_registry
 from app.middleware.audit import AuditMiddleware
 from app.middleware.logging import setup_logging
 from app.services.notification_service import NotificationScheduler
+from app.services.smtp_pool import close_smtp_pools
+from app.services.email_send_scheduler import email_send_scheduler
 from app.api.exception_handlers import (
     sigescon_exception_handler,
     database_exception_handler,
@@ -52,8 +59,22 @@ async def lifespan(app: FastAPI):
         # 1. Conexão com banco de dados
         print("📊 Conectando ao banco de dados...")
         await get_db_pool()
+
+        # 2. Barramento de invalidação de cache entre workers (LISTEN/NOTIFY)
+        print("🔄 Iniciando listener de invalidação de cache...")
+        try:
+            await cache_invalidation_listener.start()
+        except Exception as e:
+            # Sem o listener os caches continuam válidos por TTL
+            print(f"⚠️ Listener de invalidação de cache indisponível: {e}")
+
+        # 3. Catálogo do schema e tabelas de domínio (status, modalidade, perfil...) em memória
+        print("📚 Carregando catálogo do schema e tabelas de domínio...")
+        async with acquire_connection() as conn:
+            await schema_registry.load(conn)
+            await lookup_registry.warm_up(conn)
         
-        # 2. Configuração do scheduler de notificações
+        # 4. Configuração do scheduler de notificações
         print("⏰ Configurando scheduler de notificações...")
         await notification_scheduler.setup_services()
         notification_scheduler.start_scheduler()
@@ -81,8 +102,17 @@ async def lifespan(app: FastAPI):
         # 1. Para o scheduler
         print("⏰ Parando scheduler...")
         notification_scheduler.stop_scheduler()
+
+        # 2. Para o listener de invalidação de cache
+        print("🔄 Parando listener de invalidação de cache...")
+        await cache_invalidation_listener.stop()
         
-        # 2. Fecha conexões do banco
+        # 3. Fecha as sessões SMTP e as conexões do banco
+        print("📧 Aguardando envios agendados e fechando sessões SMTP...")
+        pendentes = await email_send_scheduler.aguardar_agendados(timeout=10)
+        if pendentes:
+            print(f"⚠️ {pendentes} envios agendados não concluídos")
+        await close_smtp_pools()
         print("📊 Fechando conexões do banco...")
         await close_db_pool()
         
@@ -214,6 +244,9 @@ print(f"✅ Router de configurações registrado: {API_PREFIX}/config")
 app.include_router(audit_log_router.router, prefix=API_PREFIX)
 print(f"✅ Router de auditoria registrado: {API_PREFIX}/audit-logs")
 
+app.include_router(busca_router.router, prefix=API_PREFIX)
+print(f"✅ Router de busca registrado: {API_PREFIX}/busca")
+
 
 # Routers de tabelas auxiliares
 app.include_router(perfil_router.router, prefix=API_PREFIX)
@@ -264,8 +297,7 @@ async def health_check():
     """Endpoint de health check para monitoramento."""
     try:
         # Testa conexão com banco
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             await conn.fetchval("SELECT 1")
         db_status = "healthy"
     except:
@@ -294,13 +326,20 @@ async def get_metrics():
             "max_size": pool.get_max_size(),
             "min_size": pool.get_min_size(),
             "size": pool.get_size(),
-            "idle_size": pool.get_idle_size()
+            "idle_size": pool.get_idle_size(),
+            **get_pool_metrics()
         }
         
         return {
             "database": {
                 "connection_pool": pool_stats
             },
+            "cache": {
+                "invalidation_listener": cache_invalidation_listener.is_listening,
+                "usuarios": user_cache.stats(),
+                "dashboards": dashboard_cache.stats(),
+                "tabelas_dominio": lookup_registry.stats()
+            },
             "application": {
                 "version": "2.0.0",
                 "uptime": time.time() - app.state.start_time if hasattr(app.state, 'start_time') else 0
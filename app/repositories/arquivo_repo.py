@@ -1,6 +1,6 @@
 # app/repositories/arquivo_repo.py
 import asyncpg
-from typing import Dict, Optional 
+from typing import Dict, List, Optional 
 
 class ArquivoRepository:
     def __init__(self, conn: asyncpg.Connection):
@@ -81,3 +81,35 @@ class ArquivoRepository:
         query = "UPDATE arquivo SET ativo = FALSE, updated_at = NOW() WHERE id = $1"
         await self.conn.execute(query, arquivo_id)
         return True
+
+    async def get_arquivos_para_coleta(self, limite: int = 500) -> List[Dict]:
+        """Arquivos de contratos excluídos cujo prazo de retenção já venceu"""
+        query = """
+            SELECT ac.arquivo_id, ac.caminho_arquivo, a.ativo
+            FROM arquivo_coleta ac
+            JOIN arquivo a ON a.id = ac.arquivo_id
+            WHERE ac.remover_apos <= NOW()
+            ORDER BY ac.remover_apos
+            LIMIT $1
+        """
+        rows = await self.conn.fetch(query, limite)
+        return [dict(r) for r in rows]
+
+    async def adiar_coleta(self, arquivo_ids: List[int], horas: int) -> None:
+        """
+        Reagenda arquivos que não puderam ser removidos: saem do lote atual e
+        não ocupam o início dos próximos até o novo prazo
+        """
+        await self.conn.execute(
+            """
+            UPDATE arquivo_coleta SET remover_apos = NOW() + make_interval(hours => $2::int)
+            WHERE arquivo_id = ANY($1::int[])
+            """,
+            list(arquivo_ids), horas
+        )
+
+    async def remover_da_coleta(self, arquivo_ids: List[int]) -> None:
+        """Retira os arquivos da fila de coleta (já removidos ou reativados)"""
+        await self.conn.execute(
+            "DELETE FROM arquivo_coleta WHERE arquivo_id = ANY($1::int[])", list(arquivo_ids)
+        )
@@ -4,6 +4,7 @@ Repository para logs de auditoria
 import asyncpg
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
+from app.core.pagination import Pagina, paginar
 from app.schemas.audit_log_schema import AuditLogCreate, AuditLogFilter
 
 
@@ -53,7 +54,7 @@ class AuditLogRepository:
     async def get_logs_with_filters(
         self,
         filters: AuditLogFilter
-    ) -> tuple[List[Dict[str, Any]], int]:
+    ) -> Pagina:
         """
         Busca logs com filtros e paginação
 
@@ -61,7 +62,7 @@ class AuditLogRepository:
             filters: Filtros de busca
 
         Returns:
-            Tupla (lista de logs, total de registros)
+            Página de logs; o total segue a estratégia filters.contagem
         """
         # Construir WHERE clause
         where_clauses = []
@@ -113,11 +114,6 @@ class AuditLogRepository:
         # Construir query base
         where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
 
-        # Contar total
-        count_query = f"SELECT COUNT(*) FROM audit_log WHERE {where_sql}"
-        total = await self.conn.fetchval(count_query, *params)
-
-        # Buscar logs paginados
         offset = (filters.pagina - 1) * filters.tamanho_pagina
 
         # Validar campo de ordenação
@@ -125,18 +121,17 @@ class AuditLogRepository:
         order_field = filters.ordenar_por if filters.ordenar_por in valid_order_fields else 'data_hora'
         order_dir = 'DESC' if filters.ordem.upper() == 'DESC' else 'ASC'
 
-        data_query = f"""
-            SELECT * FROM audit_log
-            WHERE {where_sql}
-            ORDER BY {order_field} {order_dir}
-            LIMIT ${param_count} OFFSET ${param_count + 1}
-        """
-        params.extend([filters.tamanho_pagina, offset])
-
-        rows = await self.conn.fetch(data_query, *params)
-        logs = [dict(row) for row in rows]
-
-        return logs, total
+        return await paginar(
+            self.conn,
+            colunas="*",
+            from_sql="FROM audit_log",
+            where_sql=f" WHERE {where_sql}",
+            params=params,
+            order_by=f"{order_field} {order_dir}",
+            limit=filters.tamanho_pagina,
+            offset=offset,
+            contagem=filters.contagem
+        )
 
     async def get_log_by_id(self, log_id: int) -> Optional[Dict[str, Any]]:
         """
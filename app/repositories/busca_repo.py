@@ -0,0 +1,114 @@
+# app/repositories/busca_repo.py
+import asyncpg
+import html
+from typing import Dict, List, Optional, Sequence
+
+from app.repositories.contrato_repo import ContratoRepository
+
+# Configuração de busca textual das colunas busca_tsv (migrations/007_busca_textual.sql)
+CONFIGURACAO_BUSCA = "portuguese"
+
+# ts_headline marca os termos com caracteres de controle (removidos do texto
+# antes); o trecho é escapado e só então as marcas viram <mark>...</mark>, para
+# que texto salvo pelos usuários nunca chegue ao cliente como HTML
+INICIO_DESTAQUE = "\x02"
+FIM_DESTAQUE = "\x03"
+OPCOES_DESTAQUE = (
+    f"StartSel={INICIO_DESTAQUE}, StopSel={FIM_DESTAQUE}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2"
+)
+
+# Uma consulta por tipo de resultado; {where} recebe o isolamento por perfil
+# sobre o contrato (alias c), o mesmo de ContratoRepository.get_all_contratos
+CONSULTAS_POR_TIPO = {
+    "contrato": """
+        SELECT 'contrato' AS tipo, c.id, c.id AS contrato_id, c.nr_contrato,
+               c.objeto AS titulo,
+               concat_ws(' ', c.objeto, c.termos_contratuais) AS texto,
+               ts_rank(c.busca_tsv, q.consulta) AS relevancia
+        FROM contrato c
+        CROSS JOIN q
+        WHERE {where} AND c.busca_tsv @@ q.consulta
+    """,
+    "pendencia": """
+        SELECT 'pendencia' AS tipo, p.id, c.id AS contrato_id, c.nr_contrato,
+               p.titulo,
+               concat_ws(' ', p.titulo, p.descricao) AS texto,
+               ts_rank(p.busca_tsv, q.consulta) AS relevancia
+        FROM pendenciarelatorio p
+        JOIN contrato c ON p.contrato_id = c.id
+        CROSS JOIN q
+        WHERE {where} AND p.ativo = TRUE AND p.busca_tsv @@ q.consulta
+    """,
+    "relatorio": """
+        SELECT 'relatorio' AS tipo, r.id, c.id AS contrato_id, c.nr_contrato,
+               NULL::text AS titulo,
+               r.observacoes AS texto,
+               ts_rank(r.busca_tsv, q.consulta) AS relevancia
+        FROM relatoriofiscal r
+        JOIN contrato c ON r.contrato_id = c.id
+        CROSS JOIN q
+        WHERE {where} AND r.ativo = TRUE AND r.busca_tsv @@ q.consulta
+    """,
+}
+
+
+def montar_trecho(trecho: str) -> str:
+    """Escapa o trecho de ts_headline e troca as marcas de destaque por <mark>"""
+    return (
+        html.escape(trecho, quote=False)
+        .replace(INICIO_DESTAQUE, "<mark>")
+        .replace(FIM_DESTAQUE, "</mark>")
+    )
+
+
+class BuscaRepository:
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def buscar(
+        self,
+        termo: str,
+        tipos: Sequence[str],
+        limit: int,
+        offset: int,
+        user_context: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Busca textual em contratos, pendências e relatórios, ordenada por
+        ts_rank. O ranqueamento usa apenas os índices GIN; ts_headline (caro)
+        é calculado só para as linhas da página.
+        """
+        where_clauses, params, _ = ContratoRepository(self.conn)._build_list_filters(None, user_context)
+        where_sql = " AND ".join(where_clauses)
+        termo_idx = len(params) + 1
+
+        uniao = "\nUNION ALL\n".join(
+            CONSULTAS_POR_TIPO[tipo].format(where=where_sql) for tipo in tipos
+        )
+        query = f"""
+            WITH q AS (
+                SELECT websearch_to_tsquery('{CONFIGURACAO_BUSCA}', ${termo_idx}) AS consulta
+            ),
+            resultados AS (
+                {uniao}
+            ),
+            pagina AS (
+                SELECT * FROM resultados
+                ORDER BY relevancia DESC, tipo, id
+                LIMIT ${termo_idx + 1} OFFSET ${termo_idx + 2}
+            )
+            SELECT pagina.tipo, pagina.id, pagina.contrato_id, pagina.nr_contrato,
+                   pagina.titulo, pagina.relevancia,
+                   ts_headline('{CONFIGURACAO_BUSCA}',
+                               translate(coalesce(pagina.texto, ''), ${termo_idx + 3}, ''),
+                               q.consulta, ${termo_idx + 4}) AS trecho
+            FROM pagina
+            CROSS JOIN q
+            ORDER BY pagina.relevancia DESC, pagina.tipo, pagina.id
+        """
+        rows = await self.conn.fetch(
+            query, *params, termo, limit, offset,
+            INICIO_DESTAQUE + FIM_DESTAQUE, OPCOES_DESTAQUE
+        )
+        return [{**dict(r), 'trecho': montar_trecho(r['trecho'])} for r in rows]
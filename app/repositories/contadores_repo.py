@@ -0,0 +1,221 @@
+# app/repositories/contadores_repo.py
+import asyncpg
+from typing import Dict
+
+from app.core.schema_registry import schema_registry
+
+# Cada conjunto de contadores é calculado em uma única instrução SQL,
+# usando CTEs e COUNT(*) FILTER (...) em vez de um COUNT(*) por métrica.
+
+CONTADORES_ADMIN_QUERY = """
+    WITH contratos AS (
+        SELECT
+            COUNT(*) AS total_contratacoes,
+            COUNT(*) FILTER (WHERE s.nome = 'Ativo') AS contratos_ativos
+        FROM contrato c
+        LEFT JOIN status s ON c.status_id = s.id
+        WHERE c.ativo = true
+    ),
+    pendencias AS (
+        SELECT
+            COUNT(DISTINCT c.id) AS contratos_com_pendencias,
+            COUNT(DISTINCT c.contratado_id) FILTER (
+                WHERE p.data_prazo < CURRENT_DATE
+            ) AS contratados_com_pendencias_vencidas
+        FROM pendenciarelatorio p
+        JOIN contrato c ON p.contrato_id = c.id
+        JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
+        WHERE c.ativo = true AND sp.nome = 'Pendente'
+    ),
+    relatorios AS (
+        SELECT COUNT(*) AS relatorios_para_analise
+        FROM relatoriofiscal r
+        JOIN statusrelatorio sr ON r.status_id = sr.id
+        WHERE sr.nome = 'Pendente de Análise'
+    ),
+    usuarios AS (
+        SELECT COUNT(*) AS usuarios_ativos FROM usuario WHERE ativo = true
+    )
+    SELECT
+        relatorios.relatorios_para_analise,
+        pendencias.contratos_com_pendencias,
+        usuarios.usuarios_ativos,
+        contratos.contratos_ativos,
+        contratos.total_contratacoes,
+        pendencias.contratados_com_pendencias_vencidas
+    FROM contratos, pendencias, relatorios, usuarios
+"""
+
+CONTADORES_FISCAL_QUERY = """
+    WITH pendencias AS (
+        SELECT
+            COUNT(*) AS minhas_pendencias,
+            COUNT(*) FILTER (
+                WHERE p.data_prazo IS NOT NULL AND p.data_prazo < CURRENT_DATE
+            ) AS pendencias_em_atraso
+        FROM pendenciarelatorio p
+        JOIN contrato c ON p.contrato_id = c.id
+        JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
+        WHERE c.fiscal_id = $1 AND c.ativo = true AND sp.nome = 'Pendente'
+    ),
+    relatorios AS (
+        SELECT COUNT(*) AS relatorios_enviados_mes
+        FROM relatoriofiscal r
+        JOIN contrato c ON r.contrato_id = c.id
+        WHERE r.fiscal_usuario_id = $1
+            AND c.ativo = true
+            AND date_trunc('month', r.created_at) = date_trunc('month', CURRENT_DATE)
+    ),
+    contratos AS (
+        SELECT COUNT(*) AS contratos_ativos
+        FROM contrato c
+        WHERE (c.fiscal_id = $1 OR c.fiscal_substituto_id = $1) AND c.ativo = true
+    )
+    SELECT
+        pendencias.minhas_pendencias,
+        pendencias.pendencias_em_atraso,
+        relatorios.relatorios_enviados_mes,
+        contratos.contratos_ativos
+    FROM pendencias, relatorios, contratos
+"""
+
+CONTADORES_GESTOR_QUERY = """
+    WITH contratos AS (
+        SELECT
+            COUNT(*) AS contratos_sob_gestao,
+            COUNT(*) FILTER (WHERE s.nome = 'Ativo') AS contratos_ativos_sob_gestao
+        FROM contrato c
+        LEFT JOIN status s ON c.status_id = s.id
+        WHERE c.gestor_id = $1 AND c.ativo = true
+    ),
+    relatorios AS (
+        SELECT COUNT(*) AS relatorios_equipe_pendentes
+        FROM relatoriofiscal r
+        JOIN contrato c ON r.contrato_id = c.id
+        JOIN statusrelatorio sr ON r.status_id = sr.id
+        WHERE c.gestor_id = $1 AND c.ativo = true AND sr.nome = 'Pendente de Análise'
+    )
+    SELECT
+        contratos.contratos_sob_gestao,
+        contratos.contratos_ativos_sob_gestao,
+        relatorios.relatorios_equipe_pendentes
+    FROM contratos, relatorios
+"""
+
+# Estatísticas exibidas em /auth/dashboard-data, por perfil ativo
+ESTATISTICAS_SESSAO_ADMIN_QUERY = """
+    WITH contratos AS (
+        SELECT COUNT(*) AS total_contratos FROM contrato WHERE ativo = TRUE
+    ),
+    usuarios AS (
+        SELECT COUNT(*) AS usuarios_ativos FROM usuario WHERE ativo = TRUE
+    ),
+    relatorios AS (
+        SELECT COUNT(*) AS relatorios_pendentes
+        FROM relatoriofiscal rf
+        JOIN statusrelatorio sr ON rf.status_id = sr.id
+        WHERE sr.nome = 'Pendente de Análise'
+    ),
+    pendencias AS (
+        SELECT COUNT(*) AS pendencias_abertas
+        FROM pendenciarelatorio pr
+        JOIN statuspendencia sp ON pr.status_pendencia_id = sp.id
+        WHERE sp.nome = 'Pendente'
+    )
+    SELECT
+        contratos.total_contratos,
+        usuarios.usuarios_ativos,
+        relatorios.relatorios_pendentes,
+        pendencias.pendencias_abertas
+    FROM contratos, usuarios, relatorios, pendencias
+"""
+
+ESTATISTICAS_SESSAO_GESTOR_QUERY = """
+    WITH contratos AS (
+        SELECT COUNT(*) AS contratos_sob_gestao
+        FROM contrato
+        WHERE gestor_id = $1 AND ativo = TRUE
+    ),
+    relatorios AS (
+        SELECT COUNT(*) AS relatorios_para_aprovar
+        FROM relatoriofiscal rf
+        JOIN contrato c ON rf.contrato_id = c.id
+        JOIN statusrelatorio sr ON rf.status_id = sr.id
+        WHERE c.gestor_id = $1 AND sr.nome = 'Pendente de Análise'
+    ),
+    pendencias AS (
+        SELECT COUNT(*) AS pendencias_criadas
+        FROM pendenciarelatorio
+        WHERE criado_por_usuario_id = $1
+    )
+    SELECT
+        contratos.contratos_sob_gestao,
+        relatorios.relatorios_para_aprovar,
+        pendencias.pendencias_criadas
+    FROM contratos, relatorios, pendencias
+"""
+
+ESTATISTICAS_SESSAO_FISCAL_QUERY = """
+    WITH contratos AS (
+        SELECT COUNT(*) AS contratos_fiscalizados
+        FROM contrato
+        WHERE (fiscal_id = $1 OR fiscal_substituto_id = $1) AND ativo = TRUE
+    ),
+    pendencias AS (
+        SELECT COUNT(*) AS pendencias_ativas
+        FROM pendenciarelatorio pr
+        JOIN contrato c ON pr.contrato_id = c.id
+        JOIN statuspendencia sp ON pr.status_pendencia_id = sp.id
+        WHERE (c.fiscal_id = $1 OR c.fiscal_substituto_id = $1) AND sp.nome = 'Pendente'
+    ),
+    relatorios AS (
+        SELECT COUNT(*) AS relatorios_submetidos
+        FROM relatoriofiscal
+        WHERE fiscal_usuario_id = $1
+    )
+    SELECT
+        contratos.contratos_fiscalizados,
+        pendencias.pendencias_ativas,
+        relatorios.relatorios_submetidos
+    FROM contratos, pendencias, relatorios
+"""
+
+TABELAS_CONTADORES = [
+    'contrato', 'status', 'usuario', 'pendenciarelatorio',
+    'statuspendencia', 'relatoriofiscal', 'statusrelatorio'
+]
+
+
+class ContadoresRepository:
+    """Contadores agregados dos dashboards, um round trip por perfil"""
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def _fetch_counters(self, query: str, *args) -> Dict[str, int]:
+        """Executa a consulta agregada; retorna {} se faltar alguma tabela"""
+        missing_tables = await schema_registry.missing_tables(self.conn, TABELAS_CONTADORES)
+        if missing_tables:
+            print(f"Tabelas não encontradas: {missing_tables}. Retornando contadores zerados.")
+            return {}
+        row = await self.conn.fetchrow(query, *args)
+        return {key: value or 0 for key, value in dict(row).items()} if row else {}
+
+    async def get_contadores_admin(self) -> Dict[str, int]:
+        return await self._fetch_counters(CONTADORES_ADMIN_QUERY)
+
+    async def get_contadores_fiscal(self, fiscal_id: int) -> Dict[str, int]:
+        return await self._fetch_counters(CONTADORES_FISCAL_QUERY, fiscal_id)
+
+    async def get_contadores_gestor(self, gestor_id: int) -> Dict[str, int]:
+        return await self._fetch_counters(CONTADORES_GESTOR_QUERY, gestor_id)
+
+    async def get_estatisticas_sessao(self, usuario_id: int, perfil_ativo: str) -> Dict[str, int]:
+        """Estatísticas do perfil ativo para /auth/dashboard-data"""
+        if perfil_ativo == "Administrador":
+            return await self._fetch_counters(ESTATISTICAS_SESSAO_ADMIN_QUERY)
+        if perfil_ativo == "Gestor":
+            return await self._fetch_counters(ESTATISTICAS_SESSAO_GESTOR_QUERY, usuario_id)
+        if perfil_ativo == "Fiscal":
+            return await self._fetch_counters(ESTATISTICAS_SESSAO_FISCAL_QUERY, usuario_id)
+        return {}
@@ -1,8 +1,13 @@
 # app/repositories/contratado_repo.py
 import asyncpg
 from typing import List, Optional, Dict, Any, Tuple
+from app.core.busca_trigram import filtro_contem, filtro_similar, ordem_similaridade, trigram_disponivel
+from app.core.pagination import Contagem, Pagina, paginar
 from app.schemas.contratado_schema import ContratadoCreate, ContratadoUpdate
 
+# Colunas da busca aproximada (índices de migrations/006_busca_trigram.sql)
+CONTRATADO_BUSCA_COLUNAS = ("nome", "email")
+
 class ContratadoRepository:
     def __init__(self, conn: asyncpg.Connection):
         self.conn = conn
@@ -58,14 +63,17 @@ class ContratadoRepository:
         self, 
         limit: int = 10, 
         offset: int = 0, 
-        filters: Optional[Dict] = None
-    ) -> Tuple[List[Dict], int]:
+        filters: Optional[Dict] = None,
+        contagem: Contagem = "exata"
+    ) -> Pagina:
         """Busca contratados com paginação e filtros"""
+        trigram = await trigram_disponivel(self.conn)
         
         # Base da query
         where_clauses = ["ativo = TRUE"]
         params = []
         param_idx = 1
+        order_by = "nome ASC"
         
         # Aplica filtros se fornecidos
         if filters:
@@ -74,7 +82,7 @@ class ContratadoRepository:
                     continue
                     
                 if key == 'nome':
-                    where_clauses.append(f"nome ILIKE ${param_idx}")
+                    where_clauses.append(filtro_contem("nome", f"${param_idx}", trigram))
                     params.append(f"%{value}%")
                     param_idx += 1
                 elif key == 'cnpj':
@@ -86,26 +94,27 @@ class ContratadoRepository:
                     params.append(value)
                     param_idx += 1
                 elif key == 'email':
-                    where_clauses.append(f"email ILIKE ${param_idx}")
+                    where_clauses.append(filtro_contem("email", f"${param_idx}", trigram))
                     params.append(f"%{value}%")
                     param_idx += 1
+                elif key == 'busca':
+                    where_clauses.append(filtro_similar(CONTRATADO_BUSCA_COLUNAS, f"${param_idx}", trigram))
+                    if trigram:
+                        # Busca aproximada: resultados mais parecidos com o termo primeiro
+                        order_by = f"{ordem_similaridade(CONTRATADO_BUSCA_COLUNAS, f'${param_idx}')}, nome ASC"
+                    params.append(value)
+                    param_idx += 1
         
         where_sql = " WHERE " + " AND ".join(where_clauses)
         
-        # Query para contar total de itens
-        count_query = f"SELECT COUNT(*) FROM contratado{where_sql}"
-        total_items = await self.conn.fetchval(count_query, *params)
-        
-        # Query para buscar dados paginados
-        data_query = f"""
-            SELECT * FROM contratado
-            {where_sql}
-            ORDER BY nome ASC
-            LIMIT ${param_idx} OFFSET ${param_idx + 1}
-        """
-        
-        # Adiciona limit e offset aos parâmetros
-        paginated_params = params + [limit, offset]
-        contratados = await self.conn.fetch(data_query, *paginated_params)
-        
-        return [dict(c) for c in contratados], total_items or 0
\ No newline at end of file
+        return await paginar(
+            self.conn,
+            colunas="*",
+            from_sql="FROM contratado",
+            where_sql=where_sql,
+            params=params,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+            contagem=contagem
+        )
\ No newline at end of file
@@ -0,0 +1,103 @@
+# app/repositories/contrato_import_repo.py
+import asyncpg
+from typing import Dict, List, Sequence
+
+from app.repositories.contrato_repo import PERFIS_FISCAL, PERFIS_GESTOR
+
+# Colunas gravadas pela importação em lote, na ordem dos registros de COPY
+COLUNAS_IMPORTACAO = (
+    "nr_contrato", "objeto", "data_inicio", "data_fim", "contratado_id",
+    "modalidade_id", "status_id", "gestor_id", "fiscal_id",
+    "valor_anual", "valor_global", "base_legal", "termos_contratuais",
+    "fiscal_substituto_id", "pae", "doe", "data_doe", "garantia"
+)
+
+
+class ContratoImportRepository:
+    """Consultas em conjunto (uma por tabela) usadas pela importação em lote"""
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def get_contratados(self, ids: Sequence[int], documentos: Sequence[str]) -> List[Dict]:
+        """Contratados ativos por id ou por CNPJ/CPF (somente dígitos)"""
+        query = """
+            SELECT id, nome,
+                   regexp_replace(coalesce(cnpj, ''), '\\D', '', 'g') AS cnpj_digitos,
+                   regexp_replace(coalesce(cpf, ''), '\\D', '', 'g') AS cpf_digitos
+            FROM contratado
+            WHERE ativo = TRUE
+              AND (id = ANY($1::int[])
+                   OR regexp_replace(coalesce(cnpj, ''), '\\D', '', 'g') = ANY($2::text[])
+                   OR regexp_replace(coalesce(cpf, ''), '\\D', '', 'g') = ANY($2::text[]))
+        """
+        rows = await self.conn.fetch(query, list(ids), list(documentos))
+        return [dict(r) for r in rows]
+
+    async def get_usuarios(self, ids: Sequence[int], emails: Sequence[str]) -> List[Dict]:
+        """
+        Usuários ativos por id ou por email (sem diferenciar maiúsculas), com
+        os mesmos critérios de perfil de ContratoRepository.check_foreign_keys:
+        pode_gerir (Administrador ou Gestor) e pode_fiscalizar (Administrador
+        ou Fiscal).
+        """
+        query = """
+            SELECT u.id, u.nome, u.email,
+                   COALESCE(bool_or(p.nome = ANY($3::text[])), FALSE) AS pode_gerir,
+                   COALESCE(bool_or(p.nome = ANY($4::text[])), FALSE) AS pode_fiscalizar
+            FROM usuario u
+            LEFT JOIN usuario_perfil up ON up.usuario_id = u.id AND up.ativo = TRUE
+            LEFT JOIN perfil p ON p.id = up.perfil_id AND p.ativo = TRUE
+            WHERE u.ativo = TRUE
+              AND (u.id = ANY($1::int[]) OR lower(u.email) = ANY($2::text[]))
+            GROUP BY u.id
+        """
+        rows = await self.conn.fetch(
+            query, list(ids), [e.lower() for e in emails], PERFIS_GESTOR, PERFIS_FISCAL
+        )
+        return [dict(r) for r in rows]
+
+    async def get_nr_contratos_existentes(self, nr_contratos: Sequence[str]) -> set:
+        """Números já usados por contratos ativos"""
+        rows = await self.conn.fetch(
+            "SELECT nr_contrato FROM contrato WHERE ativo = TRUE AND nr_contrato = ANY($1::text[])",
+            list(nr_contratos)
+        )
+        return {r["nr_contrato"] for r in rows}
+
+    async def inserir_contratos(self, registros: List[tuple]) -> List[Dict]:
+        """
+        Grava os contratos em uma transação: COPY para uma tabela temporária
+        e um único INSERT ... SELECT. Cada registro é (linha, *COLUNAS_IMPORTACAO).
+        Números que passaram a existir durante a importação são ignorados
+        (retornam sem id para o relatório de erros).
+        """
+        colunas = ", ".join(COLUNAS_IMPORTACAO)
+        async with self.conn.transaction():
+            await self.conn.execute(f"""
+                CREATE TEMP TABLE contrato_importacao ON COMMIT DROP AS
+                SELECT 0 AS linha, {colunas} FROM contrato WITH NO DATA
+            """)
+            await self.conn.copy_records_to_table(
+                "contrato_importacao",
+                records=registros,
+                columns=["linha", *COLUNAS_IMPORTACAO]
+            )
+            rows = await self.conn.fetch(f"""
+                WITH inseridos AS (
+                    INSERT INTO contrato ({colunas})
+                    SELECT {colunas}
+                    FROM contrato_importacao i
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM contrato c
+                        WHERE c.nr_contrato = i.nr_contrato AND c.ativo = TRUE
+                    )
+                    ORDER BY i.linha
+                    RETURNING id, nr_contrato
+                )
+                SELECT i.linha, i.nr_contrato, ins.id
+                FROM contrato_importacao i
+                LEFT JOIN inseridos ins ON ins.nr_contrato = i.nr_contrato
+                ORDER BY i.linha
+            """)
+        return [dict(r) for r in rows]
@@ -0,0 +1,154 @@
+# app/repositories/contrato_numeracao_repo.py
+import asyncpg
+import re
+import string
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.core.schema_registry import schema_registry
+
+TABELA_NUMERACAO = "contrato_numeracao"
+
+
+def _campos_formato(formato: str):
+    """(texto literal, campo, especificação) de cada trecho do formato"""
+    partes = list(string.Formatter().parse(formato))
+    campos = {campo for _, campo, _, _ in partes if campo is not None}
+    if "numero" not in campos or not campos <= {"numero", "ano"}:
+        raise ValueError(f"CONTRATO_NUMERO_FORMATO inválido: '{formato}' (use {{numero}} e, opcionalmente, {{ano}})")
+    return partes
+
+
+def formatar_nr_contrato(numero: int, ano: int, formato: str) -> str:
+    return formato.format(numero=numero, ano=ano)
+
+
+def usa_ano(formato: str) -> bool:
+    return any(campo == "ano" for _, campo, _, _ in _campos_formato(formato))
+
+
+def regex_nr_contrato(formato: str, ano: Optional[int] = None, nomeado: bool = True) -> str:
+    """
+    Expressão regular dos números no formato. Com `ano`, o ano entra como
+    literal; `nomeado=False` gera a sintaxe aceita pelo PostgreSQL, com um
+    único grupo de captura (o número).
+    """
+    regex = "^"
+    for literal, campo, _, _ in _campos_formato(formato):
+        regex += re.escape(literal)
+        if campo == "numero":
+            regex += r"(?P<numero>\d+)" if nomeado else r"(\d+)"
+        elif campo == "ano":
+            if ano is not None:
+                regex += str(ano)
+            else:
+                regex += r"(?P<ano>\d{4})" if nomeado else r"\d{4}"
+    return regex + "$"
+
+
+class ContratoNumeracaoRepository:
+    """
+    Numeração automática de contratos com um contador por chave (tabela
+    contrato_numeracao). Sem a migração, usa o maior número existente, como
+    antes (sem garantia contra concorrência).
+    """
+
+    def __init__(self, conn: asyncpg.Connection, formato: Optional[str] = None):
+        self.conn = conn
+        self.formato = formato or settings.CONTRATO_NUMERO_FORMATO
+
+    def _chave(self, ano: int) -> str:
+        return str(ano) if usa_ano(self.formato) else ""
+
+    async def _disponivel(self) -> bool:
+        return TABELA_NUMERACAO in await schema_registry.existing_tables(self.conn)
+
+    async def _maior_existente(self, ano: int) -> int:
+        """Maior número já usado por contratos ativos na chave (varredura; só na criação do contador)"""
+        query = """
+            SELECT COALESCE(MAX(CAST(substring(nr_contrato FROM $1) AS BIGINT)), 0)
+            FROM contrato
+            WHERE ativo = TRUE AND nr_contrato ~ $1
+        """
+        return await self.conn.fetchval(query, regex_nr_contrato(self.formato, ano, nomeado=False))
+
+    async def _criar_contador(self, chave: str, ano: int) -> None:
+        await self.conn.execute(
+            f"""
+            INSERT INTO {TABELA_NUMERACAO} (chave, ultimo_numero) VALUES ($1, $2)
+            ON CONFLICT (chave) DO NOTHING
+            """,
+            chave, await self._maior_existente(ano)
+        )
+
+    async def proximo(self, ano: Optional[int] = None) -> str:
+        """Próximo número, sem reservá-lo (sugestão para o formulário)"""
+        ano = ano or date.today().year
+        ultimo = None
+        if await self._disponivel():
+            ultimo = await self.conn.fetchval(
+                f"SELECT ultimo_numero FROM {TABELA_NUMERACAO} WHERE chave = $1", self._chave(ano)
+            )
+        if ultimo is None:
+            ultimo = await self._maior_existente(ano)
+        return formatar_nr_contrato(ultimo + 1, ano, self.formato)
+
+    async def alocar(self, ano: Optional[int] = None) -> str:
+        """
+        Reserva o próximo número. O UPDATE ... RETURNING bloqueia a linha do
+        contador até o fim da transação em curso (commit ou rollback), então
+        chamadas concorrentes nunca recebem o mesmo número, mas esperam por
+        ela: chame dentro de uma transação curta, perto do commit, sem SMTP
+        ou outro trabalho lento depois. Fora de uma transação (autocommit) o
+        bloqueio termina com a própria instrução e números de criações que
+        falham depois não voltam; um rollback da transação devolve o número.
+        """
+        ano = ano or date.today().year
+        if not await self._disponivel():
+            return await self.proximo(ano)
+
+        chave = self._chave(ano)
+        query = f"""
+            UPDATE {TABELA_NUMERACAO}
+            SET ultimo_numero = ultimo_numero + 1, updated_at = NOW()
+            WHERE chave = $1
+            RETURNING ultimo_numero
+        """
+        numero = await self.conn.fetchval(query, chave)
+        if numero is None:
+            await self._criar_contador(chave, ano)
+            numero = await self.conn.fetchval(query, chave)
+        return formatar_nr_contrato(numero, ano, self.formato)
+
+    async def registrar(self, nr_contratos: Iterable[str]) -> None:
+        """
+        Avança os contadores para números informados manualmente (ou
+        importados) que seguem o formato, para que não sejam alocados de novo.
+        """
+        if not await self._disponivel():
+            return
+        padrao = re.compile(regex_nr_contrato(self.formato))
+        maiores: Dict[str, tuple] = {}
+        for nr in nr_contratos:
+            encontrado = padrao.match(str(nr or ""))
+            if not encontrado:
+                continue
+            ano = int(encontrado.groupdict().get("ano") or date.today().year)
+            chave = self._chave(ano)
+            numero = int(encontrado.group("numero"))
+            if chave not in maiores or numero > maiores[chave][0]:
+                maiores[chave] = (numero, ano)
+
+        for chave, (numero, ano) in maiores.items():
+            resultado = await self.conn.execute(
+                f"""
+                UPDATE {TABELA_NUMERACAO}
+                SET ultimo_numero = GREATEST(ultimo_numero, $2), updated_at = NOW()
+                WHERE chave = $1
+                """,
+                chave, numero
+            )
+            if resultado == "UPDATE 0":
+                # Contador novo: parte do maior número existente (já inclui este)
+                await self._criar_contador(chave, ano)
@@ -1,12 +1,139 @@
 # app/repositories/contrato_repo.py
 import asyncpg
+import json
 import logging
-from typing import List, Optional, Dict, Tuple
+from datetime import date
+from typing import AsyncIterator, List, Optional, Dict, Tuple
 
+from app.core.busca_trigram import filtro_contem, filtro_similar, ordem_similaridade, trigram_disponivel
+from app.core.pagination import Contagem, Pagina, paginar
+from app.core.schema_registry import schema_registry
+from app.repositories.contrato_numeracao_repo import ContratoNumeracaoRepository
 from app.schemas.contrato_schema import ContratoCreate, ContratoUpdate
 
 logger = logging.getLogger(__name__)
 
+# Fila de remoção dos arquivos físicos (migrations/009_arquivo_coleta.sql)
+TABELA_ARQUIVO_COLETA = "arquivo_coleta"
+
+# Perfis que podem ocupar a gestão e a fiscalização de um contrato
+PERFIS_GESTOR = ["Administrador", "Gestor"]
+PERFIS_FISCAL = ["Administrador", "Fiscal"]
+
+CONTRATO_LIST_FROM = """
+            FROM contrato c
+            LEFT JOIN contratado ct ON c.contratado_id = ct.id
+            LEFT JOIN modalidade m ON c.modalidade_id = m.id
+            LEFT JOIN status s ON c.status_id = s.id
+        """
+
+CONTRATO_LIST_COLUMNS = """
+                c.id, c.nr_contrato, c.objeto, c.data_fim,
+                c.fiscal_id, c.gestor_id,
+                ct.nome as contratado_nome,
+                s.nome as status_nome,
+                fiscal.nome as fiscal_nome,
+                gestor.nome as gestor_nome"""
+
+# Chave de ordenação da paginação por cursor; a mesma expressão está nos
+# índices de migrations/005_contrato_keyset_indexes.sql
+CONTRATO_KEYSET_SORT = "COALESCE(c.data_fim, 'infinity'::date)"
+
+# Colunas da busca aproximada (índices de migrations/006_busca_trigram.sql)
+CONTRATO_BUSCA_COLUNAS = ("c.objeto", "c.nr_contrato", "c.pae")
+
+# Colunas da exportação; os nomes coincidem com os aceitos pela importação em
+# lote (referências por CNPJ/CPF, nome e email), permitindo reimportar o arquivo
+CONTRATO_EXPORT_COLUMNS = {
+    "id": "c.id",
+    "nr_contrato": "c.nr_contrato",
+    "objeto": "c.objeto",
+    "contratado_nome": "ct.nome",
+    "contratado_cnpj": "ct.cnpj",
+    "contratado_cpf": "ct.cpf",
+    "modalidade": "m.nome",
+    "status": "s.nome",
+    "gestor_nome": "gestor.nome",
+    "gestor_email": "gestor.email",
+    "fiscal_nome": "fiscal.nome",
+    "fiscal_email": "fiscal.email",
+    "fiscal_substituto_nome": "fiscal_sub.nome",
+    "fiscal_substituto_email": "fiscal_sub.email",
+    "data_inicio": "c.data_inicio",
+    "data_fim": "c.data_fim",
+    "valor_anual": "c.valor_anual",
+    "valor_global": "c.valor_global",
+    "base_legal": "c.base_legal",
+    "pae": "c.pae",
+    "doe": "c.doe",
+    "data_doe": "c.data_doe",
+    "garantia": "c.garantia",
+    "termos_contratuais": "c.termos_contratuais",
+}
+
+# Seções da visão completa do contrato: cada uma é um json_agg correlacionado
+# com o contrato (alias c), calculado na mesma consulta que o busca
+CONTRATO_SECOES_COMPLETO = {
+    "arquivos": """
+        SELECT coalesce(json_agg(t ORDER BY t.created_at DESC), '[]'::json) FROM (
+            SELECT a.id, a.nome_arquivo, a.tipo_mime AS tipo_arquivo, a.tamanho_bytes,
+                   a.contrato_id, a.created_at::text AS created_at
+            FROM arquivo a
+            WHERE a.contrato_id = c.id
+        ) t
+    """,
+    "pendencias": """
+        SELECT coalesce(json_agg(t ORDER BY t.data_prazo DESC), '[]'::json) FROM (
+            SELECT p.id, p.contrato_id, p.titulo, p.descricao, p.data_prazo,
+                   p.status_pendencia_id, p.criado_por_usuario_id, p.created_at, p.updated_at,
+                   sp.nome AS status_nome, u.nome AS criado_por_nome
+            FROM pendenciarelatorio p
+            LEFT JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
+            LEFT JOIN usuario u ON p.criado_por_usuario_id = u.id
+            WHERE p.contrato_id = c.id AND p.ativo = TRUE
+        ) t
+    """,
+    "relatorios": """
+        SELECT coalesce(json_agg(t ORDER BY t.created_at DESC), '[]'::json) FROM (
+            SELECT rf.id, rf.contrato_id, rf.pendencia_id, rf.fiscal_usuario_id, rf.arquivo_id,
+                   rf.status_id, rf.created_at, rf.updated_at, rf.observacoes AS observacoes_fiscal,
+                   u.nome AS enviado_por, sr.nome AS status_relatorio, a.nome_arquivo
+            FROM relatoriofiscal rf
+            LEFT JOIN usuario u ON rf.fiscal_usuario_id = u.id
+            LEFT JOIN statusrelatorio sr ON rf.status_id = sr.id
+            LEFT JOIN arquivo a ON rf.arquivo_id = a.id
+            WHERE rf.contrato_id = c.id AND rf.ativo = TRUE
+        ) t
+    """,
+    "arquivos_relatorios": """
+        SELECT coalesce(json_agg(t ORDER BY t.created_at DESC), '[]'::json) FROM (
+            SELECT a.id, a.nome_arquivo, a.tipo_mime AS tipo_arquivo, a.tamanho_bytes, a.created_at,
+                   rf.id AS relatorio_id, sr.nome AS status_relatorio, u.nome AS enviado_por,
+                   rf.created_at AS data_envio
+            FROM relatoriofiscal rf
+            JOIN arquivo a ON rf.arquivo_id = a.id AND a.ativo = TRUE
+            LEFT JOIN usuario u ON rf.fiscal_usuario_id = u.id
+            LEFT JOIN statusrelatorio sr ON rf.status_id = sr.id
+            WHERE rf.contrato_id = c.id AND rf.ativo = TRUE
+        ) t
+    """,
+    # Eventos do contrato e de suas pendências/relatórios (índice idx_audit_log_entidade)
+    "auditoria": """
+        SELECT coalesce(json_agg(t ORDER BY t.data_hora DESC), '[]'::json) FROM (
+            SELECT al.id, al.usuario_nome, al.perfil_usado, al.acao, al.entidade,
+                   al.entidade_id, al.descricao, al.data_hora
+            FROM audit_log al
+            WHERE (al.entidade = 'CONTRATO' AND al.entidade_id = c.id)
+               OR (al.entidade = 'PENDENCIA' AND al.entidade_id = ANY(ARRAY(
+                       SELECT id FROM pendenciarelatorio WHERE contrato_id = c.id)))
+               OR (al.entidade = 'RELATORIO' AND al.entidade_id = ANY(ARRAY(
+                       SELECT id FROM relatoriofiscal WHERE contrato_id = c.id)))
+            ORDER BY al.data_hora DESC
+            LIMIT {limite}
+        ) t
+    """,
+}
+
 class ContratoRepository:
     def __init__(self, conn: asyncpg.Connection):
         self.conn = conn
@@ -97,24 +224,73 @@ class ContratoRepository:
         return dict(contrato) if contrato else None
 
 
-    async def get_all_contratos(
+    async def get_contrato_completo(
         self,
-        filters: Optional[Dict] = None,
-        order_by: str = 'c.data_fim DESC',
-        limit: int = 10,
-        offset: int = 0,
-        user_context: Optional[Dict] = None
-    ) -> Tuple[List[Dict], int]:
-        
-        base_query = """
+        contrato_id: int,
+        secoes: List[str],
+        user_context: Optional[Dict] = None,
+        limite_auditoria: int = 20
+    ) -> Optional[Dict]:
+        """
+        Contrato com as seções pedidas (CONTRATO_SECOES_COMPLETO) em uma única
+        consulta, aplicando o isolamento por perfil uma só vez. Seções não
+        pedidas ficam fora do resultado. Retorna None se o contrato não existe
+        ou não é visível para o perfil.
+        """
+        # Sem a migração de auditoria a seção vem vazia
+        sem_auditoria = "auditoria" in secoes and "audit_log" not in await schema_registry.existing_tables(self.conn)
+        if sem_auditoria:
+            secoes = [secao for secao in secoes if secao != "auditoria"]
+
+        # Mesmo isolamento por perfil da listagem (inclui c.ativo = TRUE)
+        where_clauses, params, _ = self._build_list_filters(None, user_context)
+        colunas_secoes = "".join(
+            f",\n                ({CONTRATO_SECOES_COMPLETO[secao].format(limite=int(limite_auditoria))}) AS {secao}"
+            for secao in secoes
+        )
+        query = f"""
+            SELECT
+                c.*,
+                ct.nome AS contratado_nome,
+                m.nome AS modalidade_nome,
+                s.nome AS status_nome,
+                gestor.nome AS gestor_nome,
+                fiscal.nome AS fiscal_nome,
+                fiscal_sub.nome AS fiscal_substituto_nome{colunas_secoes}
             FROM contrato c
             LEFT JOIN contratado ct ON c.contratado_id = ct.id
             LEFT JOIN modalidade m ON c.modalidade_id = m.id
             LEFT JOIN status s ON c.status_id = s.id
+            LEFT JOIN usuario gestor ON c.gestor_id = gestor.id
+            LEFT JOIN usuario fiscal ON c.fiscal_id = fiscal.id
+            LEFT JOIN usuario fiscal_sub ON c.fiscal_substituto_id = fiscal_sub.id
+            WHERE {" AND ".join(where_clauses)} AND c.id = ${len(params) + 1}
+        """
+        row = await self.conn.fetchrow(query, *params, int(contrato_id))
+        if not row:
+            return None
+        contrato = dict(row)
+        for secao in secoes:
+            contrato[secao] = json.loads(contrato[secao])
+        if sem_auditoria:
+            contrato["auditoria"] = []
+        return contrato
+
+    def _build_list_filters(
+        self,
+        filters: Optional[Dict] = None,
+        user_context: Optional[Dict] = None,
+        trigram: bool = False
+    ) -> Tuple[List[str], List, Optional[str]]:
+        """
+        Cláusulas WHERE e parâmetros da listagem (isolamento por perfil +
+        filtros). O terceiro valor é o placeholder do termo do filtro `busca`
+        (ex.: '$3'), para ordenar por similaridade, ou None.
         """
         where_clauses = ["c.ativo = TRUE"]
         params = []
         param_idx = 1
+        busca_param = None
 
         # Aplicar isolamento por perfil
         if user_context:
@@ -143,9 +319,14 @@ class ContratoRepository:
                     params.append(value)
                     param_idx += 1
                 elif key in ['objeto', 'nr_contrato', 'pae']:
-                    where_clauses.append(f"c.{key} ILIKE ${param_idx}")
+                    where_clauses.append(filtro_contem(f"c.{key}", f"${param_idx}", trigram))
                     params.append(f"%{value}%")
                     param_idx += 1
+                elif key == 'busca':
+                    busca_param = f"${param_idx}"
+                    where_clauses.append(filtro_similar(CONTRATO_BUSCA_COLUNAS, busca_param, trigram))
+                    params.append(value)
+                    param_idx += 1
                 elif key == 'vencimento_dias':
                     # Filtro por proximidade de vencimento (cumulativo - "ou menos")
                     # Considera apenas contratos com status "Ativo"
@@ -181,27 +362,108 @@ class ContratoRepository:
                     elif value and value.strip():
                         # Se não for um número válido, ignorar o filtro mas logar
                         print(f"🛡️ REPO: AVISO - Valor inválido para garantia_prazo_dias: {value}")
+        return where_clauses, params, busca_param
+
+    async def get_all_contratos(
+        self,
+        filters: Optional[Dict] = None,
+        order_by: str = 'c.data_fim DESC',
+        limit: int = 10,
+        offset: int = 0,
+        user_context: Optional[Dict] = None,
+        contagem: Contagem = "exata"
+    ) -> Pagina:
+        trigram = await trigram_disponivel(self.conn)
+        where_clauses, params, busca_param = self._build_list_filters(filters, user_context, trigram)
         where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-        count_query = f"SELECT COUNT(c.id) AS total {base_query}{where_sql}"
-        total_items = await self.conn.fetchval(count_query, *params)
-        data_query = f"""
+        if busca_param and trigram:
+            # Busca aproximada: resultados mais parecidos com o termo primeiro,
+            # reaproveitando o parâmetro do termo adicionado por _build_list_filters
+            order_by = f"{ordem_similaridade(CONTRATO_BUSCA_COLUNAS, busca_param)}, c.id DESC"
+        return await paginar(
+            self.conn,
+            colunas=CONTRATO_LIST_COLUMNS,
+            from_sql=CONTRATO_LIST_FROM + """
+            LEFT JOIN usuario fiscal ON c.fiscal_id = fiscal.id
+            LEFT JOIN usuario gestor ON c.gestor_id = gestor.id
+            """,
+            where_sql=where_sql,
+            params=params,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+            contagem=contagem
+        )
+
+    async def iter_contratos_exportacao(
+        self,
+        filters: Optional[Dict] = None,
+        user_context: Optional[Dict] = None,
+        prefetch: int = 500
+    ) -> AsyncIterator[asyncpg.Record]:
+        """
+        Percorre todos os contratos da listagem (mesmos filtros e isolamento por
+        perfil de get_all_contratos) com um cursor no servidor: apenas
+        `prefetch` linhas ficam em memória por vez. Requer uma conexão real
+        (asyncpg.Connection); o cursor roda em uma transação somente leitura
+        que termina quando o iterador é esgotado ou fechado.
+        """
+        trigram = await trigram_disponivel(self.conn)
+        where_clauses, params, busca_param = self._build_list_filters(filters, user_context, trigram)
+        order_by = "c.data_fim DESC, c.id DESC"
+        if busca_param and trigram:
+            order_by = f"{ordem_similaridade(CONTRATO_BUSCA_COLUNAS, busca_param)}, c.id DESC"
+
+        colunas = ",\n                ".join(f"{expr} AS {nome}" for nome, expr in CONTRATO_EXPORT_COLUMNS.items())
+        query = f"""
             SELECT
-                c.id, c.nr_contrato, c.objeto, c.data_fim,
-                c.fiscal_id, c.gestor_id,
-                ct.nome as contratado_nome,
-                s.nome as status_nome,
-                fiscal.nome as fiscal_nome,
-                gestor.nome as gestor_nome
-            {base_query}
+                {colunas}
+            {CONTRATO_LIST_FROM}
+            LEFT JOIN usuario gestor ON c.gestor_id = gestor.id
+            LEFT JOIN usuario fiscal ON c.fiscal_id = fiscal.id
+            LEFT JOIN usuario fiscal_sub ON c.fiscal_substituto_id = fiscal_sub.id
+            WHERE {" AND ".join(where_clauses)}
+            ORDER BY {order_by}
+        """
+        async with self.conn.transaction(isolation="repeatable_read", readonly=True):
+            async for registro in self.conn.cursor(query, *params, prefetch=prefetch):
+                yield registro
+
+    async def get_contratos_keyset(
+        self,
+        filters: Optional[Dict] = None,
+        limit: int = 10,
+        after: Optional[Tuple[date, int]] = None,
+        user_context: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Listagem por cursor ordenada por (data_fim DESC, id DESC). Contratos sem
+        data_fim vêm primeiro, como no ORDER BY data_fim DESC da listagem por
+        página. `after` é a chave (data_fim_ordem, id) do último item da página
+        anterior. Usa os índices idx_contrato_keyset_*.
+        """
+        trigram = await trigram_disponivel(self.conn)
+        where_clauses, params, _ = self._build_list_filters(filters, user_context, trigram)
+        param_idx = len(params) + 1
+
+        if after is not None:
+            where_clauses.append(f"({CONTRATO_KEYSET_SORT}, c.id) < (${param_idx}, ${param_idx + 1})")
+            params.extend(after)
+            param_idx += 2
+
+        where_sql = " WHERE " + " AND ".join(where_clauses)
+        data_query = f"""
+            SELECT {CONTRATO_LIST_COLUMNS},
+                {CONTRATO_KEYSET_SORT} AS data_fim_ordem
+            {CONTRATO_LIST_FROM}
             LEFT JOIN usuario fiscal ON c.fiscal_id = fiscal.id
             LEFT JOIN usuario gestor ON c.gestor_id = gestor.id
             {where_sql}
-            ORDER BY {order_by}
-            LIMIT ${param_idx} OFFSET ${param_idx + 1}
+            ORDER BY {CONTRATO_KEYSET_SORT} DESC, c.id DESC
+            LIMIT ${param_idx}
         """
-        paginated_params = params + [limit, offset]
-        contratos = await self.conn.fetch(data_query, *paginated_params)
-        return [dict(c) for c in contratos], total_items if total_items is not None else 0
+        contratos = await self.conn.fetch(data_query, *params, limit)
+        return [dict(c) for c in contratos]
 
 
     async def update_contrato(self, contrato_id: int, contrato: ContratoUpdate) -> Optional[Dict]:
@@ -277,35 +539,77 @@ class ContratoRepository:
             raise
 
 
-    async def delete_contrato(self, contrato_id: int) -> bool:
+    async def delete_contrato(self, contrato_id: int, retencao_arquivos_dias: int = 30) -> bool:
+        """Soft delete de um contrato e de seus relacionamentos (ver delete_contratos)"""
+        resultado = await self.delete_contratos([contrato_id], retencao_arquivos_dias)
+        return contrato_id in resultado["contratos"]
+
+    async def delete_contratos(self, contrato_ids: List[int], retencao_arquivos_dias: int = 30) -> Dict:
         """
-        Soft delete do contrato e de todos os relacionamentos em cascata:
-        - Marca o contrato como ativo = FALSE
-        - Marca todas as pendências do contrato como ativo = FALSE
-        - Marca todos os relatórios fiscais do contrato como ativo = FALSE
+        Soft delete em cascata de vários contratos em uma única instrução
+        (CTEs que modificam dados), dentro de uma transação:
+        - Marca os contratos ativos como ativo = FALSE
+        - Marca as pendências, os relatórios fiscais e os arquivos deles como ativo = FALSE
+        - Agenda a remoção dos arquivos físicos em arquivo_coleta (se a migração existir)
+
+        Retorna os ids efetivamente excluídos e as quantidades de cada tabela.
+        """
+        coleta_sql = ""
+        if TABELA_ARQUIVO_COLETA in await schema_registry.existing_tables(self.conn):
+            coleta_sql = f""",
+            coleta AS (
+                INSERT INTO {TABELA_ARQUIVO_COLETA} (arquivo_id, caminho_arquivo, remover_apos)
+                SELECT id, caminho_arquivo, NOW() + make_interval(days => $2::int)
+                FROM arquivos
+                ON CONFLICT (arquivo_id) DO NOTHING
+            )"""
+
+        query = f"""
+            WITH contratos AS (
+                UPDATE contrato SET ativo = FALSE, updated_at = NOW()
+                WHERE id = ANY($1::int[]) AND ativo = TRUE
+                RETURNING id
+            ),
+            pendencias AS (
+                UPDATE pendenciarelatorio p SET ativo = FALSE, updated_at = NOW()
+                FROM contratos c
+                WHERE p.contrato_id = c.id AND p.ativo = TRUE
+                RETURNING p.id
+            ),
+            relatorios AS (
+                UPDATE relatoriofiscal r SET ativo = FALSE, updated_at = NOW()
+                FROM contratos c
+                WHERE r.contrato_id = c.id AND r.ativo = TRUE
+                RETURNING r.id
+            ),
+            arquivos AS (
+                UPDATE arquivo a SET ativo = FALSE, updated_at = NOW()
+                FROM contratos c
+                WHERE a.contrato_id = c.id AND a.ativo = TRUE
+                RETURNING a.id, a.caminho_arquivo
+            ){coleta_sql}
+            SELECT
+                COALESCE((SELECT array_agg(id ORDER BY id) FROM contratos), '{{}}') AS contratos,
+                (SELECT COUNT(*) FROM pendencias) AS pendencias,
+                (SELECT COUNT(*) FROM relatorios) AS relatorios,
+                (SELECT COUNT(*) FROM arquivos) AS arquivos
         """
+        params = [list(contrato_ids)]
+        if coleta_sql:
+            params.append(retencao_arquivos_dias)
         try:
-            # 1. Soft delete das pendências relacionadas ao contrato
-            await self.conn.execute(
-                "UPDATE pendenciarelatorio SET ativo = FALSE, updated_at = NOW() WHERE contrato_id = $1 AND ativo = TRUE",
-                contrato_id
-            )
-
-            # 2. Soft delete dos relatórios fiscais relacionados ao contrato
-            await self.conn.execute(
-                "UPDATE relatoriofiscal SET ativo = FALSE, updated_at = NOW() WHERE contrato_id = $1 AND ativo = TRUE",
-                contrato_id
-            )
-
-            # 3. Soft delete do contrato
-            query = "UPDATE contrato SET ativo = FALSE, updated_at = NOW() WHERE id = $1 AND ativo = TRUE"
-            status = await self.conn.execute(query, contrato_id)
-
-            return status.endswith('1')
+            async with self.conn.transaction():
+                row = await self.conn.fetchrow(query, *params)
+            return {
+                "contratos": list(row["contratos"]),
+                "pendencias": row["pendencias"],
+                "relatorios": row["relatorios"],
+                "arquivos": row["arquivos"],
+            }
         except Exception as e:
-            logger.error(f"Erro ao fazer soft delete do contrato {contrato_id}: {e}")
+            logger.error(f"Erro ao fazer soft delete dos contratos {list(contrato_ids)}: {e}")
             raise
-    
+
     async def get_by_id(self, contrato_id: int) -> Optional[Dict]:
         """Alias para find_contrato_by_id para manter consistência com outros repositories"""
         return await self.find_contrato_by_id(contrato_id)
@@ -390,6 +694,47 @@ class ContratoRepository:
         query = "SELECT COUNT(*) FROM arquivo WHERE contrato_id = $1"
         return await self.conn.fetchval(query, contrato_id)
     
+    async def check_foreign_keys(
+        self,
+        contratado_id: Optional[int] = None,
+        modalidade_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        gestor_id: Optional[int] = None,
+        fiscal_id: Optional[int] = None,
+        fiscal_substituto_id: Optional[int] = None
+    ) -> Dict[str, Optional[bool]]:
+        """
+        Verifica em uma única consulta todas as referências de um contrato.
+        Para contratado, modalidade e status retorna True/False (existe e está
+        ativo). Para gestor e fiscais retorna None se o usuário não existe (ou
+        está inativo), False se não tem o perfil exigido (Administrador ou
+        Gestor / Administrador ou Fiscal) e True caso contrário.
+        """
+        query = """
+            WITH usuarios AS (
+                SELECT u.id,
+                       COALESCE(bool_or(p.nome = ANY($7::text[])), FALSE) AS pode_gerir,
+                       COALESCE(bool_or(p.nome = ANY($8::text[])), FALSE) AS pode_fiscalizar
+                FROM usuario u
+                LEFT JOIN usuario_perfil up ON up.usuario_id = u.id AND up.ativo = TRUE
+                LEFT JOIN perfil p ON p.id = up.perfil_id AND p.ativo = TRUE
+                WHERE u.id IN ($4, $5, $6) AND u.ativo = TRUE
+                GROUP BY u.id
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM contratado WHERE id = $1 AND ativo = TRUE) AS contratado_id,
+                EXISTS (SELECT 1 FROM modalidade WHERE id = $2 AND ativo = TRUE) AS modalidade_id,
+                EXISTS (SELECT 1 FROM status WHERE id = $3 AND ativo = TRUE) AS status_id,
+                (SELECT pode_gerir FROM usuarios WHERE id = $4) AS gestor_id,
+                (SELECT pode_fiscalizar FROM usuarios WHERE id = $5) AS fiscal_id,
+                (SELECT pode_fiscalizar FROM usuarios WHERE id = $6) AS fiscal_substituto_id
+        """
+        row = await self.conn.fetchrow(
+            query, contratado_id, modalidade_id, status_id, gestor_id, fiscal_id, fiscal_substituto_id,
+            PERFIS_GESTOR, PERFIS_FISCAL
+        )
+        return dict(row)
+
     async def exists_nr_contrato(self, nr_contrato: str, exclude_id: Optional[int] = None) -> bool:
         """Verifica se um número de contrato já existe (apenas contratos ativos)"""
         print(f"\n=== DEBUG exists_nr_contrato ===")
@@ -422,12 +767,5 @@ class ContratoRepository:
             raise
     
     async def get_next_available_nr_contrato(self) -> str:
-        """Retorna o próximo número de contrato disponível"""
-        query = """
-            SELECT COALESCE(MAX(CAST(nr_contrato AS INTEGER)), 0) + 1
-            FROM contrato 
-            WHERE ativo = TRUE 
-            AND nr_contrato ~ '^[0-9]+$'
-        """
-        next_number = await self.conn.fetchval(query)
-        return str(next_number)
\ No newline at end of file
+        """Retorna o próximo número de contrato disponível (sem reservá-lo)"""
+        return await ContratoNumeracaoRepository(self.conn).proximo()
\ No newline at end of file
@@ -0,0 +1,26 @@
+# app/repositories/contrato_resumo_repo.py
+import asyncpg
+from typing import Dict, Optional
+
+
+class ContratoResumoRepository:
+    """
+    Acesso à tabela contrato_resumo (migrations/004_create_contrato_resumo.sql),
+    mantida por triggers em pendenciarelatorio e relatoriofiscal.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def get_by_contrato_id(self, contrato_id: int) -> Optional[Dict]:
+        query = "SELECT * FROM contrato_resumo WHERE contrato_id = $1"
+        resumo = await self.conn.fetchrow(query, contrato_id)
+        return dict(resumo) if resumo else None
+
+    async def refresh_contrato(self, contrato_id: int) -> None:
+        """Recalcula o resumo de um contrato"""
+        await self.conn.execute("SELECT refresh_contrato_resumo($1)", contrato_id)
+
+    async def refresh_vencidas(self) -> int:
+        """Recalcula as pendências vencidas (mudam com a data, sem escrita). Retorna contratos alterados"""
+        return await self.conn.fetchval("SELECT refresh_contrato_resumo_vencidas()")
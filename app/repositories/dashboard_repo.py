@@ -3,6 +3,9 @@ import asyncpg
 from typing import List, Dict, Any
 from datetime import date, datetime
 
+from app.core.schema_registry import schema_registry
+from app.repositories.contadores_repo import ContadoresRepository
+
 
 class DashboardRepository:
     def __init__(self, connection: asyncpg.Connection):
@@ -13,15 +16,7 @@ class DashboardRepository:
         Busca contratos que têm relatórios aguardando análise pelo administrador
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'contratado', 'usuario', 'status', 'relatoriofiscal', 'statusrelatorio')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['contrato', 'contratado', 'usuario', 'status', 'relatoriofiscal', 'statusrelatorio']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -30,6 +25,36 @@ class DashboardRepository:
                 print(f"Tabelas não encontradas: {missing_tables}. Retornando lista vazia.")
                 return []
 
+            if 'contrato_resumo' in table_names:
+                # Resumo mantido por triggers: leitura indexada, sem GROUP BY no histórico
+                query = """
+                SELECT
+                    c.id,
+                    c.nr_contrato,
+                    c.objeto,
+                    c.data_inicio,
+                    c.data_fim,
+                    ct.nome as contratado_nome,
+                    u_gestor.nome as gestor_nome,
+                    u_fiscal.nome as fiscal_nome,
+                    s.nome as status_nome,
+                    rs.relatorios_pendentes_analise as relatorios_pendentes_count,
+                    rs.ultimo_relatorio_em as ultimo_relatorio_data,
+                    u_ultimo_fiscal.nome as ultimo_relatorio_fiscal
+                FROM contrato_resumo rs
+                JOIN contrato c ON c.id = rs.contrato_id
+                JOIN contratado ct ON c.contratado_id = ct.id
+                JOIN usuario u_gestor ON c.gestor_id = u_gestor.id
+                JOIN usuario u_fiscal ON c.fiscal_id = u_fiscal.id
+                JOIN status s ON c.status_id = s.id
+                LEFT JOIN usuario u_ultimo_fiscal ON rs.ultimo_relatorio_fiscal_id = u_ultimo_fiscal.id
+                WHERE rs.relatorios_pendentes_analise > 0 AND c.ativo = true
+                ORDER BY rs.ultimo_relatorio_em ASC
+                LIMIT $1
+                """
+                rows = await self.conn.fetch(query, limit)
+                return [dict(row) for row in rows]
+
             query = """
             SELECT DISTINCT
                 c.id,
@@ -73,15 +98,7 @@ class DashboardRepository:
         Busca contratos que têm pendências ativas (status 'Pendente')
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'contratado', 'usuario', 'status', 'pendenciarelatorio', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['contrato', 'contratado', 'usuario', 'status', 'pendenciarelatorio', 'statuspendencia']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -90,6 +107,35 @@ class DashboardRepository:
                 print(f"Tabelas não encontradas: {missing_tables}. Retornando lista vazia.")
                 return []
 
+            if 'contrato_resumo' in table_names:
+                # Resumo mantido por triggers: leitura indexada, sem GROUP BY no histórico
+                query = """
+                SELECT
+                    c.id,
+                    c.nr_contrato,
+                    c.objeto,
+                    c.data_inicio,
+                    c.data_fim,
+                    ct.nome as contratado_nome,
+                    u_gestor.nome as gestor_nome,
+                    u_fiscal.nome as fiscal_nome,
+                    s.nome as status_nome,
+                    rs.pendencias_abertas as pendencias_count,
+                    rs.pendencias_vencidas as pendencias_em_atraso,
+                    rs.ultima_pendencia_em as ultima_pendencia_data
+                FROM contrato_resumo rs
+                JOIN contrato c ON c.id = rs.contrato_id
+                JOIN contratado ct ON c.contratado_id = ct.id
+                JOIN usuario u_gestor ON c.gestor_id = u_gestor.id
+                JOIN usuario u_fiscal ON c.fiscal_id = u_fiscal.id
+                JOIN status s ON c.status_id = s.id
+                WHERE rs.pendencias_abertas > 0 AND c.ativo = true
+                ORDER BY rs.ultima_pendencia_em ASC
+                LIMIT $1
+                """
+                rows = await self.conn.fetch(query, limit)
+                return [dict(row) for row in rows]
+
             query = """
             SELECT DISTINCT
                 c.id,
@@ -132,15 +178,7 @@ class DashboardRepository:
         Busca todas as pendências ativas de um fiscal específico
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('pendenciarelatorio', 'contrato', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['pendenciarelatorio', 'contrato', 'statuspendencia']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -193,199 +231,40 @@ class DashboardRepository:
         """
         Busca contadores para o dashboard do administrador
         """
+        contadores = {
+            'relatorios_para_analise': 0,
+            'contratos_com_pendencias': 0,
+            'usuarios_ativos': 0,
+            'contratos_ativos': 0,
+            'total_contratacoes': 0,
+            'contratados_com_pendencias_vencidas': 0,
+            'minhas_pendencias': 0,
+            'pendencias_em_atraso': 0,
+            'relatorios_enviados_mes': 0,
+            'contratos_sob_gestao': 0,
+            'relatorios_equipe_pendentes': 0
+        }
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('relatoriofiscal', 'statusrelatorio', 'contrato', 'pendenciarelatorio', 'statuspendencia', 'usuario', 'contratado')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
-
-            contadores = {
-                'relatorios_para_analise': 0,
-                'contratos_com_pendencias': 0,
-                'usuarios_ativos': 0,
-                'contratos_ativos': 0,
-                'total_contratacoes': 0,
-                'contratados_com_pendencias_vencidas': 0,
-                'minhas_pendencias': 0,
-                'pendencias_em_atraso': 0,
-                'relatorios_enviados_mes': 0,
-                'contratos_sob_gestao': 0,
-                'relatorios_equipe_pendentes': 0
-            }
-
-            # Relatórios para análise
-            if all(table in table_names for table in ['relatoriofiscal', 'statusrelatorio']):
-                query = """
-                    SELECT COUNT(*)
-                    FROM relatoriofiscal r
-                    JOIN statusrelatorio sr ON r.status_id = sr.id
-                    WHERE sr.nome = 'Pendente de Análise'
-                """
-                result = await self.conn.fetchval(query)
-                contadores['relatorios_para_analise'] = result or 0
-
-            # Contratos com pendências
-            if all(table in table_names for table in ['contrato', 'pendenciarelatorio', 'statuspendencia']):
-                query = """
-                    SELECT COUNT(DISTINCT c.id)
-                    FROM contrato c
-                    JOIN pendenciarelatorio p ON p.contrato_id = c.id
-                    JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
-                    WHERE c.ativo = true AND sp.nome = 'Pendente'
-                """
-                result = await self.conn.fetchval(query)
-                contadores['contratos_com_pendencias'] = result or 0
-
-            # Usuários ativos
-            if 'usuario' in table_names:
-                query = """
-                    SELECT COUNT(*)
-                    FROM usuario
-                    WHERE ativo = true
-                """
-                result = await self.conn.fetchval(query)
-                contadores['usuarios_ativos'] = result or 0
-
-            # Contratos ativos (apenas status "Ativo")
-            if 'contrato' in table_names:
-                query = """
-                    SELECT COUNT(*)
-                    FROM contrato c
-                    JOIN status s ON c.status_id = s.id
-                    WHERE c.ativo = true AND s.nome = 'Ativo'
-                """
-                result = await self.conn.fetchval(query)
-                contadores['contratos_ativos'] = result or 0
-
-            # Total de contratações (todos os contratos não excluídos, independente do status)
-            if 'contrato' in table_names:
-                query = "SELECT COUNT(*) FROM contrato WHERE ativo = true"
-                result = await self.conn.fetchval(query)
-                contadores['total_contratacoes'] = result or 0
-
-            # Contratados com pendências vencidas
-            if all(table in table_names for table in ['contrato', 'contratado', 'pendenciarelatorio', 'statuspendencia']):
-                query = """
-                    SELECT COUNT(DISTINCT ct.id)
-                    FROM contratado ct
-                    JOIN contrato c ON ct.id = c.contratado_id
-                    JOIN pendenciarelatorio p ON c.id = p.contrato_id
-                    JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
-                    WHERE c.ativo = true
-                    AND sp.nome = 'Pendente'
-                    AND p.data_prazo < CURRENT_DATE
-                """
-                result = await self.conn.fetchval(query)
-                contadores['contratados_com_pendencias_vencidas'] = result or 0
-
-            return contadores
-
+            contadores.update(await ContadoresRepository(self.conn).get_contadores_admin())
         except Exception as e:
             print(f"Erro ao buscar contadores admin: {e}. Retornando contadores zerados.")
-            return {
-                'relatorios_para_analise': 0,
-                'contratos_com_pendencias': 0,
-                'usuarios_ativos': 0,
-                'contratos_ativos': 0,
-                'total_contratacoes': 0,
-                'contratados_com_pendencias_vencidas': 0,
-                'minhas_pendencias': 0,
-                'pendencias_em_atraso': 0,
-                'relatorios_enviados_mes': 0,
-                'contratos_sob_gestao': 0,
-                'relatorios_equipe_pendentes': 0
-            }
+        return contadores
 
     async def get_contadores_fiscal(self, fiscal_id: int) -> Dict[str, int]:
         """
         Busca contadores para o dashboard do fiscal
         """
+        contadores = {
+            'minhas_pendencias': 0,
+            'pendencias_em_atraso': 0,
+            'relatorios_enviados_mes': 0,
+            'contratos_ativos': 0
+        }
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('pendenciarelatorio', 'contrato', 'statuspendencia', 'relatoriofiscal')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
-
-            contadores = {
-                'minhas_pendencias': 0,
-                'pendencias_em_atraso': 0,
-                'relatorios_enviados_mes': 0,
-                'contratos_ativos': 0
-            }
-
-            # Minhas pendências
-            if all(table in table_names for table in ['pendenciarelatorio', 'contrato', 'statuspendencia']):
-                query = """
-                    SELECT COUNT(*)
-                    FROM pendenciarelatorio p
-                    JOIN contrato c ON p.contrato_id = c.id
-                    JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
-                    WHERE c.fiscal_id = $1 AND c.ativo = true AND sp.nome = 'Pendente'
-                """
-                result = await self.conn.fetchval(query, fiscal_id)
-                contadores['minhas_pendencias'] = result or 0
-
-            # Pendências em atraso
-            if all(table in table_names for table in ['pendenciarelatorio', 'contrato', 'statuspendencia']):
-                query = """
-                    SELECT COUNT(*)
-                    FROM pendenciarelatorio p
-                    JOIN contrato c ON p.contrato_id = c.id
-                    JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
-                    WHERE c.fiscal_id = $1
-                        AND c.ativo = true
-                        AND sp.nome = 'Pendente'
-                        AND p.data_prazo IS NOT NULL
-                        AND p.data_prazo < CURRENT_DATE
-                """
-                result = await self.conn.fetchval(query, fiscal_id)
-                contadores['pendencias_em_atraso'] = result or 0
-
-            # Relatórios enviados no mês
-            if all(table in table_names for table in ['relatoriofiscal', 'contrato']):
-                query = """
-                    SELECT COUNT(*)
-                    FROM relatoriofiscal r
-                    JOIN contrato c ON r.contrato_id = c.id
-                    WHERE r.fiscal_usuario_id = $1
-                        AND c.ativo = true
-                        AND EXTRACT(MONTH FROM r.created_at) = EXTRACT(MONTH FROM CURRENT_DATE)
-                        AND EXTRACT(YEAR FROM r.created_at) = EXTRACT(YEAR FROM CURRENT_DATE)
-                """
-                result = await self.conn.fetchval(query, fiscal_id)
-                contadores['relatorios_enviados_mes'] = result or 0
-
-            # Contratos ativos do fiscal
-            if 'contrato' in table_names:
-                query = """
-                    SELECT COUNT(*)
-                    FROM contrato c
-                    WHERE (c.fiscal_id = $1 OR c.fiscal_substituto_id = $1)
-                        AND c.ativo = true
-                """
-                result = await self.conn.fetchval(query, fiscal_id)
-                contadores['contratos_ativos'] = result or 0
-
-            return contadores
-
+            contadores.update(await ContadoresRepository(self.conn).get_contadores_fiscal(fiscal_id))
         except Exception as e:
             print(f"Erro ao buscar contadores fiscal: {e}. Retornando contadores zerados.")
-            return {
-                'minhas_pendencias': 0,
-                'pendencias_em_atraso': 0,
-                'relatorios_enviados_mes': 0,
-                'contratos_ativos': 0
-            }
+        return contadores
 
     async def get_pendencias_vencidas_admin(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -393,15 +272,7 @@ class DashboardRepository:
         com informações detalhadas e classificação de urgência
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('pendenciarelatorio', 'contrato', 'usuario', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['pendenciarelatorio', 'contrato', 'usuario', 'statuspendencia']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -466,15 +337,7 @@ class DashboardRepository:
         Busca estatísticas das pendências vencidas para o dashboard do administrador
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('pendenciarelatorio', 'contrato', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['pendenciarelatorio', 'contrato', 'statuspendencia']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -528,81 +391,23 @@ class DashboardRepository:
         """
         Busca contadores para o dashboard do gestor
         """
+        contadores = {
+            'contratos_sob_gestao': 0,
+            'contratos_ativos_sob_gestao': 0,
+            'relatorios_equipe_pendentes': 0
+        }
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'relatoriofiscal', 'statusrelatorio')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
-
-            contadores = {
-                'contratos_sob_gestao': 0,
-                'contratos_ativos_sob_gestao': 0,
-                'relatorios_equipe_pendentes': 0
-            }
-
-            # Contratos sob gestão (todos os contratos ativos, independente do status)
-            if 'contrato' in table_names:
-                # Total de contratos do gestor
-                query_total = """
-                    SELECT COUNT(*)
-                    FROM contrato c
-                    WHERE c.gestor_id = $1 AND c.ativo = true
-                """
-                result_total = await self.conn.fetchval(query_total, gestor_id)
-                contadores['contratos_sob_gestao'] = result_total or 0
-
-                # Contratos com status "Ativo" do gestor
-                query_ativos = """
-                    SELECT COUNT(*)
-                    FROM contrato c
-                    JOIN status s ON c.status_id = s.id
-                    WHERE c.gestor_id = $1 AND c.ativo = true AND s.nome = 'Ativo'
-                """
-                result_ativos = await self.conn.fetchval(query_ativos, gestor_id)
-                contadores['contratos_ativos_sob_gestao'] = result_ativos or 0
-
-            # Relatórios da equipe pendentes
-            if all(table in table_names for table in ['relatoriofiscal', 'contrato', 'statusrelatorio']):
-                query = """
-                    SELECT COUNT(*)
-                    FROM relatoriofiscal r
-                    JOIN contrato c ON r.contrato_id = c.id
-                    JOIN statusrelatorio sr ON r.status_id = sr.id
-                    WHERE c.gestor_id = $1
-                        AND c.ativo = true
-                        AND sr.nome = 'Pendente de Análise'
-                """
-                result = await self.conn.fetchval(query, gestor_id)
-                contadores['relatorios_equipe_pendentes'] = result or 0
-
-            return contadores
-
+            contadores.update(await ContadoresRepository(self.conn).get_contadores_gestor(gestor_id))
         except Exception as e:
             print(f"Erro ao buscar contadores gestor: {e}. Retornando contadores zerados.")
-            return {
-                'contratos_sob_gestao': 0,
-                'relatorios_equipe_pendentes': 0
-            }
+        return contadores
 
     async def get_pendencias_gestor(self, gestor_id: int) -> List[Dict[str, Any]]:
         """
         Busca todas as pendências dos contratos gerenciados pelo gestor
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('pendenciarelatorio', 'contrato', 'statuspendencia', 'usuario')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['pendenciarelatorio', 'contrato', 'statuspendencia', 'usuario']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -683,14 +488,7 @@ class DashboardRepository:
         """
         try:
             # Verificar tabelas existentes
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'pendenciarelatorio', 'relatoriofiscal', 'usuario', 'statusrelatorio', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             metrics = {
                 'contratos_com_pendencias': 0,
@@ -794,14 +592,7 @@ class DashboardRepository:
         """
         try:
             # Verificar se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('relatoriofiscal', 'contrato', 'contratado', 'usuario', 'statusrelatorio', 'arquivo', 'pendenciarelatorio')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['relatoriofiscal', 'contrato', 'contratado', 'usuario', 'statusrelatorio']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -850,14 +641,7 @@ class DashboardRepository:
         """
         try:
             # Verificar tabelas existentes
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'pendenciarelatorio', 'relatoriofiscal', 'statusrelatorio', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             metrics = {
                 'minhas_pendencias': 0,
@@ -960,14 +744,7 @@ class DashboardRepository:
         """
         try:
             # Verificar tabelas existentes
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'pendenciarelatorio', 'relatoriofiscal', 'usuario', 'statusrelatorio', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             metrics = {
                 'contratos_sob_gestao': 0,
@@ -1113,15 +890,7 @@ class DashboardRepository:
         Busca todas as pendências pendentes (não vencidas) do sistema para o administrador
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('pendenciarelatorio', 'contrato', 'usuario', 'statuspendencia')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['pendenciarelatorio', 'contrato', 'usuario', 'statuspendencia']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -1179,15 +948,7 @@ class DashboardRepository:
         Para o dashboard do administrador
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'contratado', 'usuario', 'status')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['contrato', 'contratado', 'usuario', 'status']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -1265,15 +1026,7 @@ class DashboardRepository:
         Busca estatísticas dos contratos próximos ao vencimento para o dashboard do administrador
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'status')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['contrato', 'status']
             missing_tables = [table for table in required_tables if table not in table_names]
@@ -1325,15 +1078,7 @@ class DashboardRepository:
         Para envio de alertas aos administradores
         """
         try:
-            # Primeiro verifica se as tabelas existem
-            check_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('contrato', 'contratado', 'usuario', 'status')
-            """
-            existing_tables = await self.conn.fetch(check_query)
-            table_names = [row['table_name'] for row in existing_tables]
+            table_names = await schema_registry.existing_tables(self.conn)
 
             required_tables = ['contrato', 'contratado', 'usuario', 'status']
             missing_tables = [table for table in required_tables if table not in table_names]
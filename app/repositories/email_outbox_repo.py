@@ -0,0 +1,147 @@
+# app/repositories/email_outbox_repo.py
+import asyncpg
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.schema_registry import schema_registry
+
+TABELA_OUTBOX = "email_outbox"
+
+
+class EmailOutboxRepository:
+    """Caixa de saída de emails (migrations/010_email_outbox.sql)"""
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def disponivel(self) -> bool:
+        return TABELA_OUTBOX in await schema_registry.existing_tables(self.conn)
+
+    async def enfileirar(self, destinatario: str, assunto: str, corpo: str, is_html: bool = True) -> int:
+        """Grava um email; participa da transação em curso na conexão"""
+        return await self.conn.fetchval(
+            f"""
+            INSERT INTO {TABELA_OUTBOX} (destinatario, assunto, corpo, is_html, max_tentativas)
+            VALUES ($1, $2, $3, $4, $5)
+            RETURNING id
+            """,
+            destinatario, assunto, corpo, is_html, settings.EMAIL_OUTBOX_MAX_TENTATIVAS
+        )
+
+    async def enfileirar_varios(self, emails: Iterable[Tuple[str, str, str, bool]]) -> List[int]:
+        """Grava vários emails (destinatario, assunto, corpo, is_html) em uma instrução"""
+        emails = list(emails)
+        if not emails:
+            return []
+        destinatarios, assuntos, corpos, htmls = (list(coluna) for coluna in zip(*emails))
+        rows = await self.conn.fetch(
+            f"""
+            INSERT INTO {TABELA_OUTBOX} (destinatario, assunto, corpo, is_html, max_tentativas)
+            SELECT destinatario, assunto, corpo, is_html, $5
+            FROM unnest($1::text[], $2::text[], $3::text[], $4::bool[])
+                 AS e(destinatario, assunto, corpo, is_html)
+            RETURNING id
+            """,
+            destinatarios, assuntos, corpos, htmls, settings.EMAIL_OUTBOX_MAX_TENTATIVAS
+        )
+        return [r["id"] for r in rows]
+
+    async def reservar_lote(self, limite: int, reserva_segundos: int) -> List[Dict]:
+        """
+        Reserva até `limite` emails prontos para envio. FOR UPDATE SKIP LOCKED
+        faz workers concorrentes pegarem lotes disjuntos sem esperar uns pelos
+        outros; reservas vencidas (worker interrompido) voltam para a fila
+        enquanto houver tentativas, e as que as esgotaram ficam como 'falhou'.
+        """
+        await self.conn.execute(
+            f"""
+            UPDATE {TABELA_OUTBOX}
+            SET status = 'falhou', bloqueado_ate = NULL,
+                ultimo_erro = COALESCE(ultimo_erro, 'Reserva expirada sem resultado do envio')
+            WHERE id IN (
+                SELECT id FROM {TABELA_OUTBOX}
+                WHERE status = 'enviando' AND bloqueado_ate < NOW() AND tentativas >= max_tentativas
+                FOR UPDATE SKIP LOCKED
+            )
+            """
+        )
+        rows = await self.conn.fetch(
+            f"""
+            UPDATE {TABELA_OUTBOX} o
+            SET status = 'enviando',
+                tentativas = o.tentativas + 1,
+                bloqueado_ate = NOW() + make_interval(secs => $2::int)
+            WHERE o.id IN (
+                SELECT id FROM {TABELA_OUTBOX}
+                WHERE ((status = 'pendente' AND proxima_tentativa <= NOW())
+                       OR (status = 'enviando' AND bloqueado_ate < NOW()))
+                  AND tentativas < max_tentativas
+                ORDER BY proxima_tentativa, id
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING o.id, o.destinatario, o.assunto, o.corpo, o.is_html, o.tentativas, o.max_tentativas
+            """,
+            limite, reserva_segundos
+        )
+        return [dict(r) for r in rows]
+
+    async def renovar_reserva(self, id: int, tentativas: int, reserva_segundos: int) -> bool:
+        """
+        Estende a reserva de um email antes do envio. Retorna False se outro
+        worker o reservou depois (a reserva venceu e `tentativas` mudou).
+        """
+        renovado = await self.conn.fetchval(
+            f"""
+            UPDATE {TABELA_OUTBOX}
+            SET bloqueado_ate = NOW() + make_interval(secs => $3::int)
+            WHERE id = $1 AND status = 'enviando' AND tentativas = $2
+            RETURNING id
+            """,
+            id, tentativas, reserva_segundos
+        )
+        return renovado is not None
+
+    async def marcar_enviados(self, enviados: Sequence[Tuple[int, int]]) -> None:
+        """
+        Marca como enviados os emails (id, tentativas) reservados por este
+        worker; os que outro worker reservou depois (reserva vencida) não mudam.
+        """
+        if not enviados:
+            return
+        ids, tentativas = (list(coluna) for coluna in zip(*enviados))
+        await self.conn.execute(
+            f"""
+            UPDATE {TABELA_OUTBOX} o
+            SET status = 'enviado', enviado_em = NOW(), bloqueado_ate = NULL, ultimo_erro = NULL
+            FROM unnest($1::bigint[], $2::int[]) AS e(id, tentativas)
+            WHERE o.id = e.id AND o.status = 'enviando' AND o.tentativas = e.tentativas
+            """,
+            ids, tentativas
+        )
+
+    async def registrar_falhas(self, falhas: Sequence[Tuple[int, int, str, float]]) -> None:
+        """
+        Devolve à fila os emails (id, tentativas, erro, espera em segundos) que
+        falharam; os que esgotaram as tentativas ficam como 'falhou'. Como em
+        marcar_enviados, só altera os que continuam reservados por este worker.
+        """
+        if not falhas:
+            return
+        ids, tentativas, erros, esperas = (list(coluna) for coluna in zip(*falhas))
+        await self.conn.execute(
+            f"""
+            UPDATE {TABELA_OUTBOX} o
+            SET status = CASE WHEN o.tentativas >= o.max_tentativas THEN 'falhou' ELSE 'pendente' END,
+                proxima_tentativa = NOW() + make_interval(secs => f.espera),
+                bloqueado_ate = NULL,
+                ultimo_erro = f.erro
+            FROM unnest($1::bigint[], $2::int[], $3::text[], $4::float8[]) AS f(id, tentativas, erro, espera)
+            WHERE o.id = f.id AND o.status = 'enviando' AND o.tentativas = f.tentativas
+            """,
+            ids, tentativas, erros, esperas
+        )
+
+    async def contar_por_status(self) -> Dict[str, int]:
+        rows = await self.conn.fetch(f"SELECT status, COUNT(*) AS total FROM {TABELA_OUTBOX} GROUP BY status")
+        return {r["status"]: r["total"] for r in rows}
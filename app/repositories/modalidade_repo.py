@@ -2,6 +2,9 @@
 import asyncpg
 from typing import List, Optional, Dict
 
+from app.core.cache_bus import publish_invalidation
+from app.core.lookup_registry import lookup_entity
+
 from app.schemas.modalidade_schema import ModalidadeUpdate
 
 class ModalidadeRepository:
@@ -11,6 +14,7 @@ class ModalidadeRepository:
     async def create_modalidade(self, nome: str) -> Dict:
         query = "INSERT INTO modalidade (nome) VALUES ($1) RETURNING *"
         new_modalidade = await self.conn.fetchrow(query, nome)
+        await publish_invalidation(self.conn, lookup_entity("modalidade"))
         return dict(new_modalidade)
 
     async def get_all_modalidades(self) -> List[Dict]:
@@ -32,12 +36,17 @@ class ModalidadeRepository:
         query = f"UPDATE modalidade SET {fields} WHERE id = $1 RETURNING *"
         
         updated_modalidade = await self.conn.fetchrow(query, modalidade_id, *update_data.values())
+        if updated_modalidade:
+            await publish_invalidation(self.conn, lookup_entity("modalidade"))
         return dict(updated_modalidade) if updated_modalidade else None
 
     async def delete_modalidade(self, modalidade_id: int) -> bool:
         query = "UPDATE modalidade SET ativo = FALSE WHERE id = $1 AND ativo = TRUE"
         status = await self.conn.execute(query, modalidade_id)
-        return status.endswith('1')
+        deleted = status.endswith('1')
+        if deleted:
+            await publish_invalidation(self.conn, lookup_entity("modalidade"))
+        return deleted
         
     async def is_modalidade_in_use(self, modalidade_id: int) -> bool:
         """Verifica se a modalidade está sendo usada em algum contrato ativo."""
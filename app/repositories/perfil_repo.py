@@ -2,6 +2,9 @@
 import asyncpg
 from typing import List, Optional, Dict
 
+from app.core.cache_bus import publish_invalidation
+from app.core.lookup_registry import lookup_entity
+
 class PerfilRepository:
     def __init__(self, conn: asyncpg.Connection):
         self.conn = conn
@@ -9,6 +12,7 @@ class PerfilRepository:
     async def create_perfil(self, nome: str) -> Dict:
         query = "INSERT INTO perfil (nome) VALUES ($1) RETURNING *"
         new_perfil = await self.conn.fetchrow(query, nome)
+        await publish_invalidation(self.conn, lookup_entity("perfil"))
         return dict(new_perfil)
 
     async def get_all_perfis(self) -> List[Dict]:
@@ -0,0 +1,62 @@
+# app/repositories/preferencia_notificacao_repo.py
+import asyncpg
+from typing import Dict, Iterable
+
+from app.core.config import settings
+from app.core.schema_registry import schema_registry
+
+TABELA_PREFERENCIA_NOTIFICACAO = "usuario_preferencia_notificacao"
+
+
+class PreferenciaNotificacaoRepository:
+    """
+    Modo de entrega ('resumo' ou 'imediato') dos emails das rotinas em lote
+    (migrations/011_preferencia_notificacao.sql). Sem a migração, todos
+    seguem NOTIFICACAO_MODO_PADRAO.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def disponivel(self) -> bool:
+        return TABELA_PREFERENCIA_NOTIFICACAO in await schema_registry.existing_tables(self.conn)
+
+    async def get_modo(self, usuario_id: int) -> str:
+        modo = None
+        if await self.disponivel():
+            modo = await self.conn.fetchval(
+                f"SELECT modo FROM {TABELA_PREFERENCIA_NOTIFICACAO} WHERE usuario_id = $1", usuario_id
+            )
+        return modo or settings.NOTIFICACAO_MODO_PADRAO
+
+    async def set_modo(self, usuario_id: int, modo: str) -> str:
+        await self.conn.execute(
+            f"""
+            INSERT INTO {TABELA_PREFERENCIA_NOTIFICACAO} (usuario_id, modo) VALUES ($1, $2)
+            ON CONFLICT (usuario_id) DO UPDATE SET modo = EXCLUDED.modo, updated_at = NOW()
+            """,
+            usuario_id, modo
+        )
+        return modo
+
+    async def get_modos_por_email(self, emails: Iterable[str]) -> Dict[str, str]:
+        """
+        Modo de cada email (em minúsculas), em uma consulta. Emails sem
+        usuário ou sem preferência gravada recebem NOTIFICACAO_MODO_PADRAO.
+        """
+        emails = sorted({email.lower() for email in emails if email})
+        modos = {email: settings.NOTIFICACAO_MODO_PADRAO for email in emails}
+        if not emails or not await self.disponivel():
+            return modos
+        rows = await self.conn.fetch(
+            f"""
+            SELECT DISTINCT ON (lower(u.email)) lower(u.email) AS email, p.modo
+            FROM usuario u
+            JOIN {TABELA_PREFERENCIA_NOTIFICACAO} p ON p.usuario_id = u.id
+            WHERE lower(u.email) = ANY($1::text[]) AND u.ativo = TRUE
+            ORDER BY lower(u.email), p.updated_at DESC
+            """,
+            emails
+        )
+        modos.update({r["email"]: r["modo"] for r in rows})
+        return modos
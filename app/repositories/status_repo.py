@@ -2,6 +2,9 @@
 import asyncpg
 from typing import List, Optional, Dict
 
+from app.core.cache_bus import publish_invalidation
+from app.core.lookup_registry import lookup_entity
+
 from app.schemas.status_schema import StatusUpdate
 
 class StatusRepository:
@@ -11,6 +14,7 @@ class StatusRepository:
     async def create_status(self, nome: str) -> Dict:
         query = "INSERT INTO status (nome) VALUES ($1) RETURNING *"
         new_status = await self.conn.fetchrow(query, nome)
+        await publish_invalidation(self.conn, lookup_entity("status"))
         return dict(new_status)
 
     async def get_all_status(self) -> List[Dict]:
@@ -32,12 +36,17 @@ class StatusRepository:
         query = f"UPDATE status SET {fields} WHERE id = $1 RETURNING *"
         
         updated_status = await self.conn.fetchrow(query, status_id, *update_data.values())
+        if updated_status:
+            await publish_invalidation(self.conn, lookup_entity("status"))
         return dict(updated_status) if updated_status else None
 
     async def delete_status(self, status_id: int) -> bool:
         query = "UPDATE status SET ativo = FALSE WHERE id = $1 AND ativo = TRUE"
         status = await self.conn.execute(query, status_id)
-        return status.endswith('1')
+        deleted = status.endswith('1')
+        if deleted:
+            await publish_invalidation(self.conn, lookup_entity("status"))
+        return deleted
         
     async def is_status_in_use(self, status_id: int) -> bool:
         """Verifica se o status está sendo usado em algum contrato ativo."""
@@ -2,6 +2,8 @@
 import asyncpg
 from typing import List, Dict, Optional
 
+from app.core.cache_bus import publish_invalidation
+
 class UsuarioPerfilRepository:
     def __init__(self, conn: asyncpg.Connection):
         self.conn = conn
@@ -88,6 +90,7 @@ class UsuarioPerfilRepository:
             WHERE up.id = $1
         """
         complete_record = await self.conn.fetchrow(complete_query, record['id'])
+        await publish_invalidation(self.conn, "usuario", usuario_id)
         return dict(complete_record)
 
     async def remove_profile_from_user(self, usuario_id: int, perfil_id: int) -> bool:
@@ -98,6 +101,7 @@ class UsuarioPerfilRepository:
             WHERE usuario_id = $1 AND perfil_id = $2 AND ativo = TRUE
         """
         result = await self.conn.execute(query, usuario_id, perfil_id)
+        await publish_invalidation(self.conn, "usuario", usuario_id)
         return result.endswith('1')
 
     async def get_users_by_profile(self, perfil_nome: str, include_details: bool = False) -> List[Dict]:
@@ -1,6 +1,9 @@
 # app/repositories/usuario_repo.py
 import asyncpg
 from typing import Dict, Optional, List, Tuple
+from app.core.cache_bus import publish_invalidation
+from app.core.busca_trigram import filtro_contem, filtro_similar, ordem_similaridade, trigram_disponivel
+from app.core.pagination import Contagem, Pagina, paginar
 from app.schemas.usuario_schema import UsuarioCreate, UsuarioUpdate
 
 class UsuarioRepository:
@@ -27,70 +30,53 @@ class UsuarioRepository:
         self,
         filters: Optional[Dict] = None,
         limit: int = 10,
-        offset: int = 0
-    ) -> Tuple[List[Dict], int]:
+        offset: int = 0,
+        contagem: Contagem = "exata"
+    ) -> Pagina:
         """Lista usuários ativos com filtros e paginação, retornando os dados e o total."""
-        
-        # Determina se precisa fazer JOIN com perfis
-        need_perfil_join = filters and filters.get('perfil')
-        
-        if need_perfil_join:
-            base_query = """
-                FROM usuario u
-                INNER JOIN usuario_perfil up ON u.id = up.usuario_id
-                INNER JOIN perfil p ON up.perfil_id = p.id
-            """
-        else:
-            base_query = """
-                FROM usuario u
-            """
-        
+        trigram = await trigram_disponivel(self.conn)
         where_clauses = ["u.ativo = TRUE"]
         params = []
         param_idx = 1
+        order_by = "u.nome"
         
         if filters and filters.get('nome'):
-            where_clauses.append(f"u.nome ILIKE ${param_idx}")
+            where_clauses.append(filtro_contem("u.nome", f"${param_idx}", trigram))
             params.append(f"%{filters['nome']}%")
             param_idx += 1
+
+        if filters and filters.get('busca'):
+            where_clauses.append(filtro_similar(["u.nome"], f"${param_idx}", trigram))
+            params.append(filters['busca'])
+            if trigram:
+                # Busca aproximada: resultados mais parecidos com o termo primeiro
+                order_by = f"{ordem_similaridade(['u.nome'], f'${param_idx}')}, u.nome"
+            param_idx += 1
         
         if filters and filters.get('perfil'):
-            where_clauses.append(f"p.nome = ${param_idx}")
+            # EXISTS em vez de JOIN + DISTINCT: uma linha por usuário, o que
+            # permite contar com COUNT(*) OVER() na mesma consulta
+            where_clauses.append(f"""EXISTS (
+                SELECT 1 FROM usuario_perfil up
+                INNER JOIN perfil p ON up.perfil_id = p.id
+                WHERE up.usuario_id = u.id AND p.nome = ${param_idx}
+            )""")
             params.append(filters['perfil'])
             param_idx += 1
         
         where_sql = " WHERE " + " AND ".join(where_clauses)
 
-        # Query para contar o total de itens
-        if need_perfil_join:
-            count_query = f"SELECT COUNT(DISTINCT u.id) AS total {base_query}{where_sql}"
-        else:
-            count_query = f"SELECT COUNT(u.id) AS total {base_query}{where_sql}"
-        
-        total_items = await self.conn.fetchval(count_query, *params)
-        
-        # Query para buscar os dados paginados
-        if need_perfil_join:
-            data_query = f"""
-                SELECT DISTINCT u.id, u.nome, u.email, u.matricula
-                {base_query}
-                {where_sql}
-                ORDER BY u.nome
-                LIMIT ${param_idx} OFFSET ${param_idx + 1}
-            """
-        else:
-            data_query = f"""
-                SELECT u.id, u.nome, u.email, u.matricula
-                {base_query}
-                {where_sql}
-                ORDER BY u.nome
-                LIMIT ${param_idx} OFFSET ${param_idx + 1}
-            """
-        
-        paginated_params = params + [limit, offset]
-        users = await self.conn.fetch(data_query, *paginated_params)
-            
-        return [dict(u) for u in users], total_items or 0
+        return await paginar(
+            self.conn,
+            colunas="u.id, u.nome, u.email, u.matricula",
+            from_sql="FROM usuario u",
+            where_sql=where_sql,
+            params=params,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+            contagem=contagem
+        )
 
     async def create_user(self, user: UsuarioCreate, hashed_password: str) -> Dict:
         """Cria um novo usuário sem perfil - perfis devem ser concedidos via sistema de múltiplos perfis"""
@@ -124,12 +110,14 @@ class UsuarioRepository:
         """
         
         updated_user = await self.conn.fetchrow(query, user_id, *update_data.values())
+        await publish_invalidation(self.conn, "usuario", user_id)
         return dict(updated_user) if updated_user else None
 
     async def delete_user(self, user_id: int) -> bool:
         """Soft delete de um usuário"""
         query = "UPDATE usuario SET ativo = FALSE, updated_at = NOW() WHERE id = $1 AND ativo = TRUE"
         result = await self.conn.execute(query, user_id)
+        await publish_invalidation(self.conn, "usuario", user_id)
         return result.endswith('1')
 
     async def update_user_password(self, user_id: int, new_hash: str) -> bool:
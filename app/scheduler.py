@@ -3,9 +3,15 @@ import asyncio
 from datetime import date, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from app.core.config import settings
 from app.core.database import get_db_pool, close_db_pool
+from app.core.schema_registry import schema_registry
+from app.repositories.arquivo_repo import ArquivoRepository
+from app.repositories.contrato_repo import TABELA_ARQUIVO_COLETA
 from app.repositories.pendencia_repo import PendenciaRepository
-from app.services.email_service import EmailService
+from app.services.email_digest_service import ItemResumo, ResumoEmails
+from app.services.file_service import FileService
+from app.services.smtp_pool import close_smtp_pools
 
 async def check_deadlines_async():
     """
@@ -46,7 +52,9 @@ async def check_deadlines_async():
             pendencias = await pendencia_repo.get_due_pendencias()
             today = date.today()
             
-            emails_enviados = 0
+            # Um email por fiscal com todas as pendências do dia (ou um por
+            # pendência, conforme a preferência do fiscal)
+            resumo = ResumoEmails(conn)
             for p in pendencias:
                 prazo = p['data_prazo']
                 dias_restantes = (prazo - today).days
@@ -71,28 +79,92 @@ Este é um lembrete automático sobre uma pendência de relatório para o contra
 
 Por favor, não se esqueça de submeter o relatório a tempo.
                     """
-                    await EmailService.send_email(p['fiscal_email'], subject, body, is_html=True)
-                    emails_enviados += 1
-                    print(f"✅ Email enviado para {p['fiscal_nome']} - Pendência vence em {dias_restantes} dia(s)")
+                    resumo.adicionar(p['fiscal_email'], p['fiscal_nome'], ItemResumo(
+                        categoria="Prazos de pendências",
+                        titulo=f"Contrato {p['nr_contrato']}: {p['descricao']}",
+                        detalhes=[f"O prazo para envio {prazo_str}"],
+                        assunto=subject,
+                        corpo=body,
+                        chave=p['id']
+                    ))
             
-            print(f"📧 Total de emails de lembrete enviados: {emails_enviados}")
+            resultado = await resumo.enviar()
+            print(f"📧 Total de lembretes: {resultado.itens} em {resultado.emails} email(s)")
                     
     except Exception as e:
         print(f"ERRO ao executar a verificação de prazos: {e}")
         import traceback
         print(traceback.format_exc())
     finally:
+        await close_smtp_pools()
         if pool:
             await close_db_pool()
         print("Verificação de prazos concluída.")
 
 
+async def coletar_arquivos(arquivo_repo: ArquivoRepository, file_service: FileService) -> int:
+    """
+    Esvazia a fila de coleta vencida em lotes; retorna quantos arquivos saíram
+    do disco. Os que falham são adiados (CONTRATO_ARQUIVOS_COLETA_ESPERA_HORAS)
+    em vez de ficarem no início dos lotes seguintes.
+    """
+    removidos = 0
+    while True:
+        arquivos = await arquivo_repo.get_arquivos_para_coleta()
+        if not arquivos:
+            return removidos
+        concluidos, falhas = [], []
+        for arquivo in arquivos:
+            if arquivo['ativo'] or await file_service.delete_file(arquivo['caminho_arquivo']):
+                concluidos.append(arquivo['arquivo_id'])
+                removidos += 0 if arquivo['ativo'] else 1
+            else:
+                falhas.append(arquivo['arquivo_id'])
+        if concluidos:
+            await arquivo_repo.remover_da_coleta(concluidos)
+        if falhas:
+            print(f"⚠️ {len(falhas)} arquivo(s) não removidos; nova tentativa em "
+                  f"{settings.CONTRATO_ARQUIVOS_COLETA_ESPERA_HORAS}h")
+            await arquivo_repo.adiar_coleta(falhas, settings.CONTRATO_ARQUIVOS_COLETA_ESPERA_HORAS)
+
+
+async def coletar_arquivos_removidos_async():
+    """
+    Remove do disco os arquivos de contratos excluídos cujo prazo de retenção
+    venceu (fila arquivo_coleta). Arquivos reativados nesse meio-tempo só
+    saem da fila.
+    """
+    print("Executando coleta de arquivos de contratos excluídos...")
+    pool = None
+    try:
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            if TABELA_ARQUIVO_COLETA not in await schema_registry.existing_tables(conn):
+                print("⚠️ Tabela arquivo_coleta não encontrada (migrations/009_arquivo_coleta.sql)")
+                return
+
+            removidos = await coletar_arquivos(ArquivoRepository(conn), FileService())
+            print(f"🗑️ Total de arquivos removidos do disco: {removidos}")
+
+    except Exception as e:
+        print(f"ERRO ao executar a coleta de arquivos: {e}")
+        import traceback
+        print(traceback.format_exc())
+    finally:
+        if pool:
+            await close_db_pool()
+        print("Coleta de arquivos concluída.")
+
+
 async def main():
     """Função principal para iniciar o scheduler."""
     scheduler = AsyncIOScheduler(timezone="America/Sao_Paulo")
     
     # Agenda a tarefa para rodar todos os dias às 8h da manhã
     scheduler.add_job(check_deadlines_async, 'cron', hour=8, minute=0)
+
+    # Remove os arquivos de contratos excluídos após o prazo de retenção
+    scheduler.add_job(coletar_arquivos_removidos_async, 'cron', hour=3, minute=0)
     
     # Para testes, pode descomentar a linha abaixo para rodar a cada minuto
     # scheduler.add_job(check_deadlines_async, 'interval', minutes=1)
@@ -106,6 +178,7 @@ async def main():
             await asyncio.sleep(1)
     except (KeyboardInterrupt, SystemExit):
         scheduler.shutdown()
+        await close_smtp_pools()
         await close_db_pool()
 
 
@@ -2,7 +2,7 @@
 Schemas para logs de auditoria
 """
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -100,10 +100,12 @@ class AuditLog(BaseModel):
 class AuditLogList(BaseModel):
     """Schema de resposta de lista de logs"""
     logs: List[AuditLog]
-    total: int
+    total: Optional[int]  # None com contagem=nenhuma
     pagina: int
     tamanho_pagina: int
-    total_paginas: int
+    total_paginas: Optional[int]
+    tem_proxima_pagina: bool = False
+    total_estimado: bool = False
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -126,6 +128,9 @@ class AuditLogFilter(BaseModel):
     # Paginação
     pagina: int = Field(1, ge=1, description="Número da página")
     tamanho_pagina: int = Field(50, ge=1, le=100, description="Tamanho da página")
+    contagem: Literal["exata", "estimada", "nenhuma"] = Field(
+        "estimada", description="Estratégia de contagem do total"
+    )
 
     # Ordenação
     ordenar_por: str = Field("data_hora", description="Campo para ordenar")
@@ -0,0 +1,25 @@
+# app/schemas/busca_schema.py
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+TipoResultadoBusca = Literal["contrato", "pendencia", "relatorio"]
+
+
+class BuscaResultado(BaseModel):
+    """Item encontrado pela busca textual"""
+    tipo: TipoResultadoBusca
+    id: int
+    contrato_id: int
+    nr_contrato: str
+    titulo: Optional[str] = None
+    trecho: str  # trecho do texto (HTML escapado) com os termos destacados em <mark>...</mark>
+    relevancia: float
+
+
+class BuscaResponse(BaseModel):
+    """Resposta paginada de GET /busca, ordenada por relevância"""
+    termo: str
+    data: List[BuscaResultado]
+    current_page: int
+    per_page: int
+    has_more: bool
@@ -34,7 +34,9 @@ class Contratado(ContratadoBase):
     
 class ContratadoPaginated(BaseModel):
     data: List[Contratado]
-    total_items: int
-    total_pages: int
+    total_items: Optional[int]  # None com contagem=nenhuma
+    total_pages: Optional[int]
     current_page: int
-    per_page: int
\ No newline at end of file
+    per_page: int
+    has_more: bool = False
+    total_estimado: bool = False
\ No newline at end of file
@@ -1,7 +1,10 @@
 # app/schemas/contrato_schema.py
 from pydantic import BaseModel, ConfigDict, Field, field_validator
-from typing import Optional, List
-from datetime import date
+from typing import Literal, Optional, List
+from datetime import date, datetime
+
+from app.schemas.pendencia_schema import Pendencia
+from app.schemas.relatorio_schema import Relatorio
 
 # Schema base com os campos comuns
 class ContratoBase(BaseModel):
@@ -109,10 +112,48 @@ class ContratoList(BaseModel):
 # Schema para a resposta paginada da API
 class ContratoPaginated(BaseModel):
     data: List[ContratoList]
-    total_items: int
-    total_pages: int
+    total_items: Optional[int]  # None com contagem=nenhuma
+    total_pages: Optional[int]
     current_page: int
     per_page: int
+    has_more: bool = False
+    total_estimado: bool = False
+
+class ContratoCursorPage(BaseModel):
+    """Página da listagem por cursor (paginacao=cursor)"""
+    data: List[ContratoList]
+    per_page: int
+    next_cursor: Optional[str] = None  # None quando não há mais páginas
+    has_more: bool
+
+# Schemas da importação em lote (POST /contratos/importar)
+class ContratoImportErro(BaseModel):
+    linha: int  # linha da planilha (o cabeçalho é a linha 1)
+    nr_contrato: Optional[str] = None
+    erros: List[str]
+
+class ContratoImportado(BaseModel):
+    linha: int
+    id: int
+    nr_contrato: str
+
+class ContratoImportResultado(BaseModel):
+    total_linhas: int
+    importados: int
+    com_erro: int
+    validar_apenas: bool
+    contratos: List[ContratoImportado] = []
+    erros: List[ContratoImportErro] = []
+
+class ContratoExclusaoLote(BaseModel):
+    contrato_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+class ContratoExclusaoResultado(BaseModel):
+    excluidos: List[int]
+    nao_encontrados: List[int] = []
+    pendencias: int = 0
+    relatorios: int = 0
+    arquivos: int = 0
 
 # Schemas para gerenciamento de arquivos do contrato
 class ArquivoContrato(BaseModel):
@@ -130,4 +171,38 @@ class ArquivoContratoList(BaseModel):
     """Schema para listagem de arquivos de um contrato"""
     arquivos: List[ArquivoContrato]
     total_arquivos: int
-    contrato_id: int
\ No newline at end of file
+    contrato_id: int
+
+# Schemas da visão completa do contrato (GET /contratos/{id}/completo)
+SecaoContratoCompleto = Literal["arquivos", "pendencias", "relatorios", "arquivos_relatorios", "auditoria"]
+
+class ArquivoRelatorio(BaseModel):
+    """Arquivo enviado como relatório fiscal"""
+    id: int
+    nome_arquivo: str
+    tipo_arquivo: Optional[str] = None
+    tamanho_bytes: Optional[int] = None
+    created_at: datetime
+    relatorio_id: int
+    status_relatorio: Optional[str] = None
+    enviado_por: Optional[str] = None
+    data_envio: Optional[datetime] = None
+
+class ContratoEventoAuditoria(BaseModel):
+    """Evento de auditoria do contrato ou de suas pendências/relatórios"""
+    id: int
+    usuario_nome: str
+    perfil_usado: Optional[str] = None
+    acao: str
+    entidade: str
+    entidade_id: Optional[int] = None
+    descricao: str
+    data_hora: datetime
+
+class ContratoCompleto(Contrato):
+    """Contrato com as seções pedidas em include; seções não pedidas vêm como null"""
+    arquivos: Optional[List[ArquivoContrato]] = None
+    pendencias: Optional[List[Pendencia]] = None
+    relatorios: Optional[List[Relatorio]] = None
+    arquivos_relatorios: Optional[List[ArquivoRelatorio]] = None
+    auditoria: Optional[List[ContratoEventoAuditoria]] = None
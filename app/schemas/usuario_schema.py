@@ -1,6 +1,6 @@
 # app/schemas/usuario_schema.py
 from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
-from typing import Optional, List 
+from typing import Optional, List, Literal
 from datetime import datetime
 import re
 
@@ -78,6 +78,12 @@ class UsuarioChangePassword(BaseModel):
 class UsuarioResetPassword(BaseModel):
     nova_senha: str = Field(..., min_length=6, description="Nova senha para o usuário")
 
+class PreferenciaNotificacao(BaseModel):
+    modo: Literal["resumo", "imediato"] = Field(
+        ...,
+        description="'resumo': um email por execução com todos os avisos; 'imediato': um email por aviso"
+    )
+
 class Usuario(UsuarioBase):
     id: int
     ativo: bool = True
@@ -106,7 +112,9 @@ class UsuarioList(BaseModel):
 class UsuarioPaginated(BaseModel):
     """Schema para a resposta paginada de usuários."""
     data: List[UsuarioList]
-    total_items: int
-    total_pages: int
+    total_items: Optional[int]  # None com contagem=nenhuma
+    total_pages: Optional[int]
     current_page: int
-    per_page: int
\ No newline at end of file
+    per_page: int
+    has_more: bool = False
+    total_estimado: bool = False
\ No newline at end of file
@@ -332,3 +332,62 @@ async def audit_rejeitar_relatorio(
             )
     except Exception as e:
         print(f"⚠️ Erro ao criar log de auditoria (rejeitar relatório): {e}")
+
+
+async def audit_importar_contratos(
+    conn: asyncpg.Connection,
+    request: Optional[Request],
+    usuario: Usuario,
+    nr_contratos: list,
+    perfil_usado: Optional[str] = None
+):
+    """Registra log da importação de contratos em lote"""
+    try:
+        service = await get_audit_service(conn)
+        kwargs = dict(
+            usuario=usuario,
+            acao=AcaoAuditoria.CRIAR,
+            entidade=EntidadeAuditoria.CONTRATO,
+            descricao=f"Importou {len(nr_contratos)} contratos em lote",
+            dados_novos={"quantidade": len(nr_contratos), "nr_contratos": nr_contratos},
+            perfil_usado=perfil_usado
+        )
+        if request:
+            await service.criar_log_from_request(request=request, **kwargs)
+        else:
+            await service.criar_log(**kwargs)
+    except Exception as e:
+        print(f"⚠️ Erro ao criar log de auditoria (importar contratos): {e}")
+
+
+async def audit_excluir_contratos(
+    conn: asyncpg.Connection,
+    request: Optional[Request],
+    usuario: Usuario,
+    contrato_ids: list,
+    dados_exclusao: Dict[str, Any],
+    perfil_usado: Optional[str] = None
+):
+    """Registra log da exclusão de um ou mais contratos (com pendências, relatórios e arquivos)"""
+    try:
+        service = await get_audit_service(conn)
+        if len(contrato_ids) == 1:
+            descricao = f"Excluiu o contrato #{contrato_ids[0]}"
+        else:
+            descricao = f"Excluiu {len(contrato_ids)} contratos em lote"
+        kwargs = dict(
+            usuario=usuario,
+            acao=AcaoAuditoria.DELETAR,
+            entidade=EntidadeAuditoria.CONTRATO,
+            entidade_id=contrato_ids[0] if len(contrato_ids) == 1 else None,
+            descricao=descricao,
+            dados_anteriores={"ativo": True},
+            dados_novos={"ativo": False, "contrato_ids": contrato_ids, **dados_exclusao},
+            perfil_usado=perfil_usado
+        )
+        if request:
+            await service.criar_log_from_request(request=request, **kwargs)
+        else:
+            await service.criar_log(**kwargs)
+    except Exception as e:
+        print(f"⚠️ Erro ao criar log de auditoria (excluir contratos): {e}")
@@ -127,17 +127,21 @@ class AuditLogService:
         Returns:
             Lista paginada de logs
         """
-        logs, total = await self.audit_repo.get_logs_with_filters(filters)
+        pagina = await self.audit_repo.get_logs_with_filters(filters)
 
         # Calcular total de páginas
-        total_paginas = (total + filters.tamanho_pagina - 1) // filters.tamanho_pagina
+        total_paginas = None
+        if pagina.total is not None:
+            total_paginas = (pagina.total + filters.tamanho_pagina - 1) // filters.tamanho_pagina
 
         return AuditLogList(
-            logs=[AuditLog(**log) for log in logs],
-            total=total,
+            logs=[AuditLog(**log) for log in pagina.itens],
+            total=pagina.total,
             pagina=filters.pagina,
             tamanho_pagina=filters.tamanho_pagina,
-            total_paginas=total_paginas
+            total_paginas=total_paginas,
+            tem_proxima_pagina=pagina.has_more,
+            total_estimado=pagina.total_estimado
         )
 
     async def buscar_log_por_id(self, log_id: int) -> Optional[AuditLog]:
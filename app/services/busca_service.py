@@ -0,0 +1,52 @@
+# app/services/busca_service.py
+import asyncpg
+from typing import Dict, List, Optional
+from fastapi import HTTPException, status
+
+from app.repositories.busca_repo import BuscaRepository, CONSULTAS_POR_TIPO
+from app.schemas.busca_schema import BuscaResponse, BuscaResultado
+
+
+class BuscaService:
+    def __init__(self, busca_repo: BuscaRepository):
+        self.busca_repo = busca_repo
+
+    async def buscar(
+        self,
+        termo: str,
+        page: int,
+        per_page: int,
+        tipos: Optional[List[str]] = None,
+        user_context: Optional[Dict] = None
+    ) -> BuscaResponse:
+        """Busca textual unificada, respeitando o isolamento por perfil dos contratos"""
+        termo = termo.strip()
+        if not termo:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Informe um termo de busca"
+            )
+        tipos = [t for t in CONSULTAS_POR_TIPO if not tipos or t in tipos]
+
+        try:
+            # Busca um item a mais para saber se existe próxima página
+            rows = await self.busca_repo.buscar(
+                termo=termo,
+                tipos=tipos,
+                limit=per_page + 1,
+                offset=(page - 1) * per_page,
+                user_context=user_context
+            )
+        except asyncpg.UndefinedColumnError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Busca textual indisponível: aplique a migração 007_busca_textual.sql"
+            )
+
+        return BuscaResponse(
+            termo=termo,
+            data=[BuscaResultado.model_validate(r) for r in rows[:per_page]],
+            current_page=page,
+            per_page=per_page,
+            has_more=len(rows) > per_page
+        )
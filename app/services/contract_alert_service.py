@@ -6,6 +6,7 @@ from typing import List, Dict, Any
 from app.core.database import get_connection
 from app.repositories.dashboard_repo import DashboardRepository
 from app.repositories.usuario_repo import UsuarioRepository
+from app.services.email_digest_service import ItemResumo, ResumoEmails
 from app.services.email_service import EmailService
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,30 @@ class ContractAlertService:
     e enviar alertas por email para administradores
     """
     
+    @staticmethod
+    async def get_admins() -> List[Dict[str, Any]]:
+        """
+        Busca nome e email de todos os usuários com perfil de Administrador
+        """
+        try:
+            async for conn in get_connection():
+                query = """
+                SELECT DISTINCT u.nome, u.email
+                FROM usuario u
+                JOIN usuario_perfil up ON u.id = up.usuario_id
+                JOIN perfil p ON up.perfil_id = p.id
+                WHERE p.nome = 'Administrador'
+                AND u.ativo = true
+                AND u.email IS NOT NULL
+                """
+
+                rows = await conn.fetch(query)
+                return [dict(row) for row in rows if row['email']]
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar administradores: {e}")
+            return []
+
     @staticmethod
     async def get_admin_emails() -> List[str]:
         """
@@ -193,75 +218,88 @@ class ContractAlertService:
             logger.error(f"Erro ao buscar garantias no marco de {milestone_days} dias: {e}")
             return []
 
+    @staticmethod
+    def _item_alerta(tipo: str, dados: Dict[str, Any], milestone: int) -> ItemResumo:
+        """Item do resumo de um alerta de contrato ou de garantia no marco"""
+        if tipo == 'contract_expiration':
+            assunto, corpo = EmailService.contract_expiration_alert_message(dados, milestone)
+            categoria = "Contratos próximos do vencimento"
+            titulo = f"Contrato {dados['contrato_numero']} vence em {dados['data_fim']} ({dados['dias_para_vencer']} dias)"
+        else:
+            assunto, corpo = EmailService.garantia_expiration_alert_message(dados, milestone)
+            categoria = "Garantias próximas do vencimento"
+            titulo = f"Garantia do contrato {dados['contrato_numero']} vence em {dados['data_garantia']} ({dados['dias_para_vencer']} dias)"
+
+        return ItemResumo(
+            categoria=categoria,
+            titulo=titulo,
+            detalhes=[
+                f"Objeto: {dados['contrato_objeto']}",
+                f"Contratado: {dados['contratado_nome']}",
+                f"Gestor: {dados['gestor_nome']} | Fiscal: {dados['fiscal_nome']}"
+            ],
+            assunto=assunto,
+            corpo=corpo,
+            is_html=False,
+            chave=(tipo, dados['contrato_id'], milestone)
+        )
+
     @staticmethod
     async def send_daily_alerts():
         """
         Método principal para ser chamado diariamente
-        Verifica e envia alertas para contratos e garantias que vencem em 90, 60 ou 30 dias
+        Verifica e envia alertas para contratos e garantias que vencem em 90, 60 ou 30 dias.
+        Cada administrador recebe um único email de resumo com todos os alertas
+        da execução (ou um por alerta, se preferir o modo imediato).
         """
         try:
             logger.info("🚀 Iniciando processo diário de alertas de contratos e garantias")
 
-            admin_emails = await ContractAlertService.get_admin_emails()
+            admins = await ContractAlertService.get_admins()
 
-            if not admin_emails:
+            if not admins:
                 logger.warning("Nenhum administrador encontrado para envio de alertas")
                 return
 
-            total_alerts = 0
-
             async for conn in get_connection():
-                # Verificar cada marco de dias para CONTRATOS
-                for milestone in [90, 60, 30]:
-                    contratos = await ContractAlertService.check_contracts_by_milestone(milestone)
-
-                    logger.info(f"Encontrados {len(contratos)} contratos que vencem em {milestone} dias")
-
-                    for contrato in contratos:
-                        success = await EmailService.send_contract_expiration_alert(
-                            admin_emails=admin_emails,
-                            contract_data=contrato,
-                            days_remaining=milestone
-                        )
+                resumo = ResumoEmails(conn)
 
-                        if success:
-                            # Registrar notificação enviada
-                            insert_query = """
-                                INSERT INTO notification_log (notification_type, contrato_id, alert_milestone)
-                                VALUES ('contract_expiration', $1, $2)
-                                ON CONFLICT (notification_type, contrato_id, alert_milestone) DO NOTHING
-                            """
-                            await conn.execute(insert_query, contrato['contrato_id'], milestone)
-
-                            total_alerts += 1
-                            logger.info(f"✅ Alerta de contrato enviado: {contrato['contrato_numero']} ({milestone} dias)")
+                # Verificar cada marco de dias para CONTRATOS e GARANTIAS
+                for tipo, buscar in (
+                    ('contract_expiration', ContractAlertService.check_contracts_by_milestone),
+                    ('garantia_expiration', ContractAlertService.check_garantias_by_milestone),
+                ):
+                    for milestone in [90, 60, 30]:
+                        itens = await buscar(milestone)
 
-                # Verificar cada marco de dias para GARANTIAS
-                for milestone in [90, 60, 30]:
-                    garantias = await ContractAlertService.check_garantias_by_milestone(milestone)
+                        logger.info(f"Encontrados {len(itens)} alertas '{tipo}' no marco de {milestone} dias")
 
-                    logger.info(f"Encontrados {len(garantias)} garantias que vencem em {milestone} dias")
+                        for dados in itens:
+                            item = ContractAlertService._item_alerta(tipo, dados, milestone)
+                            for admin in admins:
+                                resumo.adicionar(admin['email'], admin['nome'], item)
 
-                    for garantia in garantias:
-                        success = await EmailService.send_garantia_expiration_alert(
-                            admin_emails=admin_emails,
-                            garantia_data=garantia,
-                            days_remaining=milestone
-                        )
+                if not len(resumo):
+                    logger.info("Nenhum alerta de vencimento a enviar")
+                    return
 
-                        if success:
-                            # Registrar notificação enviada
-                            insert_query = """
-                                INSERT INTO notification_log (notification_type, contrato_id, alert_milestone)
-                                VALUES ('garantia_expiration', $1, $2)
-                                ON CONFLICT (notification_type, contrato_id, alert_milestone) DO NOTHING
+                # Emails (caixa de saída) e registro dos marcos na mesma transação
+                async with conn.transaction():
+                    resultado = await resumo.enviar()
+                    if resultado.entregues:
+                        await conn.executemany(
                             """
-                            await conn.execute(insert_query, garantia['contrato_id'], milestone)
-
-                            total_alerts += 1
-                            logger.info(f"✅ Alerta de garantia enviado: {garantia['contrato_numero']} ({milestone} dias)")
+                            INSERT INTO notification_log (notification_type, contrato_id, alert_milestone)
+                            VALUES ($1, $2, $3)
+                            ON CONFLICT (notification_type, contrato_id, alert_milestone) DO NOTHING
+                            """,
+                            sorted(resultado.entregues)
+                        )
 
-            logger.info(f"🎯 Processo diário concluído: {total_alerts} alertas enviados")
+                logger.info(
+                    f"🎯 Processo diário concluído: {len(resultado.entregues)} alertas "
+                    f"em {resultado.emails} emails"
+                )
 
         except Exception as e:
             logger.error(f"❌ Erro no processo diário de alertas: {e}")
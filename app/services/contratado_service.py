@@ -1,6 +1,6 @@
 # app/services/contratado_service.py
-import math
 from typing import List, Optional, Dict
+from app.core.pagination import Contagem
 from app.repositories.contratado_repo import ContratadoRepository
 from app.schemas.contratado_schema import Contratado, ContratadoCreate, ContratadoUpdate, ContratadoPaginated
 
@@ -16,30 +16,31 @@ class ContratadoService:
         self, 
         page: int = 1, 
         per_page: int = 10, 
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        contagem: Contagem = "exata"
     ) -> ContratadoPaginated:
         # Calcula offset
         offset = (page - 1) * per_page
         
-        # Busca dados paginados
-        contratados_data, total_items = await self.contratado_repo.get_all_contratados_paginated(
+        # Busca dados paginados (total conforme a estratégia de contagem)
+        pagina = await self.contratado_repo.get_all_contratados_paginated(
             limit=per_page,
             offset=offset,
-            filters=filters or {}
+            filters=filters or {},
+            contagem=contagem
         )
         
-        # Calcula total de páginas
-        total_pages = math.ceil(total_items / per_page) if total_items > 0 else 1
-        
         # Converte para schema
-        contratados = [Contratado.model_validate(c) for c in contratados_data]
+        contratados = [Contratado.model_validate(c) for c in pagina.itens]
         
         return ContratadoPaginated(
             data=contratados,
-            total_items=total_items,
-            total_pages=total_pages,
+            total_items=pagina.total,
+            total_pages=pagina.total_paginas(per_page),
             current_page=page,
-            per_page=per_page
+            per_page=per_page,
+            has_more=pagina.has_more,
+            total_estimado=pagina.total_estimado
         )
 
     async def get_by_id(self, contratado_id: int) -> Optional[Contratado]:
@@ -0,0 +1,251 @@
+# app/services/contrato_export_service.py
+"""
+Exportação em streaming da listagem de contratos (CSV e XLSX).
+
+As linhas são lidas por um cursor no servidor e convertidas em blocos de bytes
+enviados pela StreamingResponse à medida que chegam: a memória usada não
+depende da quantidade de contratos e o cabeçalho sai antes da consulta.
+"""
+import csv
+import io
+import re
+import zipfile
+from contextlib import aclosing
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+from xml.sax.saxutils import escape
+
+from app.core.config import settings
+from app.core.database import acquire_connection
+from app.repositories.contrato_repo import ContratoRepository, CONTRATO_EXPORT_COLUMNS
+
+# Linhas acumuladas antes de enviar um bloco ao cliente
+LINHAS_POR_BLOCO = 200
+
+# formato -> (media type, extensão)
+FORMATOS_EXPORTACAO = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+# Textos que o Excel/LibreOffice interpretariam como fórmula ao abrir o arquivo
+# (objeto, nome do contratado etc. são digitados pelos usuários)
+_INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _parece_formula(valor: Any) -> bool:
+    return isinstance(valor, str) and valor.startswith(_INICIO_FORMULA)
+
+
+# --- CSV ---
+
+def _celula_csv(valor: Any) -> Any:
+    if valor is None:
+        return ""
+    # O apóstrofo faz a planilha tratar o valor como texto
+    return f"'{valor}" if _parece_formula(valor) else valor
+
+
+async def gerar_csv(colunas: Iterable[str], registros: AsyncIterator) -> AsyncIterator[bytes]:
+    """CSV separado por ';' com BOM (abre direto no Excel em pt-BR)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    buffer.write("\ufeff")
+    writer.writerow(colunas)
+    yield _drenar_texto(buffer)
+
+    pendentes = 0
+    async for registro in registros:
+        writer.writerow([_celula_csv(valor) for valor in registro.values()])
+        pendentes += 1
+        if pendentes >= LINHAS_POR_BLOCO:
+            yield _drenar_texto(buffer)
+            pendentes = 0
+    if pendentes:
+        yield _drenar_texto(buffer)
+
+
+def _drenar_texto(buffer: io.StringIO) -> bytes:
+    conteudo = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    return conteudo
+
+
+# --- XLSX ---
+# Planilha mínima (SpreadsheetML) escrita direto no zip, sem montar o arquivo
+# em memória: textos como inlineStr e datas como número com formato de data.
+# Textos que começam como fórmula recebem o estilo com quotePrefix, para que
+# continuem texto mesmo quando a célula é editada.
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CABECALHO_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_PARTES_XLSX = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        f'<Relationships xmlns="{_NS_PKG_REL}">'
+        f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">'
+        '<sheets><sheet name="Contratos" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        f'<Relationships xmlns="{_NS_PKG_REL}">'
+        f'<Relationship Id="rId1" Type="{_NS_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # Estilos: 0 = padrão, 1 = data (numFmt 14), 2 = cabeçalho em negrito,
+    # 3 = texto com quotePrefix
+    "xl/styles.xml": (
+        f'<styleSheet xmlns="{_NS_MAIN}">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" quotePrefix="1"/></cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+_ESTILO_DATA = 1
+_ESTILO_CABECALHO = 2
+_ESTILO_TEXTO_LITERAL = 3
+_EPOCA_EXCEL = date(1899, 12, 30)
+_CARACTERES_INVALIDOS_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class _BufferSaida:
+    """Destino sem seek para o ZipFile: acumula os bytes até serem drenados"""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, dados: bytes) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self) -> None:
+        pass
+
+    def drenar(self) -> bytes:
+        conteudo = b"".join(self._partes)
+        self._partes.clear()
+        return conteudo
+
+
+def _letra_coluna(indice: int) -> str:
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _celula_xlsx(ref: str, valor: Any, estilo: Optional[int] = None) -> str:
+    atributo_estilo = f' s="{estilo}"' if estilo is not None else ""
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return f'<c r="{ref}" t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, float, Decimal)):
+        return f'<c r="{ref}"{atributo_estilo}><v>{valor}</v></c>'
+    if isinstance(valor, datetime):
+        valor = valor.date()
+    if isinstance(valor, date):
+        return f'<c r="{ref}" s="{_ESTILO_DATA}"><v>{(valor - _EPOCA_EXCEL).days}</v></c>'
+    texto = escape(_CARACTERES_INVALIDOS_XML.sub("", str(valor)))
+    if estilo is None and _parece_formula(valor):
+        atributo_estilo = f' s="{_ESTILO_TEXTO_LITERAL}"'
+    return f'<c r="{ref}" t="inlineStr"{atributo_estilo}><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _linha_xlsx(numero: int, letras: list, valores: Iterable[Any], estilo: Optional[int] = None) -> str:
+    celulas = "".join(
+        _celula_xlsx(f"{letra}{numero}", valor, estilo) for letra, valor in zip(letras, valores)
+    )
+    return f'<row r="{numero}">{celulas}</row>'
+
+
+async def gerar_xlsx(colunas: Iterable[str], registros: AsyncIterator) -> AsyncIterator[bytes]:
+    """XLSX com uma aba; o zip é escrito em streaming (descritores de dados)"""
+    colunas = list(colunas)
+    letras = [_letra_coluna(i) for i in range(len(colunas))]
+    saida = _BufferSaida()
+
+    with zipfile.ZipFile(saida, mode="w", compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for nome, conteudo in _PARTES_XLSX.items():
+            arquivo_zip.writestr(nome, _CABECALHO_XML + conteudo)
+
+        with arquivo_zip.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True) as planilha:
+            planilha.write(
+                f'{_CABECALHO_XML}<worksheet xmlns="{_NS_MAIN}"><sheetData>'.encode("utf-8")
+                + _linha_xlsx(1, letras, colunas, _ESTILO_CABECALHO).encode("utf-8")
+            )
+            yield saida.drenar()
+
+            numero = 1
+            async for registro in registros:
+                numero += 1
+                planilha.write(_linha_xlsx(numero, letras, registro.values()).encode("utf-8"))
+                if numero % LINHAS_POR_BLOCO == 0:
+                    # O deflate pode reter os bytes até completar um bloco
+                    bloco = saida.drenar()
+                    if bloco:
+                        yield bloco
+            planilha.write(b"</sheetData></worksheet>")
+
+    yield saida.drenar()
+
+
+ESCRITORES = {"csv": gerar_csv, "xlsx": gerar_xlsx}
+
+
+class ContratoExportService:
+    @staticmethod
+    async def _registros(filters: Optional[Dict], user_context: Optional[Dict]) -> AsyncIterator:
+        # A resposta é transmitida depois que as dependências da requisição já
+        # liberaram a conexão; a exportação usa uma conexão própria do pool,
+        # obtida só quando o cabeçalho já foi enviado
+        async with acquire_connection() as conn:
+            cursor = ContratoRepository(conn).iter_contratos_exportacao(
+                filters, user_context, prefetch=settings.CONTRATO_EXPORT_PREFETCH
+            )
+            async with aclosing(cursor):
+                async for registro in cursor:
+                    yield registro
+
+    @staticmethod
+    async def exportar(
+        formato: str,
+        filters: Optional[Dict] = None,
+        user_context: Optional[Dict] = None
+    ) -> AsyncIterator[bytes]:
+        """Blocos do arquivo exportado; a conexão é devolvida ao fim ou se o cliente desconectar"""
+        async with aclosing(ContratoExportService._registros(filters, user_context)) as registros:
+            async for bloco in ESCRITORES[formato](CONTRATO_EXPORT_COLUMNS.keys(), registros):
+                yield bloco
@@ -0,0 +1,395 @@
+# app/services/contrato_import_service.py
+import csv
+import io
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+
+from app.core.cache import invalidate_dashboards
+from app.core.config import settings
+from app.core.lookup_registry import lookup_registry
+from app.repositories.contrato_import_repo import ContratoImportRepository, COLUNAS_IMPORTACAO
+from app.repositories.contrato_numeracao_repo import ContratoNumeracaoRepository
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.schemas.contrato_schema import (
+    ContratoCreate, ContratoImportErro, ContratoImportado, ContratoImportResultado
+)
+from app.schemas.usuario_schema import Usuario
+from app.services.audit_integration import audit_importar_contratos
+from app.services.contrato_service import mensagem_sem_perfil
+from app.services.email_outbox_service import EmailOutboxService, EmailPendente
+from app.services.email_service import EmailService
+from app.services.email_templates import EmailTemplates
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_DATA = {"data_inicio", "data_fim", "data_doe", "garantia"}
+CAMPOS_VALOR = {"valor_anual", "valor_global"}
+
+# Colunas alternativas aos ids: usuários podem ser informados pelo email
+COLUNAS_EMAIL_USUARIO = {
+    "gestor_id": "gestor_email",
+    "fiscal_id": "fiscal_email",
+    "fiscal_substituto_id": "fiscal_substituto_email",
+}
+
+# Funções de usuário no contrato: campo -> (perfil exigido, coluna de get_usuarios)
+PERFIS_USUARIO = {
+    "gestor_id": ("Gestor", "pode_gerir"),
+    "fiscal_id": ("Fiscal", "pode_fiscalizar"),
+    "fiscal_substituto_id": ("Fiscal", "pode_fiscalizar"),
+}
+
+# Valor natural (documento, nome, email) que corresponde a mais de um registro
+AMBIGUO = object()
+
+LinhaPlanilha = Tuple[int, Dict[str, Any]]
+
+
+# --- Leitura da planilha ---
+
+def ler_planilha(conteudo: bytes, nome_arquivo: str) -> List[LinhaPlanilha]:
+    """Lê um CSV (separado por ; , ou tab) ou XLSX; retorna (nº da linha, valores)"""
+    nome = (nome_arquivo or "").lower()
+    if nome.endswith(".xlsx"):
+        return _ler_xlsx(conteudo)
+    if nome.endswith(".csv") or nome.endswith(".txt"):
+        return _ler_csv(conteudo)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Formato não suportado: envie um arquivo .csv ou .xlsx"
+    )
+
+
+def _ler_csv(conteudo: bytes) -> List[LinhaPlanilha]:
+    try:
+        texto = conteudo.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        texto = conteudo.decode("latin-1")
+    try:
+        dialeto = csv.Sniffer().sniff(texto[:4096], delimiters=";,\t")
+    except csv.Error:
+        dialeto = csv.excel
+    reader = csv.DictReader(io.StringIO(texto), dialect=dialeto)
+    linhas = [(reader.line_num, _limpar_linha(valores)) for valores in reader]
+    return [(numero, valores) for numero, valores in linhas if any(v is not None for v in valores.values())]
+
+
+def _ler_xlsx(conteudo: bytes) -> List[LinhaPlanilha]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Importação de XLSX indisponível: instale o pacote openpyxl"
+        )
+    workbook = load_workbook(io.BytesIO(conteudo), read_only=True, data_only=True)
+    try:
+        linhas = workbook.active.iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if not cabecalho:
+            return []
+        nomes = [str(c).strip() if c is not None else "" for c in cabecalho]
+        return [
+            (numero, _limpar_linha(dict(zip(nomes, valores))))
+            for numero, valores in enumerate(linhas, start=2)
+            if any(v not in (None, "") for v in valores)
+        ]
+    finally:
+        workbook.close()
+
+
+def _limpar_linha(valores: Dict) -> Dict[str, Any]:
+    linha = {}
+    for chave, valor in valores.items():
+        if not chave:
+            continue
+        if isinstance(valor, str):
+            valor = valor.strip() or None
+        linha[str(chave).strip().lower()] = valor
+    return linha
+
+
+def _normalizar(campo: str, valor: Any) -> Any:
+    """Converte formatos usuais de planilha (dd/mm/aaaa, 1.234,56) para o schema"""
+    if valor is None:
+        return None
+    if campo in CAMPOS_DATA:
+        if isinstance(valor, datetime):
+            return valor.date()
+        if isinstance(valor, date):
+            return valor
+        try:
+            return datetime.strptime(str(valor), "%d/%m/%Y").date()
+        except ValueError:
+            return valor  # formato ISO é validado pelo Pydantic
+    if campo in CAMPOS_VALOR:
+        if isinstance(valor, str):
+            texto = valor.replace("R$", "").replace(" ", "")
+            if "," in texto:
+                texto = texto.replace(".", "").replace(",", ".")
+            return texto
+        return valor
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)  # células numéricas do XLSX
+    if campo.endswith("_id"):
+        return valor
+    return str(valor)
+
+
+def _inteiro(valor: Any) -> Optional[int]:
+    if valor is None:
+        return None
+    return int(str(valor).strip())
+
+
+def _minusculo(valor: Any) -> str:
+    return str(valor).strip().lower()
+
+
+def _digitos(valor: Any) -> Optional[str]:
+    if valor is None:
+        return None
+    digitos = "".join(ch for ch in str(valor) if ch.isdigit())
+    return digitos or None
+
+
+def _indexar(pares) -> Dict[Any, Any]:
+    """Mapa valor natural -> id; valores de mais de um registro apontam para AMBIGUO"""
+    mapa: Dict[Any, Any] = {}
+    for chave, item_id in pares:
+        if not chave:
+            continue
+        mapa[chave] = item_id if mapa.get(chave, item_id) == item_id else AMBIGUO
+    return mapa
+
+
+class ContratoImportService:
+    def __init__(self, import_repo: ContratoImportRepository):
+        self.import_repo = import_repo
+
+    async def _carregar_referencias(self, linhas: List[LinhaPlanilha]) -> Dict[str, Dict]:
+        """Resolve todas as chaves estrangeiras da planilha com uma consulta por tabela"""
+        conn = self.import_repo.conn
+        contratado_ids, documentos, usuario_ids, emails = set(), set(), set(), set()
+        def adicionar_id(destino: set, valor: Any) -> None:
+            try:
+                if valor is not None:
+                    destino.add(_inteiro(valor))
+            except ValueError:
+                pass  # reportado na validação da linha
+
+        for _, valores in linhas:
+            adicionar_id(contratado_ids, valores.get("contratado_id"))
+            for campo, coluna_email in COLUNAS_EMAIL_USUARIO.items():
+                adicionar_id(usuario_ids, valores.get(campo))
+                if valores.get(coluna_email):
+                    emails.add(_minusculo(valores[coluna_email]))
+            for coluna in ("contratado_cnpj", "contratado_cpf"):
+                if _digitos(valores.get(coluna)):
+                    documentos.add(_digitos(valores[coluna]))
+
+        contratados = await self.import_repo.get_contratados(contratado_ids, documentos)
+        usuarios = await self.import_repo.get_usuarios(usuario_ids, emails)
+        modalidades = await lookup_registry.get_all(conn, "modalidade")
+        status_list = await lookup_registry.get_all(conn, "status")
+
+        return {
+            "contratado_id": {c["id"]: c["id"] for c in contratados},
+            "contratado_doc": _indexar(
+                (doc, c["id"]) for c in contratados for doc in (c["cnpj_digitos"], c["cpf_digitos"])
+            ),
+            "usuario_id": {u["id"]: u for u in usuarios},
+            "usuario_email": _indexar((u["email"].lower(), u["id"]) for u in usuarios),
+            "modalidade_id": {m["id"]: m["id"] for m in modalidades},
+            "modalidade": _indexar((m["nome"].lower(), m["id"]) for m in modalidades),
+            "status_id": {s["id"]: s["id"] for s in status_list},
+            "status": _indexar((s["nome"].lower(), s["id"]) for s in status_list),
+        }
+
+    def _resolver_linha(self, valores: Dict[str, Any], refs: Dict[str, Dict]) -> Tuple[Dict[str, Any], List[str]]:
+        """Monta os dados do contrato trocando referências naturais por ids"""
+        dados = {campo: _normalizar(campo, valores.get(campo)) for campo in COLUNAS_IMPORTACAO}
+        erros = []
+        # (campo, nome, ids conhecidos, colunas alternativas: (coluna, mapa valor -> id, normalização))
+        regras = [
+            ("contratado_id", "Contratado", refs["contratado_id"],
+             [("contratado_cnpj", refs["contratado_doc"], _digitos), ("contratado_cpf", refs["contratado_doc"], _digitos)]),
+            ("modalidade_id", "Modalidade", refs["modalidade_id"], [("modalidade", refs["modalidade"], _minusculo)]),
+            ("status_id", "Status", refs["status_id"], [("status", refs["status"], _minusculo)]),
+            ("gestor_id", "Gestor", refs["usuario_id"], [("gestor_email", refs["usuario_email"], _minusculo)]),
+            ("fiscal_id", "Fiscal", refs["usuario_id"], [("fiscal_email", refs["usuario_email"], _minusculo)]),
+            ("fiscal_substituto_id", "Fiscal Substituto", refs["usuario_id"],
+             [("fiscal_substituto_email", refs["usuario_email"], _minusculo)]),
+        ]
+        for campo, nome, conhecidos, alternativas in regras:
+            try:
+                item_id = _inteiro(valores.get(campo))
+            except ValueError:
+                erros.append(f"{campo}: valor inválido '{valores.get(campo)}'")
+                continue
+            if item_id is not None:
+                if item_id not in conhecidos:
+                    erros.append(f"{nome} não encontrado (id {item_id})")
+                dados[campo] = item_id
+                continue
+            for coluna, mapa, normalizar in alternativas:
+                if valores.get(coluna) is None:
+                    continue
+                encontrado = mapa.get(normalizar(valores[coluna]))
+                if encontrado is None:
+                    erros.append(f"{nome} não encontrado ({coluna} '{valores[coluna]}')")
+                elif encontrado is AMBIGUO:
+                    erros.append(f"{nome} ambíguo ({coluna} '{valores[coluna]}' corresponde a mais de um registro)")
+                else:
+                    dados[campo] = encontrado
+                break
+
+        # Mesma regra de ContratoService._validate_foreign_keys
+        for campo, (perfil, coluna) in PERFIS_USUARIO.items():
+            usuario = refs["usuario_id"].get(dados.get(campo))
+            if usuario and not usuario[coluna]:
+                erros.append(mensagem_sem_perfil(dados[campo], perfil))
+        return dados, erros
+
+    async def importar(
+        self,
+        linhas: List[LinhaPlanilha],
+        validar_apenas: bool = False,
+        current_user: Optional[Usuario] = None,
+        request: Optional[Request] = None,
+        notificar: bool = True
+    ) -> Tuple[ContratoImportResultado, List[EmailPendente]]:
+        """
+        Valida e grava os contratos da planilha. As linhas válidas são gravadas
+        mesmo que outras tenham erro; o resultado traz o relatório por linha.
+
+        Os resumos de notificação (um por gestor/fiscal) são gravados na caixa
+        de saída na mesma transação dos contratos. Sem a caixa de saída
+        (migração não aplicada), são retornados para envio após a resposta.
+        """
+        if len(linhas) > settings.CONTRATO_IMPORT_MAX_LINHAS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A planilha excede o limite de {settings.CONTRATO_IMPORT_MAX_LINHAS} linhas"
+            )
+
+        refs = await self._carregar_referencias(linhas)
+        erros: Dict[int, ContratoImportErro] = {}
+        validos: Dict[int, ContratoCreate] = {}
+        linhas_por_nr: Dict[str, int] = {}
+
+        for numero, valores in linhas:
+            dados, erros_linha = self._resolver_linha(valores, refs)
+            contrato = None
+            try:
+                contrato = ContratoCreate.model_validate({k: v for k, v in dados.items() if v is not None})
+            except ValidationError as e:
+                erros_linha.extend(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+            if contrato and contrato.nr_contrato in linhas_por_nr:
+                erros_linha.append(f"Número repetido na planilha (linha {linhas_por_nr[contrato.nr_contrato]})")
+            if erros_linha or contrato is None:
+                erros[numero] = ContratoImportErro(linha=numero, nr_contrato=dados.get("nr_contrato"), erros=erros_linha)
+                continue
+            linhas_por_nr[contrato.nr_contrato] = numero
+            validos[numero] = contrato
+
+        existentes = await self.import_repo.get_nr_contratos_existentes(list(linhas_por_nr))
+        for nr in existentes:
+            numero = linhas_por_nr[nr]
+            validos.pop(numero)
+            erros[numero] = ContratoImportErro(linha=numero, nr_contrato=nr, erros=["Já existe um contrato ativo com este número"])
+
+        importados: List[ContratoImportado] = []
+        emails: List[EmailPendente] = []
+        if validos and not validar_apenas:
+            registros = [
+                (numero, *(getattr(contrato, campo) for campo in COLUNAS_IMPORTACAO))
+                for numero, contrato in validos.items()
+            ]
+            # Contratos e emails de resumo são gravados atomicamente
+            async with self.import_repo.conn.transaction():
+                for row in await self.import_repo.inserir_contratos(registros):
+                    if row["id"] is None:
+                        validos.pop(row["linha"])
+                        erros[row["linha"]] = ContratoImportErro(
+                            linha=row["linha"], nr_contrato=row["nr_contrato"],
+                            erros=["Já existe um contrato ativo com este número"]
+                        )
+                    else:
+                        importados.append(ContratoImportado(linha=row["linha"], id=row["id"], nr_contrato=row["nr_contrato"]))
+
+                if notificar:
+                    emails = self._emails_resumo(self._montar_resumos(importados, validos, refs["usuario_id"]))
+                outbox_service = EmailOutboxService(EmailOutboxRepository(self.import_repo.conn))
+                if emails and await outbox_service.enfileirar(emails):
+                    emails = []
+
+            if importados:
+                await invalidate_dashboards(self.import_repo.conn)
+                await ContratoNumeracaoRepository(self.import_repo.conn).registrar(c.nr_contrato for c in importados)
+                if current_user:
+                    await audit_importar_contratos(
+                        conn=self.import_repo.conn,
+                        request=request,
+                        usuario=current_user,
+                        nr_contratos=[c.nr_contrato for c in importados]
+                    )
+
+        resultado = ContratoImportResultado(
+            total_linhas=len(linhas),
+            importados=len(importados) if not validar_apenas else len(validos),
+            com_erro=len(erros),
+            validar_apenas=validar_apenas,
+            contratos=importados,
+            erros=sorted(erros.values(), key=lambda e: e.linha)
+        )
+        return resultado, emails
+
+    @staticmethod
+    def _montar_resumos(importados: List[ContratoImportado], validos: Dict[int, ContratoCreate], usuarios: Dict[int, Dict]) -> List[Dict]:
+        """Agrupa os contratos importados por destinatário (gestor e fiscal)"""
+        resumos: Dict[int, Dict] = {}
+        for item in importados:
+            contrato = validos[item.linha]
+            for papel, usuario_id in (("Gestor", contrato.gestor_id), ("Fiscal", contrato.fiscal_id)):
+                usuario = usuarios.get(usuario_id)
+                if not usuario:
+                    continue
+                resumo = resumos.setdefault(usuario_id, {"nome": usuario["nome"], "email": usuario["email"], "contratos": []})
+                resumo["contratos"].append({
+                    "id": item.id,
+                    "nr_contrato": contrato.nr_contrato,
+                    "objeto": contrato.objeto,
+                    "data_inicio": contrato.data_inicio,
+                    "data_fim": contrato.data_fim,
+                    "papel": papel
+                })
+        return list(resumos.values())
+
+    @staticmethod
+    def _emails_resumo(resumos: List[Dict]) -> List[EmailPendente]:
+        """Um email por destinatário com todos os contratos atribuídos a ele"""
+        emails = []
+        for resumo in resumos:
+            subject, body = EmailTemplates.contract_import_digest(resumo["nome"], resumo["contratos"])
+            emails.append((resumo["email"], subject, body, True))
+        return emails
+
+    @staticmethod
+    async def enviar_resumos(emails: List[EmailPendente]) -> int:
+        """Envia diretamente os resumos que não puderam ir para a caixa de saída"""
+        enviados = 0
+        for email, subject, body, is_html in emails:
+            try:
+                if await EmailService.send_email(email, subject, body, is_html=is_html):
+                    enviados += 1
+            except Exception as e:
+                logger.warning(f"Erro ao enviar resumo de importação para {email}: {e}")
+        logger.info(f"📧 Resumos de importação enviados: {enviados}/{len(emails)}")
+        return enviados
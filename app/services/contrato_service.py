@@ -1,33 +1,47 @@
 # app/services/contrato_service.py
-import math
+from datetime import date
 from typing import List, Optional, Dict
 from fastapi import HTTPException, status, UploadFile, Request
 import logging
 
+from app.core.config import settings
+from app.core.database import release_connection
+from app.core.cache import invalidate_dashboards
+from app.core.pagination import Contagem, encode_cursor, decode_cursor
+
 # Repositórios
-from app.repositories.contrato_repo import ContratoRepository
+from app.repositories.contrato_repo import ContratoRepository, CONTRATO_SECOES_COMPLETO
 from app.repositories.usuario_repo import UsuarioRepository
 from app.repositories.contratado_repo import ContratadoRepository as ContratadoRepo
 from app.repositories.modalidade_repo import ModalidadeRepository
 from app.repositories.status_repo import StatusRepository
 from app.repositories.arquivo_repo import ArquivoRepository
+from app.repositories.contrato_numeracao_repo import ContratoNumeracaoRepository
 
 # Services
 from app.services.file_service import FileService
 from app.services.email_service import EmailService
 from app.services.audit_integration import (
     audit_criar_contrato,
-    audit_atualizar_contrato
+    audit_atualizar_contrato,
+    audit_excluir_contratos
 )
 
 # Schemas
 from app.schemas.contrato_schema import (
     Contrato, ContratoCreate, ContratoUpdate,
-    ContratoPaginated, ContratoList
+    ContratoPaginated, ContratoCursorPage, ContratoList, ContratoCompleto
 )
 from app.schemas.usuario_schema import Usuario
 
 logger = logging.getLogger(__name__)
+
+
+def mensagem_sem_perfil(usuario_id: int, perfil: str) -> str:
+    """Erro de usuário sem o perfil exigido pela função no contrato"""
+    return f"Usuário {usuario_id} não possui perfil de {perfil} ou Administrador"
+
+
 class ContratoService:
     def __init__(self,
                  contrato_repo: ContratoRepository,
@@ -36,7 +50,8 @@ class ContratoService:
                  modalidade_repo: ModalidadeRepository,
                  status_repo: StatusRepository,
                  arquivo_repo: ArquivoRepository,
-                 file_service: FileService):
+                 file_service: FileService,
+                 numeracao_repo: Optional[ContratoNumeracaoRepository] = None):
         self.contrato_repo = contrato_repo
         self.usuario_repo = usuario_repo
         self.contratado_repo = contratado_repo
@@ -44,94 +59,94 @@ class ContratoService:
         self.status_repo = status_repo
         self.arquivo_repo = arquivo_repo
         self.file_service = file_service
-
-    async def _validate_foreign_keys(self, contrato: ContratoCreate | ContratoUpdate):
-        """Valida se todas as chaves estrangeiras existem"""
-        print(f"Validando foreign keys para: {contrato}")
-        
-        if hasattr(contrato, 'contratado_id') and contrato.contratado_id:
-            print(f"Validando contratado_id: {contrato.contratado_id}")
-            if not await self.contratado_repo.get_contratado_by_id(contrato.contratado_id):
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contratado não encontrado")
-        
-        if hasattr(contrato, 'modalidade_id') and contrato.modalidade_id:
-            print(f"Validando modalidade_id: {contrato.modalidade_id}")
-            if not await self.modalidade_repo.get_modalidade_by_id(contrato.modalidade_id):
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Modalidade não encontrada")
-        
-        if hasattr(contrato, 'status_id') and contrato.status_id:
-            print(f"Validando status_id: {contrato.status_id}")
-            if not await self.status_repo.get_status_by_id(contrato.status_id):
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Status não encontrado")
-        
-        if hasattr(contrato, 'gestor_id') and contrato.gestor_id:
-            print(f"Validando gestor_id: {contrato.gestor_id}")
-            if not await self.usuario_repo.get_user_by_id(contrato.gestor_id):
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Gestor não encontrado")
-        
-        if hasattr(contrato, 'fiscal_id') and contrato.fiscal_id:
-            print(f"Validando fiscal_id: {contrato.fiscal_id}")
-            if not await self.usuario_repo.get_user_by_id(contrato.fiscal_id):
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Fiscal não encontrado")
-        
-        if hasattr(contrato, 'fiscal_substituto_id') and contrato.fiscal_substituto_id:
-            print(f"Validando fiscal_substituto_id: {contrato.fiscal_substituto_id}")
-            if not await self.usuario_repo.get_user_by_id(contrato.fiscal_substituto_id):
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Fiscal Substituto não encontrado")
-        
-        print("Todas as validações de foreign key passaram")
+        self.numeracao_repo = numeracao_repo or ContratoNumeracaoRepository(contrato_repo.conn)
+
+    # campo -> (nome no erro de inexistência, perfil exigido)
+    _REFERENCIAS = {
+        "contratado_id": ("Contratado não encontrado", None),
+        "modalidade_id": ("Modalidade não encontrada", None),
+        "status_id": ("Status não encontrado", None),
+        "gestor_id": ("Gestor não encontrado", "Gestor"),
+        "fiscal_id": ("Fiscal não encontrado", "Fiscal"),
+        "fiscal_substituto_id": ("Fiscal Substituto não encontrado", "Fiscal"),
+    }
+
+    async def _validate_foreign_keys(self, contrato: ContratoCreate | ContratoUpdate, atual: Optional[Dict] = None):
+        """
+        Valida em uma única consulta se as chaves estrangeiras existem e se
+        gestor e fiscais têm o perfil adequado (Administrador ou Gestor /
+        Administrador ou Fiscal). Em atualizações (`atual`), usuários que já
+        ocupavam a função no contrato não têm o perfil reverificado.
+        """
+        ids = {
+            campo: getattr(contrato, campo, None) or None
+            for campo in self._REFERENCIAS
+        }
+        if not any(ids.values()):
+            return
+
+        resultado = await self.contrato_repo.check_foreign_keys(**ids)
+
+        nao_encontrados = []
+        sem_perfil = []
+        for campo, (mensagem, perfil) in self._REFERENCIAS.items():
+            if ids[campo] is None:
+                continue
+            valido = resultado[campo]
+            if not valido and (perfil is None or valido is None):
+                nao_encontrados.append(mensagem)
+            elif valido is False and not (atual and atual.get(campo) == ids[campo]):
+                sem_perfil.append(mensagem_sem_perfil(ids[campo], perfil))
+
+        if nao_encontrados:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="; ".join(nao_encontrados))
+        if sem_perfil:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="; ".join(sem_perfil))
 
     async def _send_contract_assignment_email(self, contrato_data: Dict, fiscal_id: int, gestor_id: int, is_update: bool = False, old_fiscal_id: Optional[int] = None):
         """Envia emails de notificação para fiscal e gestor quando um contrato é criado ou atualizado"""
         from app.services.email_templates import EmailTemplates
-        
+
+        # Busca todos os destinatários antes de enviar, para liberar a conexão
+        # do banco durante os envios SMTP
+        fiscal = await self.usuario_repo.get_user_by_id(fiscal_id) if fiscal_id else None
+        gestor = await self.usuario_repo.get_user_by_id(gestor_id) if gestor_id else None
+        old_fiscal = None
+        if is_update and old_fiscal_id and old_fiscal_id != fiscal_id:
+            old_fiscal = await self.usuario_repo.get_user_by_id(old_fiscal_id)
+
+        await release_connection(self.contrato_repo.conn)
+
         # Email para o fiscal (novo ou atual)
-        if fiscal_id:
-            fiscal = await self.usuario_repo.get_user_by_id(fiscal_id)
-            if fiscal:
-                subject, body = EmailTemplates.contract_assignment_fiscal(
-                    fiscal_nome=fiscal['nome'],
-                    contrato_data=contrato_data,
-                    is_new=not is_update
-                )
-                await EmailService.send_email(fiscal['email'], subject, body, is_html=True)
+        if fiscal:
+            subject, body = EmailTemplates.contract_assignment_fiscal(
+                fiscal_nome=fiscal['nome'],
+                contrato_data=contrato_data,
+                is_new=not is_update
+            )
+            await EmailService.send_email(fiscal['email'], subject, body, is_html=True)
 
         # Email para o gestor
-        if gestor_id:
-            gestor = await self.usuario_repo.get_user_by_id(gestor_id)
-            if gestor:
-                # Busca dados do fiscal para incluir no email do gestor
-                fiscal_data = None
-                if fiscal_id:
-                    fiscal = await self.usuario_repo.get_user_by_id(fiscal_id)
-                    if fiscal:
-                        fiscal_data = {'nome': fiscal['nome'], 'email': fiscal['email']}
-                
-                subject, body = EmailTemplates.contract_assignment_manager(
-                    gestor_nome=gestor['nome'],
-                    contrato_data=contrato_data,
-                    fiscal_data=fiscal_data,
-                    is_new=not is_update
-                )
-                await EmailService.send_email(gestor['email'], subject, body, is_html=True)
+        if gestor:
+            # Dados do fiscal para incluir no email do gestor
+            fiscal_data = {'nome': fiscal['nome'], 'email': fiscal['email']} if fiscal else None
+
+            subject, body = EmailTemplates.contract_assignment_manager(
+                gestor_nome=gestor['nome'],
+                contrato_data=contrato_data,
+                fiscal_data=fiscal_data,
+                is_new=not is_update
+            )
+            await EmailService.send_email(gestor['email'], subject, body, is_html=True)
 
         # Se houve mudança de fiscal, notifica o fiscal anterior
-        if is_update and old_fiscal_id and old_fiscal_id != fiscal_id:
-            old_fiscal = await self.usuario_repo.get_user_by_id(old_fiscal_id)
-            if old_fiscal:
-                # Busca nome do novo fiscal para incluir na notificação
-                novo_fiscal_nome = None
-                if fiscal_id:
-                    novo_fiscal = await self.usuario_repo.get_user_by_id(fiscal_id)
-                    if novo_fiscal:
-                        novo_fiscal_nome = novo_fiscal['nome']
-                
-                subject, body = EmailTemplates.contract_transfer_notification(
-                    fiscal_nome=old_fiscal['nome'],
-                    contrato_data=contrato_data,
-                    novo_fiscal_nome=novo_fiscal_nome
-                )
-                await EmailService.send_email(old_fiscal['email'], subject, body, is_html=True)
+        if old_fiscal:
+            subject, body = EmailTemplates.contract_transfer_notification(
+                fiscal_nome=old_fiscal['nome'],
+                contrato_data=contrato_data,
+                novo_fiscal_nome=fiscal['nome'] if fiscal else None
+            )
+            await EmailService.send_email(old_fiscal['email'], subject, body, is_html=True)
 
     async def create_contrato(
         self,
@@ -147,8 +162,12 @@ class ContratoService:
         # Validação de chaves estrangeiras
         await self._validate_foreign_keys(contrato_create)
 
+        nr_automatico = not contrato_create.nr_contrato.strip()
+        if nr_automatico:
+            # Numeração automática: reserva o número no contador (sem repetição sob concorrência)
+            contrato_create.nr_contrato = await self.numeracao_repo.alocar()
         # Validação de número duplicado
-        if await self.contrato_repo.exists_nr_contrato(contrato_create.nr_contrato):
+        elif await self.contrato_repo.exists_nr_contrato(contrato_create.nr_contrato):
             next_available = await self.contrato_repo.get_next_available_nr_contrato()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -158,6 +177,9 @@ class ContratoService:
         # Cria o contrato primeiro para obter um ID
         new_contrato_data = await self.contrato_repo.create_contrato(contrato_create)
         contrato_id = new_contrato_data['id']
+        if not nr_automatico:
+            await self.numeracao_repo.registrar([contrato_create.nr_contrato])
+        await invalidate_dashboards(self.contrato_repo.conn)
 
         # Processamento de arquivos
         if files and any(file.filename for file in files if file):
@@ -165,6 +187,7 @@ class ContratoService:
             valid_files = [file for file in files if file and file.filename and file.filename.strip()]
 
             if valid_files:
+                await release_connection(self.contrato_repo.conn)
                 saved_files = await self.file_service.save_multiple_upload_files(contrato_id, valid_files)
 
                 # Salva cada arquivo no banco de dados
@@ -225,21 +248,67 @@ class ContratoService:
             return Contrato.model_validate(contrato_data)
         return None
 
-    async def get_all_contratos(self, page: int, per_page: int, filters: Optional[Dict] = None, user_context: Optional[Dict] = None) -> ContratoPaginated:
+    async def get_contrato_completo(
+        self,
+        contrato_id: int,
+        secoes: Optional[List[str]] = None,
+        user_context: Optional[Dict] = None
+    ) -> Optional[ContratoCompleto]:
+        """Contrato com arquivos, pendências, relatórios e auditoria (todas as seções se `secoes` for vazio)"""
+        secoes = [secao for secao in CONTRATO_SECOES_COMPLETO if not secoes or secao in secoes]
+        contrato_data = await self.contrato_repo.get_contrato_completo(contrato_id, secoes, user_context=user_context)
+        if contrato_data:
+            return ContratoCompleto.model_validate(contrato_data)
+        return None
+
+    async def get_all_contratos(self, page: int, per_page: int, filters: Optional[Dict] = None, user_context: Optional[Dict] = None, contagem: Contagem = "exata") -> ContratoPaginated:
         offset = (page - 1) * per_page
-        contratos_data, total_items = await self.contrato_repo.get_all_contratos(
+        pagina = await self.contrato_repo.get_all_contratos(
             filters=filters,
             limit=per_page,
             offset=offset,
-            user_context=user_context
+            user_context=user_context,
+            contagem=contagem
         )
-        total_pages = math.ceil(total_items / per_page) if total_items > 0 else 1
         return ContratoPaginated(
-            data=[ContratoList.model_validate(c) for c in contratos_data],
-            total_items=total_items,
-            total_pages=total_pages,
+            data=[ContratoList.model_validate(c) for c in pagina.itens],
+            total_items=pagina.total,
+            total_pages=pagina.total_paginas(per_page),
             current_page=page,
-            per_page=per_page
+            per_page=per_page,
+            has_more=pagina.has_more,
+            total_estimado=pagina.total_estimado
+        )
+
+    async def get_contratos_cursor(self, per_page: int, cursor: Optional[str] = None, filters: Optional[Dict] = None, user_context: Optional[Dict] = None) -> ContratoCursorPage:
+        after = None
+        if cursor:
+            chave = decode_cursor(cursor)
+            try:
+                after = (date.fromisoformat(chave["d"]), int(chave["id"]))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginação inválido")
+
+        # Busca um item a mais para saber se existe próxima página
+        contratos_data = await self.contrato_repo.get_contratos_keyset(
+            filters=filters,
+            limit=per_page + 1,
+            after=after,
+            user_context=user_context
+        )
+        has_more = len(contratos_data) > per_page
+        contratos_data = contratos_data[:per_page]
+
+        next_cursor = None
+        if has_more:
+            ultimo = contratos_data[-1]
+            next_cursor = encode_cursor({"d": ultimo['data_fim_ordem'].isoformat(), "id": ultimo['id']})
+
+        return ContratoCursorPage(
+            data=[ContratoList.model_validate(c) for c in contratos_data],
+            per_page=per_page,
+            next_cursor=next_cursor,
+            has_more=has_more
         )
 
     async def update_contrato(
@@ -262,7 +331,7 @@ class ContratoService:
 
             # Valida chaves estrangeiras antes da atualização
             print(f"\n=== DEBUG - Iniciando validação foreign keys ===")
-            await self._validate_foreign_keys(contrato_update)
+            await self._validate_foreign_keys(contrato_update, existing_contrato)
             print(f"=== DEBUG - Validação foreign keys concluída ===\n")
             
             # Se está atualizando o número do contrato, verifica se já existe
@@ -296,7 +365,8 @@ class ContratoService:
 
                 if valid_files:
                     print("Salvando arquivos...")
-                    # Salva os novos arquivos
+                    # Salva os novos arquivos (sem segurar conexão do banco)
+                    await release_connection(self.contrato_repo.conn)
                     saved_files = await self.file_service.save_multiple_upload_files(contrato_id, valid_files)
                     print(f"Arquivos salvos: {len(saved_files)}")
 
@@ -324,6 +394,9 @@ class ContratoService:
             print(f"contrato_id: {contrato_id} (tipo: {type(contrato_id).__name__})")
             print(f"contrato_update: {contrato_update}")
             updated_contrato = await self.contrato_repo.update_contrato(contrato_id, contrato_update)
+            await invalidate_dashboards(self.contrato_repo.conn)
+            if contrato_update.nr_contrato:
+                await self.numeracao_repo.registrar([contrato_update.nr_contrato])
             print(f"Resultado do repositório: {updated_contrato}")
             print(f"=== FIM DEBUG - Repositório ===\n")
 
@@ -369,7 +442,9 @@ class ContratoService:
                     logger.warning(f"Erro ao criar log de auditoria para contrato {contrato_id}: {e}")
 
             return updated_contrato
-            
+
+        except HTTPException:
+            raise
         except Exception as e:
             logging.error(f"Erro ao atualizar contrato {contrato_id}: {e}")
             raise HTTPException(
@@ -377,10 +452,57 @@ class ContratoService:
                 detail=f"Erro interno ao atualizar contrato: {str(e)}"
             )
 
-    async def delete_contrato(self, contrato_id: int) -> bool:
-        if not await self.contrato_repo.find_contrato_by_id(contrato_id):
+    async def delete_contrato(
+        self,
+        contrato_id: int,
+        current_user: Optional[Usuario] = None,
+        request: Optional[Request] = None
+    ) -> bool:
+        resultado = await self.delete_contratos([contrato_id], current_user, request)
+        if not resultado["excluidos"]:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contrato não encontrado")
-        return await self.contrato_repo.delete_contrato(contrato_id)
+        return True
+
+    async def delete_contratos(
+        self,
+        contrato_ids: List[int],
+        current_user: Optional[Usuario] = None,
+        request: Optional[Request] = None
+    ) -> Dict:
+        """
+        Exclui (soft delete) os contratos com suas pendências, relatórios e
+        arquivos em uma única transação. Ids inexistentes ou já excluídos
+        voltam em `nao_encontrados`.
+        """
+        contrato_ids = list(dict.fromkeys(contrato_ids))
+        resultado = await self.contrato_repo.delete_contratos(
+            contrato_ids, retencao_arquivos_dias=settings.CONTRATO_ARQUIVOS_RETENCAO_DIAS
+        )
+        excluidos = resultado["contratos"]
+        if excluidos:
+            await invalidate_dashboards(self.contrato_repo.conn)
+            if current_user:
+                await audit_excluir_contratos(
+                    conn=self.contrato_repo.conn,
+                    request=request,
+                    usuario=current_user,
+                    contrato_ids=excluidos,
+                    dados_exclusao={
+                        "pendencias": resultado["pendencias"],
+                        "relatorios": resultado["relatorios"],
+                        "arquivos": resultado["arquivos"]
+                    },
+                    perfil_usado=current_user.perfil_ativo if hasattr(current_user, 'perfil_ativo') else None
+                )
+
+        excluidos_set = set(excluidos)
+        return {
+            "excluidos": excluidos,
+            "nao_encontrados": [i for i in contrato_ids if i not in excluidos_set],
+            "pendencias": resultado["pendencias"],
+            "relatorios": resultado["relatorios"],
+            "arquivos": resultado["arquivos"]
+        }
 
     # Métodos para gerenciamento de arquivos do contrato
     async def get_arquivos_contrato(self, contrato_id: int) -> List[Dict]:
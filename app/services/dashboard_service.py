@@ -1,7 +1,10 @@
 # app/services/dashboard_service.py
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from datetime import datetime
 from fastapi import HTTPException
+from app.core.cache import dashboard_cache, invalidate_dashboards
+from app.core.database import fan_out
 from app.repositories.dashboard_repo import DashboardRepository
 from app.schemas.dashboard_schema import (
     ContratosComPendencias,
@@ -23,6 +26,35 @@ class DashboardService:
     def __init__(self, dashboard_repo: DashboardRepository):
         self.dashboard_repo = dashboard_repo
 
+    async def _cached(self, endpoint: str, perfil: str, usuario_id: Optional[int],
+                      loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Retorna o resultado em cache para (endpoint, perfil, usuario_id) ou o
+        calcula com `loader`. Dashboards de administrador não dependem do usuário
+        e usam usuario_id=None, sendo compartilhados entre administradores.
+        """
+        key = (endpoint, perfil, usuario_id)
+        result = dashboard_cache.get(key)
+        if result is None:
+            result = await loader()
+            dashboard_cache.set(key, result)
+        return result
+
+    @staticmethod
+    def _on(conn) -> 'DashboardService':
+        """Instância do serviço sobre outra conexão (usada no fan-out)"""
+        return DashboardService(DashboardRepository(conn))
+
+    async def _fan_out(self, *queries: Callable[[Any], Awaitable[Any]]) -> List[Any]:
+        """
+        Executa consultas independentes em paralelo, cada uma em sua conexão;
+        a conexão da requisição é devolvida ao pool antes
+        """
+        try:
+            return await fan_out(*queries, conn=self.dashboard_repo.conn)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Tempo limite excedido ao carregar o dashboard")
+
     async def get_contratos_com_relatorios_pendentes(self, limit: int = 20) -> ContratosComRelatoriosPendentes:
         """
         Busca contratos com relatórios pendentes de análise
@@ -173,11 +205,20 @@ class DashboardService:
         )
 
     async def get_dashboard_admin_completo(self) -> DashboardAdminResponse:
+        """Dashboard completo do administrador, compartilhado entre administradores"""
+        return await self._cached("admin/completo", "Administrador", None, lambda: self._load_dashboard_admin_completo())
+
+    async def _load_dashboard_admin_completo(self) -> DashboardAdminResponse:
         """
         Busca dados completos para dashboard do administrador
         """
-        # Busca contadores
-        admin_contadores = await self.dashboard_repo.get_contadores_admin()
+        # Contadores e listas são independentes: consultados em paralelo
+        admin_contadores, relatorios_pendentes, contratos_pendencias = await self._fan_out(
+            lambda conn: DashboardRepository(conn).get_contadores_admin(),
+            # Listas limitadas para performance
+            lambda conn: self._on(conn).get_contratos_com_relatorios_pendentes(10),
+            lambda conn: self._on(conn).get_contratos_com_pendencias(10)
+        )
         contadores = ContadoresDashboard(
             relatorios_para_analise=admin_contadores['relatorios_para_analise'],
             contratos_com_pendencias=admin_contadores['contratos_com_pendencias'],
@@ -192,12 +233,6 @@ class DashboardService:
             relatorios_equipe_pendentes=0
         )
 
-        # Busca contratos com relatórios pendentes (limitado para performance)
-        relatorios_pendentes = await self.get_contratos_com_relatorios_pendentes(10)
-
-        # Busca contratos com pendências (limitado para performance)
-        contratos_pendencias = await self.get_contratos_com_pendencias(10)
-
         return DashboardAdminResponse(
             contadores=contadores,
             contratos_com_relatorios_pendentes=relatorios_pendentes.contratos,
@@ -205,11 +240,18 @@ class DashboardService:
         )
 
     async def get_dashboard_fiscal_completo(self, fiscal_id: int) -> DashboardFiscalResponse:
+        """Dashboard completo do fiscal, em cache por fiscal"""
+        return await self._cached("fiscal/completo", "Fiscal", fiscal_id, lambda: self._load_dashboard_fiscal_completo(fiscal_id))
+
+    async def _load_dashboard_fiscal_completo(self, fiscal_id: int) -> DashboardFiscalResponse:
         """
         Busca dados completos para dashboard do fiscal
         """
-        # Busca contadores
-        fiscal_contadores = await self.dashboard_repo.get_contadores_fiscal(fiscal_id)
+        # Contadores e pendências do fiscal consultados em paralelo
+        fiscal_contadores, minhas_pendencias = await self._fan_out(
+            lambda conn: DashboardRepository(conn).get_contadores_fiscal(fiscal_id),
+            lambda conn: self._on(conn).get_minhas_pendencias_fiscal(fiscal_id)
+        )
         contadores = ContadoresDashboard(
             relatorios_para_analise=0,
             contratos_com_pendencias=0,
@@ -224,9 +266,6 @@ class DashboardService:
             contratados_com_pendencias_vencidas=0
         )
 
-        # Busca pendências do fiscal
-        minhas_pendencias = await self.get_minhas_pendencias_fiscal(fiscal_id)
-
         return DashboardFiscalResponse(
             contadores=contadores,
             minhas_pendencias=minhas_pendencias.pendencias
@@ -327,11 +366,18 @@ class DashboardService:
         }
 
     async def get_dashboard_gestor_completo(self, gestor_id: int) -> Dict[str, Any]:
+        """Dashboard completo do gestor, em cache por gestor"""
+        return await self._cached("gestor/completo", "Gestor", gestor_id, lambda: self._load_dashboard_gestor_completo(gestor_id))
+
+    async def _load_dashboard_gestor_completo(self, gestor_id: int) -> Dict[str, Any]:
         """
         Busca dados completos para dashboard do gestor
         """
-        # Busca contadores específicos do gestor
-        gestor_contadores = await self.dashboard_repo.get_contadores_gestor(gestor_id)
+        # Contadores e pendências dos contratos sob gestão consultados em paralelo
+        gestor_contadores, pendencias_gestao = await self._fan_out(
+            lambda conn: DashboardRepository(conn).get_contadores_gestor(gestor_id),
+            lambda conn: self._on(conn).get_pendencias_gestor(gestor_id)
+        )
         contadores = ContadoresDashboard(
             relatorios_para_analise=0,
             contratos_com_pendencias=0,
@@ -347,9 +393,6 @@ class DashboardService:
             total_contratacoes=0
         )
 
-        # Busca pendências dos contratos sob gestão
-        pendencias_gestao = await self.get_pendencias_gestor(gestor_id)
-
         return {
             'contadores': contadores,
             'pendencias_gestao': pendencias_gestao,
@@ -359,6 +402,10 @@ class DashboardService:
     # ===== NOVOS MÉTODOS PARA DASHBOARDS MELHORADOS =====
 
     async def get_dashboard_admin_melhorado(self) -> 'DashboardAdminCompleto':
+        """Dashboard melhorado do administrador, compartilhado entre administradores"""
+        return await self._cached("admin/melhorado", "Administrador", None, lambda: self._load_dashboard_admin_melhorado())
+
+    async def _load_dashboard_admin_melhorado(self) -> 'DashboardAdminCompleto':
         """
         Busca dados completos melhorados para o dashboard do administrador
         """
@@ -445,12 +492,11 @@ class DashboardService:
         """
         # Importar repositórios necessários
         from app.repositories.pendencia_repo import PendenciaRepository
-        from app.repositories.status_pendencia_repo import StatusPendenciaRepository
-        from app.core.database import get_connection
+        from app.core.database import acquire_connection
+        from app.core.lookup_registry import lookup_registry
         
-        async with get_connection() as conn:
+        async with acquire_connection() as conn:
             pendencia_repo = PendenciaRepository(conn)
-            status_repo = StatusPendenciaRepository(conn)
             
             # Verificar se a pendência existe
             pendencia = await pendencia_repo.get_pendencia_by_id(pendencia_id)
@@ -458,22 +504,18 @@ class DashboardService:
                 raise HTTPException(status_code=404, detail="Pendência não encontrada")
             
             # Verificar se a pendência ainda pode ser cancelada (não foi respondida)
-            if pendencia['status_pendencia_id'] != 1:  # 1 = Pendente
+            status_pendente_id = await lookup_registry.require_id(conn, "statuspendencia", "Pendente")
+            if pendencia['status_pendencia_id'] != status_pendente_id:
                 raise HTTPException(
                     status_code=400, 
                     detail="Pendência não pode ser cancelada. Status atual não permite cancelamento."
                 )
             
-            # Buscar ID do status "Cancelada"
-            status_cancelada = await status_repo.get_status_by_name("Cancelada")
-            if not status_cancelada:
-                # Se não existe, criar o status
-                status_cancelada_id = 5  # Assumindo ID 5 para cancelada
-            else:
-                status_cancelada_id = status_cancelada['id']
+            status_cancelada_id = await lookup_registry.require_id(conn, "statuspendencia", "Cancelada")
             
             # Atualizar status da pendência para cancelada
             await pendencia_repo.update_pendencia_status(pendencia_id, status_cancelada_id)
+            await invalidate_dashboards(conn)
             
             return {
                 "message": "Pendência cancelada com sucesso",
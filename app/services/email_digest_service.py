@@ -0,0 +1,167 @@
+# app/services/email_digest_service.py
+"""
+Resumo (digest) dos emails das rotinas em lote.
+
+Lembretes de prazo, alertas de vencimento e escalonamento geravam um email
+por item (e, nos alertas, um por item para cada administrador). As rotinas
+agora adicionam os itens a um ResumoEmails, que agrupa tudo o que vai para o
+mesmo destinatário na mesma execução e monta uma única mensagem. Quem
+escolheu o modo 'imediato' (usuario_preferencia_notificacao) continua
+recebendo um email por item.
+
+As mensagens vão para a caixa de saída (email_outbox) na conexão informada,
+então participam da transação do chamador; sem a tabela, são enviadas
+diretamente pelo agendador de envios.
+"""
+import asyncio
+import html
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import asyncpg
+
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.repositories.preferencia_notificacao_repo import PreferenciaNotificacaoRepository
+from app.services.email_outbox_service import EmailOutboxService, EmailPendente
+from app.services.email_send_scheduler import email_send_scheduler
+
+logger = logging.getLogger(__name__)
+
+MODO_RESUMO = "resumo"
+MODO_IMEDIATO = "imediato"
+
+
+@dataclass
+class ItemResumo:
+    categoria: str              # seção do resumo (ex.: "Prazos de pendências")
+    titulo: str                 # linha do item no resumo
+    assunto: str                # email individual (modo imediato ou item único)
+    corpo: str
+    is_html: bool = True
+    detalhes: List[str] = field(default_factory=list)
+    dados: Dict[str, Any] = field(default_factory=dict)
+    chave: Optional[Hashable] = None  # devolvida em ResultadoResumo.entregues
+
+
+# Monta o email de um destinatário cujos itens são todos de uma categoria:
+# (nome, itens) -> (assunto, corpo html)
+AgrupadorCategoria = Callable[[str, List[ItemResumo]], Tuple[str, str]]
+
+
+@dataclass
+class ResultadoResumo:
+    emails: int = 0
+    itens: int = 0
+    entregues: Set[Hashable] = field(default_factory=set)
+
+
+@dataclass
+class _Destinatario:
+    email: str
+    nome: str
+    itens: List[ItemResumo] = field(default_factory=list)
+
+
+def _render_resumo(nome: str, itens: List[ItemResumo]) -> Tuple[str, str]:
+    """Email de resumo genérico: uma seção por categoria, na ordem de chegada"""
+    categorias: Dict[str, List[ItemResumo]] = {}
+    for item in itens:
+        categorias.setdefault(item.categoria, []).append(item)
+
+    secoes = []
+    for categoria, itens_categoria in categorias.items():
+        linhas = []
+        for item in itens_categoria:
+            detalhes = "".join(
+                f'<br><span style="color: #6b7280; font-size: 14px;">{html.escape(d)}</span>'
+                for d in item.detalhes
+            )
+            linhas.append(
+                f'<li style="margin-bottom: 10px;"><strong>{html.escape(item.titulo)}</strong>{detalhes}</li>'
+            )
+        secoes.append(
+            f'<h3 style="margin: 25px 0 10px 0; color: #1f2937;">{html.escape(categoria)} ({len(itens_categoria)})</h3>'
+            f'<ul style="padding-left: 20px; margin: 0;">{"".join(linhas)}</ul>'
+        )
+
+    assunto = f"📬 Resumo SIGESCON: {len(itens)} aviso(s)"
+    corpo = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 700px; margin: 0 auto; padding: 20px;">
+                <p style="font-size: 16px; margin-top: 0;">Olá, <strong>{html.escape(nome)}</strong>,</p>
+                <p>Estes são os avisos do SIGESCON para você nesta verificação:</p>
+                {"".join(secoes)}
+                <p style="margin-top: 30px; font-size: 14px; color: #6b7280;">
+                    Para receber um email por aviso, altere sua preferência de notificação no sistema.<br>
+                    SIGESCON - Sistema de Gestão de Contratos
+                </p>
+            </div>
+        </body>
+        </html>
+        """
+    return assunto, corpo
+
+
+class ResumoEmails:
+    """Agrupa os itens de uma execução por destinatário e entrega os emails"""
+
+    def __init__(self, conn: asyncpg.Connection, agrupadores: Optional[Dict[str, AgrupadorCategoria]] = None):
+        self.conn = conn
+        self.agrupadores = agrupadores or {}
+        self._destinatarios: Dict[str, _Destinatario] = {}
+
+    def adicionar(self, email: Optional[str], nome: str, item: ItemResumo) -> None:
+        if not email:
+            return
+        destinatario = self._destinatarios.setdefault(email.lower(), _Destinatario(email, nome))
+        destinatario.itens.append(item)
+
+    def __len__(self) -> int:
+        return sum(len(d.itens) for d in self._destinatarios.values())
+
+    def montar(self, modos: Dict[str, str]) -> List[Tuple[EmailPendente, List[Hashable]]]:
+        """Emails a enviar (com as chaves dos itens de cada um), segundo o modo de cada destinatário"""
+        mensagens = []
+        for chave_email, destinatario in self._destinatarios.items():
+            itens = destinatario.itens
+            if modos.get(chave_email) == MODO_IMEDIATO or len(itens) == 1:
+                for item in itens:
+                    mensagens.append(((destinatario.email, item.assunto, item.corpo, item.is_html), [item.chave]))
+                continue
+
+            categorias = {item.categoria for item in itens}
+            agrupador = self.agrupadores.get(next(iter(categorias))) if len(categorias) == 1 else None
+            assunto, corpo = (agrupador or _render_resumo)(destinatario.nome, itens)
+            mensagens.append(((destinatario.email, assunto, corpo, True), [item.chave for item in itens]))
+        return mensagens
+
+    async def enviar(self) -> ResultadoResumo:
+        """
+        Grava os emails na caixa de saída (transação do chamador) ou, sem ela,
+        envia diretamente. `entregues` traz as chaves dos itens gravados/enviados.
+        """
+        if not self._destinatarios:
+            return ResultadoResumo()
+
+        modos = await PreferenciaNotificacaoRepository(self.conn).get_modos_por_email(self._destinatarios)
+        mensagens = self.montar(modos)
+        resultado = ResultadoResumo(emails=len(mensagens), itens=len(self))
+
+        if await EmailOutboxService(EmailOutboxRepository(self.conn)).enfileirar(m for m, _ in mensagens):
+            resultado.entregues = {chave for _, chaves in mensagens for chave in chaves}
+        else:
+            enviados = await asyncio.gather(
+                *(email_send_scheduler.enviar(*mensagem) for mensagem, _ in mensagens),
+                return_exceptions=True
+            )
+            for (mensagem, chaves), enviado in zip(mensagens, enviados):
+                if enviado is True:
+                    resultado.entregues.update(chaves)
+                else:
+                    logger.error(f"Falha ao enviar resumo para {mensagem[0]}: {enviado}")
+
+        self._destinatarios.clear()
+        logger.info(f"Resumo: {resultado.itens} aviso(s) em {resultado.emails} email(s)")
+        return resultado
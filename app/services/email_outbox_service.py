@@ -0,0 +1,153 @@
+# app/services/email_outbox_service.py
+"""
+Caixa de saída de emails (outbox).
+
+Os serviços gravam os emails na tabela email_outbox com a mesma conexão (e
+transação) da alteração que os originou: se a transação for desfeita, o email
+também é; se for confirmada, o email sobrevive a reinícios do servidor. O
+EmailOutboxWorker entrega as mensagens em lotes, fora das requisições.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import acquire_connection
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.services.email_send_scheduler import email_send_scheduler
+
+logger = logging.getLogger(__name__)
+
+# (destinatario, assunto, corpo, is_html)
+EmailPendente = Tuple[str, str, str, bool]
+
+# Resultado de _enviar quando a reserva venceu e outro worker assumiu o email
+_RESERVA_PERDIDA = object()
+
+
+class EmailOutboxService:
+    def __init__(self, outbox_repo: EmailOutboxRepository):
+        self.outbox_repo = outbox_repo
+
+    async def enfileirar(self, emails: Iterable[EmailPendente]) -> bool:
+        """
+        Grava os emails na caixa de saída. Retorna False se a migração não foi
+        aplicada; nesse caso o chamador envia diretamente (após o commit).
+        """
+        if not await self.outbox_repo.disponivel():
+            return False
+        ids = await self.outbox_repo.enfileirar_varios(emails)
+        logger.info(f"{len(ids)} email(s) gravados na caixa de saída")
+        return True
+
+
+def espera_nova_tentativa(tentativas: int) -> float:
+    """Espera exponencial (base * 2^(n-1)) limitada a EMAIL_OUTBOX_ESPERA_MAX_SEGUNDOS"""
+    espera = settings.EMAIL_OUTBOX_ESPERA_BASE_SEGUNDOS * (2 ** max(tentativas - 1, 0))
+    return float(min(espera, settings.EMAIL_OUTBOX_ESPERA_MAX_SEGUNDOS))
+
+
+class EmailOutboxWorker:
+    """
+    Entrega os emails da caixa de saída. Cada lote é reservado com
+    FOR UPDATE SKIP LOCKED, enviado com concorrência limitada e tem o
+    resultado gravado; a conexão com o banco não fica presa durante o SMTP.
+    Vários workers (processos ou instâncias da API) podem rodar juntos.
+
+    A vez no limite de taxa (um lote inteiro para o mesmo domínio leva
+    minutos) pode passar da reserva do lote, então cada email tem a reserva
+    renovada depois de obter a vez e logo antes do envio; se nesse meio
+    tempo outro worker o reservou, este desiste dele.
+    """
+
+    def __init__(
+        self,
+        lote: Optional[int] = None,
+        concorrencia: Optional[int] = None,
+        enviar: Optional[Callable[..., Awaitable[bool]]] = None,
+        aguardar_vez: Optional[Callable[[str], Awaitable[None]]] = None
+    ):
+        self.lote = lote or settings.EMAIL_OUTBOX_LOTE
+        self.concorrencia = concorrencia or settings.EMAIL_OUTBOX_CONCORRENCIA
+        # Por padrão, respeita os limites de taxa do agendador global de envios
+        self.aguardar_vez = aguardar_vez or email_send_scheduler.aguardar_vez
+        self.enviar = enviar or email_send_scheduler.entregar
+
+    async def _renovar_reserva(self, email: dict) -> bool:
+        async with acquire_connection() as conn:
+            return await EmailOutboxRepository(conn).renovar_reserva(
+                email["id"], email["tentativas"], settings.EMAIL_OUTBOX_RESERVA_SEGUNDOS
+            )
+
+    async def _enviar(self, email: dict, semaforo: asyncio.Semaphore) -> object:
+        """Envia um email; retorna a mensagem de erro, None ou _RESERVA_PERDIDA"""
+        async with semaforo:
+            try:
+                await self.aguardar_vez(email["destinatario"])
+                if not await self._renovar_reserva(email):
+                    return _RESERVA_PERDIDA
+                enviado = await self.enviar(
+                    email["destinatario"], email["assunto"], email["corpo"], is_html=email["is_html"]
+                )
+            except Exception as e:
+                return str(e) or e.__class__.__name__
+        return None if enviado else "Falha no envio SMTP"
+
+    async def processar_lote(self) -> int:
+        """Reserva, envia e registra um lote; retorna quantos emails foram reservados"""
+        async with acquire_connection() as conn:
+            outbox_repo = EmailOutboxRepository(conn)
+            if not await outbox_repo.disponivel():
+                return 0
+            emails = await outbox_repo.reservar_lote(self.lote, settings.EMAIL_OUTBOX_RESERVA_SEGUNDOS)
+        if not emails:
+            return 0
+
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        erros = await asyncio.gather(*(self._enviar(email, semaforo) for email in emails))
+
+        # A tentativa reservada identifica a reserva deste worker no registro do resultado
+        enviados: List[Tuple[int, int]] = []
+        falhas: List[Tuple[int, int, str, float]] = []
+        perdidos = 0
+        for email, erro in zip(emails, erros):
+            if erro is _RESERVA_PERDIDA:
+                perdidos += 1
+            elif erro is None:
+                enviados.append((email["id"], email["tentativas"]))
+            else:
+                falhas.append((email["id"], email["tentativas"], erro, espera_nova_tentativa(email["tentativas"])))
+
+        async with acquire_connection() as conn:
+            outbox_repo = EmailOutboxRepository(conn)
+            async with conn.transaction():
+                await outbox_repo.marcar_enviados(enviados)
+                await outbox_repo.registrar_falhas(falhas)
+
+        if perdidos:
+            logger.warning(f"Caixa de saída: {perdidos} reserva(s) vencida(s) assumida(s) por outro worker")
+        logger.info(f"Caixa de saída: {len(enviados)}/{len(emails)} emails enviados")
+        return len(emails)
+
+    async def processar_pendentes(self) -> int:
+        """Processa lotes até a fila (pronta para envio) esvaziar"""
+        total = 0
+        while True:
+            reservados = await self.processar_lote()
+            total += reservados
+            if reservados < self.lote:
+                return total
+
+    async def executar(self, parar: Optional[asyncio.Event] = None, intervalo: Optional[float] = None) -> None:
+        """Laço do worker dedicado: esvazia a fila e aguarda o próximo ciclo"""
+        parar = parar or asyncio.Event()
+        intervalo = intervalo if intervalo is not None else settings.EMAIL_OUTBOX_INTERVALO_SEGUNDOS
+        while not parar.is_set():
+            try:
+                await self.processar_pendentes()
+            except Exception as e:
+                logger.error(f"Erro ao processar a caixa de saída de emails: {e}")
+            try:
+                await asyncio.wait_for(parar.wait(), timeout=intervalo)
+            except asyncio.TimeoutError:
+                pass
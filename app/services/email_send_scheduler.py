@@ -0,0 +1,120 @@
+# app/services/email_send_scheduler.py
+"""
+Agendador de envios de email com limite de taxa (token bucket).
+
+Substitui pausas fixas (asyncio.sleep entre emails) por baldes de fichas: um
+por conta SMTP (SENDER_EMAIL) e um por domínio do destinatário. Cada envio
+consome uma ficha de cada balde; as fichas repõem-se continuamente na taxa
+configurada e acumulam até SMTP_RAJADA, então envios esparsos saem na hora e
+rajadas são espaçadas só o necessário para respeitar o provedor.
+
+Os limites valem por processo: com vários workers, divida as taxas entre eles.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from app.core.config import settings
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(self, taxa_por_segundo: float, capacidade: float, relogio: Callable[[], float] = time.monotonic):
+        self.taxa = taxa_por_segundo
+        self.capacidade = capacidade
+        self._relogio = relogio
+        self._fichas = float(capacidade)
+        self._atualizado = relogio()
+        self._lock = asyncio.Lock()
+
+    def _repor(self) -> None:
+        agora = self._relogio()
+        self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado) * self.taxa)
+        self._atualizado = agora
+
+    def espera(self) -> float:
+        """Segundos até haver uma ficha disponível (0 se já houver)"""
+        self._repor()
+        return 0.0 if self._fichas >= 1 else (1 - self._fichas) / self.taxa
+
+    async def adquirir(self) -> None:
+        """Consome uma ficha, aguardando a reposição se necessário (ordem de chegada)"""
+        async with self._lock:
+            while (espera := self.espera()) > 0:
+                await asyncio.sleep(espera)
+            self._fichas -= 1
+
+
+class EmailSendScheduler:
+    def __init__(
+        self,
+        taxa_conta_por_minuto: Optional[float] = None,
+        taxa_dominio_por_minuto: Optional[float] = None,
+        rajada: Optional[int] = None,
+        enviar: Optional[Callable[..., Awaitable[bool]]] = None
+    ):
+        self.taxa_conta = (taxa_conta_por_minuto or settings.SMTP_TAXA_CONTA_POR_MINUTO) / 60
+        self.taxa_dominio = (taxa_dominio_por_minuto or settings.SMTP_TAXA_DOMINIO_POR_MINUTO) / 60
+        self.rajada = rajada or settings.SMTP_RAJADA
+        self._enviar = enviar
+        self._baldes: Dict[str, TokenBucket] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._agendados: Set[asyncio.Task] = set()
+
+    def _balde(self, chave: str, taxa: float) -> TokenBucket:
+        # Os locks dos baldes pertencem ao event loop em que foram criados
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._baldes.clear()
+            self._loop = loop
+        balde = self._baldes.get(chave)
+        if balde is None:
+            balde = self._baldes[chave] = TokenBucket(taxa, self.rajada)
+        return balde
+
+    async def aguardar_vez(self, destinatario: str) -> None:
+        """Aguarda as fichas do domínio do destinatário e da conta SMTP"""
+        dominio = destinatario.rsplit("@", 1)[-1].lower()
+        await self._balde(f"dominio:{dominio}", self.taxa_dominio).adquirir()
+        await self._balde(f"conta:{settings.SENDER_EMAIL}", self.taxa_conta).adquirir()
+
+    async def enviar(self, destinatario: str, assunto: str, corpo: str, is_html: bool = False) -> bool:
+        """Envia respeitando os limites de taxa (aguarda a vez)"""
+        await self.aguardar_vez(destinatario)
+        return await self.entregar(destinatario, assunto, corpo, is_html=is_html)
+
+    async def entregar(self, destinatario: str, assunto: str, corpo: str, is_html: bool = False) -> bool:
+        """Envia sem aguardar: para quem já chamou aguardar_vez"""
+        enviar = self._enviar or EmailService.send_email
+        return await enviar(destinatario, assunto, corpo, is_html=is_html)
+
+    def agendar(self, destinatario: str, assunto: str, corpo: str, is_html: bool = True) -> asyncio.Task:
+        """Agenda o envio em segundo plano e retorna imediatamente"""
+        tarefa = asyncio.create_task(self._enviar_agendado(destinatario, assunto, corpo, is_html))
+        self._agendados.add(tarefa)
+        tarefa.add_done_callback(self._agendados.discard)
+        return tarefa
+
+    async def _enviar_agendado(self, destinatario: str, assunto: str, corpo: str, is_html: bool) -> bool:
+        try:
+            enviado = await self.enviar(destinatario, assunto, corpo, is_html=is_html)
+            if not enviado:
+                logger.error(f"Falha no envio agendado para {destinatario}")
+            return enviado
+        except Exception as e:
+            logger.error(f"Erro no envio agendado para {destinatario}: {e}")
+            return False
+
+    async def aguardar_agendados(self, timeout: Optional[float] = None) -> int:
+        """Aguarda os envios agendados (encerramento/testes); retorna quantos não terminaram"""
+        if not self._agendados:
+            return 0
+        _, pendentes = await asyncio.wait(set(self._agendados), timeout=timeout)
+        return len(pendentes)
+
+
+# Agendador global do processo: todos os envios dividem os mesmos baldes
+email_send_scheduler = EmailSendScheduler()
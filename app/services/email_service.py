@@ -6,6 +6,7 @@ from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
 from app.core.config import settings
+from app.services.smtp_pool import ConfigSMTP, get_smtp_pool
 
 logger = logging.getLogger(__name__)
 
@@ -74,15 +75,27 @@ class EmailService:
                 logger.info(f"Tentando enviar email para {to_email} usando {config['name']}")
                 print(f"📧 Tentando enviar email para {to_email} usando {config['name']}")
 
-                await aiosmtplib.send(
-                    message,
-                    hostname=config["hostname"],
-                    port=config["port"],
-                    username=settings.SENDER_EMAIL,
-                    password=settings.SENDER_PASSWORD,
-                    start_tls=config["start_tls"],
-                    use_tls=config["use_tls"]
-                )
+                if test_mode:
+                    # Diagnóstico: conexão nova para cada configuração testada
+                    await aiosmtplib.send(
+                        message,
+                        hostname=config["hostname"],
+                        port=config["port"],
+                        username=settings.SENDER_EMAIL,
+                        password=settings.SENDER_PASSWORD,
+                        start_tls=config["start_tls"],
+                        use_tls=config["use_tls"]
+                    )
+                else:
+                    # Reutiliza uma sessão autenticada do pool
+                    await get_smtp_pool(ConfigSMTP(
+                        hostname=config["hostname"],
+                        port=config["port"],
+                        username=settings.SENDER_EMAIL,
+                        password=settings.SENDER_PASSWORD,
+                        start_tls=config["start_tls"],
+                        use_tls=config["use_tls"]
+                    )).send_message(message)
 
                 success_msg = f"✅ E-mail enviado com sucesso para {to_email} usando {config['name']}"
                 logger.info(success_msg)
@@ -153,13 +166,9 @@ class EmailService:
         return result
 
     @staticmethod
-    async def send_contract_expiration_alert(
-        admin_emails: list[str], 
-        contract_data: dict, 
-        days_remaining: int
-    ) -> bool:
+    def contract_expiration_alert_message(contract_data: dict, days_remaining: int) -> tuple[str, str]:
         """
-        Envia alerta de vencimento de contrato para administradores
+        Monta (assunto, corpo) do alerta de vencimento de contrato
         """
         urgency = "CRÍTICO" if days_remaining <= 30 else "ALTO" if days_remaining <= 60 else "MÉDIO"
         
@@ -186,7 +195,19 @@ Por favor, entre em contato com os responsáveis para iniciar o processo de reno
 
 Sistema de Gestão de Contratos - SIGESCON
         """
-        
+        return subject, body
+
+    @staticmethod
+    async def send_contract_expiration_alert(
+        admin_emails: list[str], 
+        contract_data: dict, 
+        days_remaining: int
+    ) -> bool:
+        """
+        Envia alerta de vencimento de contrato para administradores
+        """
+        subject, body = EmailService.contract_expiration_alert_message(contract_data, days_remaining)
+
         success_count = 0
         for email in admin_emails:
             if await EmailService.send_email(email, subject, body):
@@ -195,13 +216,9 @@ Sistema de Gestão de Contratos - SIGESCON
         return success_count > 0
 
     @staticmethod
-    async def send_garantia_expiration_alert(
-        admin_emails: list[str],
-        garantia_data: dict,
-        days_remaining: int
-    ) -> bool:
+    def garantia_expiration_alert_message(garantia_data: dict, days_remaining: int) -> tuple[str, str]:
         """
-        Envia alerta de vencimento de garantia contratual para administradores
+        Monta (assunto, corpo) do alerta de vencimento de garantia contratual
         """
         urgency = "CRÍTICO" if days_remaining <= 30 else "ALTO" if days_remaining <= 60 else "MÉDIO"
 
@@ -230,6 +247,18 @@ A garantia contratual é essencial para a continuidade e segurança da execuçã
 
 Sistema de Gestão de Contratos - SIGESCON
         """
+        return subject, body
+
+    @staticmethod
+    async def send_garantia_expiration_alert(
+        admin_emails: list[str],
+        garantia_data: dict,
+        days_remaining: int
+    ) -> bool:
+        """
+        Envia alerta de vencimento de garantia contratual para administradores
+        """
+        subject, body = EmailService.garantia_expiration_alert_message(garantia_data, days_remaining)
 
         success_count = 0
         for email in admin_emails:
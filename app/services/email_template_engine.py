@@ -0,0 +1,57 @@
+# app/services/email_template_engine.py
+"""
+Templates de texto pré-montados.
+
+Um TemplateCompilado é analisado uma única vez (na importação do módulo que o
+define): layout, CSS e textos fixos viram trechos literais já concatenados,
+intercalados com os nomes dos campos. Renderizar é só juntar esses trechos
+com os valores — sem remontar o HTML nem reinterpretar o template (um
+str.format sobre o layout inteiro custa várias vezes mais por email).
+
+Sintaxe: a de str.format restrita a campos simples ({nome}); chaves literais
+são escritas dobradas ({{ e }}) ou protegidas com literal().
+"""
+import string
+from typing import List, Tuple
+
+
+def literal(texto: str) -> str:
+    """Protege as chaves de um trecho fixo (ex.: CSS) para uso em um template"""
+    return texto.replace("{", "{{").replace("}", "}}")
+
+
+class TemplateCompilado:
+    __slots__ = ("campos", "_inicio", "_trechos")
+
+    def __init__(self, fonte: str):
+        trechos: List[Tuple[str, str]] = []  # (campo, texto fixo seguinte)
+        inicio = None
+        fixo = ""
+        campo_anterior = None
+        for texto, campo, especificacao, conversao in string.Formatter().parse(fonte):
+            fixo += texto
+            if campo is None:
+                continue
+            if not campo.isidentifier() or especificacao or conversao:
+                raise ValueError(f"Campo inválido no template: '{{{campo}}}' (use apenas {{nome}})")
+            if campo_anterior is None:
+                inicio = fixo
+            else:
+                trechos.append((campo_anterior, fixo))
+            campo_anterior, fixo = campo, ""
+        if campo_anterior is None:
+            inicio = fixo
+        else:
+            trechos.append((campo_anterior, fixo))
+
+        self.campos = frozenset(campo for campo, _ in trechos)
+        self._inicio = inicio
+        self._trechos = tuple(trechos)
+
+    def render(self, **valores) -> str:
+        """Texto com os campos preenchidos; campo ausente gera KeyError"""
+        partes = [self._inicio]
+        for campo, fixo in self._trechos:
+            partes.append(str(valores[campo]))
+            partes.append(fixo)
+        return "".join(partes)
@@ -1,29 +1,23 @@
 # app/services/email_templates.py
-from typing import Dict, Optional
+"""
+Templates padronizados dos emails do sistema.
+
+Cada template é montado uma única vez, na importação (TemplateCompilado):
+o layout comum, o CSS e os textos fixos já ficam concatenados, e cada email
+é um único str.format com os seus valores. O CSS fica aqui como CSS comum;
+o layout o protege ao montar o template. Para medir a renderização em lote,
+veja bench_email_templates.py na raiz do projeto.
+"""
+import html
+from typing import Dict, List, Optional
 from datetime import date
 
-class EmailTemplates:
-    """Templates padronizados para emails do sistema"""
-    
-    @staticmethod
-    def contract_assignment_fiscal(fiscal_nome: str, contrato_data: Dict, is_new: bool = True) -> tuple[str, str]:
-        """Template para notificar fiscal sobre atribuição de contrato"""
-        action = "atribuído" if is_new else "atualizado"
-        subject = f"📋 Contrato {action}: {contrato_data['nr_contrato']} - SIGESCON"
+from app.services.email_template_engine import TemplateCompilado, literal
 
-        # Formatação de valores
-        valor_anual = f"R$ {contrato_data.get('valor_anual', 0):,.2f}" if contrato_data.get('valor_anual') else "Não informado"
-        valor_global = f"R$ {contrato_data.get('valor_global', 0):,.2f}" if contrato_data.get('valor_global') else "Não informado"
+# --- Layout comum (cabeçalho, CSS base, saudação e rodapé) ---
 
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Atribuição de Contrato - SIGESCON</title>
-    <style>
-        body {{
+_CSS_BASE = """\
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
             color: #333;
@@ -31,131 +25,158 @@ class EmailTemplates:
             margin: 0 auto;
             padding: 20px;
             background-color: #f8f9fa;
-        }}
-        .container {{
+        }
+        .container {
             background-color: #ffffff;
             padding: 30px;
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 30px;
             padding-bottom: 20px;
             border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
+        }
+        .logo {
             font-size: 24px;
             font-weight: bold;
             color: #495057;
             margin-bottom: 10px;
-        }}
-        .subtitle {{
+        }
+        .subtitle {
             color: #6c757d;
             font-size: 14px;
-        }}
-        .greeting {{
+        }
+        .greeting {
             font-size: 18px;
             margin-bottom: 20px;
             color: #495057;
-        }}
-        .section {{
+        }
+"""
+
+_CSS_RODAPE = """\
+        .footer {
+            border-top: 2px solid #e9ecef;
+            padding-top: 20px;
+            margin-top: 30px;
+            text-align: center;
+            color: #6c757d;
+            font-size: 12px;
+        }
+"""
+
+_LAYOUT = """
+<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{titulo}</title>
+    <style>
+{css}    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">{icone} SIGESCON</div>
+            <div class="subtitle">Sistema de Gestão de Contratos</div>
+        </div>
+
+        <div class="greeting">
+            Olá <strong>{{nome}}</strong>,
+        </div>
+
+{conteudo}
+        <div class="footer">
+            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
+            Este é um email automático, não responda.
+        </div>
+    </div>
+</body>
+</html>
+        """
+
+_CSS_ATRIBUICAO_FISCAL = """\
+        .section {
             background-color: #f8f9fa;
             border-left: 4px solid #007bff;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             color: #007bff;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title .icon {{
+        }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid #e9ecef;
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 120px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .responsibilities {{
+        }
+        .responsibilities {
             background-color: #e8f5e8;
             border-left: 4px solid #28a745;
-        }}
-        .responsibility-item {{
+        }
+        .responsibility-item {
             margin: 8px 0;
             padding-left: 20px;
             position: relative;
-        }}
-        .responsibility-item:before {{
+        }
+        .responsibility-item:before {
             content: "✅";
             position: absolute;
             left: 0;
-        }}
-        .action-box {{
+        }
+        .action-box {
             background-color: #fff3cd;
             border: 1px solid #ffeaa7;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .action-title {{
+        }
+        .action-title {
             font-weight: bold;
             color: #856404;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .action-item {{
+        }
+        .action-item {
             margin: 8px 0;
             color: #856404;
             padding-left: 20px;
             position: relative;
-        }}
-        .action-item:before {{
+        }
+        .action-item:before {
             content: "•";
             position: absolute;
             left: 0;
             font-weight: bold;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">📋 SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
-
-        <div class="greeting">
-            Olá <strong>{fiscal_nome}</strong>,
-        </div>
+        }
+"""
 
+_CONTEUDO_ATRIBUICAO_FISCAL = """\
         <p>Você foi designado como <strong>fiscal responsável</strong> pelo contrato abaixo:</p>
 
         <div class="section">
@@ -164,15 +185,15 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Número:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Período:</span>
-                <span class="detail-value">{contrato_data['data_inicio']} até {contrato_data['data_fim']}</span>
+                <span class="detail-value">{data_inicio} até {data_fim}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Valor Anual:</span>
@@ -184,11 +205,11 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contratado:</span>
-                <span class="detail-value">{contrato_data.get('contratado_nome', 'Não informado')}</span>
+                <span class="detail-value">{contratado_nome}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Modalidade:</span>
-                <span class="detail-value">{contrato_data.get('modalidade_nome', 'Não informada')}</span>
+                <span class="detail-value">{modalidade_nome}</span>
             </div>
         </div>
 
@@ -212,181 +233,92 @@ class EmailTemplates:
             <div class="action-item">Consultar documentos anexos</div>
             <div class="action-item">Acompanhar pendências ativas</div>
         </div>
+"""
 
-        <div class="footer">
-            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
-            Este é um email automático, não responda.
-        </div>
-    </div>
-</body>
-</html>
-        """
-        return subject, body
-
-    @staticmethod
-    def contract_assignment_manager(gestor_nome: str, contrato_data: Dict, fiscal_data: Optional[Dict] = None, is_new: bool = True) -> tuple[str, str]:
-        """Template para notificar gestor sobre atribuição de contrato"""
-        action = "criado" if is_new else "atualizado"
-        subject = f"💼 Contrato {action} sob sua gestão: {contrato_data['nr_contrato']} - SIGESCON"
-
-        # Formatação de valores
-        valor_anual = f"R$ {contrato_data.get('valor_anual', 0):,.2f}" if contrato_data.get('valor_anual') else "Não informado"
-        valor_global = f"R$ {contrato_data.get('valor_global', 0):,.2f}" if contrato_data.get('valor_global') else "Não informado"
-
-        # Informações do fiscal
-        fiscal_info_html = ""
-        if fiscal_data:
-            fiscal_info_html = f"""
-            <div class="detail-item">
-                <span class="detail-label">Fiscal Responsável:</span>
-                <span class="detail-value">{fiscal_data['nome']} ({fiscal_data['email']})</span>
-            </div>"""
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Contrato sob Gestão - SIGESCON</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #495057;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #6c757d;
-            font-size: 14px;
-        }}
-        .greeting {{
-            font-size: 18px;
-            margin-bottom: 20px;
-            color: #495057;
-        }}
-        .section {{
+_CSS_ATRIBUICAO_GESTOR = """\
+        .section {
             background-color: #f8f9fa;
             border-left: 4px solid #28a745;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             color: #28a745;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title .icon {{
+        }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid #e9ecef;
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 120px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .responsibilities {{
+        }
+        .responsibilities {
             background-color: #e8f4fd;
             border-left: 4px solid #17a2b8;
-        }}
-        .responsibilities .section-title {{
+        }
+        .responsibilities .section-title {
             color: #17a2b8;
-        }}
-        .responsibility-item {{
+        }
+        .responsibility-item {
             margin: 8px 0;
             padding-left: 20px;
             position: relative;
-        }}
-        .responsibility-item:before {{
+        }
+        .responsibility-item:before {
             content: "✅";
             position: absolute;
             left: 0;
-        }}
-        .action-box {{
+        }
+        .action-box {
             background-color: #fff3cd;
             border: 1px solid #ffeaa7;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .action-title {{
+        }
+        .action-title {
             font-weight: bold;
             color: #856404;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .action-item {{
+        }
+        .action-item {
             margin: 8px 0;
             color: #856404;
             padding-left: 20px;
             position: relative;
-        }}
-        .action-item:before {{
+        }
+        .action-item:before {
             content: "•";
             position: absolute;
             left: 0;
             font-weight: bold;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">💼 SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
+        }
+"""
 
-        <div class="greeting">
-            Olá <strong>{gestor_nome}</strong>,
-        </div>
-
-        <p>Um contrato sob sua gestão foi <strong>{action}</strong>:</p>
+_CONTEUDO_ATRIBUICAO_GESTOR = """\
+        <p>Um contrato sob sua gestão foi <strong>{acao}</strong>:</p>
 
         <div class="section">
             <div class="section-title">
@@ -394,15 +326,15 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Número:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Período:</span>
-                <span class="detail-value">{contrato_data['data_inicio']} até {contrato_data['data_fim']}</span>
+                <span class="detail-value">{data_inicio} até {data_fim}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Valor Anual:</span>
@@ -414,12 +346,12 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contratado:</span>
-                <span class="detail-value">{contrato_data.get('contratado_nome', 'Não informado')}</span>
+                <span class="detail-value">{contratado_nome}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Modalidade:</span>
-                <span class="detail-value">{contrato_data.get('modalidade_nome', 'Não informada')}</span>
-            </div>{fiscal_info_html}
+                <span class="detail-value">{modalidade_nome}</span>
+            </div>{fiscal_info}
         </div>
 
         <div class="section responsibilities">
@@ -442,150 +374,67 @@ class EmailTemplates:
             <div class="action-item">Acompanhar relatórios e pendências</div>
             <div class="action-item">Gerenciar toda a operação</div>
         </div>
+"""
 
-        <div class="footer">
-            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
-            Este é um email automático, não responda.
-        </div>
-    </div>
-</body>
-</html>
-        """
-        return subject, body
-
-    @staticmethod
-    def contract_transfer_notification(fiscal_nome: str, contrato_data: Dict, novo_fiscal_nome: Optional[str] = None) -> tuple[str, str]:
-        """Template para notificar fiscal sobre transferência de contrato"""
-        subject = f"🔄 Contrato transferido: {contrato_data['nr_contrato']} - SIGESCON"
-
-        transfer_info_html = ""
-        if novo_fiscal_nome:
-            transfer_info_html = f"""
-            <div class="detail-item">
-                <span class="detail-label">Novo Fiscal:</span>
-                <span class="detail-value">{novo_fiscal_nome}</span>
-            </div>"""
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Transferência de Contrato - SIGESCON</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #495057;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #6c757d;
-            font-size: 14px;
-        }}
-        .greeting {{
-            font-size: 18px;
-            margin-bottom: 20px;
-            color: #495057;
-        }}
-        .section {{
+_CSS_TRANSFERENCIA = """\
+        .section {
             background-color: #fff3cd;
             border-left: 4px solid #ffc107;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             color: #856404;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title .icon {{
+        }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid #f5e79e;
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 120px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .thanks-section {{
+        }
+        .thanks-section {
             background-color: #d4edda;
             border-left: 4px solid #28a745;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .thanks-title {{
+        }
+        .thanks-title {
             font-size: 16px;
             font-weight: bold;
             color: #155724;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .thanks-content {{
+        }
+        .thanks-content {
             color: #155724;
             line-height: 1.6;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">🔄 SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
-
-        <div class="greeting">
-            Olá <strong>{fiscal_nome}</strong>,
-        </div>
+        }
+"""
 
+_CONTEUDO_TRANSFERENCIA = """\
         <p>Informamos que você <strong>não é mais o fiscal responsável</strong> pelo contrato abaixo:</p>
 
         <div class="section">
@@ -594,20 +443,20 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Número:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Período:</span>
-                <span class="detail-value">{contrato_data['data_inicio']} até {contrato_data['data_fim']}</span>
+                <span class="detail-value">{data_inicio} até {data_fim}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contratado:</span>
-                <span class="detail-value">{contrato_data.get('contratado_nome', 'Não informado')}</span>
-            </div>{transfer_info_html}
+                <span class="detail-value">{contratado_nome}</span>
+            </div>{transferencia}
         </div>
 
         <div class="thanks-section">
@@ -619,194 +468,95 @@ class EmailTemplates:
                 <p>Quaisquer pendências ou relatórios em andamento serão transferidos para o novo fiscal responsável.</p>
             </div>
         </div>
+"""
 
-        <div class="footer">
-            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
-            Este é um email automático, não responda.
-        </div>
-    </div>
-</body>
-</html>
-        """
-        return subject, body
-
-    @staticmethod
-    def pending_report_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict) -> tuple[str, str]:
-        """Template para notificar sobre nova pendência (já existente, mantido para compatibilidade)"""
-
-        # Calcula dias até o prazo
-        prazo = pendencia_data['data_prazo']
-        if isinstance(prazo, str):
-            from datetime import datetime
-            prazo = datetime.strptime(prazo, '%Y-%m-%d').date()
-
-        dias_restantes = (prazo - date.today()).days
-        urgencia_emoji = ""
-        urgencia_class = "normal"
-        urgencia_texto = ""
-
-        if dias_restantes <= 1:
-            urgencia_emoji = "😨"
-            urgencia_class = "urgent"
-            urgencia_texto = " - URGENTE!"
-        elif dias_restantes <= 3:
-            urgencia_emoji = "⚠️"
-            urgencia_class = "warning"
-            urgencia_texto = " - Atenção!"
-        else:
-            urgencia_emoji = "📋"
-            urgencia_class = "normal"
-
-        subject = f"{urgencia_emoji} Nova pendência: Contrato {contrato_data['nr_contrato']}{urgencia_texto} - SIGESCON"
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Nova Pendência - SIGESCON</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #495057;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #6c757d;
-            font-size: 14px;
-        }}
-        .greeting {{
-            font-size: 18px;
-            margin-bottom: 20px;
-            color: #495057;
-        }}
-        .section {{
+_CSS_NOVA_PENDENCIA = """\
+        .section {
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section.normal {{
+        }
+        .section.normal {
             background-color: #e8f4fd;
             border-left: 4px solid #17a2b8;
-        }}
-        .section.warning {{
+        }
+        .section.warning {
             background-color: #fff3cd;
             border-left: 4px solid #ffc107;
-        }}
-        .section.urgent {{
+        }
+        .section.urgent {
             background-color: #f8d7da;
             border-left: 4px solid #dc3545;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title.normal {{ color: #17a2b8; }}
-        .section-title.warning {{ color: #856404; }}
-        .section-title.urgent {{ color: #721c24; }}
-        .section-title .icon {{
+        }
+        .section-title.normal { color: #17a2b8; }
+        .section-title.warning { color: #856404; }
+        .section-title.urgent { color: #721c24; }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid rgba(0,0,0,0.1);
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 100px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .days-remaining {{
+        }
+        .days-remaining {
             font-weight: bold;
             padding: 5px 10px;
             border-radius: 5px;
             display: inline-block;
-        }}
-        .days-remaining.normal {{
+        }
+        .days-remaining.normal {
             background-color: #d1ecf1;
             color: #0c5460;
-        }}
-        .days-remaining.warning {{
+        }
+        .days-remaining.warning {
             background-color: #fff3cd;
             color: #856404;
-        }}
-        .days-remaining.urgent {{
+        }
+        .days-remaining.urgent {
             background-color: #f8d7da;
             color: #721c24;
-        }}
-        .action-box {{
+        }
+        .action-box {
             background-color: #d4edda;
             border: 1px solid #c3e6cb;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .action-title {{
+        }
+        .action-title {
             font-weight: bold;
             color: #155724;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .action-content {{
+        }
+        .action-content {
             color: #155724;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">{urgencia_emoji} SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
-
-        <div class="greeting">
-            Olá <strong>{fiscal_nome}</strong>,
-        </div>
+        }
+"""
 
+_CONTEUDO_NOVA_PENDENCIA = """\
         <p>Uma <strong>nova pendência</strong> foi criada para você no contrato:</p>
 
         <div class="section {urgencia_class}">
@@ -815,19 +565,19 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contrato:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Descrição:</span>
-                <span class="detail-value">{pendencia_data.get('descricao', 'N/A')}</span>
+                <span class="detail-value">{descricao}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Prazo:</span>
-                <span class="detail-value">{prazo.strftime('%d/%m/%Y')}</span>
+                <span class="detail-value">{prazo}</span>
             </div>
             <div style="text-align: center; margin-top: 15px;">
                 <span class="days-remaining {urgencia_class}">
@@ -844,147 +594,72 @@ class EmailTemplates:
                 Por favor, acesse o sistema SIGESCON para submeter o relatório solicitado dentro do prazo estabelecido.
             </div>
         </div>
+"""
 
-        <div class="footer">
-            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
-            Este é um email automático, não responda.
-        </div>
-    </div>
-</body>
-</html>
-        """
-        return subject, body
-
-    @staticmethod
-    def pending_cancellation_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict) -> tuple[str, str]:
-        """Template para notificar fiscal sobre cancelamento de pendência"""
-        subject = f"✅ Pendência cancelada: Contrato {contrato_data['nr_contrato']} - SIGESCON"
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Pendência Cancelada - SIGESCON</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #495057;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #6c757d;
-            font-size: 14px;
-        }}
-        .greeting {{
-            font-size: 18px;
-            margin-bottom: 20px;
-            color: #495057;
-        }}
-        .section {{
+_CSS_PENDENCIA_CANCELADA = """\
+        .section {
             background-color: #e2e3e5;
             border-left: 4px solid #6c757d;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             color: #495057;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title .icon {{
+        }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid #adb5bd;
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 100px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .status-cancelled {{
+        }
+        .status-cancelled {
             background-color: #6c757d;
             color: white;
             padding: 5px 10px;
             border-radius: 5px;
             font-weight: bold;
-        }}
-        .success-box {{
+        }
+        .success-box {
             background-color: #d4edda;
             border: 1px solid #c3e6cb;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .success-title {{
+        }
+        .success-title {
             font-weight: bold;
             color: #155724;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .success-content {{
+        }
+        .success-content {
             color: #155724;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">✅ SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
-
-        <div class="greeting">
-            Olá <strong>{fiscal_nome}</strong>,
-        </div>
+        }
+"""
 
+_CONTEUDO_PENDENCIA_CANCELADA = """\
         <p>Uma pendência do contrato foi <strong>cancelada pelo administrador</strong>.</p>
 
         <div class="section">
@@ -993,15 +668,15 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contrato:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Descrição:</span>
-                <span class="detail-value">{pendencia_data.get('descricao', 'N/A')}</span>
+                <span class="detail-value">{descricao}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Status:</span>
@@ -1018,147 +693,72 @@ class EmailTemplates:
                 <p>A solicitação foi cancelada pela administração.</p>
             </div>
         </div>
+"""
 
-        <div class="footer">
-            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
-            Este é um email automático, não responda.
-        </div>
-    </div>
-</body>
-</html>
-        """
-        return subject, body
-
-    @staticmethod
-    def report_submitted_notification(admin_nome: str, contrato_data: Dict, pendencia_data: Dict, fiscal_data: Dict) -> tuple[str, str]:
-        """Template para notificar administrador sobre relatório submetido"""
-        subject = f"📄 Relatório submetido: Contrato {contrato_data['nr_contrato']} - SIGESCON"
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Relatório Submetido - SIGESCON</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #495057;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #6c757d;
-            font-size: 14px;
-        }}
-        .greeting {{
-            font-size: 18px;
-            margin-bottom: 20px;
-            color: #495057;
-        }}
-        .section {{
+_CSS_RELATORIO_SUBMETIDO = """\
+        .section {
             background-color: #fff3cd;
             border-left: 4px solid #ffc107;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             color: #856404;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title .icon {{
+        }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid #f5e79e;
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 100px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .status-pending {{
+        }
+        .status-pending {
             background-color: #ffc107;
             color: #212529;
             padding: 5px 10px;
             border-radius: 5px;
             font-weight: bold;
-        }}
-        .action-box {{
+        }
+        .action-box {
             background-color: #d1ecf1;
             border: 1px solid #bee5eb;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .action-title {{
+        }
+        .action-title {
             font-weight: bold;
             color: #0c5460;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .action-content {{
+        }
+        .action-content {
             color: #0c5460;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">📄 SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
-
-        <div class="greeting">
-            Olá <strong>{admin_nome}</strong>,
-        </div>
+        }
+"""
 
+_CONTEUDO_RELATORIO_SUBMETIDO = """\
         <p>Um <strong>novo relatório foi submetido</strong> e aguarda sua análise.</p>
 
         <div class="section">
@@ -1167,19 +767,19 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contrato:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Fiscal:</span>
-                <span class="detail-value">{fiscal_data['nome']} ({fiscal_data['email']})</span>
+                <span class="detail-value">{fiscal_nome} ({fiscal_email})</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Pendência:</span>
-                <span class="detail-value">{pendencia_data.get('descricao', 'N/A')}</span>
+                <span class="detail-value">{descricao}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Status:</span>
@@ -1195,161 +795,86 @@ class EmailTemplates:
                 Acesse o sistema SIGESCON para analisar o relatório submetido e decidir entre <strong>aprovar</strong> ou <strong>rejeitar</strong>.
             </div>
         </div>
+"""
 
-        <div class="footer">
-            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
-            Este é um email automático, não responda.
-        </div>
-    </div>
-</body>
-</html>
-        """
-        return subject, body
-
-    @staticmethod
-    def report_approved_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict) -> tuple[str, str]:
-        """Template para notificar fiscal sobre relatório aprovado"""
-        subject = f"✅ Relatório aprovado: Contrato {contrato_data['nr_contrato']} - SIGESCON"
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Relatório Aprovado - SIGESCON</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #495057;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #6c757d;
-            font-size: 14px;
-        }}
-        .greeting {{
-            font-size: 18px;
-            margin-bottom: 20px;
-            color: #495057;
-        }}
-        .success-badge {{
+_CSS_RELATORIO_APROVADO = """\
+        .success-badge {
             background-color: #d4edda;
             border: 1px solid #c3e6cb;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
             text-align: center;
-        }}
-        .success-title {{
+        }
+        .success-title {
             font-size: 20px;
             font-weight: bold;
             color: #155724;
             margin-bottom: 10px;
-        }}
-        .section {{
+        }
+        .section {
             background-color: #e8f5e8;
             border-left: 4px solid #28a745;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             color: #155724;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title .icon {{
+        }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid #c3e6cb;
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 100px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .status-approved {{
+        }
+        .status-approved {
             background-color: #28a745;
             color: white;
             padding: 5px 10px;
             border-radius: 5px;
             font-weight: bold;
-        }}
-        .congratulations-box {{
+        }
+        .congratulations-box {
             background-color: #fff3cd;
             border: 1px solid #ffeaa7;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
             text-align: center;
-        }}
-        .congratulations-title {{
+        }
+        .congratulations-title {
             font-weight: bold;
             color: #856404;
             margin-bottom: 15px;
             font-size: 18px;
-        }}
-        .congratulations-content {{
+        }
+        .congratulations-content {
             color: #856404;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">✅ SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
-
-        <div class="greeting">
-            Olá <strong>{fiscal_nome}</strong>,
-        </div>
+        }
+"""
 
+_CONTEUDO_RELATORIO_APROVADO = """\
         <div class="success-badge">
             <div class="success-title">🎉 Seu relatório foi APROVADO!</div>
             <p>Parabéns pelo excelente trabalho!</p>
@@ -1361,15 +886,15 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contrato:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Pendência:</span>
-                <span class="detail-value">{pendencia_data.get('descricao', 'N/A')}</span>
+                <span class="detail-value">{descricao}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Status:</span>
@@ -1384,194 +909,107 @@ class EmailTemplates:
                 <p>A pendência foi marcada como <strong>concluída</strong>.</p>
             </div>
         </div>
+"""
 
-        <div class="footer">
-            <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
-            Este é um email automático, não responda.
-        </div>
-    </div>
-</body>
-</html>
-        """
-        return subject, body
-
-    @staticmethod
-    def report_rejected_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict, observacoes: str = None) -> tuple[str, str]:
-        """Template para notificar fiscal sobre relatório rejeitado"""
-        subject = f"❌ Relatório rejeitado: Contrato {contrato_data['nr_contrato']} - SIGESCON"
-
-        observacoes_section_html = ""
-        if observacoes:
-            observacoes_section_html = f"""
-        <div class="observations-box">
-            <div class="observations-title">
-                <span class="icon">🔍</span> OBSERVAÇÕES DO ADMINISTRADOR
-            </div>
-            <div class="observations-content">
-                {observacoes}
-            </div>
-        </div>"""
-
-        body = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Relatório Rejeitado - SIGESCON</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-        .logo {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #495057;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #6c757d;
-            font-size: 14px;
-        }}
-        .greeting {{
-            font-size: 18px;
-            margin-bottom: 20px;
-            color: #495057;
-        }}
-        .rejection-badge {{
+_CSS_RELATORIO_REJEITADO = """\
+        .rejection-badge {
             background-color: #f8d7da;
             border: 1px solid #f5c6cb;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
             text-align: center;
-        }}
-        .rejection-title {{
+        }
+        .rejection-title {
             font-size: 18px;
             font-weight: bold;
             color: #721c24;
             margin-bottom: 10px;
-        }}
-        .section {{
+        }
+        .section {
             background-color: #fff5f5;
             border-left: 4px solid #dc3545;
             padding: 20px;
             margin: 20px 0;
             border-radius: 5px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 16px;
             font-weight: bold;
             color: #721c24;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .section-title .icon {{
+        }
+        .section-title .icon {
             margin-right: 8px;
             font-size: 18px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             margin: 10px 0;
             padding: 8px 0;
             border-bottom: 1px solid #f5c6cb;
-        }}
-        .detail-item:last-child {{
+        }
+        .detail-item:last-child {
             border-bottom: none;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-weight: bold;
             color: #495057;
             display: inline-block;
             min-width: 100px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             color: #212529;
-        }}
-        .status-rejected {{
+        }
+        .status-rejected {
             background-color: #dc3545;
             color: white;
             padding: 5px 10px;
             border-radius: 5px;
             font-weight: bold;
-        }}
-        .observations-box {{
+        }
+        .observations-box {
             background-color: #e2e3e5;
             border: 1px solid #adb5bd;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .observations-title {{
+        }
+        .observations-title {
             font-weight: bold;
             color: #495057;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .observations-content {{
+        }
+        .observations-content {
             color: #212529;
             background-color: #ffffff;
             padding: 15px;
             border-radius: 5px;
             border-left: 3px solid #6c757d;
-        }}
-        .action-box {{
+        }
+        .action-box {
             background-color: #fff3cd;
             border: 1px solid #ffeaa7;
             border-radius: 5px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .action-title {{
+        }
+        .action-title {
             font-weight: bold;
             color: #856404;
             margin-bottom: 15px;
             display: flex;
             align-items: center;
-        }}
-        .action-content {{
+        }
+        .action-content {
             color: #856404;
-        }}
-        .footer {{
-            border-top: 2px solid #e9ecef;
-            padding-top: 20px;
-            margin-top: 30px;
-            text-align: center;
-            color: #6c757d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="logo">❌ SIGESCON</div>
-            <div class="subtitle">Sistema de Gestão de Contratos</div>
-        </div>
-
-        <div class="greeting">
-            Olá <strong>{fiscal_nome}</strong>,
-        </div>
+        }
+"""
 
+_CONTEUDO_RELATORIO_REJEITADO = """\
         <div class="rejection-badge">
             <div class="rejection-title">❌ Seu relatório foi rejeitado</div>
             <p>Necessita de correções antes da aprovação</p>
@@ -1583,15 +1021,15 @@ class EmailTemplates:
             </div>
             <div class="detail-item">
                 <span class="detail-label">Contrato:</span>
-                <span class="detail-value">{contrato_data['nr_contrato']}</span>
+                <span class="detail-value">{nr_contrato}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Objeto:</span>
-                <span class="detail-value">{contrato_data['objeto']}</span>
+                <span class="detail-value">{objeto}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Pendência:</span>
-                <span class="detail-value">{pendencia_data.get('descricao', 'N/A')}</span>
+                <span class="detail-value">{descricao}</span>
             </div>
             <div class="detail-item">
                 <span class="detail-label">Status:</span>
@@ -1599,7 +1037,7 @@ class EmailTemplates:
             </div>
         </div>
 
-        {observacoes_section_html}
+        {observacoes}
 
         <div class="action-box">
             <div class="action-title">
@@ -1609,6 +1047,140 @@ class EmailTemplates:
                 Por favor, faça as <strong>correções necessárias</strong> e reenvie o relatório através do sistema SIGESCON.
             </div>
         </div>
+"""
+
+def _compilar_email(titulo: str, css: str, conteudo: str, icone: str) -> TemplateCompilado:
+    """Email no layout comum; `icone` pode ser fixo ou um campo (ex.: {urgencia_emoji})"""
+    return TemplateCompilado(_LAYOUT.format(
+        titulo=titulo,
+        css=literal(_CSS_BASE + css + _CSS_RODAPE),
+        icone=icone,
+        conteudo=conteudo
+    ))
+
+
+_ATRIBUICAO_FISCAL = _compilar_email(
+    "Atribuição de Contrato - SIGESCON", _CSS_ATRIBUICAO_FISCAL, _CONTEUDO_ATRIBUICAO_FISCAL, "📋"
+)
+_ATRIBUICAO_GESTOR = _compilar_email(
+    "Contrato sob Gestão - SIGESCON", _CSS_ATRIBUICAO_GESTOR, _CONTEUDO_ATRIBUICAO_GESTOR, "💼"
+)
+_TRANSFERENCIA = _compilar_email(
+    "Transferência de Contrato - SIGESCON", _CSS_TRANSFERENCIA, _CONTEUDO_TRANSFERENCIA, "🔄"
+)
+_NOVA_PENDENCIA = _compilar_email(
+    "Nova Pendência - SIGESCON", _CSS_NOVA_PENDENCIA, _CONTEUDO_NOVA_PENDENCIA, "{urgencia_emoji}"
+)
+_PENDENCIA_CANCELADA = _compilar_email(
+    "Pendência Cancelada - SIGESCON", _CSS_PENDENCIA_CANCELADA, _CONTEUDO_PENDENCIA_CANCELADA, "✅"
+)
+_RELATORIO_SUBMETIDO = _compilar_email(
+    "Relatório Submetido - SIGESCON", _CSS_RELATORIO_SUBMETIDO, _CONTEUDO_RELATORIO_SUBMETIDO, "📄"
+)
+_RELATORIO_APROVADO = _compilar_email(
+    "Relatório Aprovado - SIGESCON", _CSS_RELATORIO_APROVADO, _CONTEUDO_RELATORIO_APROVADO, "✅"
+)
+_RELATORIO_REJEITADO = _compilar_email(
+    "Relatório Rejeitado - SIGESCON", _CSS_RELATORIO_REJEITADO, _CONTEUDO_RELATORIO_REJEITADO, "❌"
+)
+
+# --- Trechos opcionais ---
+
+_FISCAL_RESPONSAVEL = TemplateCompilado("""
+            <div class="detail-item">
+                <span class="detail-label">Fiscal Responsável:</span>
+                <span class="detail-value">{nome} ({email})</span>
+            </div>""")
+
+_NOVO_FISCAL = TemplateCompilado("""
+            <div class="detail-item">
+                <span class="detail-label">Novo Fiscal:</span>
+                <span class="detail-value">{nome}</span>
+            </div>""")
+
+_OBSERVACOES = TemplateCompilado("""
+        <div class="observations-box">
+            <div class="observations-title">
+                <span class="icon">🔍</span> OBSERVAÇÕES DO ADMINISTRADOR
+            </div>
+            <div class="observations-content">
+                {observacoes}
+            </div>
+        </div>""")
+
+_LINHA_IMPORTACAO = TemplateCompilado("""
+            <tr>
+                <td>{nr_contrato}</td>
+                <td>{objeto}</td>
+                <td>{papel}</td>
+                <td>{data_inicio}</td>
+                <td>{data_fim}</td>
+            </tr>""")
+
+_IMPORTACAO = TemplateCompilado("""
+<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Contratos Atribuídos - SIGESCON</title>
+    <style>
+        body {{
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 700px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f8f9fa;
+        }}
+        .container {{
+            background-color: #ffffff;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }}
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+            font-size: 14px;
+        }}
+        th, td {{
+            border-bottom: 1px solid #e9ecef;
+            padding: 8px;
+            text-align: left;
+        }}
+        th {{
+            background-color: #2c5aa0;
+            color: #ffffff;
+        }}
+        .footer {{
+            text-align: center;
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #e9ecef;
+            color: #6c757d;
+            font-size: 14px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <p>Olá, <strong>{nome}</strong>!</p>
+        <p>Os seguintes contratos foram cadastrados no SIGESCON e atribuídos a você:</p>
+
+        <table>
+            <tr>
+                <th>Contrato</th>
+                <th>Objeto</th>
+                <th>Papel</th>
+                <th>Início</th>
+                <th>Fim</th>
+            </tr>{linhas}
+        </table>
+
+        <p>Acesse o sistema SIGESCON para ver os detalhes de cada contrato.</p>
 
         <div class="footer">
             <strong>Sistema de Gestão de Contratos - SIGESCON</strong><br>
@@ -1617,5 +1189,194 @@ class EmailTemplates:
     </div>
 </body>
 </html>
-        """
-        return subject, body
\ No newline at end of file
+        """)
+
+# (emoji, classe CSS, texto do assunto) por faixa de dias até o prazo
+_URGENCIA_URGENTE = ("😨", "urgent", " - URGENTE!")
+_URGENCIA_ATENCAO = ("⚠️", "warning", " - Atenção!")
+_URGENCIA_NORMAL = ("📋", "normal", "")
+
+
+def _formatar_valor(valor) -> str:
+    return f"R$ {valor:,.2f}" if valor else "Não informado"
+
+
+def _data_br(valor: date) -> str:
+    """dd/mm/aaaa (equivale a strftime('%d/%m/%Y'), sem o custo do strftime)"""
+    return f"{valor.day:02d}/{valor.month:02d}/{valor.year}"
+
+
+def _formatar_data(valor) -> str:
+    return _data_br(valor) if valor else '-'
+
+
+class EmailTemplates:
+    """Templates padronizados para emails do sistema"""
+    
+    @staticmethod
+    def contract_assignment_fiscal(fiscal_nome: str, contrato_data: Dict, is_new: bool = True) -> tuple[str, str]:
+        """Template para notificar fiscal sobre atribuição de contrato"""
+        action = "atribuído" if is_new else "atualizado"
+        subject = f"📋 Contrato {action}: {contrato_data['nr_contrato']} - SIGESCON"
+
+        body = _ATRIBUICAO_FISCAL.render(
+            nome=fiscal_nome,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            data_inicio=contrato_data['data_inicio'],
+            data_fim=contrato_data['data_fim'],
+            valor_anual=_formatar_valor(contrato_data.get('valor_anual')),
+            valor_global=_formatar_valor(contrato_data.get('valor_global')),
+            contratado_nome=contrato_data.get('contratado_nome', 'Não informado'),
+            modalidade_nome=contrato_data.get('modalidade_nome', 'Não informada')
+        )
+        return subject, body
+
+    @staticmethod
+    def contract_assignment_manager(gestor_nome: str, contrato_data: Dict, fiscal_data: Optional[Dict] = None, is_new: bool = True) -> tuple[str, str]:
+        """Template para notificar gestor sobre atribuição de contrato"""
+        action = "criado" if is_new else "atualizado"
+        subject = f"💼 Contrato {action} sob sua gestão: {contrato_data['nr_contrato']} - SIGESCON"
+
+        fiscal_info = ""
+        if fiscal_data:
+            fiscal_info = _FISCAL_RESPONSAVEL.render(nome=fiscal_data['nome'], email=fiscal_data['email'])
+
+        body = _ATRIBUICAO_GESTOR.render(
+            nome=gestor_nome,
+            acao=action,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            data_inicio=contrato_data['data_inicio'],
+            data_fim=contrato_data['data_fim'],
+            valor_anual=_formatar_valor(contrato_data.get('valor_anual')),
+            valor_global=_formatar_valor(contrato_data.get('valor_global')),
+            contratado_nome=contrato_data.get('contratado_nome', 'Não informado'),
+            modalidade_nome=contrato_data.get('modalidade_nome', 'Não informada'),
+            fiscal_info=fiscal_info
+        )
+        return subject, body
+
+    @staticmethod
+    def contract_transfer_notification(fiscal_nome: str, contrato_data: Dict, novo_fiscal_nome: Optional[str] = None) -> tuple[str, str]:
+        """Template para notificar fiscal sobre transferência de contrato"""
+        subject = f"🔄 Contrato transferido: {contrato_data['nr_contrato']} - SIGESCON"
+
+        body = _TRANSFERENCIA.render(
+            nome=fiscal_nome,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            data_inicio=contrato_data['data_inicio'],
+            data_fim=contrato_data['data_fim'],
+            contratado_nome=contrato_data.get('contratado_nome', 'Não informado'),
+            transferencia=_NOVO_FISCAL.render(nome=novo_fiscal_nome) if novo_fiscal_nome else ""
+        )
+        return subject, body
+
+    @staticmethod
+    def pending_report_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict) -> tuple[str, str]:
+        """Template para notificar sobre nova pendência (já existente, mantido para compatibilidade)"""
+
+        # Calcula dias até o prazo
+        prazo = pendencia_data['data_prazo']
+        if isinstance(prazo, str):
+            prazo = date.fromisoformat(prazo)
+
+        dias_restantes = (prazo - date.today()).days
+        if dias_restantes <= 1:
+            urgencia_emoji, urgencia_class, urgencia_texto = _URGENCIA_URGENTE
+        elif dias_restantes <= 3:
+            urgencia_emoji, urgencia_class, urgencia_texto = _URGENCIA_ATENCAO
+        else:
+            urgencia_emoji, urgencia_class, urgencia_texto = _URGENCIA_NORMAL
+
+        subject = f"{urgencia_emoji} Nova pendência: Contrato {contrato_data['nr_contrato']}{urgencia_texto} - SIGESCON"
+
+        body = _NOVA_PENDENCIA.render(
+            nome=fiscal_nome,
+            urgencia_emoji=urgencia_emoji,
+            urgencia_class=urgencia_class,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            descricao=pendencia_data.get('descricao', 'N/A'),
+            prazo=_data_br(prazo),
+            dias_restantes=dias_restantes
+        )
+        return subject, body
+
+    @staticmethod
+    def pending_cancellation_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict) -> tuple[str, str]:
+        """Template para notificar fiscal sobre cancelamento de pendência"""
+        subject = f"✅ Pendência cancelada: Contrato {contrato_data['nr_contrato']} - SIGESCON"
+
+        body = _PENDENCIA_CANCELADA.render(
+            nome=fiscal_nome,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            descricao=pendencia_data.get('descricao', 'N/A')
+        )
+        return subject, body
+
+    @staticmethod
+    def report_submitted_notification(admin_nome: str, contrato_data: Dict, pendencia_data: Dict, fiscal_data: Dict) -> tuple[str, str]:
+        """Template para notificar administrador sobre relatório submetido"""
+        subject = f"📄 Relatório submetido: Contrato {contrato_data['nr_contrato']} - SIGESCON"
+
+        body = _RELATORIO_SUBMETIDO.render(
+            nome=admin_nome,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            fiscal_nome=fiscal_data['nome'],
+            fiscal_email=fiscal_data['email'],
+            descricao=pendencia_data.get('descricao', 'N/A')
+        )
+        return subject, body
+
+    @staticmethod
+    def report_approved_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict) -> tuple[str, str]:
+        """Template para notificar fiscal sobre relatório aprovado"""
+        subject = f"✅ Relatório aprovado: Contrato {contrato_data['nr_contrato']} - SIGESCON"
+
+        body = _RELATORIO_APROVADO.render(
+            nome=fiscal_nome,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            descricao=pendencia_data.get('descricao', 'N/A')
+        )
+        return subject, body
+
+    @staticmethod
+    def report_rejected_notification(fiscal_nome: str, contrato_data: Dict, pendencia_data: Dict, observacoes: str = None) -> tuple[str, str]:
+        """Template para notificar fiscal sobre relatório rejeitado"""
+        subject = f"❌ Relatório rejeitado: Contrato {contrato_data['nr_contrato']} - SIGESCON"
+
+        body = _RELATORIO_REJEITADO.render(
+            nome=fiscal_nome,
+            nr_contrato=contrato_data['nr_contrato'],
+            objeto=contrato_data['objeto'],
+            descricao=pendencia_data.get('descricao', 'N/A'),
+            observacoes=_OBSERVACOES.render(observacoes=observacoes) if observacoes else ""
+        )
+        return subject, body
+
+    @staticmethod
+    def contract_import_digest(usuario_nome: str, contratos: List[Dict]) -> tuple[str, str]:
+        """Template de resumo: contratos atribuídos ao usuário em uma importação em lote"""
+        quantidade = len(contratos)
+        subject = f"📋 {quantidade} contrato(s) atribuído(s) a você - SIGESCON"
+
+        linhas = "".join(
+            _LINHA_IMPORTACAO.render(
+                # Valores vindos da planilha importada
+                nr_contrato=html.escape(str(c['nr_contrato'])),
+                objeto=html.escape(str(c['objeto'])),
+                papel=c['papel'],
+                data_inicio=_formatar_data(c.get('data_inicio')),
+                data_fim=_formatar_data(c.get('data_fim'))
+            )
+            for c in contratos
+        )
+
+        body = _IMPORTACAO.render(nome=usuario_nome, linhas=linhas)
+        return subject, body
+
@@ -2,7 +2,7 @@
 Service para escalonamento de pendências vencidas
 Envia notificações para gestores e administradores quando pendências não são resolvidas
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import date, timedelta
 import asyncpg
 
@@ -10,8 +10,12 @@ from app.repositories.config_repo import ConfigRepository
 from app.repositories.pendencia_repo import PendenciaRepository
 from app.repositories.contrato_repo import ContratoRepository
 from app.repositories.usuario_repo import UsuarioRepository
+from app.services.email_digest_service import ItemResumo, ResumoEmails
 from app.services.email_service import EmailService
 
+CATEGORIA_GESTOR = "Pendências vencidas sob sua gestão"
+CATEGORIA_ADMIN = "Pendências com prazo máximo excedido"
+
 
 class EscalationService:
     """Service para gerenciar escalonamento de pendências"""
@@ -47,6 +51,7 @@ class EscalationService:
             return {
                 'emails_gestor': 0,
                 'emails_admin': 0,
+                'emails_enviados': 0,
                 'total_pendencias_escalonadas': 0
             }
 
@@ -63,6 +68,7 @@ class EscalationService:
             return {
                 'emails_gestor': 0,
                 'emails_admin': 0,
+                'emails_enviados': 0,
                 'total_pendencias_escalonadas': 0
             }
 
@@ -87,17 +93,38 @@ class EscalationService:
         print(f"👥 Pendências para gestor: {len(pendencias_gestor)}")
         print(f"⚙️ Pendências para admin: {len(pendencias_admin)}")
 
-        # Enviar notificações
-        emails_gestor = await self._notificar_gestores(pendencias_gestor)
-        emails_admin = await self._notificar_administradores(pendencias_admin)
+        # Quem recebe como gestor e como administrador recebe um único email;
+        # com itens de um só nível, o email é o do template do nível
+        resumo = ResumoEmails(
+            self.pendencia_repo.conn,
+            agrupadores={
+                CATEGORIA_GESTOR: lambda nome, itens: self._montar_email_escalonamento_gestor(
+                    nome, [item.dados for item in itens]
+                ),
+                CATEGORIA_ADMIN: lambda nome, itens: self._montar_email_escalonamento_admin(
+                    nome, [item.dados for item in itens]
+                ),
+            }
+        )
+        self._notificar_gestores(pendencias_gestor, resumo)
+        await self._notificar_administradores(pendencias_admin, resumo)
+        resultado = await resumo.enviar()
+
+        # Destinatários notificados em cada nível
+        emails_gestor = len({chave[1] for chave in resultado.entregues if chave[0] == 'gestor'})
+        emails_admin = len({chave[1] for chave in resultado.entregues if chave[0] == 'admin'})
 
         total_escalonadas = len(pendencias_gestor) + len(pendencias_admin)
 
-        print(f"✅ Escalonamento concluído: {emails_gestor} emails para gestores, {emails_admin} emails para admins")
+        print(
+            f"✅ Escalonamento concluído: {emails_gestor} gestores e {emails_admin} admins notificados "
+            f"em {resultado.emails} emails"
+        )
 
         return {
             'emails_gestor': emails_gestor,
             'emails_admin': emails_admin,
+            'emails_enviados': resultado.emails,
             'total_pendencias_escalonadas': total_escalonadas
         }
 
@@ -132,60 +159,54 @@ class EscalationService:
         pendencias = await self.pendencia_repo.conn.fetch(query)
         return [dict(p) for p in pendencias]
 
-    async def _notificar_gestores(self, pendencias: List[Dict[str, Any]]) -> int:
+    def _item_escalonamento(self, nivel: str, nome: str, pendencia: Dict[str, Any], email: str) -> ItemResumo:
+        """Item do resumo de uma pendência escalonada; sozinha, usa o template do nível"""
+        if nivel == 'gestor':
+            assunto, corpo = self._montar_email_escalonamento_gestor(nome, [pendencia])
+            categoria = CATEGORIA_GESTOR
+        else:
+            assunto, corpo = self._montar_email_escalonamento_admin(nome, [pendencia])
+            categoria = CATEGORIA_ADMIN
+
+        dias_vencida = (date.today() - pendencia['data_vencimento']).days
+        return ItemResumo(
+            categoria=categoria,
+            titulo=f"{pendencia['titulo']} - Contrato #{pendencia['nr_contrato']}",
+            detalhes=[
+                f"Vencimento: {pendencia['data_vencimento'].strftime('%d/%m/%Y')} ({dias_vencida} dias vencida)",
+                f"Gestor: {pendencia['gestor_nome']} | Fiscal: {pendencia['fiscal_nome']}"
+            ],
+            assunto=assunto,
+            corpo=corpo,
+            dados=pendencia,
+            chave=(nivel, email.lower(), pendencia['id'])
+        )
+
+    def _notificar_gestores(self, pendencias: List[Dict[str, Any]], resumo: ResumoEmails) -> None:
         """
-        Envia emails de escalonamento para gestores
+        Adiciona ao resumo as pendências de cada gestor
 
         Args:
             pendencias: Lista de pendências para escalonamento
-
-        Returns:
-            Número de emails enviados
+            resumo: Resumo da execução (um email por destinatário)
         """
-        if not pendencias:
-            return 0
-
-        # Agrupar pendências por gestor
-        pendencias_por_gestor = {}
         for p in pendencias:
-            gestor_id = p['gestor_id']
-            if gestor_id not in pendencias_por_gestor:
-                pendencias_por_gestor[gestor_id] = {
-                    'nome': p['gestor_nome'],
-                    'email': p['gestor_email'],
-                    'pendencias': []
-                }
-            pendencias_por_gestor[gestor_id]['pendencias'].append(p)
-
-        emails_enviados = 0
-
-        # Enviar email para cada gestor
-        for gestor_id, dados in pendencias_por_gestor.items():
-            try:
-                await self._enviar_email_escalonamento_gestor(
-                    gestor_nome=dados['nome'],
-                    gestor_email=dados['email'],
-                    pendencias=dados['pendencias']
+            if p['gestor_email']:
+                resumo.adicionar(
+                    p['gestor_email'], p['gestor_nome'],
+                    self._item_escalonamento('gestor', p['gestor_nome'], p, p['gestor_email'])
                 )
-                emails_enviados += 1
-                print(f"📧 Email de escalonamento enviado para gestor: {dados['nome']}")
-            except Exception as e:
-                print(f"❌ Erro ao enviar email para gestor {dados['nome']}: {e}")
 
-        return emails_enviados
-
-    async def _notificar_administradores(self, pendencias: List[Dict[str, Any]]) -> int:
+    async def _notificar_administradores(self, pendencias: List[Dict[str, Any]], resumo: ResumoEmails) -> None:
         """
-        Envia emails de escalonamento para administradores
+        Adiciona ao resumo de cada administrador as pendências escalonadas
 
         Args:
             pendencias: Lista de pendências para escalonamento
-
-        Returns:
-            Número de emails enviados
+            resumo: Resumo da execução (um email por destinatário)
         """
         if not pendencias:
-            return 0
+            return
 
         # Buscar todos os administradores ativos
         query = """
@@ -202,32 +223,23 @@ class EscalationService:
 
         if not admins:
             print("⚠️ Nenhum administrador encontrado para enviar escalonamento")
-            return 0
+            return
 
-        emails_enviados = 0
-
-        # Enviar email para cada admin
         for admin in admins:
-            try:
-                await self._enviar_email_escalonamento_admin(
-                    admin_nome=admin['nome'],
-                    admin_email=admin['email'],
-                    pendencias=pendencias
+            if not admin['email']:
+                continue
+            for p in pendencias:
+                resumo.adicionar(
+                    admin['email'], admin['nome'],
+                    self._item_escalonamento('admin', admin['nome'], p, admin['email'])
                 )
-                emails_enviados += 1
-                print(f"📧 Email de escalonamento enviado para admin: {admin['nome']}")
-            except Exception as e:
-                print(f"❌ Erro ao enviar email para admin {admin['nome']}: {e}")
-
-        return emails_enviados
 
-    async def _enviar_email_escalonamento_gestor(
+    def _montar_email_escalonamento_gestor(
         self,
         gestor_nome: str,
-        gestor_email: str,
         pendencias: List[Dict[str, Any]]
-    ):
-        """Envia email de escalonamento para gestor"""
+    ) -> Tuple[str, str]:
+        """Monta (assunto, corpo html) do email de escalonamento para gestor"""
 
         hoje = date.today()
 
@@ -310,19 +322,14 @@ class EscalationService:
         </html>
         """
 
-        await self.email_service.send_email(
-            destinatario=gestor_email,
-            assunto=assunto,
-            corpo_html=corpo_html
-        )
+        return assunto, corpo_html
 
-    async def _enviar_email_escalonamento_admin(
+    def _montar_email_escalonamento_admin(
         self,
         admin_nome: str,
-        admin_email: str,
         pendencias: List[Dict[str, Any]]
-    ):
-        """Envia email de escalonamento para administrador"""
+    ) -> Tuple[str, str]:
+        """Monta (assunto, corpo html) do email de escalonamento para administrador"""
 
         hoje = date.today()
 
@@ -408,8 +415,4 @@ class EscalationService:
         </html>
         """
 
-        await self.email_service.send_email(
-            destinatario=admin_email,
-            assunto=assunto,
-            corpo_html=corpo_html
-        )
+        return assunto, corpo_html
@@ -7,8 +7,12 @@ import logging
 from dataclasses import dataclass
 
 from app.services.email_service import EmailService
+from app.services.email_outbox_service import EmailOutboxService, EmailOutboxWorker
+from app.services.email_digest_service import ItemResumo, ResumoEmails
+from app.services.email_template_engine import TemplateCompilado
 from app.repositories.usuario_repo import UsuarioRepository
 from app.repositories.contrato_repo import ContratoRepository
+from app.repositories.email_outbox_repo import EmailOutboxRepository
 
 logger = logging.getLogger(__name__)
 
@@ -36,22 +40,29 @@ class NotificationContext:
 
 class NotificationTemplates:
     """Templates de notificação por email"""
+
+    # Montados uma vez; os campos ausentes em `data` usam _PADROES_ASSUNTO
+    _ASSUNTOS = {
+        NotificationType.PENDENCIA_CRIADA: TemplateCompilado("Nova pendência para o contrato {nr_contrato}"),
+        NotificationType.RELATORIO_SUBMETIDO: TemplateCompilado("Relatório submetido para análise - {nr_contrato}"),
+        NotificationType.RELATORIO_APROVADO: TemplateCompilado("Relatório aprovado - {nr_contrato}"),
+        NotificationType.RELATORIO_REJEITADO: TemplateCompilado("Relatório rejeitado - {nr_contrato}"),
+        NotificationType.PRAZO_VENCENDO: TemplateCompilado("⚠️ Prazo vencendo em {dias_restantes} dias"),
+        NotificationType.PRAZO_VENCIDO: TemplateCompilado("🔴 URGENTE: Prazo vencido - {nr_contrato}"),
+        NotificationType.CONTRATO_CRIADO: TemplateCompilado("Novo contrato atribuído: {nr_contrato}"),
+        NotificationType.CONTRATO_VENCENDO: TemplateCompilado("⚠️ Contrato vencendo - {nr_contrato}"),
+        NotificationType.GARANTIA_VENCENDO: TemplateCompilado("⚠️ Garantia contratual vencendo - {nr_contrato}"),
+    }
+    _PADROES_ASSUNTO = {'nr_contrato': 'N/A', 'dias_restantes': 0}
     
     @staticmethod
     def get_subject(notification_type: NotificationType, data: Dict) -> str:
         """Retorna o assunto do email baseado no tipo"""
-        subjects = {
-            NotificationType.PENDENCIA_CRIADA: f"Nova pendência para o contrato {data.get('nr_contrato', 'N/A')}",
-            NotificationType.RELATORIO_SUBMETIDO: f"Relatório submetido para análise - {data.get('nr_contrato', 'N/A')}",
-            NotificationType.RELATORIO_APROVADO: f"Relatório aprovado - {data.get('nr_contrato', 'N/A')}",
-            NotificationType.RELATORIO_REJEITADO: f"Relatório rejeitado - {data.get('nr_contrato', 'N/A')}",
-            NotificationType.PRAZO_VENCENDO: f"⚠️ Prazo vencendo em {data.get('dias_restantes', 0)} dias",
-            NotificationType.PRAZO_VENCIDO: f"🔴 URGENTE: Prazo vencido - {data.get('nr_contrato', 'N/A')}",
-            NotificationType.CONTRATO_CRIADO: f"Novo contrato atribuído: {data.get('nr_contrato', 'N/A')}",
-            NotificationType.CONTRATO_VENCENDO: f"⚠️ Contrato vencendo - {data.get('nr_contrato', 'N/A')}",
-            NotificationType.GARANTIA_VENCENDO: f"⚠️ Garantia contratual vencendo - {data.get('nr_contrato', 'N/A')}",
-        }
-        return subjects.get(notification_type, "Notificação do SIGESCON")
+        template = NotificationTemplates._ASSUNTOS.get(notification_type)
+        if template is None:
+            return "Notificação do SIGESCON"
+        padroes = NotificationTemplates._PADROES_ASSUNTO
+        return template.render(**{campo: data.get(campo, padroes[campo]) for campo in template.campos})
     
     @staticmethod
     def get_body(notification_type: NotificationType, context: NotificationContext) -> str:
@@ -182,7 +193,8 @@ class NotificationService:
         self.usuario_repo = usuario_repo
         self.contrato_repo = contrato_repo
         self.templates = NotificationTemplates()
-        self.email_queue = asyncio.Queue()  # Fila para processamento assíncrono
+        # Notificações não urgentes vão para a caixa de saída (email_outbox)
+        self.outbox_service = EmailOutboxService(EmailOutboxRepository(usuario_repo.conn))
     
     async def send_notification(self, context: NotificationContext) -> bool:
         """Envia uma notificação"""
@@ -194,10 +206,13 @@ class NotificationService:
             if context.priority == "urgent":
                 await EmailService.send_email(context.recipient_email, subject, body, is_html=True)
                 logger.info(f"Notificação urgente enviada para {context.recipient_email}")
+            elif await self.outbox_service.enfileirar([(context.recipient_email, subject, body, True)]):
+                # Entregue depois pelo EmailOutboxWorker
+                logger.info(f"Notificação gravada na caixa de saída para {context.recipient_email}")
             else:
-                # Adiciona à fila para processamento em lote
-                await self.email_queue.put((context.recipient_email, subject, body))
-                logger.info(f"Notificação adicionada à fila para {context.recipient_email}")
+                # Sem a tabela email_outbox, envia diretamente
+                await EmailService.send_email(context.recipient_email, subject, body, is_html=True)
+                logger.info(f"Notificação enviada para {context.recipient_email}")
             
             return True
         except Exception as e:
@@ -249,30 +264,14 @@ class NotificationService:
                     )
                     await self.send_notification(context)
     
-    async def process_email_queue(self):
-        """Processa fila de emails em lote (para usar em background task)"""
-        emails_to_send = []
-        
-        # Coleta emails da fila (máximo 10 por lote)
-        for _ in range(10):
-            try:
-                email_data = self.email_queue.get_nowait()
-                emails_to_send.append(email_data)
-            except asyncio.QueueEmpty:
-                break
-        
-        # Envia emails em paralelo
-        if emails_to_send:
-            tasks = [
-                EmailService.send_email(email, subject, body, is_html=True)
-                for email, subject, body in emails_to_send
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Log dos resultados
-            success_count = sum(1 for r in results if not isinstance(r, Exception))
-            logger.info(f"Lote de emails processado: {success_count}/{len(emails_to_send)} enviados")
-    
+    @staticmethod
+    def _descrever_prazo(prazo: date, dias_restantes: int) -> str:
+        if dias_restantes < 0:
+            return f"Prazo: {prazo.strftime('%d/%m/%Y')} (vencido há {-dias_restantes} dia(s))"
+        if dias_restantes == 0:
+            return f"Prazo: {prazo.strftime('%d/%m/%Y')} (HOJE)"
+        return f"Prazo: {prazo.strftime('%d/%m/%Y')} (em {dias_restantes} dia(s))"
+
     async def check_deadline_reminders(self) -> List[Dict]:
         """
         Verifica pendências próximas do vencimento usando configurações dinâmicas.
@@ -316,40 +315,50 @@ class NotificationService:
                 logger.info(f"Lembretes serão enviados nos dias: {dias_lembrete}")
                 
                 pendencias_vencendo = await pendencia_repo.get_due_pendencias()
-            
-            today = date.today()
-            
-            for pendencia in pendencias_vencendo:
-                prazo = pendencia['data_prazo']
-                if isinstance(prazo, str):
-                    prazo = datetime.strptime(prazo, '%Y-%m-%d').date()
-                
-                dias_restantes = (prazo - today).days
-                
-                # Envia lembrete em intervalos configurados
-                if dias_restantes in dias_lembrete:
-                    priority = "urgent" if dias_restantes <= 0 else "high" if dias_restantes <= 1 else "normal"
-                    notification_type = NotificationType.PRAZO_VENCIDO if dias_restantes < 0 else NotificationType.PRAZO_VENCENDO
-                    
-                    context = NotificationContext(
-                        type=notification_type,
-                        recipient_id=0,  # Será preenchido quando buscar o fiscal
-                        recipient_email=pendencia['fiscal_email'],
-                        recipient_name=pendencia['fiscal_nome'],
-                        data={
-                            'nr_contrato': pendencia['nr_contrato'],
-                            'descricao': pendencia['descricao'],
-                            'data_prazo': prazo.strftime('%d/%m/%Y'),
-                            'dias_restantes': dias_restantes,
-                        },
-                        priority=priority
-                    )
-                    
-                    await self.send_notification(context)
-                    reminders.append(pendencia)
+                today = date.today()
+
+                # Um email por fiscal com todas as pendências do dia (ou um por
+                # pendência, conforme a preferência do fiscal)
+                resumo = ResumoEmails(conn)
+                for pendencia in pendencias_vencendo:
+                    prazo = pendencia['data_prazo']
+                    if isinstance(prazo, str):
+                        prazo = datetime.strptime(prazo, '%Y-%m-%d').date()
+
+                    dias_restantes = (prazo - today).days
+
+                    # Envia lembrete em intervalos configurados
+                    if dias_restantes in dias_lembrete:
+                        notification_type = NotificationType.PRAZO_VENCIDO if dias_restantes < 0 else NotificationType.PRAZO_VENCENDO
+
+                        context = NotificationContext(
+                            type=notification_type,
+                            recipient_id=0,  # Não usado pelos templates de prazo
+                            recipient_email=pendencia['fiscal_email'],
+                            recipient_name=pendencia['fiscal_nome'],
+                            data={
+                                'nr_contrato': pendencia['nr_contrato'],
+                                'descricao': pendencia['descricao'],
+                                'data_prazo': prazo.strftime('%d/%m/%Y'),
+                                'dias_restantes': dias_restantes,
+                            }
+                        )
+                        resumo.adicionar(context.recipient_email, context.recipient_name, ItemResumo(
+                            categoria="Prazos de pendências",
+                            titulo=f"Contrato {pendencia['nr_contrato']}: {pendencia['descricao']}",
+                            detalhes=[self._descrever_prazo(prazo, dias_restantes)],
+                            assunto=self.templates.get_subject(context.type, context.data),
+                            corpo=self.templates.get_body(context.type, context),
+                            chave=pendencia['id']
+                        ))
+                        reminders.append(pendencia)
+
+                if reminders:
+                    resultado = await resumo.enviar()
+                    logger.info(f"{resultado.itens} lembretes de prazo em {resultado.emails} emails")
+
+            return reminders
 
-                return reminders
-        
         except Exception as e:
             logger.error(f"Erro ao verificar lembretes de prazo: {e}")
             return []
@@ -360,6 +369,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.services.notification_service import NotificationService
 from app.repositories.usuario_repo import UsuarioRepository
 from app.repositories.contrato_repo import ContratoRepository
+from app.core.config import settings
 from app.core.database import get_db_pool
 import logging
 
@@ -370,7 +380,6 @@ class NotificationScheduler:
     
     def __init__(self):
         self.scheduler = AsyncIOScheduler(timezone="America/Sao_Paulo")
-        self.notification_service = None
     
     async def setup_services(self):
         """Inicializa os serviços necessários"""
@@ -378,13 +387,14 @@ class NotificationScheduler:
         # para evitar problemas de pool
         pass
     
-    async def process_notification_queue(self):
-        """Task para processar fila de notificações"""
+    async def process_email_outbox(self):
+        """Task para entregar os emails da caixa de saída (email_outbox)"""
         try:
-            if self.notification_service:
-                await self.notification_service.process_email_queue()
+            enviados = await EmailOutboxWorker().processar_pendentes()
+            if enviados:
+                logger.info(f"Caixa de saída processada. {enviados} emails reservados para envio.")
         except Exception as e:
-            logger.error(f"Erro ao processar fila de notificações: {e}")
+            logger.error(f"Erro ao processar a caixa de saída de emails: {e}")
     
     async def check_deadlines(self):
         """Task para verificar prazos vencendo"""
@@ -448,14 +458,32 @@ class NotificationScheduler:
         except Exception as e:
             logger.error(f"Erro ao verificar escalonamento de pendências: {e}")
 
+    async def refresh_contrato_resumo(self):
+        """Task para recalcular pendências vencidas no resumo por contrato (executada diariamente às 0h05)"""
+        from app.core.database import acquire_connection
+        from app.core.schema_registry import schema_registry
+        from app.repositories.contrato_resumo_repo import ContratoResumoRepository
+        from app.core.cache import invalidate_dashboards
+
+        try:
+            async with acquire_connection() as conn:
+                if 'contrato_resumo' not in await schema_registry.existing_tables(conn):
+                    return
+                atualizados = await ContratoResumoRepository(conn).refresh_vencidas()
+                if atualizados:
+                    await invalidate_dashboards(conn)
+            logger.info(f"Resumo de contratos atualizado. {atualizados} contratos com novas pendências vencidas.")
+        except Exception as e:
+            logger.error(f"Erro ao atualizar resumo de contratos: {e}")
+
     def start_scheduler(self):
         """Inicia o agendador de tarefas"""
-        # Processa fila de emails a cada 5 minutos
+        # Entrega os emails da caixa de saída (pode rodar também em app.email_worker)
         self.scheduler.add_job(
-            self.process_notification_queue,
+            self.process_email_outbox,
             'interval',
-            minutes=5,
-            id='process_notifications',
+            seconds=settings.EMAIL_OUTBOX_INTERVALO_SEGUNDOS,
+            id='process_email_outbox',
             max_instances=1
         )
         
@@ -490,6 +518,16 @@ class NotificationScheduler:
             max_instances=1
         )
 
+        # Recalcula pendências vencidas do resumo por contrato logo após a virada do dia
+        self.scheduler.add_job(
+            self.refresh_contrato_resumo,
+            'cron',
+            hour=0,
+            minute=5,
+            id='refresh_contrato_resumo',
+            max_instances=1
+        )
+
         self.scheduler.start()
         logger.info("Scheduler de notificações iniciado (alertas de contratos/garantias a cada 5 dias às 10h, escalonamento diário às 9h)")
     
@@ -1,11 +1,15 @@
 # app/services/pendencia_automatica_service.py
-import asyncio
 from datetime import date, timedelta
 from typing import List, Dict, Any
 from fastapi import HTTPException, status
+from app.core.cache import invalidate_dashboards
+from app.core.lookup_registry import lookup_registry
 from app.repositories.contrato_repo import ContratoRepository
 from app.repositories.config_repo import ConfigRepository
 from app.repositories.status_pendencia_repo import StatusPendenciaRepository
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.services.email_outbox_service import EmailOutboxService
+from app.services.email_send_scheduler import email_send_scheduler
 
 class PendenciaAutomaticaService:
     """
@@ -113,8 +117,7 @@ class PendenciaAutomaticaService:
         preview = await self.calcular_pendencias_automaticas(contrato_id)
 
         # Busca o status "Pendente"
-        all_status = await self.status_pendencia_repo.get_all()
-        status_pendente = next((s for s in all_status if s['nome'] == 'Pendente'), None)
+        status_pendente = await lookup_registry.get_by_name(self.status_pendencia_repo.conn, "statuspendencia", 'Pendente')
 
         if not status_pendente:
             raise HTTPException(
@@ -122,102 +125,96 @@ class PendenciaAutomaticaService:
                 detail="Status 'Pendente' não encontrado no sistema"
             )
 
-        # Cria as pendências
+        # Cria as pendências e grava os emails de notificação na caixa de saída
+        # na mesma transação; o envio respeita os limites de taxa do provedor
+        # sem prender a requisição
         pendencias_criadas = []
         pendencia_repo = PendenciaRepository(self.contrato_repo.conn)
 
-        for pendencia_data in preview['pendencias']:
-            pendencia_create = PendenciaCreate(
-                titulo=pendencia_data['titulo'],
-                descricao=descricao_base,
-                data_prazo=pendencia_data['data_prazo'],
-                status_pendencia_id=status_pendente['id'],
-                criado_por_usuario_id=criado_por_usuario_id
-            )
+        async with self.contrato_repo.conn.transaction():
+            for pendencia_data in preview['pendencias']:
+                pendencia_create = PendenciaCreate(
+                    titulo=pendencia_data['titulo'],
+                    descricao=descricao_base,
+                    data_prazo=pendencia_data['data_prazo'],
+                    status_pendencia_id=status_pendente['id'],
+                    criado_por_usuario_id=criado_por_usuario_id
+                )
 
-            nova_pendencia = await pendencia_repo.create_pendencia(contrato_id, pendencia_create)
-            pendencias_criadas.append(nova_pendencia)
-
-            print(f"✅ Pendência automática criada: {nova_pendencia['titulo']} - Prazo: {nova_pendencia['data_prazo']}")
-
-        # Enviar emails de notificação para o fiscal e fiscal substituto
-        try:
-            print(f"📧 Iniciando envio de emails para pendências automáticas do contrato {contrato_id}...")
-            contrato = await self.contrato_repo.find_contrato_by_id(contrato_id)
-            if contrato:
-                print(f"📋 Contrato encontrado: {contrato.get('nr_contrato')} - Fiscal ID: {contrato.get('fiscal_id')} - Fiscal Sub ID: {contrato.get('fiscal_substituto_id')}")
-
-                from app.repositories.usuario_repo import UsuarioRepository
-                from app.services.email_service import EmailService
-                from app.services.email_templates import EmailTemplates
-
-                usuario_repo = UsuarioRepository(self.contrato_repo.conn)
-
-                # Preparar resumo das pendências para o email
-                resumo_pendencias = "\n".join([
-                    f"• {p['titulo']} - Prazo: {p['data_prazo'].strftime('%d/%m/%Y') if isinstance(p['data_prazo'], date) else date.fromisoformat(p['data_prazo']).strftime('%d/%m/%Y')}"
-                    for p in pendencias_criadas
-                ])
-                print(f"📝 Resumo de {len(pendencias_criadas)} pendências preparado")
-
-                # Email para o fiscal principal
-                if contrato.get('fiscal_id'):
-                    print(f"👤 Buscando dados do fiscal principal (ID: {contrato.get('fiscal_id')})...")
-                    fiscal = await usuario_repo.get_user_by_id(contrato['fiscal_id'])
-                    if fiscal:
-                        print(f"✅ Fiscal encontrado: {fiscal.get('nome')} ({fiscal.get('email')})")
-                        subject = f"🔔 {len(pendencias_criadas)} Pendências Automáticas Criadas - Contrato {contrato['nr_contrato']}"
-                        body = f"""
-                        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                            <h2 style="color: #2563eb;">Olá, {fiscal['nome']}!</h2>
-                            <p>Foram criadas <strong>{len(pendencias_criadas)} pendências automáticas</strong> para o contrato:</p>
+                nova_pendencia = await pendencia_repo.create_pendencia(contrato_id, pendencia_create)
+                pendencias_criadas.append(nova_pendencia)
 
-                            <div style="background-color: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                                <p><strong>Contrato:</strong> {contrato['nr_contrato']}</p>
-                                <p><strong>Objeto:</strong> {contrato.get('objeto', 'N/A')}</p>
-                                <p><strong>Período:</strong> {contrato['data_inicio'].strftime('%d/%m/%Y') if isinstance(contrato['data_inicio'], date) else date.fromisoformat(contrato['data_inicio']).strftime('%d/%m/%Y')} até {contrato['data_fim'].strftime('%d/%m/%Y') if isinstance(contrato['data_fim'], date) else date.fromisoformat(contrato['data_fim']).strftime('%d/%m/%Y')}</p>
-                            </div>
+                print(f"✅ Pendência automática criada: {nova_pendencia['titulo']} - Prazo: {nova_pendencia['data_prazo']}")
 
-                            <h3 style="color: #2563eb;">Pendências Criadas:</h3>
-                            <div style="background-color: #fef3c7; padding: 15px; border-radius: 8px; border-left: 4px solid #f59e0b;">
-                                <pre style="margin: 0; white-space: pre-wrap;">{resumo_pendencias}</pre>
-                            </div>
+            emails = await self._emails_pendencias_criadas(contrato_id, pendencias_criadas)
+            outbox_service = EmailOutboxService(EmailOutboxRepository(self.contrato_repo.conn))
+            enfileirados = await outbox_service.enfileirar(emails) if emails else True
 
-                            <p style="margin-top: 20px;">Por favor, fique atento aos prazos e envie os relatórios fiscais dentro do prazo estabelecido.</p>
+        if pendencias_criadas:
+            await invalidate_dashboards(pendencia_repo.conn)
 
-                            <p style="color: #6b7280; font-size: 14px; margin-top: 30px;">
-                                Este é um email automático do SIGESCON. Não responda a este email.
-                            </p>
-                        </div>
-                        """
-                        print(f"📤 Enviando email para fiscal principal...")
-                        await EmailService.send_email(fiscal['email'], subject, body, is_html=True)
-                        print(f"✅ Email de pendências automáticas enviado para o fiscal principal: {fiscal['email']}")
-
-                        # Delay de 30 segundos entre envios para evitar bloqueio do provedor
-                        print(f"⏳ Aguardando 30 segundos antes do próximo envio...")
-                        await asyncio.sleep(30)
-                    else:
-                        print(f"⚠️ Fiscal principal não encontrado no banco de dados")
-                else:
-                    print(f"⚠️ Contrato sem fiscal principal associado")
-
-                # Email para o fiscal substituto
-                if contrato.get('fiscal_substituto_id'):
-                    print(f"👤 Buscando dados do fiscal substituto (ID: {contrato.get('fiscal_substituto_id')})...")
-                    fiscal_sub = await usuario_repo.get_user_by_id(contrato['fiscal_substituto_id'])
-                    if fiscal_sub:
-                        print(f"✅ Fiscal substituto encontrado: {fiscal_sub.get('nome')} ({fiscal_sub.get('email')})")
-                        subject = f"🔔 {len(pendencias_criadas)} Pendências Automáticas Criadas - Contrato {contrato['nr_contrato']}"
-                        body = f"""
+        if not enfileirados:
+            # Sem a caixa de saída (migração não aplicada): envio em segundo plano
+            for email in emails:
+                email_send_scheduler.agendar(*email)
+        print(f"📧 {len(emails)} email(s) de pendências automáticas agendados para o contrato {contrato_id}")
+
+        return pendencias_criadas
+
+    async def _emails_pendencias_criadas(self, contrato_id: int, pendencias_criadas: List[Dict[str, Any]]) -> list:
+        """Emails (destinatario, assunto, corpo, is_html) para o fiscal e o fiscal substituto"""
+        from app.repositories.usuario_repo import UsuarioRepository
+
+        if not pendencias_criadas:
+            return []
+        contrato = await self.contrato_repo.find_contrato_by_id(contrato_id)
+        if not contrato:
+            print(f"⚠️ Contrato não encontrado após criação das pendências")
+            return []
+
+        usuario_repo = UsuarioRepository(self.contrato_repo.conn)
+        emails = []
+        for campo, substituto in (('fiscal_id', False), ('fiscal_substituto_id', True)):
+            if not contrato.get(campo):
+                print(f"⚠️ Contrato sem {'fiscal substituto' if substituto else 'fiscal principal'} associado")
+                continue
+            fiscal = await usuario_repo.get_user_by_id(contrato[campo])
+            if not fiscal:
+                print(f"⚠️ {'Fiscal substituto' if substituto else 'Fiscal principal'} não encontrado no banco de dados")
+                continue
+            try:
+                subject = f"🔔 {len(pendencias_criadas)} Pendências Automáticas Criadas - Contrato {contrato['nr_contrato']}"
+                body = self._corpo_email_pendencias(fiscal['nome'], contrato, pendencias_criadas, substituto)
+                emails.append((fiscal['email'], subject, body, True))
+            except Exception as e:
+                # Não falha a criação das pendências por erro no email
+                print(f"❌ ERRO ao montar email de pendências automáticas para {fiscal['email']}: {e}")
+        return emails
+
+    @staticmethod
+    def _corpo_email_pendencias(nome: str, contrato: Dict, pendencias_criadas: List[Dict[str, Any]], substituto: bool) -> str:
+        def formatar(data) -> str:
+            return (data if isinstance(data, date) else date.fromisoformat(data)).strftime('%d/%m/%Y')
+
+        resumo_pendencias = "\n".join(
+            f"• {p['titulo']} - Prazo: {formatar(p['data_prazo'])}" for p in pendencias_criadas
+        )
+        if substituto:
+            introducao = "para o contrato onde você é fiscal substituto:"
+            orientacao = "Como fiscal substituto, você também deve estar ciente destes prazos."
+        else:
+            introducao = "para o contrato:"
+            orientacao = "Por favor, fique atento aos prazos e envie os relatórios fiscais dentro do prazo estabelecido."
+
+        return f"""
                         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                            <h2 style="color: #2563eb;">Olá, {fiscal_sub['nome']}!</h2>
-                            <p>Foram criadas <strong>{len(pendencias_criadas)} pendências automáticas</strong> para o contrato onde você é fiscal substituto:</p>
+                            <h2 style="color: #2563eb;">Olá, {nome}!</h2>
+                            <p>Foram criadas <strong>{len(pendencias_criadas)} pendências automáticas</strong> {introducao}</p>
 
                             <div style="background-color: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0;">
                                 <p><strong>Contrato:</strong> {contrato['nr_contrato']}</p>
                                 <p><strong>Objeto:</strong> {contrato.get('objeto', 'N/A')}</p>
-                                <p><strong>Período:</strong> {contrato['data_inicio'].strftime('%d/%m/%Y') if isinstance(contrato['data_inicio'], date) else date.fromisoformat(contrato['data_inicio']).strftime('%d/%m/%Y')} até {contrato['data_fim'].strftime('%d/%m/%Y') if isinstance(contrato['data_fim'], date) else date.fromisoformat(contrato['data_fim']).strftime('%d/%m/%Y')}</p>
+                                <p><strong>Período:</strong> {formatar(contrato['data_inicio'])} até {formatar(contrato['data_fim'])}</p>
                             </div>
 
                             <h3 style="color: #2563eb;">Pendências Criadas:</h3>
@@ -225,28 +222,10 @@ class PendenciaAutomaticaService:
                                 <pre style="margin: 0; white-space: pre-wrap;">{resumo_pendencias}</pre>
                             </div>
 
-                            <p style="margin-top: 20px;">Como fiscal substituto, você também deve estar ciente destes prazos.</p>
+                            <p style="margin-top: 20px;">{orientacao}</p>
 
                             <p style="color: #6b7280; font-size: 14px; margin-top: 30px;">
                                 Este é um email automático do SIGESCON. Não responda a este email.
                             </p>
                         </div>
                         """
-                        print(f"📤 Enviando email para fiscal substituto...")
-                        await EmailService.send_email(fiscal_sub['email'], subject, body, is_html=True)
-                        print(f"✅ Email de pendências automáticas enviado para o fiscal substituto: {fiscal_sub['email']}")
-                    else:
-                        print(f"⚠️ Fiscal substituto não encontrado no banco de dados")
-                else:
-                    print(f"⚠️ Contrato sem fiscal substituto associado")
-            else:
-                print(f"⚠️ Contrato não encontrado após criação das pendências")
-
-        except Exception as e:
-            print(f"❌ ERRO ao enviar emails de notificação de pendências automáticas: {e}")
-            print(f"❌ Tipo do erro: {type(e).__name__}")
-            import traceback
-            print(f"❌ Traceback completo:\n{traceback.format_exc()}")
-            # Não falha a criação das pendências por erro no email
-
-        return pendencias_criadas
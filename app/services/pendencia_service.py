@@ -3,11 +3,16 @@ from typing import List, Optional
 from fastapi import HTTPException, status, Request
 import logging
 
+from app.core.database import release_connection
+from app.core.cache import invalidate_dashboards
+from app.core.lookup_registry import lookup_registry
+
 # Repositórios
 from app.repositories.pendencia_repo import PendenciaRepository
 from app.repositories.contrato_repo import ContratoRepository
 from app.repositories.usuario_repo import UsuarioRepository
 from app.repositories.status_pendencia_repo import StatusPendenciaRepository
+from app.repositories.email_outbox_repo import EmailOutboxRepository
 
 # Schemas
 from app.schemas.pendencia_schema import Pendencia, PendenciaCreate
@@ -15,6 +20,7 @@ from app.schemas.usuario_schema import Usuario
 
 # Services
 from app.services.email_service import EmailService
+from app.services.email_outbox_service import EmailOutboxService
 from app.services.audit_integration import (
     audit_criar_pendencia,
     audit_atualizar_pendencia
@@ -27,11 +33,13 @@ class PendenciaService:
                  pendencia_repo: PendenciaRepository,
                  contrato_repo: ContratoRepository,
                  usuario_repo: UsuarioRepository,
-                 status_pendencia_repo: StatusPendenciaRepository):
+                 status_pendencia_repo: StatusPendenciaRepository,
+                 outbox_service: Optional[EmailOutboxService] = None):
         self.pendencia_repo = pendencia_repo
         self.contrato_repo = contrato_repo
         self.usuario_repo = usuario_repo
         self.status_pendencia_repo = status_pendencia_repo
+        self.outbox_service = outbox_service or EmailOutboxService(EmailOutboxRepository(pendencia_repo.conn))
 
     async def _validate_foreign_keys(self, pendencia: PendenciaCreate, contrato_id: int):
         """Valida se todas as chaves estrangeiras existem"""
@@ -41,7 +49,7 @@ class PendenciaService:
         if not await self.usuario_repo.get_user_by_id(pendencia.criado_por_usuario_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário criador não encontrado")
 
-        if not await self.status_pendencia_repo.get_by_id(pendencia.status_pendencia_id):
+        if not await lookup_registry.get_by_id(self.pendencia_repo.conn, "statuspendencia", pendencia.status_pendencia_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Status de pendência não encontrado")
 
     async def create_pendencia(
@@ -51,14 +59,27 @@ class PendenciaService:
         current_user: Optional[Usuario] = None,
         request: Optional[Request] = None
     ) -> Pendencia:
-        """Cria uma nova pendência e envia notificação por email para o fiscal e fiscal substituto"""
+        """
+        Cria uma nova pendência e notifica o fiscal e o fiscal substituto. Os
+        emails são gravados na caixa de saída na mesma transação da pendência.
+        """
         await self._validate_foreign_keys(pendencia_create, contrato_id)
 
-        # Cria a pendência no banco de dados
-        new_pendencia_data = await self.pendencia_repo.create_pendencia(contrato_id, pendencia_create)
-
-        # Busca dados do contrato para o log de auditoria
+        # Busca dados do contrato para os emails e o log de auditoria
         contrato = await self.contrato_repo.find_contrato_by_id(contrato_id)
+        destinatarios = []
+        for campo in ('fiscal_id', 'fiscal_substituto_id'):
+            if contrato and contrato.get(campo):
+                usuario = await self.usuario_repo.get_user_by_id(contrato[campo])
+                if usuario:
+                    destinatarios.append(usuario)
+
+        # Cria a pendência e grava os emails de notificação atomicamente
+        async with self.pendencia_repo.conn.transaction():
+            new_pendencia_data = await self.pendencia_repo.create_pendencia(contrato_id, pendencia_create)
+            emails = self._emails_pendencia_criada(destinatarios, contrato, new_pendencia_data)
+            enfileirados = await self.outbox_service.enfileirar(emails) if emails else True
+        await invalidate_dashboards(self.pendencia_repo.conn)
 
         # Log de auditoria
         if current_user and contrato:
@@ -75,40 +96,37 @@ class PendenciaService:
             except Exception as e:
                 logger.warning(f"Erro ao criar log de auditoria para pendência {new_pendencia_data['id']}: {e}")
 
-        # === NOTIFICAÇÃO POR EMAIL COM TEMPLATES ===
-        try:
-            if contrato:
-                from app.services.email_templates import EmailTemplates
-
-                # Enviar email para o fiscal principal
-                if contrato.get('fiscal_id'):
-                    fiscal = await self.usuario_repo.get_user_by_id(contrato['fiscal_id'])
-                    if fiscal:
-                        subject, body = EmailTemplates.pending_report_notification(
-                            fiscal_nome=fiscal['nome'],
-                            contrato_data=contrato,
-                            pendencia_data=new_pendencia_data
-                        )
-                        await EmailService.send_email(fiscal['email'], subject, body, is_html=True)
-                        print(f"✅ Email de pendência enviado para o fiscal principal: {fiscal['email']}")
-
-                # Enviar email para o fiscal substituto (se houver)
-                if contrato.get('fiscal_substituto_id'):
-                    fiscal_substituto = await self.usuario_repo.get_user_by_id(contrato['fiscal_substituto_id'])
-                    if fiscal_substituto:
-                        subject, body = EmailTemplates.pending_report_notification(
-                            fiscal_nome=fiscal_substituto['nome'],
-                            contrato_data=contrato,
-                            pendencia_data=new_pendencia_data
-                        )
-                        await EmailService.send_email(fiscal_substituto['email'], subject, body, is_html=True)
-                        print(f"✅ Email de pendência enviado para o fiscal substituto: {fiscal_substituto['email']}")
-        except Exception as e:
-            # Log do erro, mas não falha a criação da pendência
-            print(f"❌ Erro ao enviar email de notificação da pendência {new_pendencia_data['id']}: {e}")
+        # Sem a caixa de saída (migração não aplicada), envia diretamente
+        if not enfileirados:
+            await release_connection(self.pendencia_repo.conn)
+            for email, subject, body, is_html in emails:
+                try:
+                    await EmailService.send_email(email, subject, body, is_html=is_html)
+                    print(f"✅ Email de pendência enviado para: {email}")
+                except Exception as e:
+                    # Log do erro, mas não falha a criação da pendência
+                    print(f"❌ Erro ao enviar email de notificação da pendência {new_pendencia_data['id']}: {e}")
 
         return Pendencia.model_validate(new_pendencia_data)
 
+    @staticmethod
+    def _emails_pendencia_criada(destinatarios: List[dict], contrato: Optional[dict], pendencia_data: dict) -> list:
+        """Emails (destinatario, assunto, corpo, is_html) de nova pendência para os fiscais"""
+        from app.services.email_templates import EmailTemplates
+
+        emails = []
+        for fiscal in destinatarios:
+            try:
+                subject, body = EmailTemplates.pending_report_notification(
+                    fiscal_nome=fiscal['nome'],
+                    contrato_data=contrato,
+                    pendencia_data=pendencia_data
+                )
+                emails.append((fiscal['email'], subject, body, True))
+            except Exception as e:
+                print(f"❌ Erro ao montar email de notificação da pendência {pendencia_data['id']}: {e}")
+        return emails
+
     async def get_pendencias_by_contrato_id(self, contrato_id: int) -> List[Pendencia]:
         """Lista todas as pendências de um contrato específico"""
         if not await self.contrato_repo.find_contrato_by_id(contrato_id):
@@ -139,15 +157,16 @@ class PendenciaService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pendência não encontrada")
 
         # Verifica se o status existe
-        novo_status = await self.status_pendencia_repo.get_by_id(novo_status_id)
+        novo_status = await lookup_registry.get_by_id(self.pendencia_repo.conn, "statuspendencia", novo_status_id)
         if not novo_status:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Status de pendência não encontrado")
 
         # Busca status antigo
-        status_antigo = await self.status_pendencia_repo.get_by_id(pendencia_antiga['status_pendencia_id'])
+        status_antigo = await lookup_registry.get_by_id(self.pendencia_repo.conn, "statuspendencia", pendencia_antiga['status_pendencia_id'])
 
         # Atualiza o status
         await self.pendencia_repo.update_pendencia_status(pendencia_id, novo_status_id)
+        await invalidate_dashboards(self.pendencia_repo.conn)
 
         # Log de auditoria
         if current_user:
@@ -260,11 +279,11 @@ class PendenciaService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Fiscal não encontrado")
         
         # Busca contratos onde o usuário é fiscal
-        contratos_data, _ = await self.contrato_repo.get_all_contratos(
+        contratos_data = (await self.contrato_repo.get_all_contratos(
             filters={'fiscal_id': fiscal_id},
             limit=1000,  # Limite alto para pegar todos
-            offset=0
-        )
+            offset=0, contagem="nenhuma"
+        )).itens
         
         pendencias_fiscal = []
         for contrato in contratos_data:
@@ -337,8 +356,7 @@ class PendenciaService:
                 )
 
         # Busca o status 'Cancelada'
-        all_status = await self.status_pendencia_repo.get_all()
-        status_cancelada = next((s for s in all_status if s['nome'] == 'Cancelada'), None)
+        status_cancelada = await lookup_registry.get_by_name(self.pendencia_repo.conn, "statuspendencia", 'Cancelada')
 
         if not status_cancelada:
             raise HTTPException(
@@ -348,6 +366,7 @@ class PendenciaService:
 
         # Atualiza o status da pendência
         await self.pendencia_repo.update_pendencia_status(pendencia_id, status_cancelada['id'])
+        await invalidate_dashboards(self.pendencia_repo.conn)
 
         # === NOTIFICAÇÃO POR EMAIL DE CANCELAMENTO ===
         try:
@@ -362,6 +381,7 @@ class PendenciaService:
                         contrato_data=contrato,
                         pendencia_data=pendencia
                     )
+                    await release_connection(self.pendencia_repo.conn)
                     await EmailService.send_email(fiscal['email'], subject, body, is_html=True)
                     print(f"✅ Email de cancelamento de pendência enviado para o fiscal principal: {fiscal['email']}")
 
@@ -374,6 +394,7 @@ class PendenciaService:
                         contrato_data=contrato,
                         pendencia_data=pendencia
                     )
+                    await release_connection(self.pendencia_repo.conn)
                     await EmailService.send_email(fiscal_substituto['email'], subject, body, is_html=True)
                     print(f"✅ Email de cancelamento de pendência enviado para o fiscal substituto: {fiscal_substituto['email']}")
         except Exception as e:
@@ -4,6 +4,10 @@ from typing import List, Optional
 from fastapi import HTTPException, status, UploadFile, Request
 import logging
 
+from app.core.database import release_connection
+from app.core.cache import invalidate_dashboards
+from app.core.lookup_registry import lookup_registry
+
 # Repositórios
 from app.repositories.relatorio_repo import RelatorioRepository
 from app.repositories.arquivo_repo import ArquivoRepository
@@ -74,6 +78,7 @@ class RelatorioService:
         relatorios_existentes = await self.relatorio_repo.get_relatorios_by_pendencia_id(relatorio_data.pendencia_id)
 
         # Salva o novo arquivo
+        await release_connection(self.relatorio_repo.conn)
         nome_original, path, tamanho = await self.file_service.save_upload_file(contrato_id, file)
 
         arquivo_criado = await self.arquivo_repo.create_arquivo(
@@ -84,7 +89,7 @@ class RelatorioService:
             contrato_id=contrato_id
         )
 
-        status_relatorio_pendente = next(s for s in await self.status_relatorio_repo.get_all() if s['nome'] == 'Pendente de Análise')
+        status_relatorio_pendente = await lookup_registry.get_by_name(self.relatorio_repo.conn, "statusrelatorio", 'Pendente de Análise')
 
         # Se for reenvio, atualiza o relatório existente em vez de criar novo
         if relatorios_existentes:
@@ -131,8 +136,9 @@ class RelatorioService:
 
     async def _update_pendencia_para_analise(self, pendencia_id: int):
         """Atualiza status da pendência para indicar que tem relatório aguardando análise"""
-        # Atualiza para o novo status 'Aguardando Análise' (ID=4)
-        await self.pendencia_repo.update_pendencia_status(pendencia_id, 4)
+        status_aguardando_id = await lookup_registry.require_id(self.pendencia_repo.conn, "statuspendencia", 'Aguardando Análise')
+        await self.pendencia_repo.update_pendencia_status(pendencia_id, status_aguardando_id)
+        await invalidate_dashboards(self.pendencia_repo.conn)
         print(f"✅ Pendência {pendencia_id} alterada para 'Aguardando Análise'")
 
     async def _notify_admin_new_report(self, contrato: dict, pendencia: dict, fiscal: Usuario):
@@ -158,6 +164,7 @@ class RelatorioService:
                 )
 
                 from app.services.email_service import EmailService
+                await release_connection(self.relatorio_repo.conn)
                 await EmailService.send_email(admin['email'], subject, body, is_html=True)
 
                 print(f"✅ Email de notificação enviado para admin {admin['email']}")
@@ -178,7 +185,7 @@ class RelatorioService:
         if not await self.usuario_repo.get_user_by_id(analise_data.aprovador_usuario_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário aprovador não encontrado")
 
-        status_relatorio = await self.status_relatorio_repo.get_by_id(analise_data.status_id)
+        status_relatorio = await lookup_registry.get_by_id(self.relatorio_repo.conn, "statusrelatorio", analise_data.status_id)
         if not status_relatorio:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Status de relatório não encontrado")
 
@@ -189,6 +196,7 @@ class RelatorioService:
 
         # Atualiza o relatório
         relatorio_atualizado = await self.relatorio_repo.analise_relatorio(relatorio_id, analise_data.model_dump())
+        await invalidate_dashboards(self.relatorio_repo.conn)
 
         # Processa baseado no status
         status_nome = status_relatorio['nome']
@@ -215,7 +223,7 @@ class RelatorioService:
         """Processa aprovação do relatório"""
         try:
             # Muda status da pendência para 'Concluída'
-            status_concluida = next(s for s in await self.status_pendencia_repo.get_all() if s['nome'] == 'Concluída')
+            status_concluida = await lookup_registry.get_by_name(self.pendencia_repo.conn, "statuspendencia", 'Concluída')
             await self.pendencia_repo.update_pendencia_status(pendencia['id'], status_concluida['id'])
 
             # Log de auditoria
@@ -242,6 +250,7 @@ class RelatorioService:
             )
 
             from app.services.email_service import EmailService
+            await release_connection(self.relatorio_repo.conn)
             await EmailService.send_email(fiscal['email'], subject, body, is_html=True)
 
             print(f"✅ Relatório aprovado e email enviado para {fiscal['email']}")
@@ -261,7 +270,7 @@ class RelatorioService:
         """Processa rejeição do relatório"""
         try:
             # Volta status da pendência para 'Pendente' para que o fiscal possa reenviar
-            status_pendente = next(s for s in await self.status_pendencia_repo.get_all() if s['nome'] == 'Pendente')
+            status_pendente = await lookup_registry.get_by_name(self.pendencia_repo.conn, "statuspendencia", 'Pendente')
             await self.pendencia_repo.update_pendencia_status(pendencia['id'], status_pendente['id'])
 
             # Log de auditoria
@@ -290,6 +299,7 @@ class RelatorioService:
             )
 
             from app.services.email_service import EmailService
+            await release_connection(self.relatorio_repo.conn)
             await EmailService.send_email(fiscal['email'], subject, body, is_html=True)
 
             print(f"✅ Relatório rejeitado e email enviado para {fiscal['email']}")
@@ -7,12 +7,21 @@ from app.repositories.session_context_repo import SessionContextRepository
 from app.repositories.usuario_repo import UsuarioRepository
 from app.repositories.usuario_perfil_repo import UsuarioPerfilRepository
 from app.repositories.contrato_repo import ContratoRepository
+from app.repositories.contadores_repo import ContadoresRepository
 from app.schemas.session_context_schema import (
     ContextoSessao, PerfilAtivo, AlternarPerfilRequest, 
     LoginResponse, DashboardData, PermissaoContextual,
     PerfilSwitchHistoryItem
 )
 
+# Contadores de /auth/dashboard-data por perfil ativo
+ESTATISTICAS_POR_PERFIL = {
+    "Administrador": ("total_contratos", "usuarios_ativos", "relatorios_pendentes", "pendencias_abertas"),
+    "Gestor": ("contratos_sob_gestao", "relatorios_para_aprovar", "pendencias_criadas"),
+    "Fiscal": ("contratos_fiscalizados", "pendencias_ativas", "relatorios_submetidos"),
+}
+
+
 class SessionContextService:
     def __init__(self, 
                  session_repo: SessionContextRepository,
@@ -297,9 +306,9 @@ class SessionContextService:
             
         elif perfil_ativo == "Gestor":
             # Busca contratos onde é gestor
-            contratos_gestao, _ = await self.contrato_repo.get_all_contratos(
-                filters={'gestor_id': usuario_id}, limit=1000, offset=0
-            )
+            contratos_gestao = (await self.contrato_repo.get_all_contratos(
+                filters={'gestor_id': usuario_id}, limit=1000, offset=0, contagem="nenhuma"
+            )).itens
             contratos_ids = [c['id'] for c in contratos_gestao]
             
             permissions = PermissaoContextual(
@@ -317,9 +326,9 @@ class SessionContextService:
             
         elif perfil_ativo == "Fiscal":
             # Busca contratos onde é fiscal
-            contratos_fiscal, _ = await self.contrato_repo.get_all_contratos(
-                filters={'fiscal_id': usuario_id}, limit=1000, offset=0
-            )
+            contratos_fiscal = (await self.contrato_repo.get_all_contratos(
+                filters={'fiscal_id': usuario_id}, limit=1000, offset=0, contagem="nenhuma"
+            )).itens
             contratos_ids = [c['id'] for c in contratos_fiscal]
             
             permissions = PermissaoContextual(
@@ -354,92 +363,19 @@ class SessionContextService:
         return await self.session_repo.cleanup_expired_sessions(hours=24)
 
     async def _get_profile_statistics(self, usuario_id: int, perfil_ativo: str) -> Dict:
-        """Busca estatísticas específicas do perfil"""
-        stats = {}
-        
-        if perfil_ativo == "Administrador":
-            stats = {
-                "total_contratos": await self._count_total_contracts(),
-                "usuarios_ativos": await self._count_active_users(),
-                "relatorios_pendentes": await self._count_pending_reports(),
-                "pendencias_abertas": await self._count_open_tasks()
-            }
-        elif perfil_ativo == "Gestor":
-            stats = {
-                "contratos_sob_gestao": await self._count_user_managed_contracts(usuario_id),
-                "relatorios_para_aprovar": await self._count_reports_to_approve(usuario_id),
-                "pendencias_criadas": await self._count_created_tasks(usuario_id)
-            }
-        elif perfil_ativo == "Fiscal":
-            stats = {
-                "contratos_fiscalizados": await self._count_user_fiscal_contracts(usuario_id),
-                "pendencias_ativas": await self._count_user_active_tasks(usuario_id),
-                "relatorios_submetidos": await self._count_user_submitted_reports(usuario_id)
-            }
-        
-        return stats
-
-    # Métodos auxiliares para estatísticas
-    async def _count_total_contracts(self) -> int:
-        return await self.session_repo.conn.fetchval("SELECT COUNT(*) FROM contrato WHERE ativo = TRUE")
-
-    async def _count_active_users(self) -> int:
-        return await self.session_repo.conn.fetchval("SELECT COUNT(*) FROM usuario WHERE ativo = TRUE")
-
-    async def _count_pending_reports(self) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM relatoriofiscal rf
-            JOIN statusrelatorio sr ON rf.status_id = sr.id
-            WHERE sr.nome = 'Pendente de Análise'
-        """)
-
-    async def _count_open_tasks(self) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM pendenciarelatorio pr
-            JOIN statuspendencia sp ON pr.status_pendencia_id = sp.id
-            WHERE sp.nome = 'Pendente'
-        """)
-
-    async def _count_user_managed_contracts(self, usuario_id: int) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM contrato 
-            WHERE gestor_id = $1 AND ativo = TRUE
-        """, usuario_id)
-
-    async def _count_reports_to_approve(self, usuario_id: int) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM relatoriofiscal rf
-            JOIN contrato c ON rf.contrato_id = c.id
-            JOIN statusrelatorio sr ON rf.status_id = sr.id
-            WHERE c.gestor_id = $1 AND sr.nome = 'Pendente de Análise'
-        """, usuario_id)
-
-    async def _count_created_tasks(self, usuario_id: int) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM pendenciarelatorio 
-            WHERE criado_por_usuario_id = $1
-        """, usuario_id)
-
-    async def _count_user_fiscal_contracts(self, usuario_id: int) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM contrato 
-            WHERE (fiscal_id = $1 OR fiscal_substituto_id = $1) AND ativo = TRUE
-        """, usuario_id)
-
-    async def _count_user_active_tasks(self, usuario_id: int) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM pendenciarelatorio pr
-            JOIN contrato c ON pr.contrato_id = c.id
-            JOIN statuspendencia sp ON pr.status_pendencia_id = sp.id
-            WHERE (c.fiscal_id = $1 OR c.fiscal_substituto_id = $1) 
-            AND sp.nome = 'Pendente'
-        """, usuario_id)
-
-    async def _count_user_submitted_reports(self, usuario_id: int) -> int:
-        return await self.session_repo.conn.fetchval("""
-            SELECT COUNT(*) FROM relatoriofiscal 
-            WHERE fiscal_usuario_id = $1
-        """, usuario_id)
+        """
+        Busca estatísticas específicas do perfil (uma única consulta agregada).
+        Se a consulta falhar, os contadores do perfil vêm zerados em vez de
+        derrubar o contexto da sessão.
+        """
+        try:
+            stats = await ContadoresRepository(self.session_repo.conn).get_estatisticas_sessao(
+                usuario_id, perfil_ativo
+            )
+        except Exception as e:
+            print(f"❌ Erro ao buscar estatísticas do perfil {perfil_ativo}: {e}")
+            stats = {}
+        return {chave: stats.get(chave, 0) for chave in ESTATISTICAS_POR_PERFIL.get(perfil_ativo, ())}
 
     async def get_session_context_by_user(self, usuario_id: int) -> Optional[ContextoSessao]:
         """Busca contexto de sessão ativo baseado no ID do usuário"""
@@ -589,9 +525,9 @@ class SessionContextService:
             elif perfil_ativo == "Gestor":
                 # Busca contratos onde é gestor
                 try:
-                    contratos_gestao, _ = await self.contrato_repo.get_all_contratos(
-                        filters={'gestor_id': usuario_id}, limit=100, offset=0
-                    )
+                    contratos_gestao = (await self.contrato_repo.get_all_contratos(
+                        filters={'gestor_id': usuario_id}, limit=100, offset=0, contagem="nenhuma"
+                    )).itens
                     contratos_ids = [c['id'] for c in contratos_gestao]
                 except:
                     contratos_ids = []
@@ -612,9 +548,9 @@ class SessionContextService:
             elif perfil_ativo == "Fiscal":
                 # Busca contratos onde é fiscal
                 try:
-                    contratos_fiscal, _ = await self.contrato_repo.get_all_contratos(
-                        filters={'fiscal_id': usuario_id}, limit=100, offset=0
-                    )
+                    contratos_fiscal = (await self.contrato_repo.get_all_contratos(
+                        filters={'fiscal_id': usuario_id}, limit=100, offset=0, contagem="nenhuma"
+                    )).itens
                     contratos_ids = [c['id'] for c in contratos_fiscal]
                 except:
                     contratos_ids = []
@@ -0,0 +1,185 @@
+# app/services/smtp_pool.py
+"""
+Pool de conexões SMTP autenticadas.
+
+aiosmtplib.send abre uma conexão (TCP + STARTTLS + AUTH) por mensagem; em
+execuções em lote (alertas, escalonamento, caixa de saída) isso significa
+centenas de sessões TLS. O pool mantém até SMTP_POOL_TAMANHO sessões abertas
+e as reutiliza:
+
+- conexões ociosas há mais de SMTP_POOL_NOOP_APOS_SEGUNDOS passam por um NOOP
+  antes do uso; as ociosas há mais de SMTP_POOL_OCIOSA_MAX_SEGUNDOS são fechadas;
+- cada conexão envia no máximo SMTP_POOL_MAX_MENSAGENS mensagens (muitos
+  provedores derrubam sessões longas);
+- se o servidor desconectar no meio do envio, a mensagem é reenviada uma vez
+  por uma conexão nova.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Dict, List, Optional
+
+import aiosmtplib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Erros que indicam que a sessão não serve mais (reconectar e tentar de novo)
+ERROS_CONEXAO = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError, OSError)
+
+
+@dataclass(frozen=True)
+class ConfigSMTP:
+    hostname: str
+    port: int
+    username: Optional[str] = None
+    password: Optional[str] = None
+    start_tls: bool = True
+    use_tls: bool = False
+    timeout: float = 60.0
+
+
+@dataclass
+class _ConexaoSMTP:
+    cliente: aiosmtplib.SMTP
+    mensagens: int = 0
+    ultimo_uso: float = field(default_factory=time.monotonic)
+
+
+class SMTPConnectionPool:
+    def __init__(
+        self,
+        config: ConfigSMTP,
+        tamanho: Optional[int] = None,
+        max_mensagens: Optional[int] = None,
+        noop_apos: Optional[float] = None,
+        ociosa_max: Optional[float] = None
+    ):
+        self.config = config
+        self.tamanho = tamanho or settings.SMTP_POOL_TAMANHO
+        self.max_mensagens = max_mensagens or settings.SMTP_POOL_MAX_MENSAGENS
+        self.noop_apos = noop_apos if noop_apos is not None else settings.SMTP_POOL_NOOP_APOS_SEGUNDOS
+        self.ociosa_max = ociosa_max if ociosa_max is not None else settings.SMTP_POOL_OCIOSA_MAX_SEGUNDOS
+        self._livres: List[_ConexaoSMTP] = []
+        self._vagas = asyncio.Semaphore(self.tamanho)
+        self.loop = asyncio.get_running_loop()
+        self.conexoes_abertas = 0  # sessões autenticadas criadas desde o início (métrica/testes)
+
+    async def _conectar(self) -> _ConexaoSMTP:
+        cliente = aiosmtplib.SMTP(
+            hostname=self.config.hostname,
+            port=self.config.port,
+            username=self.config.username,
+            password=self.config.password,
+            start_tls=self.config.start_tls,
+            use_tls=self.config.use_tls,
+            timeout=self.config.timeout
+        )
+        # connect() também faz STARTTLS e AUTH quando configurados
+        await cliente.connect()
+        self.conexoes_abertas += 1
+        return _ConexaoSMTP(cliente)
+
+    @staticmethod
+    async def _fechar(conexao: _ConexaoSMTP) -> None:
+        try:
+            if conexao.cliente.is_connected:
+                await conexao.cliente.quit()
+        except Exception:
+            conexao.cliente.close()
+
+    async def _saudavel(self, conexao: _ConexaoSMTP) -> bool:
+        if not conexao.cliente.is_connected or conexao.mensagens >= self.max_mensagens:
+            return False
+        ociosa = time.monotonic() - conexao.ultimo_uso
+        if ociosa > self.ociosa_max:
+            return False
+        if ociosa > self.noop_apos:
+            try:
+                await conexao.cliente.noop()
+            except Exception:
+                return False
+        return True
+
+    async def _obter(self) -> _ConexaoSMTP:
+        """Conexão livre e saudável ou uma nova (a vaga já foi reservada)"""
+        while self._livres:
+            conexao = self._livres.pop()
+            if await self._saudavel(conexao):
+                return conexao
+            await self._fechar(conexao)
+        return await self._conectar()
+
+    async def _devolver(self, conexao: _ConexaoSMTP) -> None:
+        conexao.ultimo_uso = time.monotonic()
+        if conexao.cliente.is_connected and conexao.mensagens < self.max_mensagens:
+            self._livres.append(conexao)
+        else:
+            await self._fechar(conexao)
+
+    async def send_message(self, message: Message) -> None:
+        """Envia a mensagem por uma sessão do pool; reconecta uma vez se a sessão caiu"""
+        async with self._vagas:
+            conexao = await self._obter()
+            try:
+                try:
+                    await conexao.cliente.send_message(message)
+                except ERROS_CONEXAO as e:
+                    logger.warning(f"Sessão SMTP perdida ({e}); reconectando")
+                    await self._fechar(conexao)
+                    conexao = await self._conectar()
+                    await conexao.cliente.send_message(message)
+            except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+                # Recusa do servidor (ex.: destinatário inválido): a sessão continua utilizável
+                conexao.mensagens += 1
+                await self._devolver(conexao)
+                raise
+            except BaseException:
+                # Estado da sessão desconhecido (queda, timeout, cancelamento)
+                await self._fechar(conexao)
+                raise
+            conexao.mensagens += 1
+            await self._devolver(conexao)
+
+    async def close(self) -> None:
+        livres, self._livres = self._livres, []
+        for conexao in livres:
+            await self._fechar(conexao)
+
+    def descartar(self) -> None:
+        """Abandona as sessões sem QUIT (o event loop delas já terminou)"""
+        livres, self._livres = self._livres, []
+        for conexao in livres:
+            try:
+                conexao.cliente.close()
+            except Exception:
+                pass
+
+
+# Um pool por configuração; sessões não podem trocar de event loop, então um
+# loop novo (ex.: scripts com asyncio.run, testes) recebe um pool novo
+_pools: Dict[ConfigSMTP, SMTPConnectionPool] = {}
+
+
+def get_smtp_pool(config: ConfigSMTP) -> SMTPConnectionPool:
+    """Pool da configuração; deve ser chamado dentro do event loop"""
+    pool = _pools.get(config)
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        if pool is not None:
+            pool.descartar()
+        pool = _pools[config] = SMTPConnectionPool(config)
+    return pool
+
+
+async def close_smtp_pools() -> None:
+    """Fecha as sessões SMTP abertas (encerramento da aplicação/scripts)"""
+    loop = asyncio.get_running_loop()
+    while _pools:
+        _, pool = _pools.popitem()
+        if pool.loop is loop:
+            await pool.close()
+        else:
+            pool.descartar()
@@ -1,36 +1,54 @@
 # app/services/usuario_service.py
-import math
 from typing import Optional, List, Dict
 from fastapi import HTTPException, status
 from app.repositories.usuario_repo import UsuarioRepository
+from app.repositories.preferencia_notificacao_repo import PreferenciaNotificacaoRepository
 from app.schemas.usuario_schema import (
     Usuario, UsuarioCreate, UsuarioUpdate, 
     UsuarioChangePassword, UsuarioResetPassword,
-    UsuarioPaginated, UsuarioList
+    UsuarioPaginated, UsuarioList, PreferenciaNotificacao
 )
+from app.core.pagination import Contagem
 from app.core.security import get_password_hash, verify_password
 
 class UsuarioService:
     def __init__(self, usuario_repo: UsuarioRepository):
         self.usuario_repo = usuario_repo
+        self.preferencia_repo = PreferenciaNotificacaoRepository(usuario_repo.conn)
+
+    async def get_preferencia_notificacao(self, usuario_id: int) -> PreferenciaNotificacao:
+        """Modo de entrega dos emails das rotinas em lote (resumo ou imediato)."""
+        return PreferenciaNotificacao(modo=await self.preferencia_repo.get_modo(usuario_id))
+
+    async def set_preferencia_notificacao(
+        self, usuario_id: int, preferencia: PreferenciaNotificacao
+    ) -> PreferenciaNotificacao:
+        if not await self.preferencia_repo.disponivel():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Preferências de notificação indisponíveis: aplique a migração 011_preferencia_notificacao.sql"
+            )
+        modo = await self.preferencia_repo.set_modo(usuario_id, preferencia.modo)
+        return PreferenciaNotificacao(modo=modo)
 
     async def get_all_paginated(
-        self, page: int, per_page: int, filters: Optional[Dict] = None
+        self, page: int, per_page: int, filters: Optional[Dict] = None,
+        contagem: Contagem = "exata"
     ) -> UsuarioPaginated:
         """Lista todos os usuários com paginação e filtros."""
         offset = (page - 1) * per_page
-        users_data, total_items = await self.usuario_repo.get_all_users_paginated(
-            filters=filters, limit=per_page, offset=offset
+        pagina = await self.usuario_repo.get_all_users_paginated(
+            filters=filters, limit=per_page, offset=offset, contagem=contagem
         )
         
-        total_pages = math.ceil(total_items / per_page) if total_items > 0 else 1
-        
         return UsuarioPaginated(
-            data=[UsuarioList.model_validate(u) for u in users_data],
-            total_items=total_items,
-            total_pages=total_pages,
+            data=[UsuarioList.model_validate(u) for u in pagina.itens],
+            total_items=pagina.total,
+            total_pages=pagina.total_paginas(per_page),
             current_page=page,
-            per_page=per_page
+            per_page=per_page,
+            has_more=pagina.has_more,
+            total_estimado=pagina.total_estimado
         )
 
     async def get_by_id(self, user_id: int) -> Optional[Usuario]:
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark dos templates de email (sem enviar emails)
+
+    python bench_email_templates.py [quantidade]
+
+Renderiza `quantidade` notificações (todos os templates, em rodízio), como em
+uma rotina em lote, e mostra o tempo total e por email.
+"""
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+# Adicionar o diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.email_templates import EmailTemplates
+
+
+def benchmark(quantidade: int = 10_000) -> float:
+    """Renderiza `quantidade` notificações; retorna os segundos gastos"""
+    contrato = {
+        'nr_contrato': '001/2025', 'objeto': 'Serviços de limpeza', 'data_inicio': date(2025, 1, 1),
+        'data_fim': date(2025, 12, 31), 'valor_anual': 120000.0, 'valor_global': 360000.0,
+        'contratado_nome': 'Empresa XYZ', 'modalidade_nome': 'Pregão Eletrônico'
+    }
+    pendencia = {'descricao': 'Relatório mensal', 'data_prazo': date.today() + timedelta(days=2)}
+    fiscal = {'nome': 'Maria Souza', 'email': 'maria@exemplo.gov.br'}
+    renderizadores = [
+        lambda: EmailTemplates.contract_assignment_fiscal('Maria Souza', contrato),
+        lambda: EmailTemplates.contract_assignment_manager('João Lima', contrato, fiscal),
+        lambda: EmailTemplates.contract_transfer_notification('Maria Souza', contrato, 'Ana Costa'),
+        lambda: EmailTemplates.pending_report_notification('Maria Souza', contrato, pendencia),
+        lambda: EmailTemplates.pending_cancellation_notification('Maria Souza', contrato, pendencia),
+        lambda: EmailTemplates.report_submitted_notification('João Lima', contrato, pendencia, fiscal),
+        lambda: EmailTemplates.report_approved_notification('Maria Souza', contrato, pendencia),
+        lambda: EmailTemplates.report_rejected_notification('Maria Souza', contrato, pendencia, 'Faltam anexos'),
+    ]
+
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        renderizadores[i % len(renderizadores)]()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    segundos = benchmark(quantidade)
+    print(f"📧 {quantidade} notificações renderizadas em {segundos * 1000:.1f} ms "
+          f"({segundos / quantidade * 1e6:.1f} µs por email)")
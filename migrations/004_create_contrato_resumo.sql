@@ -0,0 +1,137 @@
+-- Migration: Resumo de pendências e relatórios por contrato
+-- Descrição: Tabela mantida por triggers com os contadores por contrato usados
+--            nas listas do dashboard (pendências abertas, vencidas, relatórios
+--            aguardando análise e última atividade). Evita JOIN + GROUP BY sobre
+--            todo o histórico de pendências e relatórios a cada leitura.
+
+CREATE TABLE IF NOT EXISTS contrato_resumo (
+    contrato_id INTEGER PRIMARY KEY REFERENCES contrato(id) ON DELETE CASCADE,
+
+    -- Pendências com status 'Pendente'
+    pendencias_abertas INTEGER NOT NULL DEFAULT 0,
+    pendencias_vencidas INTEGER NOT NULL DEFAULT 0,      -- recalculado diariamente (depende da data)
+    ultima_pendencia_em TIMESTAMP,                       -- criação da pendência aberta mais recente
+
+    -- Relatórios com status 'Pendente de Análise'
+    relatorios_pendentes_analise INTEGER NOT NULL DEFAULT 0,
+    ultimo_relatorio_em TIMESTAMP,                       -- envio do relatório pendente mais recente
+    ultimo_relatorio_fiscal_id INTEGER REFERENCES usuario(id),
+
+    ultima_atividade TIMESTAMP,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+-- Índices parciais: as listas do dashboard leem apenas contratos com algo pendente
+CREATE INDEX IF NOT EXISTS idx_contrato_resumo_pendencias
+    ON contrato_resumo (ultima_pendencia_em) WHERE pendencias_abertas > 0;
+CREATE INDEX IF NOT EXISTS idx_contrato_resumo_relatorios
+    ON contrato_resumo (ultimo_relatorio_em) WHERE relatorios_pendentes_analise > 0;
+
+-- Recalcula o resumo de um contrato (usa os índices por contrato_id)
+CREATE OR REPLACE FUNCTION refresh_contrato_resumo(p_contrato_id INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO contrato_resumo (
+        contrato_id, pendencias_abertas, pendencias_vencidas, ultima_pendencia_em,
+        relatorios_pendentes_analise, ultimo_relatorio_em, ultimo_relatorio_fiscal_id,
+        ultima_atividade, atualizado_em
+    )
+    SELECT
+        p_contrato_id,
+        pend.abertas,
+        pend.vencidas,
+        pend.ultima,
+        rel.pendentes,
+        rel.ultimo,
+        rel.ultimo_fiscal_id,
+        GREATEST(pend.ultima_atividade, rel.ultima_atividade),
+        CURRENT_TIMESTAMP
+    FROM (
+        SELECT
+            COUNT(*) FILTER (WHERE sp.nome = 'Pendente') AS abertas,
+            COUNT(*) FILTER (WHERE sp.nome = 'Pendente' AND p.data_prazo < CURRENT_DATE) AS vencidas,
+            MAX(p.created_at) FILTER (WHERE sp.nome = 'Pendente') AS ultima,
+            MAX(p.updated_at) AS ultima_atividade
+        FROM pendenciarelatorio p
+        JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
+        WHERE p.contrato_id = p_contrato_id
+    ) pend,
+    (
+        SELECT
+            COUNT(*) FILTER (WHERE sr.nome = 'Pendente de Análise') AS pendentes,
+            MAX(r.created_at) FILTER (WHERE sr.nome = 'Pendente de Análise') AS ultimo,
+            (ARRAY_AGG(r.fiscal_usuario_id ORDER BY r.created_at DESC)
+                FILTER (WHERE sr.nome = 'Pendente de Análise'))[1] AS ultimo_fiscal_id,
+            MAX(r.updated_at) AS ultima_atividade
+        FROM relatoriofiscal r
+        JOIN statusrelatorio sr ON r.status_id = sr.id
+        WHERE r.contrato_id = p_contrato_id
+    ) rel
+    ON CONFLICT (contrato_id) DO UPDATE SET
+        pendencias_abertas = EXCLUDED.pendencias_abertas,
+        pendencias_vencidas = EXCLUDED.pendencias_vencidas,
+        ultima_pendencia_em = EXCLUDED.ultima_pendencia_em,
+        relatorios_pendentes_analise = EXCLUDED.relatorios_pendentes_analise,
+        ultimo_relatorio_em = EXCLUDED.ultimo_relatorio_em,
+        ultimo_relatorio_fiscal_id = EXCLUDED.ultimo_relatorio_fiscal_id,
+        ultima_atividade = EXCLUDED.ultima_atividade,
+        atualizado_em = EXCLUDED.atualizado_em;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger compartilhado por pendenciarelatorio e relatoriofiscal
+CREATE OR REPLACE FUNCTION trg_refresh_contrato_resumo()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_contrato_resumo(OLD.contrato_id);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.contrato_id IS DISTINCT FROM OLD.contrato_id) THEN
+        PERFORM refresh_contrato_resumo(NEW.contrato_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pendenciarelatorio_contrato_resumo ON pendenciarelatorio;
+CREATE TRIGGER pendenciarelatorio_contrato_resumo
+    AFTER INSERT OR UPDATE OR DELETE ON pendenciarelatorio
+    FOR EACH ROW EXECUTE FUNCTION trg_refresh_contrato_resumo();
+
+DROP TRIGGER IF EXISTS relatoriofiscal_contrato_resumo ON relatoriofiscal;
+CREATE TRIGGER relatoriofiscal_contrato_resumo
+    AFTER INSERT OR UPDATE OR DELETE ON relatoriofiscal
+    FOR EACH ROW EXECUTE FUNCTION trg_refresh_contrato_resumo();
+
+-- Pendências vencem com a passagem do tempo, sem nenhuma escrita: recalcula
+-- diariamente apenas os contratos com pendências abertas (agendador da aplicação)
+CREATE OR REPLACE FUNCTION refresh_contrato_resumo_vencidas()
+RETURNS INTEGER AS $$
+DECLARE
+    atualizados INTEGER;
+BEGIN
+    UPDATE contrato_resumo rs
+    SET pendencias_vencidas = v.vencidas,
+        atualizado_em = CURRENT_TIMESTAMP
+    FROM (
+        SELECT rs2.contrato_id, COUNT(sp.id) AS vencidas
+        FROM contrato_resumo rs2
+        LEFT JOIN pendenciarelatorio p
+            ON p.contrato_id = rs2.contrato_id AND p.data_prazo < CURRENT_DATE
+        LEFT JOIN statuspendencia sp
+            ON p.status_pendencia_id = sp.id AND sp.nome = 'Pendente'
+        WHERE rs2.pendencias_abertas > 0
+        GROUP BY rs2.contrato_id
+    ) v
+    WHERE rs.contrato_id = v.contrato_id
+      AND rs.pendencias_vencidas IS DISTINCT FROM v.vencidas;
+
+    GET DIAGNOSTICS atualizados = ROW_COUNT;
+    RETURN atualizados;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Carga inicial
+SELECT refresh_contrato_resumo(c.id) FROM contrato c;
+
+COMMENT ON TABLE contrato_resumo IS 'Resumo por contrato de pendências e relatórios, mantido por triggers';
@@ -0,0 +1,21 @@
+-- Migration: Índices para paginação por cursor (keyset) de contratos
+-- Descrição: GET /api/v1/contratos?paginacao=cursor ordena por
+--            (COALESCE(data_fim, 'infinity'), id) DESC e filtra por
+--            (chave, id) < (cursor). Um índice por forma de isolamento de perfil:
+--            administrador (todos), gestor e fiscal / fiscal substituto.
+
+CREATE INDEX IF NOT EXISTS idx_contrato_keyset
+    ON contrato ((COALESCE(data_fim, 'infinity'::date)) DESC, id DESC)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_keyset_gestor
+    ON contrato (gestor_id, (COALESCE(data_fim, 'infinity'::date)) DESC, id DESC)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_keyset_fiscal
+    ON contrato (fiscal_id, (COALESCE(data_fim, 'infinity'::date)) DESC, id DESC)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_keyset_fiscal_substituto
+    ON contrato (fiscal_substituto_id, (COALESCE(data_fim, 'infinity'::date)) DESC, id DESC)
+    WHERE ativo = TRUE AND fiscal_substituto_id IS NOT NULL;
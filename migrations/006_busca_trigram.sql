@@ -0,0 +1,53 @@
+-- Migration: Busca aproximada por trigramas (pg_trgm + unaccent)
+-- Descrição: Os filtros de texto de contratos (objeto, nr_contrato, pae),
+--            contratados (nome, email) e usuários (nome) usavam ILIKE '%termo%',
+--            que obriga a varredura sequencial da tabela. Esta migração cria a
+--            função normalizar_busca (minúsculas, sem acentos) e índices GIN de
+--            trigramas sobre a expressão normalizada, usados tanto pelos filtros
+--            "contém" (LIKE) quanto pela busca por similaridade (<%).
+--
+-- Após aplicar, notifique os workers para relerem o catálogo:
+--   SELECT pg_notify('sigescon_cache_invalidation', '{"entity": "schema", "key": null}');
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() é STABLE (depende do dicionário configurado) e não pode ser usado
+-- em índices; fixar o dicionário torna a expressão IMMUTABLE.
+CREATE OR REPLACE FUNCTION normalizar_busca(texto TEXT)
+RETURNS TEXT AS $$
+    SELECT lower(public.unaccent('public.unaccent'::regdictionary, texto))
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+-- Contratos
+CREATE INDEX IF NOT EXISTS idx_contrato_objeto_trgm
+    ON contrato USING gin (normalizar_busca(objeto) gin_trgm_ops)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_nr_contrato_trgm
+    ON contrato USING gin (normalizar_busca(nr_contrato) gin_trgm_ops)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_pae_trgm
+    ON contrato USING gin (normalizar_busca(pae) gin_trgm_ops)
+    WHERE ativo = TRUE;
+
+-- Contratados
+CREATE INDEX IF NOT EXISTS idx_contratado_nome_trgm
+    ON contratado USING gin (normalizar_busca(nome) gin_trgm_ops)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_contratado_email_trgm
+    ON contratado USING gin (normalizar_busca(email) gin_trgm_ops)
+    WHERE ativo = TRUE;
+
+-- Usuários
+CREATE INDEX IF NOT EXISTS idx_usuario_nome_trgm
+    ON usuario USING gin (normalizar_busca(nome) gin_trgm_ops)
+    WHERE ativo = TRUE;
+
+ANALYZE contrato;
+ANALYZE contratado;
+ANALYZE usuario;
+
+COMMENT ON FUNCTION normalizar_busca(TEXT) IS 'Texto em minúsculas e sem acentos, base dos índices de trigramas';
@@ -0,0 +1,44 @@
+-- Migration: Busca textual (full-text) em contratos, pendências e relatórios
+-- Descrição: Colunas tsvector geradas com a configuração 'portuguese' (stemming
+--            e stopwords em português) e índices GIN, usadas por
+--            GET /api/v1/busca. Por serem GENERATED ... STORED, as colunas são
+--            mantidas pelo próprio banco em cada INSERT/UPDATE.
+--            Peso A: identificação/título; peso B: textos longos.
+
+ALTER TABLE contrato
+    ADD COLUMN IF NOT EXISTS busca_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(nr_contrato, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(objeto, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(termos_contratuais, '')), 'B')
+    ) STORED;
+
+ALTER TABLE pendenciarelatorio
+    ADD COLUMN IF NOT EXISTS busca_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(descricao, '')), 'B')
+    ) STORED;
+
+-- observacoes guarda as observações do fiscal (observacoes_fiscal na API)
+ALTER TABLE relatoriofiscal
+    ADD COLUMN IF NOT EXISTS busca_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(observacoes, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_busca_tsv
+    ON contrato USING gin (busca_tsv)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_pendenciarelatorio_busca_tsv
+    ON pendenciarelatorio USING gin (busca_tsv)
+    WHERE ativo = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_relatoriofiscal_busca_tsv
+    ON relatoriofiscal USING gin (busca_tsv)
+    WHERE ativo = TRUE;
+
+COMMENT ON COLUMN contrato.busca_tsv IS 'Vetor de busca textual (portuguese): nr_contrato, objeto, termos_contratuais';
+COMMENT ON COLUMN pendenciarelatorio.busca_tsv IS 'Vetor de busca textual (portuguese): titulo, descricao';
+COMMENT ON COLUMN relatoriofiscal.busca_tsv IS 'Vetor de busca textual (portuguese): observacoes do fiscal';
@@ -0,0 +1,17 @@
+-- Migration: Numeração de contratos por contador
+-- Descrição: Um contador por chave de numeração ('' para a numeração única ou
+--            o ano quando CONTRATO_NUMERO_FORMATO contém {ano}). O próximo
+--            número é obtido com UPDATE ... RETURNING na linha do contador,
+--            que a bloqueia até o fim da instrução: O(1) e sem números
+--            repetidos sob criação concorrente, no lugar de
+--            MAX(CAST(nr_contrato AS INTEGER)) sobre todos os contratos.
+--            As linhas são criadas na primeira alocação de cada chave, a
+--            partir do maior número já existente.
+
+CREATE TABLE IF NOT EXISTS contrato_numeracao (
+    chave VARCHAR(20) PRIMARY KEY,
+    ultimo_numero BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE contrato_numeracao IS 'Último número de contrato alocado por chave de numeração (ano ou vazio)';
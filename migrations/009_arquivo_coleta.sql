@@ -0,0 +1,18 @@
+-- Migration: Fila de coleta de arquivos de contratos excluídos
+-- Descrição: A exclusão (soft delete) de contratos desativa os registros de
+--            arquivo na mesma instrução e agenda aqui a remoção dos arquivos
+--            físicos, feita depois do prazo de retenção
+--            (CONTRATO_ARQUIVOS_RETENCAO_DIAS) pelo job de coleta do
+--            agendador. Enquanto o prazo não vence, reativar o contrato e
+--            seus arquivos ainda é possível.
+
+CREATE TABLE IF NOT EXISTS arquivo_coleta (
+    arquivo_id INTEGER PRIMARY KEY REFERENCES arquivo(id),
+    caminho_arquivo TEXT NOT NULL,
+    remover_apos TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_arquivo_coleta_remover_apos ON arquivo_coleta (remover_apos);
+
+COMMENT ON TABLE arquivo_coleta IS 'Arquivos físicos de contratos excluídos aguardando remoção do disco';
@@ -0,0 +1,33 @@
+-- Migration: Caixa de saída de emails (outbox)
+-- Descrição: Emails gravados na mesma transação da alteração que os originou
+--            e entregues por um worker (EmailOutboxWorker). Os workers
+--            reservam lotes com FOR UPDATE SKIP LOCKED, então vários podem
+--            rodar em paralelo sem enviar a mesma mensagem duas vezes. Uma
+--            reserva expira em `bloqueado_ate` (worker que caiu no meio do
+--            lote); falhas voltam para 'pendente' com espera exponencial até
+--            `max_tentativas`, quando ficam como 'falhou'.
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    destinatario VARCHAR(255) NOT NULL,
+    assunto TEXT NOT NULL,
+    corpo TEXT NOT NULL,
+    is_html BOOLEAN NOT NULL DEFAULT TRUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pendente'
+        CHECK (status IN ('pendente', 'enviando', 'enviado', 'falhou')),
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    max_tentativas INTEGER NOT NULL DEFAULT 5,
+    proxima_tentativa TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    bloqueado_ate TIMESTAMP,
+    ultimo_erro TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    enviado_em TIMESTAMP
+);
+
+-- Fila: só as mensagens ainda não entregues
+CREATE INDEX IF NOT EXISTS idx_email_outbox_fila
+    ON email_outbox (proxima_tentativa)
+    WHERE status IN ('pendente', 'enviando');
+
+COMMENT ON TABLE email_outbox IS 'Emails aguardando entrega pelo worker da caixa de saída';
+COMMENT ON COLUMN email_outbox.bloqueado_ate IS 'Fim da reserva de um worker; depois disso a mensagem pode ser reservada de novo';
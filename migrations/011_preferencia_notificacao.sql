@@ -0,0 +1,15 @@
+-- Migration: Preferência de notificação por usuário
+-- Descrição: Define como cada usuário recebe os emails das rotinas em lote
+--            (lembretes de prazo, alertas de vencimento e escalonamento):
+--            'resumo' junta todos os itens de uma execução em um único email;
+--            'imediato' mantém um email por item. Usuários sem linha aqui
+--            seguem NOTIFICACAO_MODO_PADRAO.
+
+CREATE TABLE IF NOT EXISTS usuario_preferencia_notificacao (
+    usuario_id INTEGER PRIMARY KEY REFERENCES usuario(id) ON DELETE CASCADE,
+    modo VARCHAR(10) NOT NULL DEFAULT 'resumo'
+        CHECK (modo IN ('resumo', 'imediato')),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE usuario_preferencia_notificacao IS 'Modo de entrega (resumo ou imediato) dos emails das rotinas em lote';
@@ -0,0 +1,54 @@
+# tests/test_arquivo_coleta.py
+import pytest
+
+from app.scheduler import coletar_arquivos
+
+
+class FilaColeta:
+    """Fila arquivo_coleta em memória, com a mesma ordem e limite do repositório"""
+
+    def __init__(self, caminhos, limite=2):
+        self.vencidos = {i: caminho for i, caminho in enumerate(caminhos, start=1)}
+        self.adiados = {}
+        self.limite = limite
+
+    async def get_arquivos_para_coleta(self):
+        return [
+            {"arquivo_id": i, "caminho_arquivo": caminho, "ativo": False}
+            for i, caminho in sorted(self.vencidos.items())[:self.limite]
+        ]
+
+    async def remover_da_coleta(self, arquivo_ids):
+        for i in arquivo_ids:
+            del self.vencidos[i]
+
+    async def adiar_coleta(self, arquivo_ids, horas):
+        for i in arquivo_ids:
+            self.adiados[i] = self.vencidos.pop(i)
+
+
+class Disco:
+    def __init__(self, protegidos):
+        self.protegidos = set(protegidos)
+        self.removidos = []
+
+    async def delete_file(self, caminho):
+        if caminho in self.protegidos:
+            return False
+        self.removidos.append(caminho)
+        return True
+
+
+@pytest.mark.asyncio
+async def test_falhas_permanentes_nao_travam_a_coleta():
+    """Arquivos que não podem ser removidos são adiados e o restante da fila é coletado."""
+    caminhos = ["a", "b", "c", "d", "e"]
+    fila = FilaColeta(caminhos, limite=2)
+    disco = Disco(protegidos={"a", "b"})
+
+    removidos = await coletar_arquivos(fila, disco)
+
+    assert removidos == 3
+    assert disco.removidos == ["c", "d", "e"]
+    assert fila.vencidos == {}
+    assert sorted(fila.adiados.values()) == ["a", "b"]
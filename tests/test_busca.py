@@ -0,0 +1,70 @@
+# tests/test_busca.py
+import pytest
+from httpx import AsyncClient
+from typing import Dict
+
+
+@pytest.mark.asyncio
+async def test_busca_requer_autenticacao(async_client: AsyncClient):
+    response = await async_client.get("/api/v1/busca", params={"q": "contrato"})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_busca_ordenada_por_relevancia(async_client: AsyncClient, admin_headers: Dict, db_connection):
+    """Um contrato é encontrado pelo seu objeto, com trecho destacado."""
+    contrato = await db_connection.fetchrow(
+        "SELECT id, objeto FROM contrato WHERE ativo = TRUE AND length(objeto) > 5 ORDER BY id LIMIT 1"
+    )
+    if not contrato:
+        pytest.skip("Nenhum contrato ativo para buscar")
+
+    response = await async_client.get(
+        "/api/v1/busca",
+        params={"q": contrato["objeto"], "tipos": "contrato", "per_page": 50},
+        headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert {r["tipo"] for r in data["data"]} <= {"contrato"}
+    assert contrato["id"] in [r["id"] for r in data["data"]]
+
+    relevancias = [r["relevancia"] for r in data["data"]]
+    assert relevancias == sorted(relevancias, reverse=True)
+    assert any("<mark>" in r["trecho"] for r in data["data"])
+
+
+def test_trecho_escapa_html_e_mantem_destaque():
+    """Só as marcas de destaque viram HTML; o texto salvo pelo usuário é escapado."""
+    from app.repositories.busca_repo import montar_trecho, INICIO_DESTAQUE, FIM_DESTAQUE
+
+    trecho = montar_trecho(
+        f"<script>alert(1)</script> serviço de {INICIO_DESTAQUE}limpeza{FIM_DESTAQUE} & copa"
+    )
+    assert trecho == "&lt;script&gt;alert(1)&lt;/script&gt; serviço de <mark>limpeza</mark> &amp; copa"
+
+
+@pytest.mark.asyncio
+async def test_busca_nao_devolve_html_do_texto(db_connection):
+    """Um objeto com <script> volta escapado no trecho, com o termo em <mark>."""
+    from app.repositories.busca_repo import BuscaRepository
+
+    contrato_id = await db_connection.fetchval("SELECT id FROM contrato WHERE ativo = TRUE ORDER BY id LIMIT 1")
+    if not contrato_id:
+        pytest.skip("Nenhum contrato ativo para buscar")
+
+    transacao = db_connection.transaction()
+    await transacao.start()
+    try:
+        await db_connection.execute(
+            "UPDATE contrato SET objeto = $2 WHERE id = $1",
+            contrato_id, "<script>alert(1)</script> <img src=x onerror=alert(2)> zeladoriaxss"
+        )
+        rows = await BuscaRepository(db_connection).buscar("zeladoriaxss", ["contrato"], 10, 0)
+    finally:
+        await transacao.rollback()
+
+    trecho = next(r["trecho"] for r in rows if r["id"] == contrato_id)
+    assert "<script>" not in trecho and "<img" not in trecho
+    assert "&lt;script&gt;" in trecho
+    assert "<mark>zeladoriaxss</mark>" in trecho
@@ -0,0 +1,70 @@
+# tests/test_busca_trigram.py
+import pytest
+
+from app.core.busca_trigram import filtro_contem, filtro_similar, ordem_similaridade, trigram_disponivel
+
+NOMES = ["Construtora Ipiranga Ltda", "João Ipiranga Serviços", "Ipiranga", "Vigilância Horizonte"]
+
+
+def test_filtro_contem_usa_expressao_indexada():
+    """Com a migração aplicada, o filtro compara a expressão dos índices GIN."""
+    assert filtro_contem("c.objeto", "$2", True) == "normalizar_busca(c.objeto) LIKE normalizar_busca($2)"
+    assert filtro_contem("c.objeto", "$2", False) == "c.objeto ILIKE $2"
+
+
+def test_filtro_similar_combina_contem_e_similaridade():
+    sql = filtro_similar(["nome", "email"], "$1", True)
+    assert "normalizar_busca($1) <% normalizar_busca(nome)" in sql
+    assert "normalizar_busca($1) <% normalizar_busca(email)" in sql
+    assert filtro_similar(["nome"], "$1", False) == "(nome ILIKE '%' || $1 || '%')"
+
+
+def test_ordem_similaridade_por_maior_relevancia():
+    assert ordem_similaridade(["u.nome"], "$1").endswith(" DESC")
+    assert ordem_similaridade(["c.objeto", "c.pae"], "$3").startswith("GREATEST(")
+
+
+def test_placeholder_da_busca_nao_depende_do_valor():
+    """Outro filtro com o mesmo valor do termo não desloca o parâmetro da ordenação."""
+    from app.repositories.contrato_repo import ContratoRepository
+
+    _, params, busca_param = ContratoRepository(None)._build_list_filters(
+        {"ano": "2025", "busca": "2025"}, {"usuario_id": 7, "perfil_ativo_nome": "Gestor"}, True
+    )
+    assert params == [7, "2025", "2025"]
+    assert busca_param == "$3"
+
+    _, _, sem_busca = ContratoRepository(None)._build_list_filters({"objeto": "limpeza"})
+    assert sem_busca is None
+
+
+async def _buscar_nomes(conn, termo: str):
+    """Aplica os fragmentos da busca aproximada sobre uma lista fixa de nomes"""
+    if not await trigram_disponivel(conn):
+        pytest.skip("Migração 006_busca_trigram.sql não aplicada")
+    rows = await conn.fetch(f"""
+        SELECT nome FROM unnest($2::text[]) AS t(nome)
+        WHERE {filtro_similar(["nome"], "$1", True)}
+        ORDER BY {ordem_similaridade(["nome"], "$1")}, nome
+    """, termo, NOMES)
+    return [r["nome"] for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_busca_similar_tolera_erro_de_digitacao(db_connection):
+    assert "Construtora Ipiranga Ltda" in await _buscar_nomes(db_connection, "ipirangs")
+    assert "Vigilância Horizonte" in await _buscar_nomes(db_connection, "vigilancia horisonte")
+
+
+@pytest.mark.asyncio
+async def test_busca_similar_ignora_acentos(db_connection):
+    assert await _buscar_nomes(db_connection, "joao") == ["João Ipiranga Serviços"]
+    assert await _buscar_nomes(db_connection, "VIGILANCIA") == ["Vigilância Horizonte"]
+
+
+@pytest.mark.asyncio
+async def test_busca_similar_ordena_pela_maior_similaridade(db_connection):
+    """O nome mais parecido com o termo vem primeiro; nomes sem relação ficam de fora."""
+    nomes = await _buscar_nomes(db_connection, "construtora ipiranga")
+    assert nomes[0] == "Construtora Ipiranga Ltda"
+    assert "Vigilância Horizonte" not in nomes
@@ -0,0 +1,133 @@
+# tests/test_cache.py
+import time
+import pytest
+
+from app.core.cache import TTLCache, user_cache
+from app.core.cache_bus import publish_invalidation
+
+
+def test_ttl_cache_get_set_and_stats():
+    """Valores armazenados são retornados e contabilizados como hit."""
+    cache = TTLCache("teste", max_size=10, ttl_seconds=60)
+    assert cache.get("a") is None
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_ttl_cache_expiration():
+    """Entradas expiradas são descartadas."""
+    cache = TTLCache("teste", max_size=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_lru_eviction():
+    """Ao exceder o tamanho máximo, a entrada menos usada é descartada."""
+    cache = TTLCache("teste", max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "a" passa a ser a mais recente
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+class FakeConnection:
+    def __init__(self):
+        self.notifications = []
+
+    async def execute(self, query, *args):
+        self.notifications.append(args)
+        return "SELECT 1"
+
+
+@pytest.mark.asyncio
+async def test_publish_invalidation_evicts_locally_and_notifies():
+    """publish_invalidation remove o usuário do cache local e emite NOTIFY."""
+    user_cache.set(999999, {"user": {"id": 999999}, "perfis": ["Fiscal"]})
+    conn = FakeConnection()
+
+    await publish_invalidation(conn, "usuario", 999999)
+
+    assert user_cache.get(999999) is None
+    assert len(conn.notifications) == 1
+    channel, payload = conn.notifications[0]
+    assert channel == "sigescon_cache_invalidation"
+    assert '"entity": "usuario"' in payload
+
+
+@pytest.mark.asyncio
+async def test_listener_trata_as_proprias_notificacoes():
+    """A notificação do próprio worker (entregue após o commit) remove o que foi recolocado no cache."""
+    import asyncio
+    import json
+
+    from app.core.cache_bus import WORKER_ID, CacheInvalidationListener
+
+    conn = FakeConnection()
+    await publish_invalidation(conn, "usuario", 999998)
+    # Leitura concorrente, antes do commit, recoloca o dado antigo
+    user_cache.set(999998, {"user": {"id": 999998}, "perfis": ["Fiscal"]})
+
+    _, payload = conn.notifications[0]
+    assert json.loads(payload)["origin"] == WORKER_ID
+    CacheInvalidationListener()._on_notification(None, 0, "sigescon_cache_invalidation", payload)
+    await asyncio.sleep(0)
+
+    assert user_cache.get(999998) is None
+
+
+@pytest.mark.asyncio
+async def test_profile_change_invalidates_cached_user(async_client, admin_headers):
+    """Conceder perfil a um usuário invalida seu cache de autenticação."""
+    me = await async_client.get("/api/v1/usuarios/me", headers=admin_headers)
+    assert me.status_code == 200
+    user_id = me.json()["id"]
+
+    assert user_cache.get(user_id) is not None
+
+    from app.repositories.usuario_perfil_repo import UsuarioPerfilRepository
+    from app.core.database import acquire_connection
+
+    async with acquire_connection() as conn:
+        perfis = await UsuarioPerfilRepository(conn).get_user_profiles(user_id)
+        perfil_id = perfis[0]["perfil_id"]
+        await UsuarioPerfilRepository(conn).add_profile_to_user(user_id, perfil_id, user_id)
+
+    assert user_cache.get(user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_dashboard_cache_hit_and_invalidation():
+    """Dashboards são servidos do cache até uma escrita invalidá-los."""
+    from app.core.cache import dashboard_cache, invalidate_dashboards
+    from app.services.dashboard_service import DashboardService
+
+    dashboard_cache.clear()
+    service = DashboardService(dashboard_repo=None)
+    chamadas = []
+
+    async def loader():
+        chamadas.append(1)
+        return {"contadores": len(chamadas)}
+
+    primeiro = await service._cached("fiscal/completo", "Fiscal", 42, loader)
+    segundo = await service._cached("fiscal/completo", "Fiscal", 42, loader)
+    outro_usuario = await service._cached("fiscal/completo", "Fiscal", 43, loader)
+
+    assert primeiro is segundo
+    assert outro_usuario["contadores"] == 2
+
+    await invalidate_dashboards(FakeConnection())
+    terceiro = await service._cached("fiscal/completo", "Fiscal", 42, loader)
+    assert terceiro["contadores"] == 3
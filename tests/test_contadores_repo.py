@@ -0,0 +1,109 @@
+# tests/test_contadores_repo.py
+import pytest
+
+from app.core.database import acquire_connection
+from app.repositories.contadores_repo import ContadoresRepository
+
+
+@pytest.mark.asyncio
+async def test_contadores_admin_batem_com_contagens_individuais(async_client, admin_headers):
+    """A consulta agregada do admin retorna os mesmos valores dos COUNT(*) isolados."""
+    async with acquire_connection() as conn:
+        contadores = await ContadoresRepository(conn).get_contadores_admin()
+
+        assert contadores["total_contratacoes"] == await conn.fetchval(
+            "SELECT COUNT(*) FROM contrato WHERE ativo = true"
+        )
+        assert contadores["usuarios_ativos"] == await conn.fetchval(
+            "SELECT COUNT(*) FROM usuario WHERE ativo = true"
+        )
+        assert contadores["relatorios_para_analise"] == await conn.fetchval("""
+            SELECT COUNT(*) FROM relatoriofiscal r
+            JOIN statusrelatorio sr ON r.status_id = sr.id
+            WHERE sr.nome = 'Pendente de Análise'
+        """)
+
+
+@pytest.mark.asyncio
+async def test_estatisticas_sessao_por_perfil(async_client, admin_headers):
+    """Cada perfil recebe seu conjunto de estatísticas; perfis desconhecidos, nenhum."""
+    me = await async_client.get("/api/v1/usuarios/me", headers=admin_headers)
+    user_id = me.json()["id"]
+
+    async with acquire_connection() as conn:
+        repo = ContadoresRepository(conn)
+        admin = await repo.get_estatisticas_sessao(user_id, "Administrador")
+        fiscal = await repo.get_estatisticas_sessao(user_id, "Fiscal")
+        desconhecido = await repo.get_estatisticas_sessao(user_id, "Visitante")
+
+    assert set(admin) == {"total_contratos", "usuarios_ativos", "relatorios_pendentes", "pendencias_abertas"}
+    assert set(fiscal) == {"contratos_fiscalizados", "pendencias_ativas", "relatorios_submetidos"}
+    assert desconhecido == {}
+
+
+class _ConexaoContadora:
+    """Repassa as chamadas à conexão real contando as consultas feitas"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.consultas = []
+
+    def __getattr__(self, nome):
+        atributo = getattr(self._conn, nome)
+        if nome in ("fetch", "fetchrow", "fetchval"):
+            async def consulta(query, *args):
+                self.consultas.append(query)
+                return await atributo(query, *args)
+            return consulta
+        return atributo
+
+
+@pytest.mark.asyncio
+async def test_session_context_service_usa_consulta_agregada(async_client, admin_headers):
+    """SessionContextService._get_profile_statistics faz uma consulta por perfil, sem os COUNT(*) isolados."""
+    from app.repositories.contrato_repo import ContratoRepository
+    from app.repositories.session_context_repo import SessionContextRepository
+    from app.repositories.usuario_perfil_repo import UsuarioPerfilRepository
+    from app.repositories.usuario_repo import UsuarioRepository
+    from app.services.session_context_service import SessionContextService
+
+    me = await async_client.get("/api/v1/usuarios/me", headers=admin_headers)
+    user_id = me.json()["id"]
+
+    async with acquire_connection() as conn:
+        esperado = {
+            perfil: await ContadoresRepository(conn).get_estatisticas_sessao(user_id, perfil)
+            for perfil in ("Administrador", "Gestor", "Fiscal")
+        }
+        contadora = _ConexaoContadora(conn)
+        service = SessionContextService(
+            SessionContextRepository(contadora), UsuarioRepository(contadora),
+            UsuarioPerfilRepository(contadora), ContratoRepository(contadora)
+        )
+        for perfil, estatisticas in esperado.items():
+            contadora.consultas.clear()
+            assert await service._get_profile_statistics(user_id, perfil) == estatisticas
+            assert len(contadora.consultas) == 1
+
+
+class _ConexaoComErro:
+    """Conexão cujas consultas sempre falham"""
+
+    async def _falhar(self, *args, **kwargs):
+        raise RuntimeError("consulta indisponível")
+
+    fetch = fetchrow = fetchval = execute = _falhar
+
+
+@pytest.mark.asyncio
+async def test_session_context_service_zera_estatisticas_se_a_consulta_falhar():
+    """Uma falha na consulta agregada não derruba o contexto: os contadores do perfil vêm zerados."""
+    from app.repositories.session_context_repo import SessionContextRepository
+    from app.services.session_context_service import SessionContextService
+
+    service = SessionContextService(SessionContextRepository(_ConexaoComErro()), None, None, None)
+
+    assert await service._get_profile_statistics(1, "Gestor") == {
+        "contratos_sob_gestao": 0, "relatorios_para_aprovar": 0, "pendencias_criadas": 0
+    }
+    assert await service._get_profile_statistics(1, "Visitante") == {}
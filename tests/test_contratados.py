@@ -185,4 +185,34 @@ async def test_non_admin_user_blocked(async_client: AsyncClient, admin_headers:
     print("--> Usuário não-admin corretamente bloqueado das operações de escrita.")
     
     # Limpa o usuário de teste
-    await async_client.delete(f"/api/v1/usuarios/{fiscal_id}", headers=admin_headers)
\ No newline at end of file
+    await async_client.delete(f"/api/v1/usuarios/{fiscal_id}", headers=admin_headers)
+
+
+@pytest.mark.asyncio
+async def test_busca_aproximada_contratados(async_client: AsyncClient, admin_headers: Dict):
+    """A busca encontra o contratado pelo nome, sem acentos e com erro de digitação."""
+    unique_num = str(random.randint(10000000, 99999999))
+    create_data = {
+        "nome": f"Construtora João Ipiranga {unique_num}",
+        "email": f"busca_{unique_num}@example.com",
+        "cnpj": f"{unique_num}000188",
+    }
+    response = await async_client.post("/api/v1/contratados/", json=create_data, headers=admin_headers)
+    assert response.status_code == 201
+    contratado_id = response.json()["id"]
+
+    response = await async_client.get(
+        "/api/v1/contratados", params={"busca": f"Ipiranga {unique_num}"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["data"][0]["id"] == contratado_id
+
+    # Sem acento e com uma letra trocada ("Ipirangs")
+    for busca in (f"joao ipiranga {unique_num}", f"Ipirangs {unique_num}"):
+        response = await async_client.get(
+            "/api/v1/contratados", params={"busca": busca, "per_page": 100}, headers=admin_headers
+        )
+        assert response.status_code == 200
+        assert contratado_id in [c["id"] for c in response.json()["data"]], busca
+
+    await async_client.delete(f"/api/v1/contratados/{contratado_id}", headers=admin_headers)
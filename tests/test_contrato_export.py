@@ -0,0 +1,92 @@
+# tests/test_contrato_export.py
+import csv
+import io
+import zipfile
+from datetime import date
+from decimal import Decimal
+from typing import Dict
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.contrato_export_service import LINHAS_POR_BLOCO, gerar_csv, gerar_xlsx
+
+COLUNAS = ["id", "nr_contrato", "valor_global", "data_fim", "pae"]
+
+
+async def _registros(quantidade: int):
+    for i in range(quantidade):
+        yield {"id": i, "nr_contrato": f"{i:03d}/2025 & <A>", "valor_global": Decimal("1234.56"),
+               "data_fim": date(2025, 12, 31), "pae": None}
+
+
+@pytest.mark.asyncio
+async def test_csv_envia_cabecalho_antes_das_linhas_e_em_blocos():
+    blocos = [b async for b in gerar_csv(COLUNAS, _registros(LINHAS_POR_BLOCO * 2 + 1))]
+
+    assert blocos[0] == "\ufeffid;nr_contrato;valor_global;data_fim;pae\r\n".encode("utf-8")
+    assert len(blocos) == 4
+    linhas = list(csv.reader(io.StringIO(b"".join(blocos).decode("utf-8-sig")), delimiter=";"))
+    assert len(linhas) == LINHAS_POR_BLOCO * 2 + 2
+    assert linhas[1] == ["0", "000/2025 & <A>", "1234.56", "2025-12-31", ""]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_gera_pacote_valido():
+    blocos = [b async for b in gerar_xlsx(COLUNAS, _registros(3))]
+
+    assert blocos[0].startswith(b"PK")
+    arquivo = zipfile.ZipFile(io.BytesIO(b"".join(blocos)))
+    assert arquivo.testzip() is None
+    planilha = arquivo.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert '<row r="4">' in planilha
+    assert "000/2025 &amp; &lt;A&gt;" in planilha
+    assert '<c r="C2"><v>1234.56</v></c>' in planilha
+    assert '<c r="D2" s="1"><v>46022</v></c>' in planilha  # 31/12/2025 como data do Excel
+    assert 'r="E2"' not in planilha  # célula vazia omitida
+
+
+async def _registros_com_formula():
+    yield {"id": 1, "nr_contrato": '=HYPERLINK("http://exemplo.invalid","clique")',
+           "valor_global": Decimal("-10"), "data_fim": None, "pae": "@SUM(1)"}
+
+
+@pytest.mark.asyncio
+async def test_csv_nao_exporta_texto_como_formula():
+    conteudo = b"".join([b async for b in gerar_csv(COLUNAS, _registros_com_formula())])
+    linhas = list(csv.reader(io.StringIO(conteudo.decode("utf-8-sig")), delimiter=";"))
+
+    assert linhas[1] == ["1", '\'=HYPERLINK("http://exemplo.invalid","clique")', "-10", "", "'@SUM(1)"]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_marca_texto_com_cara_de_formula_como_literal():
+    blocos = [b async for b in gerar_xlsx(COLUNAS, _registros_com_formula())]
+    planilha = zipfile.ZipFile(io.BytesIO(b"".join(blocos))).read("xl/worksheets/sheet1.xml").decode("utf-8")
+
+    assert '<c r="B2" t="inlineStr" s="3"><is><t xml:space="preserve">=HYPERLINK(' in planilha
+    assert "<f>" not in planilha
+    assert '<c r="C2"><v>-10</v></c>' in planilha  # números negativos continuam números
+
+
+@pytest.mark.asyncio
+async def test_exportar_contratos_csv(async_client: AsyncClient, admin_headers: Dict, db_connection):
+    total = await db_connection.fetchval("SELECT COUNT(*) FROM contrato WHERE ativo = TRUE")
+
+    response = await async_client.get(
+        "/api/v1/contratos/exportar", params={"formato": "csv"}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+
+    linhas = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig")), delimiter=";"))
+    assert len(linhas) == total
+    if linhas:
+        assert {"nr_contrato", "contratado_cnpj", "gestor_email", "modalidade", "status"} <= set(linhas[0])
+
+
+@pytest.mark.asyncio
+async def test_exportar_contratos_requer_autenticacao(async_client: AsyncClient):
+    response = await async_client.get("/api/v1/contratos/exportar")
+    assert response.status_code == 401
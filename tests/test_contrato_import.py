@@ -0,0 +1,202 @@
+# tests/test_contrato_import.py
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.database import acquire_connection
+from app.repositories.contrato_import_repo import COLUNAS_IMPORTACAO, ContratoImportRepository
+from app.services.contrato_import_service import AMBIGUO, ContratoImportService, _normalizar, ler_planilha
+from app.services.email_templates import EmailTemplates
+
+
+def test_ler_csv_detecta_separador_e_ignora_linhas_vazias():
+    conteudo = (
+        "\ufeffNR_CONTRATO;Objeto;data_inicio;valor_global\n"
+        "001/2025;Limpeza;01/02/2025;1.234,56\n"
+        ";;;\n"
+        "002/2025;Vigilância;2025-03-01;\n"
+    ).encode("utf-8")
+
+    linhas = ler_planilha(conteudo, "contratos.csv")
+
+    assert [numero for numero, _ in linhas] == [2, 4]
+    numero, valores = linhas[0]
+    assert valores["nr_contrato"] == "001/2025"
+    assert valores["objeto"] == "Limpeza"
+    assert linhas[1][1]["valor_global"] is None
+
+
+def test_ler_csv_latin1():
+    conteudo = "nr_contrato,objeto\n003/2025,Manutenção\n".encode("latin-1")
+    linhas = ler_planilha(conteudo, "contratos.CSV")
+    assert linhas[0][1]["objeto"] == "Manutenção"
+
+
+def test_formato_nao_suportado():
+    with pytest.raises(HTTPException) as exc:
+        ler_planilha(b"qualquer", "contratos.pdf")
+    assert exc.value.status_code == 400
+
+
+def test_normalizar_formatos_de_planilha():
+    assert _normalizar("data_inicio", "15/03/2025") == date(2025, 3, 15)
+    assert _normalizar("data_inicio", "2025-03-15") == "2025-03-15"
+    assert _normalizar("valor_global", "R$ 1.234,56") == "1234.56"
+    assert _normalizar("valor_anual", "1234.56") == "1234.56"
+    assert _normalizar("contratado_id", 12.0) == 12
+    assert _normalizar("pae", 12345.0) == "12345"
+    assert _normalizar("objeto", None) is None
+
+
+def _refs():
+    usuarios = {
+        1: {"id": 1, "nome": "Gestora", "email": "gestora@teste.com", "pode_gerir": True, "pode_fiscalizar": False},
+        2: {"id": 2, "nome": "Fiscal", "email": "fiscal@teste.com", "pode_gerir": False, "pode_fiscalizar": True},
+    }
+    return {
+        "contratado_id": {10: 10, 11: 11},
+        "contratado_doc": {"12345678000199": 10, "11122233344": AMBIGUO},
+        "usuario_id": usuarios,
+        "usuario_email": {u["email"]: u["id"] for u in usuarios.values()},
+        "modalidade_id": {5: 5},
+        "modalidade": {"pregão": 5, "dispensa": AMBIGUO},
+        "status_id": {7: 7},
+        "status": {"ativo": 7},
+    }
+
+
+def test_resolver_linha_troca_referencias_naturais_por_ids():
+    dados, erros = ContratoImportService(None)._resolver_linha({
+        "nr_contrato": "001/2025",
+        "contratado_cnpj": "12.345.678/0001-99",
+        "modalidade": "Pregão",
+        "status": "ATIVO",
+        "gestor_email": "Gestora@Teste.com",
+        "fiscal_id": "2",
+    }, _refs())
+
+    assert erros == []
+    assert (dados["contratado_id"], dados["modalidade_id"], dados["status_id"]) == (10, 5, 7)
+    assert (dados["gestor_id"], dados["fiscal_id"]) == (1, 2)
+
+
+def test_resolver_linha_reporta_referencias_desconhecidas_e_ambiguas():
+    _, erros = ContratoImportService(None)._resolver_linha({
+        "contratado_cpf": "111.222.333-44",
+        "modalidade": "Dispensa",
+        "status": "Encerrado",
+        "gestor_id": "99",
+        "fiscal_id": "abc",
+    }, _refs())
+
+    assert "Contratado ambíguo (contratado_cpf '111.222.333-44' corresponde a mais de um registro)" in erros
+    assert "Modalidade ambíguo (modalidade 'Dispensa' corresponde a mais de um registro)" in erros
+    assert "Status não encontrado (status 'Encerrado')" in erros
+    assert "Gestor não encontrado (id 99)" in erros
+    assert "fiscal_id: valor inválido 'abc'" in erros
+
+
+def test_resolver_linha_exige_perfil_de_gestor_e_fiscal():
+    _, erros = ContratoImportService(None)._resolver_linha({
+        "gestor_email": "fiscal@teste.com",
+        "fiscal_id": 1,
+        "fiscal_substituto_id": 2,
+    }, _refs())
+
+    assert erros == [
+        "Usuário 2 não possui perfil de Gestor ou Administrador",
+        "Usuário 1 não possui perfil de Fiscal ou Administrador",
+    ]
+
+
+def test_resumo_de_importacao_escapa_valores_da_planilha():
+    _, corpo = EmailTemplates.contract_import_digest("Ana", [{
+        "nr_contrato": "<b>001</b>", "objeto": "<script>alert(1)</script>", "papel": "Gestor",
+        "data_inicio": date(2025, 1, 1), "data_fim": None,
+    }])
+
+    assert "<script>" not in corpo and "<b>001</b>" not in corpo
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in corpo
+
+
+@pytest.mark.asyncio
+async def test_inserir_contratos_via_copy(async_client):
+    """COPY + INSERT ... SELECT grava as linhas novas e devolve sem id os números já existentes."""
+    sufixo = uuid.uuid4().hex[:8]
+    async with acquire_connection() as conn:
+        referencias = await conn.fetchrow("""
+            SELECT (SELECT id FROM contratado WHERE ativo = TRUE LIMIT 1) AS contratado_id,
+                   (SELECT id FROM modalidade WHERE ativo = TRUE LIMIT 1) AS modalidade_id,
+                   (SELECT id FROM status WHERE ativo = TRUE LIMIT 1) AS status_id,
+                   (SELECT id FROM usuario WHERE ativo = TRUE ORDER BY id LIMIT 1) AS usuario_id
+        """)
+        if referencias["contratado_id"] is None:
+            pytest.skip("Nenhum contratado ativo para a importação")
+        existente = await conn.fetchval("SELECT nr_contrato FROM contrato WHERE ativo = TRUE LIMIT 1")
+
+        def registro(linha, nr_contrato):
+            valores = {
+                "nr_contrato": nr_contrato, "objeto": f"Importação {sufixo}",
+                "data_inicio": date(2025, 1, 1), "data_fim": date(2025, 12, 31),
+                "contratado_id": referencias["contratado_id"], "modalidade_id": referencias["modalidade_id"],
+                "status_id": referencias["status_id"], "gestor_id": referencias["usuario_id"],
+                "fiscal_id": referencias["usuario_id"],
+            }
+            return (linha, *(valores.get(coluna) for coluna in COLUNAS_IMPORTACAO))
+
+        registros = [registro(2, f"IMP-{sufixo}-1"), registro(3, f"IMP-{sufixo}-2")]
+        if existente:
+            registros.append(registro(4, existente))
+
+        rows = await ContratoImportRepository(conn).inserir_contratos(registros)
+        try:
+            por_linha = {r["linha"]: r for r in rows}
+            assert [por_linha[2]["nr_contrato"], por_linha[3]["nr_contrato"]] == [f"IMP-{sufixo}-1", f"IMP-{sufixo}-2"]
+            assert por_linha[2]["id"] is not None and por_linha[3]["id"] is not None
+            if existente:
+                assert por_linha[4]["id"] is None
+            gravados = await conn.fetchval("SELECT COUNT(*) FROM contrato WHERE objeto = $1", f"Importação {sufixo}")
+            assert gravados == 2
+        finally:
+            await conn.execute("DELETE FROM contrato WHERE objeto = $1", f"Importação {sufixo}")
+
+
+@pytest.mark.asyncio
+async def test_importar_grava_resumos_na_caixa_de_saida(async_client):
+    """Os resumos entram na caixa de saída na transação da importação, sem envio direto."""
+    sufixo = uuid.uuid4().hex[:8]
+    async with acquire_connection() as conn:
+        if not await conn.fetchval("SELECT to_regclass('email_outbox') IS NOT NULL"):
+            pytest.skip("Migração da caixa de saída não aplicada")
+        referencias = await conn.fetchrow("""
+            SELECT (SELECT id FROM contratado WHERE ativo = TRUE LIMIT 1) AS contratado_id,
+                   (SELECT id FROM modalidade WHERE ativo = TRUE LIMIT 1) AS modalidade_id,
+                   (SELECT id FROM status WHERE ativo = TRUE LIMIT 1) AS status_id,
+                   (SELECT u.id FROM usuario u
+                    JOIN usuario_perfil up ON up.usuario_id = u.id AND up.ativo = TRUE
+                    JOIN perfil p ON p.id = up.perfil_id AND p.nome = 'Administrador'
+                    WHERE u.ativo = TRUE ORDER BY u.id LIMIT 1) AS usuario_id
+        """)
+        if referencias["contratado_id"] is None or referencias["usuario_id"] is None:
+            pytest.skip("Referências insuficientes para a importação")
+
+        linhas = [(2, {
+            "nr_contrato": f"IMP-{sufixo}", "objeto": f"Importação {sufixo}",
+            "data_inicio": "2025-01-01", "data_fim": "2025-12-31",
+            "contratado_id": referencias["contratado_id"], "modalidade_id": referencias["modalidade_id"],
+            "status_id": referencias["status_id"], "gestor_id": referencias["usuario_id"],
+            "fiscal_id": referencias["usuario_id"],
+        })]
+        try:
+            resultado, emails_pendentes = await ContratoImportService(ContratoImportRepository(conn)).importar(linhas)
+            assert resultado.importados == 1, resultado.erros
+            assert emails_pendentes == []
+            gravados = await conn.fetchval(
+                "SELECT COUNT(*) FROM email_outbox WHERE corpo LIKE $1", f"%IMP-{sufixo}%"
+            )
+            assert gravados == 1  # gestor e fiscal são o mesmo usuário: um único resumo
+        finally:
+            await conn.execute("DELETE FROM email_outbox WHERE corpo LIKE $1", f"%IMP-{sufixo}%")
+            await conn.execute("DELETE FROM contrato WHERE objeto = $1", f"Importação {sufixo}")
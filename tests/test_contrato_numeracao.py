@@ -0,0 +1,53 @@
+# tests/test_contrato_numeracao.py
+import asyncio
+import re
+
+import pytest
+
+from app.core.database import acquire_connection
+from app.core.schema_registry import schema_registry
+from app.repositories.contrato_numeracao_repo import (
+    ContratoNumeracaoRepository, formatar_nr_contrato, regex_nr_contrato, usa_ano
+)
+
+
+def test_formato_padrao_equivale_a_numeracao_numerica():
+    assert formatar_nr_contrato(42, 2025, "{numero}") == "42"
+    assert not usa_ano("{numero}")
+    assert regex_nr_contrato("{numero}", nomeado=False) == r"^(\d+)$"
+
+
+def test_formato_por_ano():
+    formato = "{numero:03d}/{ano}"
+    assert usa_ano(formato)
+    assert formatar_nr_contrato(7, 2025, formato) == "007/2025"
+
+    encontrado = re.match(regex_nr_contrato(formato), "015/2024")
+    assert encontrado.group("numero") == "015" and encontrado.group("ano") == "2024"
+    assert re.match(regex_nr_contrato(formato, ano=2025, nomeado=False), "015/2024") is None
+
+
+def test_formato_invalido():
+    with pytest.raises(ValueError):
+        usa_ano("CT-{sequencia}")
+
+
+@pytest.mark.asyncio
+async def test_alocacao_concorrente_sem_repeticao(async_client):
+    async with acquire_connection() as conn:
+        if "contrato_numeracao" not in await schema_registry.existing_tables(conn):
+            pytest.skip("migrations/008_contrato_numeracao.sql não aplicada")
+
+    async def alocar():
+        async with acquire_connection() as conn:
+            return await ContratoNumeracaoRepository(conn, "TESTE-{numero}/{ano}").alocar(ano=1999)
+
+    try:
+        numeros = await asyncio.gather(*(alocar() for _ in range(20)))
+    finally:
+        async with acquire_connection() as conn:
+            await conn.execute("DELETE FROM contrato_numeracao WHERE chave = '1999'")
+
+    assert len(set(numeros)) == 20
+    sequencia = sorted(int(n.split("-")[1].split("/")[0]) for n in numeros)
+    assert sequencia == list(range(sequencia[0], sequencia[0] + 20))
@@ -0,0 +1,38 @@
+# tests/test_contrato_resumo.py
+import pytest
+
+from app.core.database import acquire_connection
+from app.core.schema_registry import schema_registry
+
+
+@pytest.mark.asyncio
+async def test_resumo_acompanha_pendencias_abertas(async_client, admin_headers):
+    """O resumo mantido por triggers confere com a contagem direta de pendências abertas."""
+    async with acquire_connection() as conn:
+        if 'contrato_resumo' not in await schema_registry.existing_tables(conn):
+            pytest.skip("Migration 004_create_contrato_resumo.sql não aplicada")
+
+        divergentes = await conn.fetch("""
+            SELECT c.id
+            FROM contrato c
+            LEFT JOIN contrato_resumo rs ON rs.contrato_id = c.id
+            WHERE COALESCE(rs.pendencias_abertas, 0) <> (
+                SELECT COUNT(*)
+                FROM pendenciarelatorio p
+                JOIN statuspendencia sp ON p.status_pendencia_id = sp.id
+                WHERE p.contrato_id = c.id AND sp.nome = 'Pendente'
+            )
+        """)
+
+    assert divergentes == []
+
+
+@pytest.mark.asyncio
+async def test_dashboard_contratos_com_pendencias_usa_resumo(async_client, admin_headers):
+    """A lista de contratos com pendências continua respondendo com o resumo."""
+    response = await async_client.get(
+        "/api/v1/dashboard/admin/contratos-com-pendencias", headers=admin_headers
+    )
+    assert response.status_code == 200
+    for contrato in response.json()["contratos"]:
+        assert contrato["pendencias_count"] > 0
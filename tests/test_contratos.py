@@ -41,15 +41,15 @@ async def contract_prerequisites(async_client: AsyncClient, admin_headers: Dict)
         assert response.status_code == 201
         user = response.json()
 
-        # Se o perfil desejado não for Fiscal (3), concede o perfil correto
-        if perfil_id != 3:
-            perfil_data = {"perfil_ids": [perfil_id]}
-            perfil_response = await async_client.post(
-                f"/api/v1/usuarios/{user['id']}/perfis/conceder",
-                json=perfil_data,
-                headers=admin_headers
-            )
-            assert perfil_response.status_code == 200
+        # Concede o perfil desejado via sistema de múltiplos perfis
+        # (o perfil_id legado não é gravado na criação)
+        perfil_data = {"perfil_ids": [perfil_id]}
+        perfil_response = await async_client.post(
+            f"/api/v1/usuarios/{user['id']}/perfis/conceder",
+            json=perfil_data,
+            headers=admin_headers
+        )
+        assert perfil_response.status_code == 200
 
         return user
 
@@ -223,4 +223,154 @@ async def test_unauthorized_contract_access(async_client: AsyncClient):
     }
     
     create_response = await async_client.post("/api/v1/contratos/", data=form_data)
-    assert create_response.status_code == 401
\ No newline at end of file
+    assert create_response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_list_contratos_cursor_pagination(async_client: AsyncClient, admin_headers: Dict):
+    """Percorre a listagem por cursor: páginas sem repetição e na mesma ordem da listagem por página."""
+    vistos = []
+    cursor = None
+    for _ in range(3):
+        params = {"paginacao": "cursor", "per_page": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await async_client.get("/api/v1/contratos", params=params, headers=admin_headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert "next_cursor" in page and "total_items" not in page
+        vistos.extend(c["id"] for c in page["data"])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            assert cursor is None
+            break
+
+    assert len(vistos) == len(set(vistos))
+
+    invalido = await async_client.get("/api/v1/contratos", params={"cursor": "nao-e-um-cursor"}, headers=admin_headers)
+    assert invalido.status_code == 400
+
+@pytest.mark.asyncio
+async def test_create_contrato_valida_referencias_e_perfis(async_client: AsyncClient, admin_headers: Dict, contract_prerequisites: Dict):
+    """Referências inexistentes retornam 404; gestor/fiscal sem o perfil exigido, 400."""
+    base = {
+        "objeto": "Contrato para validação de referências",
+        "data_inicio": str(date(2025, 1, 1)),
+        "data_fim": str(date(2025, 12, 31)),
+        **contract_prerequisites
+    }
+
+    inexistente = {**base, "nr_contrato": f"FK-{uuid.uuid4().hex[:8]}", "contratado_id": 999999999}
+    response = await async_client.post("/api/v1/contratos/", data=inexistente, headers=admin_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Contratado não encontrado"
+
+    # O fiscal não tem perfil de Gestor
+    gestor_sem_perfil = {**base, "nr_contrato": f"FK-{uuid.uuid4().hex[:8]}", "gestor_id": contract_prerequisites["fiscal_id"]}
+    response = await async_client.post("/api/v1/contratos/", data=gestor_sem_perfil, headers=admin_headers)
+    assert response.status_code == 400
+    assert "Gestor" in response.json()["detail"]
+
+    # O gestor não tem perfil de Fiscal
+    fiscal_sem_perfil = {**base, "nr_contrato": f"FK-{uuid.uuid4().hex[:8]}", "fiscal_id": contract_prerequisites["gestor_id"]}
+    response = await async_client.post("/api/v1/contratos/", data=fiscal_sem_perfil, headers=admin_headers)
+    assert response.status_code == 400
+    assert "Fiscal" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_contrato_completo(async_client: AsyncClient, admin_headers: Dict, contract_prerequisites: Dict):
+    """A visão completa traz o contrato e as seções pedidas em include."""
+    form_data = {
+        "nr_contrato": f"C360-{uuid.uuid4().hex[:8]}",
+        "objeto": "Contrato para visão completa",
+        "data_inicio": str(date(2025, 1, 1)),
+        "data_fim": str(date(2025, 12, 31)),
+        **contract_prerequisites
+    }
+    files = {"documento_contrato": ("documento_c360.txt", "conteúdo", "text/plain")}
+    create_response = await async_client.post("/api/v1/contratos/", data=form_data, files=files, headers=admin_headers)
+    assert create_response.status_code == 201
+    contrato_id = create_response.json()["id"]
+
+    response = await async_client.get(f"/api/v1/contratos/{contrato_id}/completo", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    completo = response.json()
+    assert completo["nr_contrato"] == form_data["nr_contrato"]
+    assert completo["gestor_id"] == contract_prerequisites["gestor_id"]
+    assert [a["nome_arquivo"] for a in completo["arquivos"]] == ["documento_c360.txt"]
+    assert completo["pendencias"] == []
+    assert completo["relatorios"] == []
+    assert completo["arquivos_relatorios"] == []
+    assert isinstance(completo["auditoria"], list)
+
+    response = await async_client.get(
+        f"/api/v1/contratos/{contrato_id}/completo",
+        params=[("include", "pendencias"), ("include", "relatorios")],
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    parcial = response.json()
+    assert parcial["pendencias"] == [] and parcial["relatorios"] == []
+    assert parcial["arquivos"] is None and parcial["auditoria"] is None
+
+    response = await async_client.get(f"/api/v1/contratos/999999999/completo", headers=admin_headers)
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_create_contrato_numeracao_automatica(async_client: AsyncClient, admin_headers: Dict, contract_prerequisites: Dict):
+    """Sem nr_contrato, o contrato recebe o próximo número e a sugestão avança."""
+    form_data = {
+        "objeto": "Contrato com numeração automática",
+        "data_inicio": str(date(2025, 1, 1)),
+        "data_fim": str(date(2025, 12, 31)),
+        **contract_prerequisites
+    }
+    primeiro = await async_client.post("/api/v1/contratos/", data=form_data, headers=admin_headers)
+    segundo = await async_client.post("/api/v1/contratos/", data=form_data, headers=admin_headers)
+    assert primeiro.status_code == 201 and segundo.status_code == 201
+    nr_primeiro = primeiro.json()["nr_contrato"]
+    nr_segundo = segundo.json()["nr_contrato"]
+    assert nr_primeiro and nr_segundo and nr_primeiro != nr_segundo
+
+    sugestao = await async_client.get("/api/v1/contratos/next-number", headers=admin_headers)
+    assert sugestao.status_code == 200
+    assert sugestao.json()["next_number"] not in (nr_primeiro, nr_segundo)
+
+@pytest.mark.asyncio
+async def test_excluir_contratos_lote(async_client: AsyncClient, admin_headers: Dict, contract_prerequisites: Dict):
+    """A exclusão em lote desativa os contratos e seus arquivos em uma transação."""
+    contrato_ids = []
+    for i in range(2):
+        form_data = {
+            "nr_contrato": f"EXC-{uuid.uuid4().hex[:8]}",
+            "objeto": f"Contrato para exclusão em lote {i}",
+            "data_inicio": str(date(2025, 1, 1)),
+            "data_fim": str(date(2025, 12, 31)),
+            **contract_prerequisites
+        }
+        files = {"documento_contrato": ("documento_exclusao.txt", "conteúdo", "text/plain")}
+        response = await async_client.post("/api/v1/contratos/", data=form_data, files=files, headers=admin_headers)
+        assert response.status_code == 201
+        contrato_ids.append(response.json()["id"])
+
+    inexistente = 999999999
+    response = await async_client.post(
+        "/api/v1/contratos/excluir-lote",
+        json={"contrato_ids": [*contrato_ids, inexistente]},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    resultado = response.json()
+    assert sorted(resultado["excluidos"]) == sorted(contrato_ids)
+    assert resultado["nao_encontrados"] == [inexistente]
+    assert resultado["arquivos"] == 2
+
+    for contrato_id in contrato_ids:
+        assert (await async_client.get(f"/api/v1/contratos/{contrato_id}", headers=admin_headers)).status_code == 404
+
+    # Repetir a exclusão não afeta nada
+    response = await async_client.post(
+        "/api/v1/contratos/excluir-lote", json={"contrato_ids": contrato_ids}, headers=admin_headers
+    )
+    assert response.json()["excluidos"] == []
+    response = await async_client.delete(f"/api/v1/contratos/{contrato_ids[0]}", headers=admin_headers)
+    assert response.status_code == 404
@@ -0,0 +1,100 @@
+# tests/test_email_digest.py
+import os
+
+import pytest
+
+from app.services.email_digest_service import ItemResumo, ResumoEmails
+
+
+def _item(categoria, n):
+    return ItemResumo(
+        categoria=categoria,
+        titulo=f"Item {n}",
+        detalhes=[f"Detalhe <{n}>"],
+        assunto=f"Assunto {n}",
+        corpo=f"Corpo {n}",
+        dados={"n": n},
+        chave=(categoria, n)
+    )
+
+
+def test_resumo_agrupa_itens_por_destinatario():
+    resumo = ResumoEmails(conn=None)
+    for n in range(5):
+        resumo.adicionar("Fiscal@Exemplo.gov.br", "Fiscal", _item("Prazos", n))
+    resumo.adicionar("fiscal@exemplo.gov.br", "Fiscal", _item("Alertas", 5))
+    resumo.adicionar("gestor@exemplo.gov.br", "Gestor", _item("Prazos", 6))
+
+    mensagens = resumo.montar({})
+
+    assert len(resumo) == 7
+    assert len(mensagens) == 2
+    (destinatario, assunto, corpo, is_html), chaves = mensagens[0]
+    assert destinatario == "Fiscal@Exemplo.gov.br"
+    assert is_html and "6 aviso(s)" in assunto
+    assert "Prazos (5)" in corpo and "Alertas (1)" in corpo
+    assert "Detalhe &lt;0&gt;" in corpo
+    assert chaves == [("Prazos", n) for n in range(5)] + [("Alertas", 5)]
+    # Item único: vai o email individual
+    assert mensagens[1] == (("gestor@exemplo.gov.br", "Assunto 6", "Corpo 6", True), [("Prazos", 6)])
+
+
+def test_resumo_respeita_modo_imediato():
+    resumo = ResumoEmails(conn=None)
+    for n in range(3):
+        resumo.adicionar("fiscal@exemplo.gov.br", "Fiscal", _item("Prazos", n))
+        resumo.adicionar("gestor@exemplo.gov.br", "Gestor", _item("Prazos", n))
+
+    mensagens = resumo.montar({"fiscal@exemplo.gov.br": "imediato", "gestor@exemplo.gov.br": "resumo"})
+
+    individuais = [m for m, _ in mensagens if m[0] == "fiscal@exemplo.gov.br"]
+    assert [assunto for _, assunto, _, _ in individuais] == ["Assunto 0", "Assunto 1", "Assunto 2"]
+    assert len([m for m, _ in mensagens if m[0] == "gestor@exemplo.gov.br"]) == 1
+
+
+def test_resumo_usa_agrupador_da_categoria():
+    def agrupador(nome, itens):
+        return f"{len(itens)} pendências", f"{nome}: " + ",".join(str(i.dados["n"]) for i in itens)
+
+    resumo = ResumoEmails(conn=None, agrupadores={"Escalonamento": agrupador})
+    for n in range(3):
+        resumo.adicionar("gestor@exemplo.gov.br", "Gestor", _item("Escalonamento", n))
+    resumo.adicionar("admin@exemplo.gov.br", "Admin", _item("Escalonamento", 0))
+    resumo.adicionar("admin@exemplo.gov.br", "Admin", _item("Outros", 1))
+
+    mensagens = dict((m[0], m) for m, _ in resumo.montar({}))
+
+    assert mensagens["gestor@exemplo.gov.br"][1:3] == ("3 pendências", "Gestor: 0,1,2")
+    # Categorias misturadas: resumo genérico
+    assert "2 aviso(s)" in mensagens["admin@exemplo.gov.br"][1]
+
+
+@pytest.mark.asyncio
+async def test_preferencia_notificacao_usuario_logado(async_client):
+    login = await async_client.post("/auth/login", data={
+        "username": os.getenv("ADMIN_EMAIL"),
+        "password": os.getenv("ADMIN_PASSWORD")
+    })
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    original = await async_client.get("/api/v1/usuarios/me/preferencias-notificacao", headers=headers)
+    assert original.status_code == 200
+    assert original.json()["modo"] in ("resumo", "imediato")
+
+    response = await async_client.put(
+        "/api/v1/usuarios/me/preferencias-notificacao", json={"modo": "imediato"}, headers=headers
+    )
+    if response.status_code == 503:
+        pytest.skip("migrations/011_preferencia_notificacao.sql não aplicada")
+    assert response.status_code == 200
+    assert response.json() == {"modo": "imediato"}
+
+    atual = await async_client.get("/api/v1/usuarios/me/preferencias-notificacao", headers=headers)
+    assert atual.json() == {"modo": "imediato"}
+
+    invalido = await async_client.put(
+        "/api/v1/usuarios/me/preferencias-notificacao", json={"modo": "semanal"}, headers=headers
+    )
+    assert invalido.status_code == 422
+
+    await async_client.put("/api/v1/usuarios/me/preferencias-notificacao", json=original.json(), headers=headers)
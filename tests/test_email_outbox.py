@@ -0,0 +1,185 @@
+# tests/test_email_outbox.py
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.core.database import acquire_connection
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.services.email_outbox_service import EmailOutboxWorker, espera_nova_tentativa
+
+
+def test_espera_exponencial_limitada():
+    base = settings.EMAIL_OUTBOX_ESPERA_BASE_SEGUNDOS
+    assert espera_nova_tentativa(1) == base
+    assert espera_nova_tentativa(3) == min(base * 4, settings.EMAIL_OUTBOX_ESPERA_MAX_SEGUNDOS)
+    assert espera_nova_tentativa(50) == settings.EMAIL_OUTBOX_ESPERA_MAX_SEGUNDOS
+
+
+async def _sem_espera(destinatario):
+    return None
+
+
+@pytest_asyncio.fixture
+async def outbox_isolada(async_client):
+    """
+    Trava os emails que já estavam na fila durante o teste: com FOR UPDATE
+    SKIP LOCKED, os workers do teste reservam apenas os emails criados por ele.
+    """
+    async with acquire_connection() as conn:
+        if not await EmailOutboxRepository(conn).disponivel():
+            pytest.skip("migrations/010_email_outbox.sql não aplicada")
+        transacao = conn.transaction()
+        await transacao.start()
+        try:
+            await conn.execute("SELECT id FROM email_outbox FOR UPDATE")
+            yield
+        finally:
+            await transacao.rollback()
+
+
+async def _enfileirar(destinatarios):
+    async with acquire_connection() as conn:
+        repo = EmailOutboxRepository(conn)
+        if not await repo.disponivel():
+            pytest.skip("migrations/010_email_outbox.sql não aplicada")
+        return await repo.enfileirar_varios(
+            (destinatario, "Teste da caixa de saída", "corpo", False) for destinatario in destinatarios
+        )
+
+
+async def _status(ids):
+    async with acquire_connection() as conn:
+        rows = await conn.fetch(
+            "SELECT id, status, tentativas, ultimo_erro FROM email_outbox WHERE id = ANY($1::bigint[])", ids
+        )
+    return {r["id"]: dict(r) for r in rows}
+
+
+async def _remover(ids):
+    async with acquire_connection() as conn:
+        await conn.execute("DELETE FROM email_outbox WHERE id = ANY($1::bigint[])", ids)
+
+
+@pytest.mark.asyncio
+async def test_worker_registra_envios_e_falhas(outbox_isolada):
+    prefixo = uuid.uuid4().hex[:8]
+    ids = await _enfileirar([f"outbox.{i}.{prefixo}@teste.com" for i in range(3)])
+
+    async def enviar(destinatario, assunto, corpo, is_html=False):
+        assert destinatario.endswith(f".{prefixo}@teste.com")
+        if destinatario.startswith("outbox.1."):
+            raise ConnectionError("SMTP indisponível")
+        return True
+
+    try:
+        await EmailOutboxWorker(lote=100, enviar=enviar, aguardar_vez=_sem_espera).processar_pendentes()
+        status = await _status(ids)
+        assert status[ids[0]]["status"] == "enviado"
+        assert status[ids[2]]["status"] == "enviado"
+        assert status[ids[1]]["status"] == "pendente"
+        assert status[ids[1]]["tentativas"] == 1
+        assert "SMTP indisponível" in status[ids[1]]["ultimo_erro"]
+    finally:
+        await _remover(ids)
+
+
+@pytest.mark.asyncio
+async def test_workers_concorrentes_nao_repetem_envio(outbox_isolada):
+    prefixo = uuid.uuid4().hex[:8]
+    ids = await _enfileirar([f"concorrente.{i}.{prefixo}@teste.com" for i in range(40)])
+    enviados = []
+
+    async def enviar(destinatario, assunto, corpo, is_html=False):
+        await asyncio.sleep(0)
+        enviados.append(destinatario)
+        return True
+
+    try:
+        workers = [
+            EmailOutboxWorker(lote=5, concorrencia=2, enviar=enviar, aguardar_vez=_sem_espera)
+            for _ in range(4)
+        ]
+        await asyncio.gather(*(worker.processar_pendentes() for worker in workers))
+        assert len(enviados) == len(set(enviados)) == 40
+        assert all(s["status"] == "enviado" for s in (await _status(ids)).values())
+    finally:
+        await _remover(ids)
+
+
+@pytest.mark.asyncio
+async def test_reserva_vencida_respeita_max_tentativas(outbox_isolada):
+    prefixo = uuid.uuid4().hex[:8]
+    ids = await _enfileirar([f"esgotado.{prefixo}@teste.com", f"retomado.{prefixo}@teste.com"])
+    try:
+        async with acquire_connection() as conn:
+            # Dois emails presos em 'enviando' por um worker que caiu; um já sem tentativas
+            await conn.execute(
+                """
+                UPDATE email_outbox
+                SET status = 'enviando', bloqueado_ate = NOW() - INTERVAL '1 minute',
+                    tentativas = CASE WHEN id = $1 THEN max_tentativas ELSE 1 END
+                WHERE id = ANY($2::bigint[])
+                """,
+                ids[0], ids
+            )
+            reservados = await EmailOutboxRepository(conn).reservar_lote(10, 60)
+
+        assert [r["id"] for r in reservados] == [ids[1]]
+        status = await _status(ids)
+        assert status[ids[0]]["status"] == "falhou"
+        assert status[ids[1]]["tentativas"] == 2
+    finally:
+        await _remover(ids)
+
+
+@pytest.mark.asyncio
+async def test_worker_desiste_do_email_reservado_por_outro_durante_a_espera(outbox_isolada):
+    prefixo = uuid.uuid4().hex[:8]
+    ids = await _enfileirar([f"demorado.{prefixo}@teste.com", f"normal.{prefixo}@teste.com"])
+    enviados = []
+
+    async def aguardar_vez(destinatario):
+        if destinatario.startswith("demorado."):
+            # Enquanto este worker esperava a vez, a reserva venceu e outro worker o reservou
+            async with acquire_connection() as conn:
+                await conn.execute(
+                    "UPDATE email_outbox SET tentativas = tentativas + 1 WHERE id = $1", ids[0]
+                )
+
+    async def enviar(destinatario, assunto, corpo, is_html=False):
+        enviados.append(destinatario)
+        return True
+
+    try:
+        await EmailOutboxWorker(enviar=enviar, aguardar_vez=aguardar_vez).processar_lote()
+        assert enviados == [f"normal.{prefixo}@teste.com"]
+        status = await _status(ids)
+        assert status[ids[0]]["status"] == "enviando"  # segue com o outro worker
+        assert status[ids[1]]["status"] == "enviado"
+    finally:
+        await _remover(ids)
+
+
+@pytest.mark.asyncio
+async def test_resultado_nao_altera_email_reservado_por_outro_worker(outbox_isolada):
+    """Um worker cuja reserva venceu não marca como enviado nem falho o email que outro assumiu."""
+    prefixo = uuid.uuid4().hex[:8]
+    ids = await _enfileirar([f"assumido.{prefixo}@teste.com", f"falho.{prefixo}@teste.com"])
+    try:
+        async with acquire_connection() as conn:
+            repo = EmailOutboxRepository(conn)
+            reservados = {r["id"]: r["tentativas"] for r in await repo.reservar_lote(10, 60)}
+            # Outro worker reservou os dois emails depois que a reserva deste venceu
+            await conn.execute(
+                "UPDATE email_outbox SET tentativas = tentativas + 1 WHERE id = ANY($1::bigint[])", ids
+            )
+            await repo.marcar_enviados([(ids[0], reservados[ids[0]])])
+            await repo.registrar_falhas([(ids[1], reservados[ids[1]], "SMTP indisponível", 60.0)])
+
+        status = await _status(ids)
+        assert all(s["status"] == "enviando" and s["tentativas"] == 2 for s in status.values())
+    finally:
+        await _remover(ids)
@@ -0,0 +1,74 @@
+# tests/test_email_send_scheduler.py
+import asyncio
+import time
+
+import pytest
+
+from app.services.email_send_scheduler import EmailSendScheduler, TokenBucket
+
+
+class _Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+def test_token_bucket_repoe_ate_a_capacidade():
+    relogio = _Relogio()
+    balde = TokenBucket(taxa_por_segundo=2, capacidade=3, relogio=relogio)
+    assert balde.espera() == 0
+    balde._fichas = 0
+    assert balde.espera() == pytest.approx(0.5)
+
+    relogio.agora = 0.25
+    assert balde.espera() == pytest.approx(0.25)
+
+    relogio.agora = 100
+    balde.espera()
+    assert balde._fichas == 3
+
+
+@pytest.mark.asyncio
+async def test_rajada_e_depois_taxa_por_dominio():
+    enviados = []
+
+    async def enviar(destinatario, assunto, corpo, is_html=False):
+        enviados.append((destinatario, time.monotonic()))
+        return True
+
+    # 10 envios/s por domínio, rajada de 2; conta sem limite prático
+    agendador = EmailSendScheduler(
+        taxa_conta_por_minuto=60000, taxa_dominio_por_minuto=600, rajada=2, enviar=enviar
+    )
+    inicio = time.monotonic()
+    await asyncio.gather(*(agendador.enviar(f"u{i}@lento.com", "a", "c") for i in range(4)))
+    duracao = time.monotonic() - inicio
+
+    assert len(enviados) == 4
+    assert duracao >= 0.18  # 2 na rajada + 2 espaçados de 0,1 s
+
+    # Outro domínio tem balde próprio: sai sem esperar o anterior
+    inicio = time.monotonic()
+    await agendador.enviar("u@rapido.com", "a", "c")
+    assert time.monotonic() - inicio < 0.05
+
+
+@pytest.mark.asyncio
+async def test_agendar_retorna_imediatamente():
+    liberar = asyncio.Event()
+    enviados = []
+
+    async def enviar(destinatario, assunto, corpo, is_html=False):
+        await liberar.wait()
+        enviados.append(destinatario)
+        return True
+
+    agendador = EmailSendScheduler(enviar=enviar)
+    tarefa = agendador.agendar("fiscal@teste.com", "Assunto", "Corpo")
+    assert not tarefa.done() and enviados == []
+
+    liberar.set()
+    assert await agendador.aguardar_agendados(timeout=1) == 0
+    assert enviados == ["fiscal@teste.com"]
@@ -52,7 +52,7 @@ async def test_email_templates_structure():
 async def test_email_service_send_mock():
     """Testa o envio de email com mock."""
 
-    with patch('aiosmtplib.send') as mock_send:
+    with patch('app.services.smtp_pool.SMTPConnectionPool.send_message', new_callable=AsyncMock) as mock_send:
         mock_send.return_value = None
 
         # Simular envio de email usando método estático
@@ -69,7 +69,7 @@ async def test_email_service_send_mock():
 async def test_notification_workflow_pendencia():
     """Testa o fluxo de notificação para criação de pendência."""
 
-    with patch('aiosmtplib.send') as mock_send:
+    with patch('app.services.smtp_pool.SMTPConnectionPool.send_message', new_callable=AsyncMock) as mock_send:
         mock_send.return_value = None
 
         templates = EmailTemplates()
@@ -108,7 +108,7 @@ async def test_notification_workflow_pendencia():
 async def test_notification_workflow_relatorio():
     """Testa o fluxo de notificação para submissão de relatório."""
 
-    with patch('aiosmtplib.send') as mock_send:
+    with patch('app.services.smtp_pool.SMTPConnectionPool.send_message', new_callable=AsyncMock) as mock_send:
         mock_send.return_value = None
 
         templates = EmailTemplates()
@@ -150,7 +150,7 @@ async def test_notification_workflow_relatorio():
 async def test_email_service_error_handling():
     """Testa tratamento de erros no serviço de email."""
 
-    with patch('aiosmtplib.send') as mock_send:
+    with patch('app.services.smtp_pool.SMTPConnectionPool.send_message', new_callable=AsyncMock) as mock_send:
         # Simular erro de conexão
         mock_send.side_effect = Exception("Falha na conexão SMTP")
 
@@ -0,0 +1,60 @@
+# tests/test_email_templates.py
+from datetime import date
+
+import pytest
+
+from app.services.email_template_engine import TemplateCompilado, literal
+from app.services.email_templates import EmailTemplates
+from app.services.notification_service import NotificationTemplates, NotificationType
+
+
+def test_template_compilado_renderiza_campos():
+    template = TemplateCompilado("Olá, {nome}! {{fixo}} {nome} tem {qtd} item(ns)")
+
+    assert template.campos == frozenset({"nome", "qtd"})
+    assert template.render(nome="Ana", qtd=3) == "Olá, Ana! {fixo} Ana tem 3 item(ns)"
+
+
+def test_template_compilado_literal_protege_chaves():
+    css = "body { color: red; }"
+    template = TemplateCompilado(f"<style>{literal(css)}</style>{{corpo}}")
+
+    assert template.campos == frozenset({"corpo"})
+    assert template.render(corpo="x") == "<style>body { color: red; }</style>x"
+
+
+@pytest.mark.parametrize("fonte", ["{valor:>3}", "{a.b}", "{lista[0]}", "{nome!r}", "{}"])
+def test_template_compilado_rejeita_campos_complexos(fonte):
+    with pytest.raises(ValueError):
+        TemplateCompilado(fonte)
+
+
+def test_template_compilado_exige_todos_os_campos():
+    template = TemplateCompilado("{a}-{b}")
+    with pytest.raises(KeyError):
+        template.render(a=1)
+
+
+def test_template_compilado_aceita_palavras_reservadas():
+    assert TemplateCompilado("<p class=\"{class}\">").render(**{"class": "x"}) == '<p class="x">'
+
+
+def test_email_usa_layout_compartilhado():
+    contrato = {'nr_contrato': '001/2025', 'objeto': 'Limpeza predial', 'data_fim': date(2025, 12, 31)}
+    pendencia = {'descricao': 'Relatório', 'data_prazo': '2030-01-05'}
+
+    assunto, corpo = EmailTemplates.pending_report_notification('Maria', contrato, pendencia)
+
+    assert "001/2025" in assunto
+    assert corpo.count("<html") == 1 and "Maria" in corpo
+    assert "05/01/2030" in corpo
+    assert "Limpeza predial" in corpo
+    assert "{" not in corpo.split("</style>")[1]
+
+
+def test_assunto_de_notificacao_usa_padroes():
+    assert NotificationTemplates.get_subject(NotificationType.RELATORIO_APROVADO, {}) == "Relatório aprovado - N/A"
+    assert "123/2025" in NotificationTemplates.get_subject(
+        NotificationType.PENDENCIA_CRIADA, {'nr_contrato': '123/2025'}
+    )
+
@@ -0,0 +1,164 @@
+# tests/test_lazy_connection.py
+import pytest
+
+from app.core import database
+from app.core.database import LazyConnection, get_connection, release_connection
+
+
+class FakeConnection:
+    def __init__(self):
+        self.queries = []
+
+    async def fetchval(self, query, *args, **kwargs):
+        self.queries.append(query)
+        return 1
+
+
+class FakePool:
+    def __init__(self):
+        self.acquired = 0
+        self.released = 0
+
+    async def acquire(self, timeout=None):
+        self.acquired += 1
+        return FakeConnection()
+
+    async def release(self, connection):
+        self.released += 1
+
+    def get_max_size(self):
+        return 10
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(database, "pool", pool)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_lazy_connection_only_acquires_on_first_query(fake_pool):
+    """A conexão só sai do pool quando a primeira query é executada."""
+    gen = get_connection()
+    conn = await gen.__anext__()
+
+    assert isinstance(conn, LazyConnection)
+    assert fake_pool.acquired == 0
+    assert not conn.is_acquired
+
+    assert await conn.fetchval("SELECT 1") == 1
+    assert await conn.fetchval("SELECT 2") == 1
+    assert fake_pool.acquired == 1
+
+    await gen.aclose()
+    assert fake_pool.released == 1
+
+
+@pytest.mark.asyncio
+async def test_lazy_connection_release_early_and_reacquire(fake_pool):
+    """Após release antecipado a próxima query obtém outra conexão."""
+    conn = LazyConnection()
+    await conn.fetchval("SELECT 1")
+    await release_connection(conn)
+
+    assert fake_pool.released == 1
+    assert not conn.is_acquired
+
+    await conn.fetchval("SELECT 1")
+    assert fake_pool.acquired == 2
+
+    await conn.close()
+    assert fake_pool.released == 2
+
+
+@pytest.mark.asyncio
+async def test_unused_lazy_connection_never_touches_pool(fake_pool):
+    """Requisições que não consultam o banco não ocupam conexões."""
+    gen = get_connection()
+    await gen.__anext__()
+    await gen.aclose()
+
+    assert fake_pool.acquired == 0
+    assert fake_pool.released == 0
+
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_queries_concurrently_on_separate_connections(fake_pool):
+    """Consultas independentes rodam em paralelo, cada uma com sua conexão."""
+    import asyncio
+    from app.core.database import fan_out
+
+    ativas = 0
+    pico = 0
+    conexoes = set()
+
+    async def consulta(conn):
+        nonlocal ativas, pico
+        conexoes.add(id(conn))
+        ativas += 1
+        pico = max(pico, ativas)
+        await asyncio.sleep(0.01)
+        ativas -= 1
+        return await conn.fetchval("SELECT 1")
+
+    resultados = await fan_out(consulta, consulta, consulta, max_concurrency=2)
+
+    assert resultados == [1, 1, 1]
+    assert pico == 2
+    assert len(conexoes) == 3
+    assert fake_pool.acquired == fake_pool.released == 3
+
+
+@pytest.mark.asyncio
+async def test_fan_out_timeout_releases_connections(fake_pool):
+    """Uma consulta que excede o timeout cancela o fan-out e devolve as conexões."""
+    import asyncio
+    from app.core.database import fan_out
+
+    async def lenta(conn):
+        await asyncio.sleep(1)
+
+    async def rapida(conn):
+        return await conn.fetchval("SELECT 1")
+
+    with pytest.raises(asyncio.TimeoutError):
+        await fan_out(rapida, lenta, timeout=0.01)
+
+    assert fake_pool.acquired == fake_pool.released
+
+
+@pytest.mark.asyncio
+async def test_fan_out_releases_request_connection_first(fake_pool):
+    """A conexão da requisição volta ao pool antes do fan-out; presa numa transação, conta no limite."""
+    import asyncio
+    from app.core.database import fan_out
+
+    ativas = 0
+    pico = 0
+
+    async def consulta(conn):
+        nonlocal ativas, pico
+        ativas += 1
+        pico = max(pico, ativas)
+        await asyncio.sleep(0.01)
+        ativas -= 1
+        return await conn.fetchval("SELECT 1")
+
+    request_conn = LazyConnection()
+    await request_conn.fetchval("SELECT 1")
+    await fan_out(consulta, consulta, consulta, max_concurrency=2, conn=request_conn)
+
+    assert not request_conn.is_acquired
+    assert pico == 2
+
+    # Fixada (ex.: transação aberta): não pode ser devolvida, então ocupa uma vaga
+    pico = 0
+    await request_conn.acquire()
+    request_conn._pinned += 1
+    await fan_out(consulta, consulta, consulta, max_concurrency=2, conn=request_conn)
+
+    assert request_conn.is_acquired
+    assert pico == 1
+    await request_conn.close()
+    assert fake_pool.acquired == fake_pool.released
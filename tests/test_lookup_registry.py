@@ -0,0 +1,66 @@
+# tests/test_lookup_registry.py
+import pytest
+
+from app.core.cache_bus import publish_invalidation
+from app.core.lookup_registry import LookupRegistry, lookup_entity
+
+
+class FakeConnection:
+    """Conexão falsa que conta as consultas às tabelas de domínio."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetch_count = 0
+
+    async def fetch(self, query, *args):
+        self.fetch_count += 1
+        return list(self.rows)
+
+    async def execute(self, query, *args):
+        return "SELECT 1"
+
+
+@pytest.mark.asyncio
+async def test_lookup_registry_resolves_without_queries_after_warm_up():
+    """Após o warm-up, nomes e ids são resolvidos sem consultar o banco."""
+    registry = LookupRegistry(tables=("statuspendencia",))
+    conn = FakeConnection([{"id": 1, "nome": "Pendente"}, {"id": 3, "nome": "Cancelada"}])
+
+    await registry.warm_up(conn)
+    assert conn.fetch_count == 1
+
+    assert await registry.require_id(conn, "statuspendencia", "Cancelada") == 3
+    assert (await registry.get_by_id(conn, "statuspendencia", 1))["nome"] == "Pendente"
+    assert await registry.get_by_name(conn, "statuspendencia", "Inexistente") is None
+    assert conn.fetch_count == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_registry_reloads_after_invalidation():
+    """Uma escrita publicada no barramento força a recarga da tabela."""
+    registry = LookupRegistry(tables=("modalidade",))
+    conn = FakeConnection([{"id": 1, "nome": "Pregão"}])
+    await registry.warm_up(conn)
+
+    conn.rows.append({"id": 2, "nome": "Concorrência"})
+    await publish_invalidation(conn, lookup_entity("modalidade"))
+
+    assert await registry.require_id(conn, "modalidade", "Concorrência") == 2
+    assert conn.fetch_count == 2
+
+
+@pytest.mark.asyncio
+async def test_schema_registry_reads_catalog_once():
+    """O catálogo é lido uma vez e relido apenas após invalidação."""
+    from app.core.schema_registry import SchemaRegistry
+
+    registry = SchemaRegistry()
+    conn = FakeConnection([{"table_name": "contrato"}, {"table_name": "usuario"}])
+
+    assert await registry.missing_tables(conn, ["contrato", "garantia"]) == ["garantia"]
+    assert "usuario" in await registry.existing_tables(conn)
+    assert conn.fetch_count == 1
+
+    registry.invalidate()
+    await registry.existing_tables(conn)
+    assert conn.fetch_count == 2
@@ -0,0 +1,77 @@
+# tests/test_pagination.py
+import json
+
+import pytest
+
+from app.core.pagination import paginar
+
+
+class FakeConnection:
+    """Conexão falsa que registra as consultas e simula LIMIT/OFFSET."""
+
+    def __init__(self, rows, plan_rows=1000):
+        self.rows = rows
+        self.plan_rows = plan_rows
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        limit, offset = args[-2], args[-1]
+        page = [dict(r) for r in self.rows[offset:offset + limit]]
+        if "COUNT(*) OVER()" in query:
+            for row in page:
+                row["_total_paginacao"] = len(self.rows)
+        return page
+
+    async def fetchval(self, query, *args):
+        self.queries.append(query)
+        if query.startswith("EXPLAIN"):
+            return json.dumps([{"Plan": {"Plan Rows": self.plan_rows}}])
+        return len(self.rows)
+
+
+def _paginar(conn, contagem, limit=2, offset=0):
+    return paginar(
+        conn, colunas="*", from_sql="FROM contratado", where_sql=" WHERE ativo = TRUE",
+        params=[], order_by="nome", limit=limit, offset=offset, contagem=contagem
+    )
+
+
+ROWS = [{"id": i, "nome": f"Contratado {i}"} for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_contagem_exata_em_uma_consulta():
+    """O total vem da janela COUNT(*) OVER() da própria consulta da página."""
+    conn = FakeConnection(ROWS)
+    pagina = await _paginar(conn, "exata")
+
+    assert len(conn.queries) == 1
+    assert pagina.total == 5 and pagina.has_more and not pagina.total_estimado
+    assert "_total_paginacao" not in pagina.itens[0]
+    assert pagina.total_paginas(2) == 3
+
+
+@pytest.mark.asyncio
+async def test_contagem_nenhuma_indica_proxima_pagina():
+    conn = FakeConnection(ROWS)
+    pagina = await _paginar(conn, "nenhuma", offset=2)
+    assert len(conn.queries) == 1
+    assert pagina.total is None and pagina.total_paginas(2) is None
+    assert [r["id"] for r in pagina.itens] == [2, 3] and pagina.has_more
+
+    ultima = await _paginar(conn, "nenhuma", offset=4)
+    assert not ultima.has_more
+
+
+@pytest.mark.asyncio
+async def test_contagem_estimada_usa_planejador_e_e_exata_na_ultima_pagina():
+    conn = FakeConnection(ROWS, plan_rows=1000)
+    pagina = await _paginar(conn, "estimada")
+    assert pagina.total == 1000 and pagina.total_estimado
+    assert conn.queries[-1].startswith("EXPLAIN")
+
+    conn.queries.clear()
+    ultima = await _paginar(conn, "estimada", offset=4)
+    assert ultima.total == 5 and not ultima.total_estimado
+    assert len(conn.queries) == 1
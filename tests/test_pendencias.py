@@ -64,7 +64,7 @@ async def setup_contract(async_client: AsyncClient, admin_headers: Dict, admin_u
         "contratado_id": contratado['id'],
         "modalidade_id": modalidades_resp.json()[0]['id'],
         "status_id": status_resp.json()[0]['id'],
-        "gestor_id": fiscal['id'],  # Usando o fiscal como gestor para simplificar
+        "gestor_id": admin_user_id,  # Gestor precisa ter perfil de Gestor ou Administrador
         "fiscal_id": fiscal['id']
     }
     
@@ -57,7 +57,7 @@ async def setup_for_reports(async_client: AsyncClient, admin_headers: Dict, admi
         "nr_contrato": f"REL-{uuid.uuid4().hex[:8]}", "objeto": "Contrato para teste de relatórios",
         "data_inicio": str(date(2025, 1, 1)), "data_fim": str(date(2025, 12, 31)),
         "contratado_id": contratado['id'], "modalidade_id": modalidades_resp.json()[0]['id'],
-        "status_id": status_resp.json()[0]['id'], "gestor_id": fiscal['id'], "fiscal_id": fiscal['id']
+        "status_id": status_resp.json()[0]['id'], "gestor_id": admin_user['id'], "fiscal_id": fiscal['id']
     }
     contrato_resp = await async_client.post("/api/v1/contratos/", data=contrato_data, headers=admin_headers)
     contrato = contrato_resp.json()
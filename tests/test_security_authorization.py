@@ -233,6 +233,10 @@ class TestSecurity:
             headers=admin_headers
         )
 
+        # Admin como gestor do contrato (gestor precisa ter perfil de Gestor ou Administrador)
+        admin_response = await async_client.get("/api/v1/usuarios/me", headers=admin_headers)
+        admin_id = admin_response.json()["id"]
+
         # 2. Criar contratado
         contratado_data = {
             "nome": f"Empresa Teste {uuid.uuid4().hex[:6]}",
@@ -264,7 +268,7 @@ class TestSecurity:
             "data_fim": "2024-12-31",
             "valor": 10000.00,
             "fiscal_responsavel_id": fiscal_id,
-            "gestor_id": fiscal_id,
+            "gestor_id": admin_id,
             "fiscal_id": fiscal_id
         }
 
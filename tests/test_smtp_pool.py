@@ -0,0 +1,97 @@
+# tests/test_smtp_pool.py
+"""Pool SMTP contra um servidor local (aiosmtpd), sem TLS nem autenticação"""
+import socket
+from email.message import EmailMessage
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from app.services.smtp_pool import ConfigSMTP, SMTPConnectionPool
+
+
+class _Caixa:
+    def __init__(self):
+        self.mensagens = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.mensagens.append(envelope)
+        return "250 OK"
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def servidor_smtp():
+    caixa = _Caixa()
+    controller = aiosmtpd_controller.Controller(caixa, hostname="127.0.0.1", port=_porta_livre())
+    controller.start()
+    yield controller, caixa
+    controller.stop()
+
+
+def _mensagem(i: int) -> EmailMessage:
+    mensagem = EmailMessage()
+    mensagem["From"] = "sigescon@teste.com"
+    mensagem["To"] = f"destinatario{i}@teste.com"
+    mensagem["Subject"] = f"Teste {i}"
+    mensagem.set_content("corpo")
+    return mensagem
+
+
+def _config(controller) -> ConfigSMTP:
+    return ConfigSMTP(hostname=controller.hostname, port=controller.port, start_tls=False, timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_reutiliza_sessoes(servidor_smtp):
+    controller, caixa = servidor_smtp
+    pool = SMTPConnectionPool(_config(controller), tamanho=2, max_mensagens=1000)
+    try:
+        for i in range(20):
+            await pool.send_message(_mensagem(i))
+    finally:
+        await pool.close()
+
+    assert len(caixa.mensagens) == 20
+    assert pool.conexoes_abertas == 1
+
+
+@pytest.mark.asyncio
+async def test_limite_de_mensagens_por_conexao(servidor_smtp):
+    controller, caixa = servidor_smtp
+    pool = SMTPConnectionPool(_config(controller), tamanho=1, max_mensagens=3)
+    try:
+        for i in range(7):
+            await pool.send_message(_mensagem(i))
+    finally:
+        await pool.close()
+
+    assert len(caixa.mensagens) == 7
+    assert pool.conexoes_abertas == 3
+
+
+@pytest.mark.asyncio
+async def test_reconecta_apos_queda():
+    caixa = _Caixa()
+    porta = _porta_livre()
+    controller = aiosmtpd_controller.Controller(caixa, hostname="127.0.0.1", port=porta)
+    controller.start()
+    pool = SMTPConnectionPool(_config(controller), tamanho=1, max_mensagens=1000, noop_apos=3600)
+    try:
+        await pool.send_message(_mensagem(1))
+        # O servidor reinicia: a sessão guardada no pool deixa de existir
+        controller.stop()
+        controller = aiosmtpd_controller.Controller(caixa, hostname="127.0.0.1", port=porta)
+        controller.start()
+        await pool.send_message(_mensagem(2))
+    finally:
+        await pool.close()
+        controller.stop()
+
+    assert [m.rcpt_tos for m in caixa.mensagens] == [["destinatario1@teste.com"], ["destinatario2@teste.com"]]
+    assert pool.conexoes_abertas == 2
@@ -43,6 +43,10 @@ async def setup_complete_workflow(async_client: AsyncClient, admin_headers: Dict
     }, headers=admin_headers)
     contratado = contratado_resp.json()
 
+    # Obter ID do usuário admin (gestor do contrato)
+    admin_user_resp = await async_client.get("/api/v1/usuarios/me", headers=admin_headers)
+    admin_user = admin_user_resp.json()
+
     # Obter dados auxiliares
     modalidades_resp = await async_client.get("/api/v1/modalidades/", headers=admin_headers)
     status_resp = await async_client.get("/api/v1/status/", headers=admin_headers)
@@ -56,7 +60,7 @@ async def setup_complete_workflow(async_client: AsyncClient, admin_headers: Dict
         "contratado_id": contratado['id'],
         "modalidade_id": modalidades_resp.json()[0]['id'],
         "status_id": status_resp.json()[0]['id'],
-        "gestor_id": fiscal['id'],
+        "gestor_id": admin_user['id'],
         "fiscal_id": fiscal['id']
     }
 
@@ -74,10 +78,6 @@ async def setup_complete_workflow(async_client: AsyncClient, admin_headers: Dict
     })
     fiscal_headers = {"Authorization": f"Bearer {fiscal_login.json()['access_token']}"}
 
-    # Obter ID do usuário admin
-    admin_user_resp = await async_client.get("/api/v1/usuarios/me", headers=admin_headers)
-    admin_user = admin_user_resp.json()
-
     return {
         "contrato_id": contrato['id'],
         "fiscal_id": fiscal['id'],